@@ -0,0 +1,86 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+"""Run the benchmarks.
+
+Usage::
+
+    python -m benchmarks [-k PATTERN] [--quick] [--repeat N]
+        [--save results.json] [--compare baseline.json]
+        [--tolerance 0.25] [--no-thresholds]
+
+The exit code is 1 if a benchmark failed, got slower than the baseline
+(by more than the tolerance) or failed a ``thresholds.json`` ratio check.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .harness import (
+    THRESHOLDS_FILE,
+    find_regressions,
+    load_results,
+    load_thresholds,
+    run,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks.
+
+    Parameters
+    ----------
+    argv : list[str] | None
+        The command line arguments.
+
+    Returns
+    -------
+    int
+        The exit code.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("-k", dest="pattern", help="Only run matching names")
+    parser.add_argument("--quick", action="store_true", help="Smoke run")
+    parser.add_argument("--repeat", type=int, default=None)
+    parser.add_argument("--save", type=Path, help="Save the results (json)")
+    parser.add_argument("--compare", type=Path, help="Baseline results")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument(
+        "--no-thresholds",
+        action="store_true",
+        help=f"Do not check the ratios in {THRESHOLDS_FILE.name}",
+    )
+    args = parser.parse_args(argv)
+    results = run(args.pattern, repeat=args.repeat, quick=args.quick)
+    width = max((len(result.name) for result in results), default=10)
+    for result in results:
+        if result.error:
+            print(f"{result.name:<{width}}  FAILED: {result.error}")
+        else:
+            timings = f"best {result.best:9.4f}s  median {result.median:9.4f}s"
+            print(f"{result.name:<{width}}  {timings}  ({result.runs} runs)")
+    if args.save:
+        args.save.write_text(
+            json.dumps([result.to_dict() for result in results], indent=2),
+            encoding="utf-8",
+        )
+    thresholds = (
+        load_thresholds(THRESHOLDS_FILE)
+        if THRESHOLDS_FILE.is_file() and not args.no_thresholds
+        else None
+    )
+    regressions = find_regressions(
+        results,
+        baseline=load_results(args.compare) if args.compare else None,
+        thresholds=thresholds,
+        tolerance=args.tolerance,
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
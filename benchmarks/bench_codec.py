@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=attribute-defined-outside-init,missing-param-doc
+# pylint: disable=unused-argument
+# pyright: reportUninitializedInstanceVariable=false
+# pyright: reportUnusedParameter=false
+
+"""Benchmarks for the I/O stream message codecs.
+
+The codecs whose packages are not installed are skipped. The size of
+each codec's messages (with the envelope's base64 overhead) is printed
+by ``python -m benchmarks.bench_codec``.
+"""
+
+from typing import Any
+
+from waldiez.io.codec import PayloadCodec, decode_payload, get_codec
+
+CODECS = ["json", "orjson", "msgpack", "json+zstd", "msgpack+zstd"]
+MESSAGE_SIZES = [200, 20_000]
+MESSAGE_COUNT = 1_000
+
+
+def _message(size: int) -> dict[str, Any]:
+    """Get a (text) message of about ``size`` bytes."""
+    return {
+        "type": "text",
+        "id": "0d6c1c4e-4f1b-4b5e-9c1b-2f1f6b1f8c3a",
+        "timestamp": "2025-01-01T00:00:00.000000+00:00",
+        "content": {
+            "uuid": "5f3e1c1a-6b1d-4e5b-8a1f-3c2d1e0f9a8b",
+            "content": ("Lorem ipsum dolor sit amet. " * (size // 28 + 1))[
+                :size
+            ],
+            "sender_name": "assistant",
+            "recipient_name": "user",
+        },
+    }
+
+
+def _codec(name: str) -> PayloadCodec:
+    """Get a codec (asv's skip if its packages are not installed)."""
+    try:
+        return get_codec(name, min_compress_size=1024)
+    except ValueError as error:
+        raise NotImplementedError(str(error)) from error
+
+
+class Codecs:
+    """Encode and decode stream messages."""
+
+    params = [CODECS, MESSAGE_SIZES]
+    param_names = ["codec", "size"]
+
+    def setup(self, codec: str, size: int) -> None:
+        """Create the codec and the messages."""
+        self.codec = _codec(codec)
+        self.messages = [
+            {**_message(size), "index": index} for index in range(MESSAGE_COUNT)
+        ]
+        self.encoded = [self.codec.dumps(message) for message in self.messages]
+
+    def time_dumps(self, codec: str, size: int) -> None:
+        """Time ``PayloadCodec.dumps``."""
+        for message in self.messages:
+            self.codec.dumps(message)
+
+    def time_decode(self, codec: str, size: int) -> None:
+        """Time ``decode_payload`` (of any codec)."""
+        for message in self.encoded:
+            decode_payload(message)
+
+
+def main() -> None:
+    """Print the size of a message with each (installed) codec."""
+    for size in MESSAGE_SIZES:
+        message = _message(size)
+        plain = len(get_codec("json").dumps(message))
+        for name in CODECS:
+            try:
+                codec = _codec(name)
+            except NotImplementedError as error:
+                print(f"{name:<14}{size:>8}  skipped: {error}")
+                continue
+            encoded = len(codec.dumps(message))
+            print(
+                f"{name:<14}{size:>8}{encoded:>8} bytes ({encoded / plain:.0%})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=attribute-defined-outside-init,missing-param-doc
+# pylint: disable=unused-argument
+# pyright: reportUninitializedInstanceVariable=false
+# pyright: reportUnusedParameter=false
+
+"""Benchmarks for loading and exporting flows."""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from waldiez import Waldiez, WaldiezExporter
+from waldiez.exporting.core import (
+    DefaultPathResolver,
+    DefaultSerializer,
+    ExportConfig,
+    ExporterContext,
+)
+from waldiez.exporting.flow import ExportMemo, get_export_memo
+from waldiez.exporting.flow.orchestrator import ExportOrchestrator
+from waldiez.logger import WaldiezLogger
+
+from .synthetic import make_flow
+
+FLOW_SIZES = [10, 100, 500]
+
+
+class LoadFlow:
+    """Load a ``.waldiez`` file."""
+
+    params = FLOW_SIZES
+    param_names = ["agents"]
+
+    def setup(self, agents: int) -> None:
+        """Write the flow to a file."""
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="waldiez-bench-"))
+        self.flow_file = self.tmp_dir / "flow.waldiez"
+        self.flow_file.write_text(
+            make_flow(agents).model_dump_json(by_alias=True), encoding="utf-8"
+        )
+
+    def teardown(self, agents: int) -> None:
+        """Remove the flow."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def time_load(self, agents: int) -> None:
+        """Time ``Waldiez.load``."""
+        Waldiez.load(self.flow_file)
+
+
+class ExportFlow:
+    """Export a flow to a python script or a notebook (without memo)."""
+
+    params = [FLOW_SIZES, ["py", "ipynb"]]
+    param_names = ["agents", "extension"]
+    repeat = 3
+
+    def setup(self, agents: int, extension: str) -> None:
+        """Create the exporter and disable the agents' memo."""
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="waldiez-bench-"))
+        self.exporter = WaldiezExporter(Waldiez(flow=make_flow(agents)))
+        self.memo_size = get_export_memo().max_entries
+        get_export_memo().max_entries = 0
+
+    def teardown(self, agents: int, extension: str) -> None:
+        """Restore the memo and remove the output."""
+        get_export_memo().max_entries = self.memo_size
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def time_export(self, agents: int, extension: str) -> None:
+        """Time ``WaldiezExporter.export``."""
+        self.exporter.export(self.tmp_dir / f"flow.{extension}", force=True)
+
+
+class Orchestrate:
+    """Generate a flow's (merged) content, cold or with memoized agents."""
+
+    params = [FLOW_SIZES, ["cold", "memoized"]]
+    param_names = ["agents", "memo"]
+
+    def setup(self, agents: int, memo: str) -> None:
+        """Create the flow (and fill the memo)."""
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="waldiez-bench-"))
+        self.waldiez = Waldiez(flow=make_flow(agents))
+        self.memo = ExportMemo(max_entries=0 if memo == "cold" else 1024)
+        if memo == "memoized":
+            self.orchestrate()
+
+    def teardown(self, agents: int, memo: str) -> None:
+        """Remove the output."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def orchestrate(self) -> None:
+        """Run the export orchestrator."""
+        context = ExporterContext(
+            config=ExportConfig(
+                name=self.waldiez.name,
+                output_directory=self.tmp_dir,
+                is_async=self.waldiez.is_async,
+            ),
+            serializer=DefaultSerializer(),
+            path_resolver=DefaultPathResolver(),
+            logger=WaldiezLogger(),
+        )
+        ExportOrchestrator(self.waldiez, context, memo=self.memo).orchestrate()
+
+    def time_orchestrate(self, agents: int, memo: str) -> None:
+        """Time ``ExportOrchestrator.orchestrate``."""
+        self.orchestrate()
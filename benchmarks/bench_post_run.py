@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=attribute-defined-outside-init,missing-param-doc
+# pylint: disable=unused-argument
+# pyright: reportUninitializedInstanceVariable=false
+# pyright: reportUnusedParameter=false
+
+"""Benchmarks for the post-run processing (timeline, sequence diagram)."""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from waldiez.running.gen_seq_diagram import generate_sequence_diagram
+from waldiez.running.timeline_processor import TimelineProcessor
+
+from .synthetic import make_events_frame, make_log_frames
+
+LOG_SIZES = [100, 1_000, 10_000]
+
+
+class ProcessTimeline:
+    """Generate the timeline of a run's logs."""
+
+    params = LOG_SIZES
+    param_names = ["rows"]
+
+    def setup(self, rows: int) -> None:
+        """Create the logs."""
+        self.frames = make_log_frames(rows)
+
+    def time_process_timeline(self, rows: int) -> None:
+        """Time ``TimelineProcessor.process_timeline``."""
+        processor = TimelineProcessor()
+        processor.load_data_frames(
+            agents=self.frames["agents"],
+            chat=self.frames["chat"],
+            events=self.frames["events"],
+            functions=self.frames["functions"],
+        )
+        processor.process_timeline()
+
+
+class SequenceDiagram:
+    """Generate the mermaid sequence diagram of a run's events."""
+
+    params = LOG_SIZES
+    param_names = ["rows"]
+
+    def setup(self, rows: int) -> None:
+        """Write the events to a csv file."""
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="waldiez-bench-"))
+        self.events_file = self.tmp_dir / "events.csv"
+        make_events_frame(rows).to_csv(self.events_file, index=False)
+
+    def teardown(self, rows: int) -> None:
+        """Remove the files."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def time_generate_sequence_diagram(self, rows: int) -> None:
+        """Time ``generate_sequence_diagram``."""
+        generate_sequence_diagram(self.events_file, self.tmp_dir / "flow.mmd")
@@ -0,0 +1,49 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=attribute-defined-outside-init,missing-param-doc
+# pylint: disable=unused-argument
+# pylint: disable=protected-access
+# pyright: reportUninitializedInstanceVariable=false
+# pyright: reportUnusedParameter=false
+# pyright: reportPrivateUsage=false
+
+"""Benchmarks for the overhead of running a flow (offline)."""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from waldiez import Waldiez
+from waldiez.runner import WaldiezRunner
+
+from .synthetic import make_runnable_flow
+
+
+class RunFlow:
+    """Export and run a flow whose agents reply without an LLM.
+
+    Installing the requirements (pip) is not included.
+    """
+
+    params = [[2, 20], [False, True]]
+    param_names = ["max_turns", "post_run"]
+    repeat = 3
+
+    def setup(self, max_turns: int, post_run: bool) -> None:
+        """Create the runner."""
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="waldiez-bench-"))
+        self.runner = WaldiezRunner(Waldiez(flow=make_runnable_flow(max_turns)))
+        self.runner._called_install_requirements = True
+
+    def teardown(self, max_turns: int, post_run: bool) -> None:
+        """Remove the output."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def time_run(self, max_turns: int, post_run: bool) -> None:
+        """Time ``WaldiezRunner.run`` (with or without the timeline/mmd)."""
+        self.runner.run(
+            output_path=self.tmp_dir / "flow.py",
+            skip_mmd=not post_run,
+            skip_timeline=not post_run,
+        )
@@ -0,0 +1,94 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=attribute-defined-outside-init,missing-param-doc
+# pylint: disable=unused-argument
+# pyright: reportUninitializedInstanceVariable=false
+# pyright: reportUnusedParameter=false
+
+"""Benchmarks for the filesystem checkpoint storage."""
+
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from waldiez.storage import FilesystemStorage, WaldiezCheckpoint
+
+CHECKPOINT_COUNTS = [10, 100, 500]
+SESSION = "benchmark"
+
+
+def _state(index: int, messages: int = 20) -> dict[str, Any]:
+    """Get a (group chat like) checkpoint state."""
+    return {
+        "messages": [
+            {
+                "role": "assistant",
+                "name": f"agent_{turn % 5}",
+                "content": f"Message {index}.{turn}: " + "lorem ipsum " * 20,
+            }
+            for turn in range(messages)
+        ],
+        "context_variables": {"step": index, "done": False},
+    }
+
+
+class Checkpoints:
+    """Save, list, load and record the history of checkpoints."""
+
+    params = CHECKPOINT_COUNTS
+    param_names = ["checkpoints"]
+
+    def setup(self, checkpoints: int) -> None:
+        """Create a workspace with some checkpoints."""
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix="waldiez-bench-"))
+        self.storage = FilesystemStorage(self.tmp_dir / "workspace")
+        self.started = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for index in range(checkpoints):
+            self.storage.save_checkpoint(
+                SESSION,
+                _state(index),
+                metadata={"index": index},
+                timestamp=self.started + timedelta(seconds=index),
+            )
+        self.latest = self.storage.get_checkpoint(SESSION)
+        self.next_index = checkpoints
+
+    def teardown(self, checkpoints: int) -> None:
+        """Remove the workspace."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def time_save_checkpoint(self, checkpoints: int) -> None:
+        """Time ``FilesystemStorage.save_checkpoint``."""
+        self.next_index += 1
+        self.storage.save_checkpoint(
+            SESSION,
+            _state(self.next_index),
+            metadata={"index": self.next_index},
+            timestamp=self.started + timedelta(seconds=self.next_index),
+        )
+
+    def time_list_checkpoints(self, checkpoints: int) -> None:
+        """Time ``FilesystemStorage.list_checkpoints``."""
+        self.storage.list_checkpoints(SESSION)
+
+    def time_get_latest_checkpoint(self, checkpoints: int) -> None:
+        """Time ``FilesystemStorage.get_checkpoint`` (latest)."""
+        self.storage.get_checkpoint(SESSION)
+
+    def time_history(self, checkpoints: int) -> None:
+        """Time appending to and reading back a checkpoint's history."""
+        if self.latest is None:  # pragma: no cover
+            return
+        journal = self.latest.path / "history.jsonl"
+        for index in range(checkpoints):
+            WaldiezCheckpoint.append_history_entry(
+                journal, {"index": index, "state": _state(index, messages=2)}
+            )
+        WaldiezCheckpoint(
+            session_name=SESSION,
+            timestamp=self.latest.timestamp,
+            path=self.latest.path,
+        ).history()
@@ -0,0 +1,91 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=attribute-defined-outside-init,missing-param-doc
+# pylint: disable=unused-argument
+# pylint: disable=protected-access,too-few-public-methods
+# pyright: reportUninitializedInstanceVariable=false
+# pyright: reportUnusedParameter=false
+# pyright: reportPrivateUsage=false,reportArgumentType=false
+
+"""Benchmarks for the websocket server's message path."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+
+from waldiez.ws.client_manager import ClientManager
+from waldiez.ws.session_manager import SessionManager
+
+MESSAGE_COUNTS = [100, 1_000, 10_000]
+
+
+class _WebSocket:
+    """A websocket connection that only counts what is sent."""
+
+    def __init__(self) -> None:
+        self.remote_address = ("127.0.0.1", 12345)
+        self.request = SimpleNamespace(headers={"User-Agent": "benchmark"})
+        self.sent = 0
+
+    async def send(self, message: str) -> None:
+        """Send a message."""
+        self.sent += len(message)
+
+
+class MessagePath:
+    """Handle client requests and relay the runner's output."""
+
+    params = MESSAGE_COUNTS
+    param_names = ["messages"]
+
+    def setup(self, messages: int) -> None:
+        """Create the client manager and the messages."""
+        self.client = ClientManager(
+            websocket=_WebSocket(),  # type: ignore[arg-type]
+            client_id="benchmark",
+            session_manager=SessionManager(),
+        )
+        self.requests = [
+            json.dumps({"type": "ping", "echo_data": {"index": index}})
+            for index in range(messages)
+        ]
+        self.outputs: list[dict[str, Any]] = [
+            {
+                "type": "subprocess_output",
+                "session_id": "benchmark",
+                "stream": "stdout",
+                "subprocess_type": "output",
+                "content": json.dumps(
+                    {
+                        "type": "text",
+                        "content": {
+                            "uuid": str(index),
+                            "content": f"Message {index} " + "lorem " * 20,
+                            "sender_name": "assistant",
+                            "recipient_name": "user",
+                        },
+                    }
+                ),
+            }
+            for index in range(messages)
+        ]
+
+    def time_handle_requests(self, messages: int) -> None:
+        """Time ``ClientManager.handle_message`` (ping requests)."""
+
+        async def handle() -> None:
+            for request in self.requests:
+                await self.client.handle_message(request)
+
+        asyncio.run(handle())
+
+    def time_relay_runner_output(self, messages: int) -> None:
+        """Time relaying the runner's output to the client."""
+
+        async def relay() -> None:
+            for output in self.outputs:
+                await self.client._handle_runner_output(output)
+
+        asyncio.run(relay())
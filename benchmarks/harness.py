@@ -0,0 +1,308 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=broad-exception-caught
+# pyright: reportUnknownVariableType=false,reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+"""Minimal runner for the (asv style) benchmarks.
+
+The ``bench_*`` modules define classes with ``time_*`` methods and
+optional ``params``/``param_names``, ``setup``/``teardown``, ``repeat``
+and ``number`` attributes (the same layout `asv` uses, so they can also
+be run with it). This runner discovers and times them without any extra
+dependency, and compares the results with a saved baseline and/or the
+ratio checks in ``thresholds.json``.
+
+Absolute timings depend on the machine, so the thresholds compare two
+benchmarks of the same run instead: each entry maps a benchmark to a
+``reference`` benchmark and the ``max_ratio`` of their best timings
+(e.g. a memoized export must stay faster than a cold one, and ten
+times the data must not take a hundred times as long).
+"""
+
+import contextlib
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+HERE = Path(__file__).resolve().parent
+THRESHOLDS_FILE = HERE / "thresholds.json"
+DEFAULT_REPEAT = 5
+
+
+@dataclass
+class BenchmarkResult:
+    """The timings of a benchmark (for one combination of params)."""
+
+    name: str
+    best: float
+    median: float
+    runs: int
+    error: str | None = None
+    samples: list[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the result as a json serializable dict.
+
+        Returns
+        -------
+        dict[str, Any]
+            The result.
+        """
+        return asdict(self)
+
+
+def _param_combinations(cls: type) -> list[tuple[Any, ...]]:
+    """Get all the combinations of a benchmark class' params."""
+    params: Any = getattr(cls, "params", None)
+    if not params:
+        return [()]
+    if not isinstance(params[0], (list, tuple)):
+        params = [params]
+    return list(itertools.product(*params))
+
+
+def _name(module: str, cls: type, method: str, params: tuple[Any, ...]) -> str:
+    """Get a benchmark's name (e.g. ``bench_export.Export.time_py[100]``)."""
+    name = f"{module}.{cls.__name__}.{method}"
+    if params:
+        name += "[" + ",".join(str(param) for param in params) + "]"
+    return name
+
+
+def discover(pattern: str | None = None) -> list[tuple[str, type, str]]:
+    """Discover the benchmarks.
+
+    Parameters
+    ----------
+    pattern : str | None
+        Only keep the benchmarks whose name contains this.
+
+    Returns
+    -------
+    list[tuple[str, type, str]]
+        The (module name, class, method name) of each benchmark.
+    """
+    found: list[tuple[str, type, str]] = []
+    for module_info in sorted(pkgutil.iter_modules([str(HERE)])):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"{__package__}.{module_info.name}")
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for method in sorted(vars(cls)):
+                if not method.startswith("time_"):
+                    continue
+                name = f"{module_info.name}.{cls.__name__}.{method}"
+                if pattern and pattern not in name:
+                    continue
+                found.append((module_info.name, cls, method))
+    return found
+
+
+def _time_one(
+    cls: type, method: str, params: tuple[Any, ...], repeat: int
+) -> list[float]:
+    """Time a benchmark method (setup/teardown are not timed).
+
+    An untimed first run warms up the imports and the caches.
+    """
+    number = int(getattr(cls, "number", 1))
+    samples: list[float] = []
+    # what the flows (and the loggers) print is not interesting here
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            _time_sample(cls, method, params, number)
+            for _ in range(repeat):
+                samples.append(_time_sample(cls, method, params, number))
+    return samples
+
+
+def _time_sample(
+    cls: type, method: str, params: tuple[Any, ...], number: int
+) -> float:
+    """Set up, time and tear down a benchmark method once."""
+    instance = cls()
+    setup = getattr(instance, "setup", None)
+    if setup is not None:
+        setup(*params)
+    func = getattr(instance, method)
+    teardown = getattr(instance, "teardown", None)
+    started = time.perf_counter()
+    try:
+        for _ in range(number):
+            func(*params)
+    finally:
+        elapsed = time.perf_counter() - started
+        if teardown is not None:
+            teardown(*params)
+    return elapsed / number
+
+
+def run(
+    pattern: str | None = None,
+    repeat: int | None = None,
+    quick: bool = False,
+) -> list[BenchmarkResult]:
+    """Run the benchmarks.
+
+    Parameters
+    ----------
+    pattern : str | None
+        Only run the benchmarks whose name contains this.
+    repeat : int | None
+        How many times to time each benchmark, by default the class'
+        ``repeat`` (or 5).
+    quick : bool
+        Only time the first combination of params, once.
+
+    Returns
+    -------
+    list[BenchmarkResult]
+        The results.
+    """
+    results: list[BenchmarkResult] = []
+    for module, cls, method in discover(pattern):
+        combinations = _param_combinations(cls)
+        if quick:
+            combinations = combinations[:1]
+        times = (
+            1
+            if quick
+            else repeat or int(getattr(cls, "repeat", DEFAULT_REPEAT))
+        )
+        for params in combinations:
+            name = _name(module, cls, method, params)
+            try:
+                samples = _time_one(cls, method, params, times)
+            except NotImplementedError:  # asv's way to skip a combination
+                continue
+            except Exception as error:
+                results.append(
+                    BenchmarkResult(
+                        name,
+                        0.0,
+                        0.0,
+                        0,
+                        error=f"{type(error).__name__}: {error}",
+                    )
+                )
+                continue
+            results.append(
+                BenchmarkResult(
+                    name=name,
+                    best=min(samples),
+                    median=statistics.median(samples),
+                    runs=len(samples),
+                    samples=samples,
+                )
+            )
+    return results
+
+
+def load_results(path: Path) -> dict[str, float]:
+    """Load the (best) timings of a saved run.
+
+    Parameters
+    ----------
+    path : Path
+        The saved results (a json list of results or a name -> seconds map).
+
+    Returns
+    -------
+    dict[str, float]
+        The best timing of each benchmark.
+    """
+    data: Any = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        return {str(key): float(value) for key, value in data.items()}
+    return {
+        str(item["name"]): float(item["best"])
+        for item in data
+        if isinstance(item, dict) and not item.get("error")
+    }
+
+
+def load_thresholds(path: Path) -> dict[str, tuple[str, float]]:
+    """Load the ratio checks.
+
+    Parameters
+    ----------
+    path : Path
+        The thresholds file (benchmark name ->
+        ``{"reference": name, "max_ratio": ratio}``).
+
+    Returns
+    -------
+    dict[str, tuple[str, float]]
+        The reference benchmark and the maximum ratio of each benchmark.
+    """
+    data: Any = json.loads(path.read_text(encoding="utf-8"))
+    return {
+        str(name): (str(check["reference"]), float(check["max_ratio"]))
+        for name, check in data.items()
+    }
+
+
+def find_regressions(
+    results: list[BenchmarkResult],
+    baseline: dict[str, float] | None = None,
+    thresholds: dict[str, tuple[str, float]] | None = None,
+    tolerance: float = 0.25,
+) -> list[str]:
+    """Find the benchmarks that got slower.
+
+    Parameters
+    ----------
+    results : list[BenchmarkResult]
+        This run's results.
+    baseline : dict[str, float] | None
+        A previous run's best timings, compared with ``tolerance``.
+    thresholds : dict[str, tuple[str, float]] | None
+        The maximum ratio of each benchmark's best timing to its
+        reference's (of the same run). Checks whose benchmarks did not
+        run (e.g. filtered out) are skipped.
+    tolerance : float
+        How much slower than the baseline is still fine (0.25 = 25%).
+
+    Returns
+    -------
+    list[str]
+        A description of each regression (or failed benchmark).
+    """
+    regressions: list[str] = []
+    timings = {
+        result.name: result.best
+        for result in results
+        if not result.error and result.best > 0
+    }
+    for result in results:
+        if result.error:
+            regressions.append(f"{result.name}: failed ({result.error})")
+            continue
+        previous = (baseline or {}).get(result.name)
+        if previous and result.best > previous * (1 + tolerance):
+            change = (result.best / previous - 1) * 100
+            regressions.append(
+                f"{result.name}: {result.best:.4f}s vs {previous:.4f}s "
+                + f"baseline (+{change:.0f}%)"
+            )
+        reference, max_ratio = (thresholds or {}).get(result.name, ("", 0))
+        if reference in timings and result.name in timings:
+            ratio = result.best / timings[reference]
+            if ratio > max_ratio:
+                regressions.append(
+                    f"{result.name}: {ratio:.2f}x {reference} "
+                    + f"(at most {max_ratio:.2f}x)"
+                )
+    return regressions
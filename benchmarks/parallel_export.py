@@ -0,0 +1,121 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=invalid-name
+
+"""Benchmark exporting a flow's agents sequentially and concurrently.
+
+Usage::
+
+    python -m benchmarks.parallel_export [--agents 50 100 250 500]
+        [--workers N] [--repeat 3]
+
+Each mode exports the same synthetic flow (without memoization) and
+the best of ``--repeat`` runs is reported, with the speedup over the
+sequential export.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from waldiez.exporting import create_flow_exporter
+from waldiez.exporting.core import (
+    DefaultPathResolver,
+    DefaultSerializer,
+    ExporterContext,
+)
+from waldiez.exporting.flow import PARALLEL_MODES, ExportMemo, ParallelMode
+from waldiez.logger import WaldiezLogger
+from waldiez.models import Waldiez
+
+from .synthetic import make_flow
+
+
+def time_export(
+    waldiez: Waldiez,
+    parallel: ParallelMode,
+    workers: int | None,
+    repeat: int,
+) -> float:
+    """Get the best time of exporting a flow.
+
+    Parameters
+    ----------
+    waldiez : Waldiez
+        The flow to export.
+    parallel : ParallelMode
+        How to export the agents.
+    workers : int | None
+        The pool's size.
+    repeat : int
+        How many times to export.
+
+    Returns
+    -------
+    float
+        The best time, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        output_dir = Path(tempfile.mkdtemp(prefix="waldiez-bench-"))
+        exporter = create_flow_exporter(
+            waldiez=waldiez,
+            output_dir=output_dir,
+            uploads_root=None,
+            for_notebook=False,
+            context=ExporterContext(
+                serializer=DefaultSerializer(),
+                path_resolver=DefaultPathResolver(),
+                logger=WaldiezLogger(level="warning"),
+            ),
+            memo=ExportMemo(max_entries=0),
+            parallel=parallel,
+            max_workers=workers,
+        )
+        started = time.perf_counter()
+        try:
+            exporter.export()
+        finally:
+            best = min(best, time.perf_counter() - started)
+            shutil.rmtree(output_dir, ignore_errors=True)
+    return best
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark.
+
+    Parameters
+    ----------
+    argv : list[str] | None
+        The command line arguments.
+    """
+    parser = argparse.ArgumentParser(prog="parallel_export")
+    parser.add_argument(
+        "--agents", type=int, nargs="+", default=[50, 100, 250, 500]
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    print(f"cpus: {os.cpu_count()}, workers: {args.workers}")
+    print(
+        f"{'agents':>8} " + " ".join(f"{mode:>16}" for mode in PARALLEL_MODES)
+    )
+    for agents in args.agents:
+        waldiez = Waldiez(flow=make_flow(agents))
+        sequential = 0.0
+        row = f"{agents:>8} "
+        for mode in PARALLEL_MODES:
+            elapsed = time_export(waldiez, mode, args.workers, args.repeat)
+            if mode == "off":
+                sequential = elapsed
+            speedup = sequential / elapsed if elapsed else 0.0
+            row += f"{elapsed:>9.3f}s {speedup:>4.2f}x "
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
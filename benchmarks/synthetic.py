@@ -0,0 +1,297 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+"""Synthetic flows and run logs for the benchmarks."""
+
+import json
+
+import pandas as pd
+
+from waldiez.models import (
+    WaldiezAgents,
+    WaldiezAgentTerminationMessage,
+    WaldiezAssistant,
+    WaldiezAssistantData,
+    WaldiezChat,
+    WaldiezChatData,
+    WaldiezChatMessage,
+    WaldiezFlow,
+    WaldiezFlowData,
+    WaldiezModel,
+    WaldiezModelData,
+    WaldiezUserProxy,
+    WaldiezUserProxyData,
+)
+
+TIMESTAMP = "2025-01-01T00:00:00.000Z"
+
+
+def _model(index: int) -> WaldiezModel:
+    return WaldiezModel(
+        id=f"wm-{index}",
+        name=f"gpt-4.1-{index}",
+        description=f"Model {index}",
+        type="model",
+        data=WaldiezModelData(api_type="openai", api_key="sk-benchmark"),
+        tags=[],
+        requirements=[],
+        created_at=TIMESTAMP,
+        updated_at=TIMESTAMP,
+    )
+
+
+def _assistant(index: int, model_id: str) -> WaldiezAssistant:
+    return WaldiezAssistant(
+        id=f"wa-{index}",
+        name=f"assistant_{index}",
+        description=f"Assistant {index}",
+        type="agent",
+        agent_type="assistant",
+        data=WaldiezAssistantData(
+            system_message=f"You are assistant {index}. Be concise.",
+            max_consecutive_auto_reply=3,
+            termination=WaldiezAgentTerminationMessage(
+                type="keyword",
+                keywords=["TERMINATE", f"DONE_{index}"],
+                criterion="found",
+            ),
+            model_ids=[model_id],
+        ),
+        tags=["benchmark"],
+        requirements=[],
+        created_at=TIMESTAMP,
+        updated_at=TIMESTAMP,
+    )
+
+
+def _chat(index: int, target_id: str) -> WaldiezChat:
+    return WaldiezChat(
+        id=f"wc-{index}",
+        source="wa-0",
+        target=target_id,
+        type="chat",
+        data=WaldiezChatData(
+            name=f"chat_{index}",
+            description=f"Chat {index}",
+            source_type="user_proxy",
+            target_type="assistant",
+            order=index,
+            position=index,
+            max_turns=1,
+            message=WaldiezChatMessage(
+                type="string",
+                content=f"Task {index}",
+                use_carryover=False,
+                context={},
+            ),
+        ),
+    )
+
+
+def make_flow(agents: int, models: int = 4) -> WaldiezFlow:
+    """Make a flow with a user and many assistants.
+
+    The user has a (sequential) chat with each assistant.
+
+    Parameters
+    ----------
+    agents : int
+        The number of assistants.
+    models : int
+        The number of models (shared by the assistants).
+
+    Returns
+    -------
+    WaldiezFlow
+        The flow.
+    """
+    all_models = [_model(index) for index in range(max(models, 1))]
+    assistants = [
+        _assistant(index, all_models[index % len(all_models)].id)
+        for index in range(1, agents + 1)
+    ]
+    user = WaldiezUserProxy(
+        id="wa-0",
+        name="user",
+        description="User",
+        type="agent",
+        agent_type="user_proxy",
+        data=WaldiezUserProxyData(human_input_mode="NEVER"),
+        tags=[],
+        requirements=[],
+        created_at=TIMESTAMP,
+        updated_at=TIMESTAMP,
+    )
+    all_chats = [
+        _chat(index, assistant.id) for index, assistant in enumerate(assistants)
+    ]
+    return WaldiezFlow(
+        id=f"wf-benchmark-{agents}",
+        name=f"benchmark_{agents}",
+        type="flow",
+        description=f"A flow with {agents} assistants",
+        data=WaldiezFlowData(
+            nodes=[],
+            edges=[],
+            viewport={},
+            agents=WaldiezAgents(
+                userProxyAgents=[user],
+                assistantAgents=assistants,
+                ragUserProxyAgents=[],
+                reasoningAgents=[],
+                captainAgents=[],
+            ),
+            models=all_models,
+            tools=[],
+            chats=all_chats,
+            is_async=False,
+        ),
+        tags=["benchmark"],
+        requirements=[],
+        storage_id=f"benchmark-{agents}",
+        created_at=TIMESTAMP,
+        updated_at=TIMESTAMP,
+    )
+
+
+def make_log_frames(rows: int, agents: int = 5) -> dict[str, pd.DataFrame]:
+    """Make the (sqlite log) data frames of a run.
+
+    Parameters
+    ----------
+    rows : int
+        The number of chat completions (and of events).
+    agents : int
+        The number of agents taking turns.
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+        The "agents", "chat", "events" and "functions" data frames.
+    """
+    names = [f"agent_{index}" for index in range(agents)]
+    start = pd.Timestamp("2025-01-01 10:00:00")
+    starts = [start + pd.Timedelta(seconds=3 * index) for index in range(rows)]
+    fmt = "%Y-%m-%d %H:%M:%S.%f"
+    usage = {"prompt_tokens": 120, "completion_tokens": 40, "total_tokens": 160}
+    return {
+        "agents": pd.DataFrame(
+            {
+                "name": names,
+                "class": ["AssistantAgent"] * agents,
+                "init_args": [json.dumps({"llm_config": {"model": "gpt-4.1"}})]
+                * agents,
+            }
+        ),
+        "chat": pd.DataFrame(
+            {
+                "source_name": [names[i % agents] for i in range(rows)],
+                "start_time": [ts.strftime(fmt) for ts in starts],
+                "end_time": [
+                    (ts + pd.Timedelta(seconds=2)).strftime(fmt)
+                    for ts in starts
+                ],
+                "cost": [0.001] * rows,
+                "is_cached": [i % 7 == 0 for i in range(rows)],
+                "request": [
+                    json.dumps(
+                        {
+                            "model": "gpt-4.1",
+                            "messages": [{"content": f"Message {i}"}],
+                        }
+                    )
+                    for i in range(rows)
+                ],
+                "response": [json.dumps({"usage": usage})] * rows,
+                "session_id": [f"session_{i}" for i in range(rows)],
+            }
+        ),
+        "events": make_events_frame(rows, agents, start=start),
+        "functions": pd.DataFrame(
+            {
+                "function_name": [f"tool_{i % 3}" for i in range(rows // 10)],
+                "timestamp": [
+                    (start + pd.Timedelta(seconds=30 * i + 2.5)).strftime(fmt)
+                    for i in range(rows // 10)
+                ],
+            }
+        ),
+    }
+
+
+def make_events_frame(
+    rows: int, agents: int = 5, start: pd.Timestamp | None = None
+) -> pd.DataFrame:
+    """Make the events (sqlite log) data frame of a run.
+
+    Parameters
+    ----------
+    rows : int
+        The number of events.
+    agents : int
+        The number of agents exchanging messages.
+    start : pd.Timestamp | None
+        The time of the first event.
+
+    Returns
+    -------
+    pd.DataFrame
+        The events.
+    """
+    names = [f"agent_{index}" for index in range(agents)]
+    start = start if start is not None else pd.Timestamp("2025-01-01 10:00:00")
+    return pd.DataFrame(
+        {
+            "event_name": [
+                "received_message" if i % 2 else "send_func_executed"
+                for i in range(rows)
+            ],
+            "source_name": [names[(i + 1) % agents] for i in range(rows)],
+            "timestamp": [
+                (start + pd.Timedelta(seconds=3 * i + 1)).strftime(
+                    "%Y-%m-%d %H:%M:%S.%f"
+                )
+                for i in range(rows)
+            ],
+            "json_state": [
+                json.dumps(
+                    {
+                        "sender": names[i % agents],
+                        "message": {
+                            "role": "assistant",
+                            "content": f"Reply {i}: " + "lorem ipsum " * 8,
+                        },
+                    }
+                )
+                for i in range(rows)
+            ],
+        }
+    )
+
+
+def make_runnable_flow(max_turns: int = 4) -> WaldiezFlow:
+    """Make a flow that runs offline.
+
+    The user and the assistant have no models: they answer with their
+    default auto replies, so nothing calls an LLM.
+
+    Parameters
+    ----------
+    max_turns : int
+        The chat's maximum number of turns.
+
+    Returns
+    -------
+    WaldiezFlow
+        The flow.
+    """
+    flow = make_flow(1, models=1)
+    dumped = flow.model_dump(by_alias=True)
+    dumped["data"]["models"] = []
+    for agent in dumped["data"]["agents"]["assistantAgents"]:
+        agent["data"]["modelIds"] = []
+        agent["data"]["agentDefaultAutoReply"] = "I am a (mocked) assistant."
+    for agent in dumped["data"]["agents"]["userProxyAgents"]:
+        agent["data"]["agentDefaultAutoReply"] = "Please continue."
+    dumped["data"]["chats"][0]["data"]["maxTurns"] = max_turns
+    return WaldiezFlow(**dumped)
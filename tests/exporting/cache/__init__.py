@@ -0,0 +1,3 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+"""Test waldiez.exporting.cache.*."""
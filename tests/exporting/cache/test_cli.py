@@ -0,0 +1,58 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc
+
+"""Tests for waldiez.exporting.cache.cli.*."""
+
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from waldiez.exporting.cache import ExportCache
+from waldiez.exporting.cache.cli import app
+
+
+def _cache_with_entries(root: Path, *keys: str) -> ExportCache:
+    """Create a cache with some entries."""
+    cache = ExportCache(root)
+    export_dir = root.parent / "export"
+    export_dir.mkdir(exist_ok=True)
+    (export_dir / "flow.py").write_text("print('hi')\n", encoding="utf-8")
+    for key in keys:
+        cache.put(key, export_dir, main_file="flow.py")
+    return cache
+
+
+def test_export_cache_cli_stats_and_list(tmp_path: Path) -> None:
+    """Test showing the cache stats and entries."""
+    root = tmp_path / "cache"
+    _cache_with_entries(root, "one", "two")
+    runner = CliRunner()
+    result = runner.invoke(app, ["--dir", str(root)])
+    assert result.exit_code == 0
+    assert "'entries': 2" in result.output
+    result = runner.invoke(app, ["--dir", str(root), "--list"])
+    assert result.exit_code == 0
+    assert "one" in result.output
+    assert "two" in result.output
+
+
+def test_export_cache_cli_remove_prune_purge(tmp_path: Path) -> None:
+    """Test removing cached exports."""
+    root = tmp_path / "cache"
+    cache = _cache_with_entries(root, "one", "two", "three")
+    runner = CliRunner()
+    result = runner.invoke(app, ["--dir", str(root), "--remove", "one"])
+    assert result.exit_code == 0
+    result = runner.invoke(app, ["--dir", str(root), "--remove", "one"])
+    assert result.exit_code == 1
+    result = runner.invoke(
+        app, ["--dir", str(root), "--prune", "--max-entries", "1"]
+    )
+    assert result.exit_code == 0
+    assert "Removed 1" in result.output
+    assert len(cache.entries()) == 1
+    result = runner.invoke(app, ["--dir", str(root), "--purge"])
+    assert result.exit_code == 0
+    assert not cache.entries()
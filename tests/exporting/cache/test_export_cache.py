@@ -0,0 +1,186 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc
+
+"""Tests for waldiez.exporting.cache.export_cache.*."""
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from waldiez import Waldiez, WaldiezExporter
+from waldiez.exporting.cache import EXPORT_CACHE_ENV, ExportCache
+from waldiez.exporting.cache.export_cache import EXPORT_DIR_PLACEHOLDER
+from waldiez.models import WaldiezFlow, WaldiezModel
+
+from ..flow_helpers import get_flow
+
+
+def _files(directory: Path) -> dict[str, bytes]:
+    """Get the files in a directory (relative path -> content)."""
+    return {
+        path.relative_to(directory).as_posix(): path.read_bytes()
+        for path in directory.rglob("*")
+        if path.is_file()
+    }
+
+
+def test_export_cache_hit_matches_plain_export(
+    tmp_path: Path, waldiez_flow: WaldiezFlow
+) -> None:
+    """Test that a cached export writes the same files as a plain one."""
+    exporter = WaldiezExporter(Waldiez(flow=waldiez_flow))
+    expected_dir = tmp_path / "expected"
+    exporter.export(expected_dir / "flow.py", structured_io=True)
+
+    cache = ExportCache(tmp_path / "cache")
+    first_dir = tmp_path / "first"
+    assert not cache.export(exporter, first_dir / "flow.py", True)
+    assert _files(first_dir) == _files(expected_dir)
+
+    second_dir = tmp_path / "second"
+    with patch.object(exporter, "export") as mock_export:
+        assert cache.export(exporter, second_dir / "flow.py", True)
+    mock_export.assert_not_called()
+    assert _files(second_dir) == _files(expected_dir)
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_export_cache_does_not_store_api_keys(
+    tmp_path: Path, waldiez_flow: WaldiezFlow
+) -> None:
+    """Test that the api keys module is written, but not cached."""
+    dumped = waldiez_flow.model_dump(by_alias=True)
+    model = WaldiezModel(
+        id="wm-1",
+        name="gpt",
+        description="model description",
+        data={"apiType": "openai", "apiKey": "sk-secret"},  # type: ignore
+    )
+    dumped["data"]["models"] = [model.model_dump(by_alias=True)]
+    exporter = WaldiezExporter(Waldiez(flow=WaldiezFlow(**dumped)))
+    expected_dir = tmp_path / "expected"
+    exporter.export(expected_dir / "flow.py")
+    api_keys_file = f"{waldiez_flow.name}_api_keys.py"
+    assert (expected_dir / api_keys_file).is_file()
+
+    cache = ExportCache(tmp_path / "cache")
+    assert not cache.export(exporter, tmp_path / "first" / "flow.py")
+    assert cache.export(exporter, tmp_path / "second" / "flow.py")
+    for output_dir in ("first", "second"):
+        assert _files(tmp_path / output_dir) == _files(expected_dir)
+    cached = _files(cache.root)
+    assert not [name for name in cached if name.endswith("_api_keys.py")]
+    assert not [name for name, data in cached.items() if b"sk-secret" in data]
+    if os.name != "nt":
+        assert cache.root.stat().st_mode & 0o777 == 0o700
+    # the keys cannot be restored without the flow
+    (key,) = [entry.key for entry in cache.entries()]
+    assert not cache.restore(key, tmp_path / "third")
+
+
+def test_export_cache_key_includes_options(
+    tmp_path: Path, waldiez_flow: WaldiezFlow
+) -> None:
+    """Test that different export options are different entries."""
+    exporter = WaldiezExporter(Waldiez(flow=waldiez_flow))
+    cache = ExportCache(tmp_path / "cache")
+    cache.export(exporter, tmp_path / "a" / "flow.py", structured_io=False)
+    cache.export(exporter, tmp_path / "b" / "flow.py", structured_io=True)
+    cache.export(exporter, tmp_path / "c" / "flow.ipynb")
+    assert cache.misses == 3
+    assert len(cache.entries()) == 3
+    assert (tmp_path / "c" / "flow.ipynb").is_file()
+    with pytest.raises(FileExistsError):
+        cache.export(exporter, tmp_path / "c" / "flow.ipynb")
+
+
+def test_export_cache_skips_doc_agents(tmp_path: Path) -> None:
+    """Test that flows with doc agents are exported without the cache."""
+    exporter = WaldiezExporter(Waldiez(flow=get_flow()))
+    cache = ExportCache(tmp_path / "cache")
+    assert not cache.export(exporter, tmp_path / "out" / "flow.py")
+    assert (tmp_path / "out" / "flow.py").is_file()
+    assert not cache.entries()
+
+
+def test_export_cache_relocates_the_export_dir(tmp_path: Path) -> None:
+    """Test that absolute references to the export dir are relocated."""
+    cache = ExportCache(tmp_path / "cache")
+    export_dir = (tmp_path / "export").resolve()
+    export_dir.mkdir()
+    (export_dir / "flow.py").write_text(
+        f'DB_PATH = "{export_dir / "chroma"}"\n', encoding="utf-8"
+    )
+    entry = cache.put("abc", export_dir, main_file="flow.py")
+    assert entry is not None
+    cached = (entry.path / "files" / "flow.py").read_text(encoding="utf-8")
+    assert EXPORT_DIR_PLACEHOLDER in cached
+
+    output_dir = (tmp_path / "elsewhere").resolve()
+    assert cache.restore("abc", output_dir)
+    restored = (output_dir / "flow.py").read_text(encoding="utf-8")
+    assert restored == f'DB_PATH = "{output_dir / "chroma"}"\n'
+
+
+def test_export_cache_lru_eviction(tmp_path: Path) -> None:
+    """Test evicting the least recently used entries."""
+    cache = ExportCache(tmp_path / "cache", max_size=250)
+    export_dir = tmp_path / "export"
+    export_dir.mkdir()
+    (export_dir / "flow.py").write_bytes(b"x" * 100)
+    for index, key in enumerate(("first", "second")):
+        cache.put(key, export_dir, main_file="flow.py")
+        entry_file = cache.root / key / "entry.json"
+        os.utime(entry_file, (time.time() - 100 + index, time.time() - 100))
+    # using "first" makes "second" the least recently used one
+    assert cache.restore("first", tmp_path / "out")
+    cache.put("third", export_dir, main_file="flow.py")
+    assert [entry.key for entry in cache.entries()] == ["third", "first"]
+    assert cache.stats()["size"] == 200
+
+    assert cache.evict(max_entries=1) == 1
+    assert [entry.key for entry in cache.entries()] == ["third"]
+    assert cache.purge() == 1
+    assert not cache.entries()
+    assert not cache.restore("third", tmp_path / "out")
+
+
+def test_export_cache_purge_keeps_running_exports(tmp_path: Path) -> None:
+    """Test that purging keeps the recent staging directories."""
+    cache = ExportCache(tmp_path / "cache")
+    running = cache.root / ".export-running"
+    stale = cache.root / ".export-stale"
+    for directory in (running, stale):
+        directory.mkdir(parents=True)
+        (directory / "flow.py").write_text("# flow")
+    an_hour_ago = time.time() - 3601
+    os.utime(stale, (an_hour_ago, an_hour_ago))
+    assert cache.purge() == 0
+    assert running.is_dir()
+    assert not stale.exists()
+
+
+def test_export_cache_from_option(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test resolving the runner's export_cache option."""
+    cache = ExportCache(tmp_path)
+    assert ExportCache.from_option(cache) is cache
+    assert ExportCache.from_option(False) is None
+    from_path = ExportCache.from_option(tmp_path / "custom")
+    assert from_path is not None
+    assert from_path.root == tmp_path / "custom"
+    monkeypatch.delenv(EXPORT_CACHE_ENV, raising=False)
+    assert ExportCache.from_option(None) is None
+    monkeypatch.setenv(EXPORT_CACHE_ENV, "0")
+    assert ExportCache.from_option(None) is None
+    monkeypatch.setenv(EXPORT_CACHE_ENV, str(tmp_path / "env"))
+    from_env = ExportCache.from_option(None)
+    assert from_env is not None
+    assert from_env.root == tmp_path / "env"
@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc
+
+"""Test waldiez.exporting.flow.memo.*."""
+
+from pathlib import Path
+
+from waldiez.exporting.core import (
+    DefaultPathResolver,
+    DefaultSerializer,
+    ExportConfig,
+    ExporterContext,
+    ExportResult,
+)
+from waldiez.exporting.flow import ExportMemo
+from waldiez.exporting.flow.orchestrator import ExportOrchestrator
+from waldiez.logger import WaldiezLogger
+from waldiez.models import Waldiez, WaldiezFlow
+
+from ..flow_helpers import get_flow
+
+
+def _orchestrate(
+    flow: WaldiezFlow, memo: ExportMemo, output_dir: Path
+) -> tuple[str, ExportOrchestrator]:
+    """Export a flow's agents and get the merged content."""
+    waldiez = Waldiez(flow=flow)
+    context = ExporterContext(
+        config=ExportConfig(
+            name=waldiez.name,
+            output_directory=output_dir,
+            is_async=waldiez.is_async,
+            cache_seed=waldiez.cache_seed,
+        ),
+        serializer=DefaultSerializer(),
+        path_resolver=DefaultPathResolver(),
+        logger=WaldiezLogger(),
+    )
+    orchestrator = ExportOrchestrator(waldiez, context, memo=memo)
+    result = orchestrator.orchestrate()
+    content = "\n".join(item.content for item in result.positioned_content)
+    return content, orchestrator
+
+
+def test_export_memo_reuses_unchanged_agents(tmp_path: Path) -> None:
+    """Test that a second export only re-exports the changed agents."""
+    memo = ExportMemo()
+    flow = get_flow()
+    first, orchestrator = _orchestrate(flow, memo, tmp_path)
+    # captain and doc agents write/clean files, they are never memoized
+    assert orchestrator.memo_hits == 0
+    assert orchestrator.memo_misses == 5
+    assert len(memo) == 5
+
+    second, orchestrator = _orchestrate(flow, memo, tmp_path)
+    assert second == first
+    assert orchestrator.merge_statistics is not None
+    assert orchestrator.merge_statistics.memo_hits == 5
+    assert orchestrator.merge_statistics.memo_misses == 0
+
+    dumped = flow.model_dump(by_alias=True)
+    assistant = dumped["data"]["agents"]["assistantAgents"][0]
+    assistant["data"]["systemMessage"] = "You are a changed assistant."
+    changed, orchestrator = _orchestrate(WaldiezFlow(**dumped), memo, tmp_path)
+    assert orchestrator.memo_hits == 4
+    assert orchestrator.memo_misses == 1
+    assert "You are a changed assistant." in changed
+
+
+def test_export_memo_is_bounded() -> None:
+    """Test evicting the least recently used results."""
+    memo = ExportMemo(max_entries=2)
+    memo.put("a", ExportResult(main_content="a"))
+    memo.put("b", ExportResult(main_content="b"))
+    assert memo.get("a") is not None
+    memo.put("c", ExportResult(main_content="c"))
+    assert memo.get("b") is None
+    cached = memo.get("a")
+    assert cached is not None and cached.main_content == "a"
+    cached.main_content = "changed"
+    cached = memo.get("a")
+    assert cached is not None and cached.main_content == "a"
+    assert (memo.hits, memo.misses) == (3, 1)
+    memo.clear()
+    assert len(memo) == 0
+
+    disabled = ExportMemo(max_entries=0)
+    disabled.put("a", ExportResult())
+    assert not disabled.enabled
+    assert len(disabled) == 0
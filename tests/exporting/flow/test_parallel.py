@@ -0,0 +1,50 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc
+
+"""Test waldiez.exporting.flow.parallel.*."""
+
+from pathlib import Path
+
+import pytest
+
+from waldiez.exporting import create_flow_exporter
+from waldiez.exporting.flow import PARALLEL_MODES, ExportMemo, ParallelMode
+from waldiez.exporting.flow.parallel import export_agents
+from waldiez.models import Waldiez
+
+from ..flow_helpers import get_flow
+
+
+def _export(output_dir: Path, parallel: ParallelMode) -> str:
+    """Export the test flow without memoization."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    exporter = create_flow_exporter(
+        waldiez=Waldiez(flow=get_flow(is_group=True)),
+        output_dir=output_dir,
+        uploads_root=None,
+        for_notebook=False,
+        memo=ExportMemo(max_entries=0),
+        parallel=parallel,
+        max_workers=2,
+    )
+    content = exporter.export().main_content
+    assert content
+    return content
+
+
+@pytest.mark.parametrize("parallel", ["thread", "process"])
+def test_parallel_export_matches_sequential(
+    tmp_path: Path, parallel: ParallelMode
+) -> None:
+    """Test that exporting the agents concurrently gives the same output."""
+    expected = _export(tmp_path / "off", "off")
+    assert _export(tmp_path / parallel, parallel) == expected
+
+
+def test_invalid_parallel_mode() -> None:
+    """Test an invalid parallel mode."""
+    assert "invalid" not in PARALLEL_MODES
+    with pytest.raises(ValueError):
+        export_agents([], inputs=None, mode="invalid")  # type: ignore
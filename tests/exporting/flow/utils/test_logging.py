@@ -0,0 +1,76 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+# pylint: disable=missing-param-doc,exec-used
+"""Test waldiez.exporting.flow.utils.logging.*."""
+
+import csv
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import aiofiles
+import aiosqlite
+from aiocsv import AsyncDictWriter
+
+from waldiez.exporting.flow.utils.logging import get_sqlite_out
+from waldiez.running.db_utils import get_sqlite_out as db_get_sqlite_out
+
+
+def _create_db(db_path: Path) -> None:
+    """Create a database with one table."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE events (id INTEGER, name TEXT, cost REAL)")
+    conn.executemany(
+        "INSERT INTO events VALUES (?, ?, ?)",
+        [(i, f"event\n{i}", i / 3) for i in range(12)] + [(12, None, None)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _load_generated(is_async: bool) -> Any:
+    """Load the generated get_sqlite_out function."""
+    namespace: dict[str, Any] = {
+        "Any": Any,
+        "csv": csv,
+        "json": json,
+        "sqlite3": sqlite3,
+        "aiofiles": aiofiles,
+        "aiosqlite": aiosqlite,
+        "AsyncDictWriter": AsyncDictWriter,
+    }
+    exec(get_sqlite_out(is_async=is_async), namespace)  # nosec # nosemgrep
+    return namespace["get_sqlite_out"]
+
+
+def test_generated_sqlite_out_matches_db_utils(tmp_path: Path) -> None:
+    """Test that the generated export writes the same files as db_utils."""
+    db_path = tmp_path / "flow.db"
+    _create_db(db_path)
+    db_get_sqlite_out(str(db_path), "events", str(tmp_path / "expected.csv"))
+
+    generated = _load_generated(is_async=False)
+    generated(str(db_path), "events", str(tmp_path / "sync.csv"), 5)
+
+    for ext in ("csv", "json"):
+        assert (tmp_path / f"sync.{ext}").read_bytes() == (
+            tmp_path / f"expected.{ext}"
+        ).read_bytes()
+
+
+async def test_generated_async_sqlite_out_matches_db_utils(
+    tmp_path: Path,
+) -> None:
+    """Test that the generated async export writes the same files."""
+    db_path = tmp_path / "flow.db"
+    _create_db(db_path)
+    db_get_sqlite_out(str(db_path), "events", str(tmp_path / "expected.csv"))
+
+    generated = _load_generated(is_async=True)
+    await generated(str(db_path), "events", str(tmp_path / "async.csv"), 5)
+
+    for ext in ("csv", "json"):
+        assert (tmp_path / f"async.{ext}").read_bytes() == (
+            tmp_path / f"expected.{ext}"
+        ).read_bytes()
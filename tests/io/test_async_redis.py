@@ -0,0 +1,241 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pyright: reportMissingTypeStubs=false
+# pyright: reportPrivateUsage=false,reportUnknownMemberType=false
+# pyright: reportUnknownVariableType=false,reportUnknownArgumentType=false
+# pylint: disable=missing-param-doc,missing-type-doc,missing-return-doc
+# pylint: disable=protected-access
+
+"""Tests for the AsyncRedisIOStream class."""
+
+import asyncio
+import json
+from typing import Any
+
+import fakeredis
+import pytest
+
+from waldiez.io import AsyncRedisIOStream
+from waldiez.io.async_redis import shared_connection_pool
+
+
+def _stream(
+    client: fakeredis.aioredis.FakeRedis, task_id: str, **kwargs: Any
+) -> AsyncRedisIOStream:
+    """Create a stream that uses a fake client."""
+    stream = AsyncRedisIOStream("redis://localhost", task_id, **kwargs)
+    stream.redis = client
+    return stream
+
+
+def _response(task_id: str, request_id: str, text: str) -> str:
+    """Get the published response to an input request."""
+    return json.dumps(
+        {
+            "id": f"response-{request_id}",
+            "timestamp": "now",
+            "request_id": request_id,
+            "data": json.dumps({"content": {"type": "text", "text": text}}),
+            "task_id": task_id,
+            "type": "input_response",
+        }
+    )
+
+
+@pytest.fixture(name="a_fake_redis")
+def a_fake_redis_fixture() -> fakeredis.aioredis.FakeRedis:
+    """Fake async Redis client fixture."""
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+@pytest.mark.asyncio
+async def test_print_is_flushed_in_background(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that print() buffers and a background task sends the batch."""
+    task_id = "test_async_print"
+    stream = _stream(a_fake_redis, task_id, flush_interval=0.01)
+
+    for index in range(3):
+        stream.print("message", index)
+    assert stream.stats["pending"] == 3
+    assert not await a_fake_redis.xrange(f"task:{task_id}:output")
+
+    await asyncio.sleep(0.05)
+    entries = await a_fake_redis.xrange(f"task:{task_id}:output")
+    assert [entry[1]["data"] for entry in entries] == [
+        "message 0\n",
+        "message 1\n",
+        "message 2\n",
+    ]
+    assert len(await a_fake_redis.xrange("task-output")) == 3
+    stats = stream.stats
+    assert stats["batches"] == 1
+    assert stats["messages"] == 3
+    assert stats["pending"] == 0
+    await stream.a_close()
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_delay(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that a full buffer is flushed without waiting."""
+    task_id = "test_async_full_batch"
+    stream = _stream(a_fake_redis, task_id, max_batch_size=2, flush_interval=60)
+    stream.print("first")
+    stream.print("second")
+    await asyncio.sleep(0.01)
+    assert len(await a_fake_redis.xrange(f"task:{task_id}:output")) == 2
+    await stream.a_close()
+
+
+def test_print_without_loop(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that print() sends the message when no loop is running."""
+    task_id = "test_async_print_no_loop"
+    stream = AsyncRedisIOStream("redis://localhost", task_id)
+
+    async def _entries() -> list[Any]:
+        stream.redis = a_fake_redis
+        stream.print("Hello")
+        return await a_fake_redis.xrange(f"task:{task_id}:output")
+
+    assert not asyncio.run(_entries())
+    stream.print("World")
+    stats = stream.stats
+    assert stats["pending"] == 0
+    assert stats["messages"] == 2
+
+
+@pytest.mark.asyncio
+async def test_a_input(a_fake_redis: fakeredis.aioredis.FakeRedis) -> None:
+    """Test requesting and receiving input."""
+    task_id = "test_async_input"
+    requests: list[str] = []
+    responses: list[str] = []
+
+    async def on_input_request(
+        prompt: str, request_id: str, _task_id: str
+    ) -> None:
+        requests.append(prompt)
+        await a_fake_redis.publish(
+            f"task:{task_id}:input_response",
+            _response(task_id, request_id, "hi"),
+        )
+
+    def on_input_response(user_input: str, _task_id: str) -> None:
+        responses.append(user_input)
+
+    stream = _stream(
+        a_fake_redis,
+        task_id,
+        input_timeout=2,
+        on_input_request=on_input_request,
+        on_input_response=on_input_response,
+    )
+    stream.print("before the prompt")
+
+    # printed before the request is published
+    assert await stream.a_input("Your name?", request_id="req-1") == "hi"
+    assert requests == ["Your name?"]
+    assert responses == ["hi"]
+    assert await a_fake_redis.zscore(f"processed_requests:{task_id}", "req-1")
+    await stream.flush()
+    entries = await a_fake_redis.xrange(f"task:{task_id}:output")
+    assert [entry[1]["type"] for entry in entries] == [
+        "print",
+        "input_request",
+        "input_response",
+    ]
+    await stream.a_close()
+    assert stream._pubsub is None
+
+
+@pytest.mark.asyncio
+async def test_a_input_ignores_other_and_processed(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that only the first response to the request is used."""
+    task_id = "test_async_input_other"
+    await a_fake_redis.zadd(f"processed_requests:{task_id}", {"req-1": 1})
+
+    async def on_input_request(
+        _prompt: str, request_id: str, _task_id: str
+    ) -> None:
+        channel = f"task:{task_id}:input_response"
+        for rid, data in (("other", "no"), (request_id, "hi")):
+            await a_fake_redis.publish(channel, _response(task_id, rid, data))
+
+    stream = _stream(
+        a_fake_redis,
+        task_id,
+        input_timeout=1,
+        on_input_request=on_input_request,
+    )
+    # already processed (e.g. by another consumer)
+    assert await stream.a_input("prompt", request_id="req-1") == ""
+    assert await stream.a_input("prompt", request_id="req-2") == "hi"
+    await stream.a_close()
+
+
+@pytest.mark.asyncio
+async def test_input_from_thread(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test the sync input() of a worker thread (as async agents call it)."""
+    task_id = "test_async_input_thread"
+
+    async def on_input_request(
+        _prompt: str, request_id: str, _task_id: str
+    ) -> None:
+        await a_fake_redis.publish(
+            f"task:{task_id}:input_response",
+            _response(task_id, request_id, "from thread"),
+        )
+
+    stream = _stream(
+        a_fake_redis,
+        task_id,
+        input_timeout=2,
+        on_input_request=on_input_request,
+    )
+    stream.print("hello")  # the stream's loop
+    assert stream.input("sync prompt") == ""  # would block the loop
+    assert await asyncio.to_thread(stream.input, "prompt") == "from thread"
+    await stream.a_close()
+
+
+@pytest.mark.asyncio
+async def test_async_context_manager(
+    a_fake_redis: fakeredis.aioredis.FakeRedis,
+) -> None:
+    """Test that exiting the context sends the pending messages."""
+    task_id = "test_async_context"
+    async with _stream(a_fake_redis, task_id, flush_interval=60) as stream:
+        stream.print("bye")
+    assert len(await a_fake_redis.xrange(f"task:{task_id}:output")) == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_connection_pool() -> None:
+    """Test that the streams of a loop share their connection pool."""
+    first = AsyncRedisIOStream("redis://localhost:6379/0", "one")
+    second = AsyncRedisIOStream("redis://localhost:6379/0", "two")
+    other = AsyncRedisIOStream(
+        "redis://localhost:6379/0",
+        "three",
+        redis_connection_kwargs={"max_connections": 5},
+    )
+    pool = first.redis.connection_pool
+    assert second.redis.connection_pool is pool
+    assert other.redis.connection_pool is not pool
+    assert other.redis.connection_pool.max_connections == 5
+    assert shared_connection_pool("redis://localhost:6379/0") is pool
+
+    async def _in_other_loop() -> Any:
+        return shared_connection_pool("redis://localhost:6379/0")
+
+    assert await asyncio.to_thread(asyncio.run, _in_other_loop()) is not pool
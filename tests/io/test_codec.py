@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc,no-self-use
+
+"""Tests for the I/O stream message codecs."""
+
+import base64
+import json
+from typing import Any
+
+import pytest
+
+from waldiez.io import (
+    PayloadCodec,
+    StructuredIOStream,
+    codec as codec_module,
+    decode_payload,
+    get_codec,
+)
+from waldiez.io.codec import CODEC_ENV, envelope_codec
+
+MESSAGE: dict[str, Any] = {
+    "type": "text",
+    "content": {"content": "héllo " * 400, "sender": "user"},
+    "count": 3,
+}
+
+
+def _envelope(codec: str, data: bytes) -> str:
+    """Get an enveloped message."""
+    return json.dumps(
+        {"codec": codec, "payload": base64.b64encode(data).decode("ascii")}
+    )
+
+
+class TestGetCodec:
+    """Tests for selecting a codec."""
+
+    def test_default_is_json(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that plain JSON is used by default."""
+        monkeypatch.delenv(CODEC_ENV, raising=False)
+        codec = get_codec()
+        assert codec == PayloadCodec()
+        assert codec.is_plain
+        # the same as before the codecs
+        assert codec.dumps(MESSAGE, ensure_ascii=False) == json.dumps(
+            MESSAGE, ensure_ascii=False
+        )
+
+    def test_from_environment(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test selecting the codec with an environment variable."""
+        pytest.importorskip("orjson")
+        monkeypatch.setenv(CODEC_ENV, " ORJSON ")
+        assert get_codec().name == "orjson"
+        assert get_codec("json").name == "json"
+
+    @pytest.mark.parametrize("name", ["xml", "json+gzip", "+zstd"])
+    def test_unknown(self, name: str) -> None:
+        """Test that unknown codecs are rejected."""
+        with pytest.raises(ValueError, match="Unknown codec"):
+            get_codec(name)
+
+
+class TestCodecs:
+    """Tests for encoding and decoding messages."""
+
+    def test_orjson(self) -> None:
+        """Test the faster JSON encoding."""
+        pytest.importorskip("orjson")
+        codec = get_codec("orjson")
+        dumped = codec.dumps({**MESSAGE, 1: "key", "big": 2**70})
+        assert not dumped.startswith('{"codec"')
+        assert json.loads(dumped)["1"] == "key"
+        assert decode_payload(dumped)["big"] == 2**70
+
+    def test_msgpack(self) -> None:
+        """Test the binary encoding."""
+        pytest.importorskip("msgpack")
+        dumped = get_codec("msgpack").dumps(MESSAGE)
+        assert envelope_codec(dumped) == "msgpack"
+        assert decode_payload(dumped) == MESSAGE
+
+    def test_zstd(self) -> None:
+        """Test compressing the large messages."""
+        pytest.importorskip("zstandard")
+        codec = get_codec("json+zstd", min_compress_size=100)
+        dumped = codec.dumps(MESSAGE)
+        assert envelope_codec(dumped) == "json+zstd"
+        assert len(dumped) < len(json.dumps(MESSAGE))
+        assert decode_payload(dumped.encode("utf-8")) == MESSAGE
+        # small messages stay plain
+        assert codec.dumps({"a": 1}) == '{"a": 1}'
+
+    def test_decode(self) -> None:
+        """Test decoding plain and enveloped messages."""
+        assert decode_payload('{"a": [1, 2]}') == {"a": [1, 2]}
+        assert decode_payload(b'{"a": NaN}')["a"] != 0
+        enveloped = _envelope("json", json.dumps(MESSAGE).encode("utf-8"))
+        assert decode_payload(enveloped) == MESSAGE
+        assert decode_payload(json.loads(enveloped)) == MESSAGE
+        # not an envelope
+        other = {"codec": "json", "payload": "x", "more": 1}
+        assert envelope_codec(other) is None
+        assert decode_payload(json.dumps(other)) == other
+
+    def test_zstd_bomb(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that payloads that expand too much are rejected."""
+        zstd = pytest.importorskip("zstandard")
+        monkeypatch.setattr(codec_module, "MAX_DECOMPRESSED_SIZE", 10_000)
+        data = json.dumps({"content": "a" * 10_000}).encode("utf-8")
+        bomb = zstd.ZstdCompressor().compress(data)
+        assert len(bomb) < 100
+        with pytest.raises(ValueError, match="over 10000 bytes"):
+            decode_payload(_envelope("json+zstd", bomb))
+        with pytest.raises(ValueError, match="Invalid json\\+zstd payload"):
+            decode_payload(_envelope("json+zstd", b"not zstd"))
+        small = zstd.ZstdCompressor().compress(json.dumps(MESSAGE).encode())
+        assert decode_payload(_envelope("json+zstd", small)) == MESSAGE
+
+    def test_decode_invalid(self) -> None:
+        """Test decoding invalid (or unsupported) messages."""
+        with pytest.raises(ValueError):
+            decode_payload("not json")
+        with pytest.raises(ValueError, match="Invalid json payload"):
+            decode_payload('{"codec": "json", "payload": "%%%"}')
+        with pytest.raises(ValueError, match="Unknown message format"):
+            decode_payload(_envelope("xml", b"<a/>"))
+        with pytest.raises(ValueError, match="Unknown message compression"):
+            decode_payload(_envelope("json+lz4", b"{}"))
+
+
+def test_structured_stream(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that a stream's (enveloped) output decodes to the same message."""
+    plain = StructuredIOStream()
+    plain.print(MESSAGE)
+    expected = json.loads(capsys.readouterr().out)
+
+    pytest.importorskip("orjson")
+    codec = get_codec("orjson")
+    stream = StructuredIOStream(codec=codec)
+    assert stream.codec is codec
+    stream.print(MESSAGE)
+    received = decode_payload(capsys.readouterr().out)
+    for key in ("id", "timestamp"):
+        expected.pop(key)
+        received.pop(key)
+    assert received == expected
@@ -187,32 +187,32 @@ def test_parse_pubsub_input() -> None:
     """Test parsing of Pub/Sub input response."""
 
 
-def test_locking_mechanism(fake_redis: fakeredis.FakeRedis) -> None:
-    """Test that a lock prevents multiple tasks processing the same input."""
-    task_id = "test_task_locking"
-    lock_key = f"lock:{task_id}"
+def test_claim_request_once_per_task(fake_redis: fakeredis.FakeRedis) -> None:
+    """Test that only one stream of a task processes the same input."""
+    task_id = "test_task_claiming"
 
     stream = RedisIOStream("redis://localhost", task_id, input_timeout=1)
     stream.redis = fake_redis
+    other = RedisIOStream("redis://localhost", task_id, input_timeout=1)
+    other.redis = fake_redis
     # pylint: disable=protected-access
-    assert stream._acquire_lock(lock_key) is True
-    assert stream._acquire_lock(lock_key) is False
-    stream._release_lock(lock_key)
-    assert stream._acquire_lock(lock_key) is True
+    assert stream._claim_request("req-1") is True
+    assert other._claim_request("req-1") is False
+    assert other._claim_request("req-2") is True
+    assert stream._claim_request("req-2") is False
 
 
 def test_context_manager(fake_redis: fakeredis.FakeRedis) -> None:
-    """Test context manager cleanup and lock release."""
+    """Test that the claimed requests outlive the context manager."""
     task_id = "test_task_context_manager"
-    lock_key = f"lock:{task_id}"
 
     stream = RedisIOStream("redis://localhost", task_id, input_timeout=1)
     stream.redis = fake_redis
 
     with stream as io_stream:
-        assert io_stream._acquire_lock(lock_key) is True
+        assert io_stream._claim_request("req-1") is True
 
-    assert io_stream._acquire_lock(lock_key) is False
+    assert io_stream._claim_request("req-1") is False
 
 
 def test_cleanup_processed_task_requests(
@@ -527,7 +527,7 @@ def test_wait_for_input_already_processed(
     stream.redis = fake_redis
 
     # Mark request as already processed
-    stream._mark_request_processed("processed-id")
+    assert stream._claim_request("processed-id") is True
 
     def delayed_publish() -> None:
         """Publish a response for an already processed request."""
@@ -651,31 +651,31 @@ def test_get_user_input_list_content() -> None:
     assert result == "First part Second part"
 
 
-def test_acquire_lock_redis_error() -> None:
-    """Test _acquire_lock with Redis error."""
+def test_claim_request_redis_error() -> None:
+    """Test _claim_request with Redis error."""
     with patch("redis.Redis.from_url") as mock_redis_class:
         mock_redis = MagicMock()
-        mock_redis.set.side_effect = redis.RedisError("Connection failed")
+        mock_redis.zadd.side_effect = redis.RedisError("Connection failed")
         mock_redis_class.return_value = mock_redis
 
         stream = RedisIOStream("redis://localhost", "test_task")
 
-        # Should return False on Redis error
-        result = stream._acquire_lock("test_lock")
+        # Should not claim the request on Redis error
+        result = stream._claim_request("test_request")
         assert result is False
 
 
-def test_acquire_lock_general_exception() -> None:
-    """Test _acquire_lock with general exception."""
+def test_claim_request_general_exception() -> None:
+    """Test _claim_request with general exception."""
     with patch("redis.Redis.from_url") as mock_redis_class:
         mock_redis = MagicMock()
-        mock_redis.set.side_effect = Exception("Unexpected error")
+        mock_redis.zadd.side_effect = Exception("Unexpected error")
         mock_redis_class.return_value = mock_redis
 
         stream = RedisIOStream("redis://localhost", "test_task")
 
-        # Should return False on general exception
-        result = stream._acquire_lock("test_lock")
+        # Should not claim the request on general exception
+        result = stream._claim_request("test_request")
         assert result is False
 
 
@@ -742,3 +742,153 @@ def test_parse_pubsub_input_invalid_formats() -> None:
     # Test with dict missing 'data' key
     result = stream.parse_pubsub_input({"type": "test"})
     assert result is None
+
+
+def test_print_single_round_trip(fake_redis: fakeredis.FakeRedis) -> None:
+    """Test that both streams are written in one pipeline per message."""
+    task_id = "test_print_single_round_trip"
+    stream = RedisIOStream("redis://localhost", task_id)
+    stream.redis = fake_redis
+
+    stream.print("one")
+    stream.print("two")
+
+    assert len(fake_redis.xrange(f"task:{task_id}:output")) == 2
+    assert len(fake_redis.xrange("task-output")) >= 2
+    stats = stream.stats
+    assert stats["messages"] == stats["batches"] == 2
+    assert stats["largest_batch"] == 1
+    assert stats["errors"] == 0
+
+
+def test_buffered_print_batches(fake_redis: fakeredis.FakeRedis) -> None:
+    """Test that buffered messages are sent when the batch is full."""
+    task_id = "test_buffered_print_batches"
+    stream = RedisIOStream(
+        "redis://localhost",
+        task_id,
+        buffered=True,
+        max_batch_size=3,
+        flush_interval=60,
+    )
+    stream.redis = fake_redis
+    output = f"task:{task_id}:output"
+
+    stream.print("one")
+    stream.print("two")
+    assert not fake_redis.xrange(output)
+    assert stream.stats["pending"] == 2
+
+    stream.print("three")
+    entries = fake_redis.xrange(output)
+    assert [entry[1]["data"] for entry in entries] == [
+        "one\n",
+        "two\n",
+        "three\n",
+    ]
+    stream.print("four")
+    stream.close()
+    assert len(fake_redis.xrange(output)) == 4
+    stats = stream.stats
+    assert stats["batches"] == 2
+    assert stats["largest_batch"] == 3
+    assert stats["average_batch"] == 2
+    assert stats["pending"] == 0
+
+
+def test_buffered_print_flush_interval(
+    fake_redis: fakeredis.FakeRedis,
+) -> None:
+    """Test that buffered messages are sent after the flush interval."""
+    task_id = "test_buffered_print_flush_interval"
+    stream = RedisIOStream(
+        "redis://localhost", task_id, buffered=True, flush_interval=0.05
+    )
+    stream.redis = fake_redis
+
+    stream.print("Hello")
+    deadline = time.monotonic() + 2
+    while stream.stats["batches"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(fake_redis.xrange(f"task:{task_id}:output")) == 1
+    assert stream.stats["last_flush_seconds"] >= 0
+
+
+def test_buffered_flush_before_input(fake_redis: fakeredis.FakeRedis) -> None:
+    """Test that the buffer is flushed before requesting input."""
+    task_id = "test_buffered_flush_before_input"
+    seen: list[int] = []
+
+    def on_input_request(_prompt: str, _request_id: str, task: str) -> None:
+        """Count the sent messages when the input is requested."""
+        seen.append(len(fake_redis.xrange(f"task:{task}:output")))
+
+    stream = RedisIOStream(
+        "redis://localhost",
+        task_id,
+        input_timeout=0,
+        on_input_request=on_input_request,
+        buffered=True,
+        flush_interval=60,
+    )
+    stream.redis = fake_redis
+
+    stream.print("Before the prompt")
+    assert stream.input("Enter something:") == ""
+    # the printed message and the input request
+    assert seen == [2]
+
+
+def test_input_response_before_wait(fake_redis: fakeredis.FakeRedis) -> None:
+    """Test that a response sent right after the request is not missed."""
+    task_id = "test_input_response_before_wait"
+
+    def on_input_request(_prompt: str, request_id: str, task: str) -> None:
+        """Respond before the stream starts waiting."""
+        fake_redis.publish(
+            f"task:{task}:input_response",
+            json.dumps(
+                {
+                    "request_id": request_id,
+                    "data": json.dumps(
+                        {"content": {"type": "text", "text": request_id}}
+                    ),
+                    "task_id": task,
+                }
+            ),
+        )
+
+    stream = RedisIOStream(
+        "redis://localhost",
+        task_id,
+        input_timeout=5,
+        on_input_request=on_input_request,
+    )
+    stream.redis = fake_redis
+
+    started = time.monotonic()
+    assert stream.input("First:", request_id="first") == "first"
+    subscriber = stream._pubsub
+    assert subscriber is not None
+    assert stream.input("Second:", request_id="second") == "second"
+    # no polling delay, one subscriber for all the requests
+    assert time.monotonic() - started < 2
+    assert stream._pubsub is subscriber
+
+    stream.close()
+    assert stream._pubsub is None
+
+
+def test_claim_request(fake_redis: fakeredis.FakeRedis) -> None:
+    """Test that a request can only be claimed once."""
+    stream = RedisIOStream("redis://localhost", "test_claim_request")
+    stream.redis = fake_redis
+
+    assert stream._claim_request("req-1") is True
+    assert stream._claim_request("req-1") is False
+    assert RedisIOStream.is_request_processed(
+        fake_redis, task_id="test_claim_request", request_id="req-1"
+    )
+    assert not RedisIOStream.is_request_processed(
+        fake_redis, task_id="test_claim_request", request_id="req-2"
+    )
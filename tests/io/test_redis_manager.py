@@ -0,0 +1,247 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pyright: reportMissingTypeStubs=false
+# pyright: reportPrivateUsage=false,reportUnknownMemberType=false
+# pyright: reportUnknownVariableType=false,reportUnknownArgumentType=false
+# pylint: disable=missing-param-doc,missing-type-doc,missing-return-doc
+# pylint: disable=missing-yield-doc,protected-access
+
+"""Tests for the RedisConnectionManager class."""
+
+import json
+import threading
+import time
+from collections.abc import Callable, Generator
+
+import fakeredis
+import pytest
+
+from waldiez.io import (
+    AsyncRedisIOStream,
+    RedisConnectionManager,
+    RedisIOStream,
+    UserResponse,
+)
+from waldiez.io.redis_manager import InputWaiter
+
+
+def _response(task_id: str, request_id: str, text: str) -> str:
+    """Get the published response to an input request."""
+    return json.dumps(
+        {
+            "id": f"response-{request_id}",
+            "timestamp": "now",
+            "request_id": request_id,
+            "data": json.dumps({"content": {"type": "text", "text": text}}),
+            "task_id": task_id,
+            "type": "input_response",
+        }
+    )
+
+
+@pytest.fixture(name="server")
+def server_fixture() -> fakeredis.FakeServer:
+    """Fake Redis server fixture."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture(name="manager")
+def manager_fixture(
+    server: fakeredis.FakeServer,
+) -> Generator[RedisConnectionManager, None, None]:
+    """Create a connection manager that uses a fake client."""
+    manager = RedisConnectionManager(
+        client=fakeredis.FakeRedis(server=server, decode_responses=True)
+    )
+    yield manager
+    manager.close()
+
+
+def _reply_on_request(
+    client: fakeredis.FakeRedis, text: str
+) -> Callable[[str, str, str], None]:
+    """Get an input request callback that publishes a response."""
+
+    def on_input_request(_prompt: str, request_id: str, task_id: str) -> None:
+        client.publish(
+            f"task:{task_id}:input_response",
+            _response(task_id, request_id, f"{text} {task_id}"),
+        )
+
+    return on_input_request
+
+
+def test_streams_share_the_subscriber(
+    server: fakeredis.FakeServer, manager: RedisConnectionManager
+) -> None:
+    """Test that concurrent inputs get their responses via one subscriber."""
+    publisher = fakeredis.FakeRedis(server=server, decode_responses=True)
+    streams = [
+        RedisIOStream(
+            task_id=f"task-{index}",
+            input_timeout=5,
+            on_input_request=_reply_on_request(publisher, "hello"),
+            connection_manager=manager,
+        )
+        for index in range(5)
+    ]
+    results: dict[str, str] = {}
+
+    def _ask(stream: RedisIOStream) -> None:
+        results[stream.task_id] = stream.input("Your name?")
+
+    threads = [
+        threading.Thread(target=_ask, args=(stream,)) for stream in streams
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert results == {
+        f"task-{index}": f"hello task-{index}" for index in range(5)
+    }
+    assert all(stream.redis is manager.client for stream in streams)
+    assert all(stream._pubsub is None for stream in streams)
+    stats = manager.stats
+    assert stats["dispatched"] == 5
+    assert stats["waiters"] == 0
+    assert stats["subscribed"] == 1
+    for stream in streams:
+        stream.close()
+    # the shared client is still usable
+    assert manager.client.ping()
+
+
+def test_binary_client(server: fakeredis.FakeServer) -> None:
+    """Test the responses of a client without decoded responses."""
+    manager = RedisConnectionManager(
+        client=fakeredis.FakeRedis(server=server, decode_responses=False)
+    )
+    publisher = fakeredis.FakeRedis(server=server, decode_responses=False)
+    stream = RedisIOStream(
+        task_id="task-bytes",
+        input_timeout=5,
+        on_input_request=_reply_on_request(publisher, "hello"),
+        connection_manager=manager,
+    )
+    assert stream.input("Your name?") == "hello task-bytes"
+    assert manager.stats["dispatched"] == 1
+    # an unknown request of the same (binary) channel
+    assert not manager.dispatch(
+        {
+            "type": "pmessage",
+            "channel": b"task:task-bytes:input_response",
+            "data": _response("task-bytes", "unknown", "hi").encode(),
+        }
+    )
+    assert manager.stats["dropped"] == 1
+    stream.close()
+    manager.close()
+
+
+def test_skips_processed_and_unknown_responses(
+    server: fakeredis.FakeServer, manager: RedisConnectionManager
+) -> None:
+    """Test that only the first (unclaimed) response is used."""
+    publisher = fakeredis.FakeRedis(server=server, decode_responses=True)
+    publisher.zadd("processed_requests:task", {"req-1": 1})
+
+    def on_input_request(_prompt: str, request_id: str, task_id: str) -> None:
+        channel = f"task:{task_id}:input_response"
+        publisher.publish(channel, _response(task_id, "unknown", "no"))
+        publisher.publish(channel, _response(task_id, request_id, "first"))
+        publisher.publish(channel, _response(task_id, request_id, "second"))
+
+    stream = RedisIOStream(
+        task_id="task",
+        input_timeout=2,
+        on_input_request=on_input_request,
+        connection_manager=manager,
+    )
+    # the first response is dropped as already processed (by another worker)
+    assert stream.input("prompt", request_id="req-1") == ""
+    assert stream.input("prompt", request_id="req-2") == "first"
+    assert manager.stats["dropped"] >= 2
+
+
+def test_subscribes_only_waiting_tasks(
+    server: fakeredis.FakeServer, manager: RedisConnectionManager
+) -> None:
+    """Test that the responses of other tasks are not received."""
+    publisher = fakeredis.FakeRedis(server=server, decode_responses=True)
+    waiter = manager.expect("mine", "req")
+    assert manager.stats["channels"] == 1
+    # (another worker's task)
+    publisher.publish(
+        "task:other:input_response", _response("other", "req", "no")
+    )
+    publisher.publish(
+        "task:mine:input_response", _response("mine", "req", "hi")
+    )
+    response = waiter.get(timeout=2)
+    assert response is not None
+    assert response.request_id == "req"
+    stats = manager.stats
+    assert stats["dispatched"] == 1
+    assert stats["dropped"] == 0
+
+    manager.discard(waiter)
+    assert manager.stats["channels"] == 0
+    deadline = time.monotonic() + 2
+    while publisher.pubsub_numsub("task:mine:input_response")[0][1]:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_async_stream(
+    server: fakeredis.FakeServer, manager: RedisConnectionManager
+) -> None:
+    """Test waiting for input in an event loop."""
+    publisher = fakeredis.FakeRedis(server=server, decode_responses=True)
+    stream = AsyncRedisIOStream(
+        task_id="async-task",
+        input_timeout=2,
+        on_input_request=_reply_on_request(publisher, "hi"),
+        connection_manager=manager,
+    )
+    stream.redis = fakeredis.aioredis.FakeRedis(
+        server=server, decode_responses=True
+    )
+    assert await stream.a_input("prompt") == "hi async-task"
+    assert stream._pubsub is None
+    assert manager.stats["dispatched"] == 1
+    await stream.a_close()
+
+
+@pytest.mark.asyncio
+async def test_input_waiter() -> None:
+    """Test queuing and waiting for the responses."""
+    waiter = InputWaiter("task", "req")
+    assert waiter.get(timeout=0.01) is None
+    assert await waiter.a_get(timeout=0.01) is None
+
+    first = UserResponse(request_id="req", data="first")
+    second = UserResponse(request_id="req", data="second")
+    waiter.put(first)
+    waiter.put(second)
+    assert waiter.get(timeout=1) is first
+    assert await waiter.a_get(timeout=1) is second
+
+    threading.Timer(0.05, waiter.put, args=(first,)).start()
+    assert await waiter.a_get(timeout=2) is first
+
+
+def test_shared_manager() -> None:
+    """Test getting the process' manager of a Redis URL."""
+    url = "redis://localhost:6379/15"
+    manager = RedisConnectionManager.shared(url, max_connections=3)
+    assert RedisConnectionManager.shared(url, max_connections=3) is manager
+    assert RedisConnectionManager.shared(url) is not manager
+    stats = manager.stats
+    assert stats["max_connections"] == 3
+    assert stats["created_connections"] == 0
+    manager.close()
+    assert RedisConnectionManager.shared(url, max_connections=3) is not manager
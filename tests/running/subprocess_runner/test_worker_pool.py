@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+# pylint: disable=missing-param-doc, missing-return-doc, missing-yield-doc
+# pylint: disable=protected-access
+# pyright: reportPrivateUsage=false
+"""Tests for the subprocess runner's warm worker pool."""
+
+import os
+import socket
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from waldiez.running.subprocess_runner import (
+    SyncSubprocessRunner,
+    WorkerPool,
+)
+from waldiez.running.subprocess_runner._worker_protocol import (
+    receive_message,
+    send_message,
+)
+
+pytestmark = pytest.mark.skipif(
+    not WorkerPool.is_supported(), reason="The worker pool requires posix"
+)
+
+
+@pytest.fixture(name="pool", scope="module")
+def pool_fixture() -> Iterator[WorkerPool]:
+    """Start a small warm worker pool."""
+    with WorkerPool(size=1, max_jobs_per_worker=2) as pool:
+        yield pool
+
+
+def _wait_for_idle(pool: WorkerPool, timeout: float = 120.0) -> None:
+    """Wait until the pool has an idle worker again."""
+    deadline = time.monotonic() + timeout
+    while pool.stats["idle"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def test_message_round_trip_with_fds() -> None:
+    """Test sending a message with file descriptors."""
+    ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+    read_fd, write_fd = os.pipe()
+    send_message(ours, {"type": "job", "args": ["ü"]}, [write_fd])
+    os.close(write_fd)
+    message, fds = receive_message(theirs)
+    assert message == {"type": "job", "args": ["ü"]}
+    assert len(fds) == 1
+    os.write(fds[0], b"hi")
+    os.close(fds[0])
+    assert os.read(read_fd, 2) == b"hi"
+    os.close(read_fd)
+    ours.close()
+    assert receive_message(theirs) == (None, [])
+    theirs.close()
+
+
+def test_invalid_pool_size() -> None:
+    """Test the pool's size validation."""
+    with pytest.raises(ValueError):
+        WorkerPool(size=0)
+    with pytest.raises(ValueError):
+        WorkerPool(max_jobs_per_worker=0)
+
+
+def test_submit_runs_the_cli(pool: WorkerPool) -> None:
+    """Test running a cli command in a warm worker."""
+    _wait_for_idle(pool)
+    jobs = pool.stats["jobs"]
+    process = pool.submit(["--version"], timeout=120)
+    assert process is not None
+    assert process.stdout is not None
+    assert "waldiez version" in process.stdout.read()
+    assert process.wait(timeout=30) == 0
+    assert process.poll() == 0
+    process.terminate()  # already exited, no-op
+    deadline = time.monotonic() + 5
+    while pool.stats["jobs"] == jobs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.stats["jobs"] == jobs + 1
+
+
+def test_submit_reports_the_exit_code(pool: WorkerPool, tmp_path: Path) -> None:
+    """Test a failing job's exit code and stderr."""
+    _wait_for_idle(pool)
+    missing = tmp_path / "missing.waldiez"
+    process = pool.submit(["run", "--file", str(missing)], timeout=120)
+    assert process is not None
+    assert process.stderr is not None
+    assert "does not exist" in process.stderr.read()
+    assert process.wait(timeout=30) == 2
+
+
+def test_worker_is_recycled(pool: WorkerPool) -> None:
+    """Test replacing a worker after max_jobs_per_worker jobs."""
+    _wait_for_idle(pool)
+    recycled = pool.stats["recycled"]
+    pid = pool._idle[0].pid
+    for _ in range(pool.max_jobs_per_worker):
+        _wait_for_idle(pool)
+        process = pool.submit(["--version"], timeout=120)
+        assert process is not None
+        process.wait(timeout=30)
+    _wait_for_idle(pool)
+    assert pool.stats["recycled"] > recycled
+    assert pool._idle[0].pid != pid
+
+
+def test_health_check_replaces_dead_worker(pool: WorkerPool) -> None:
+    """Test that the health check replaces a dead worker."""
+    _wait_for_idle(pool)
+    replaced = pool.stats["replaced"]
+    assert pool.health_check() == 1
+    worker = pool._idle[0]
+    worker.process.kill()
+    worker.process.wait()
+    assert pool.health_check() == 0
+    assert pool.stats["replaced"] == replaced + 1
+    _wait_for_idle(pool)
+    assert pool._idle[0].pid != worker.pid
+    assert pool.health_check() == 1
+
+
+def test_sync_runner_uses_the_pool(pool: WorkerPool, tmp_path: Path) -> None:
+    """Test that the sync runner runs the flow in a warm worker."""
+    _wait_for_idle(pool)
+    on_output = MagicMock()
+    runner = SyncSubprocessRunner(
+        on_output=on_output,
+        on_input_request=MagicMock(),
+        worker_pool=pool,
+    )
+    with patch("subprocess.Popen") as mock_popen:
+        success = runner.run_subprocess(
+            tmp_path / "missing.waldiez", mode="run"
+        )
+    assert not success
+    mock_popen.assert_not_called()
+    completion = on_output.call_args_list[-1].args[0]
+    assert completion["type"] == "subprocess_completion"
+    assert completion["exit_code"] == 2
+
+
+def test_closed_pool_refuses_jobs() -> None:
+    """Test that a closed pool does not accept jobs."""
+    pool = WorkerPool(size=1)
+    pool.close()
+    assert pool.submit(["--version"]) is None
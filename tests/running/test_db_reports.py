@@ -0,0 +1,195 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc
+
+"""Tests for waldiez.running.db_reports.*."""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from waldiez.running.db_reports import generate_db_reports
+from waldiez.running.db_utils import get_sqlite_out
+from waldiez.running.gen_seq_diagram import generate_sequence_diagram
+from waldiez.running.results_mixin import ResultsMixin
+from waldiez.running.timeline_processor import TimelineProcessor
+
+
+def _create_flow_db(db_path: Path) -> None:
+    """Create a small flow.db with the runtime logging tables."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        CREATE TABLE agents (
+            id INTEGER, name TEXT, class TEXT, init_args TEXT, timestamp TEXT
+        );
+        CREATE TABLE chat_completions (
+            id INTEGER, session_id TEXT, source_name TEXT, request TEXT,
+            response TEXT, is_cached INTEGER, cost REAL,
+            start_time TEXT, end_time TEXT
+        );
+        CREATE TABLE events (
+            source_name TEXT, event_name TEXT, json_state TEXT, timestamp TEXT
+        );
+        CREATE TABLE function_calls (
+            source_name TEXT, function_name TEXT, timestamp TEXT
+        );
+    """
+    )
+    conn.executemany(
+        "INSERT INTO agents VALUES (?, ?, ?, ?, ?)",
+        [
+            (1, "user", "UserProxyAgent", "{}", "2025-01-01 10:00:00"),
+            (
+                2,
+                "assistant",
+                "AssistantAgent",
+                json.dumps({"llm_config": {"config_list": [{"model": "m-1"}]}}),
+                "2025-01-01 10:00:00",
+            ),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO chat_completions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                1,
+                "a1b2",
+                "assistant",
+                json.dumps({"model": "gpt-4o", "messages": []}),
+                json.dumps({"usage": {"prompt_tokens": 3}}),
+                0,
+                0.01,
+                "2025-01-01 10:00:01.000000",
+                "2025-01-01 10:00:02.500000",
+            ),
+            (
+                2,
+                "a1b2",
+                "",
+                "plain text",
+                "{}",
+                1,
+                0.02,
+                "2025-01-01 10:00:12.000000",
+                "2025-01-01 10:00:13.000000",
+            ),
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO events VALUES (?, ?, ?, ?)",
+        [
+            (
+                "assistant",
+                "received_message",
+                json.dumps(
+                    {"sender": "user", "message": {"content": "Hi there"}}
+                ),
+                "2025-01-01 10:00:00.500000",
+            ),
+            (
+                "user",
+                "received_message",
+                json.dumps(
+                    {
+                        "sender": "assistant",
+                        "message": {"role": "user", "content": "Hello"},
+                    }
+                ),
+                "2025-01-01 10:00:12.500000",
+            ),
+            (
+                "user",
+                "reply_func_executed",
+                json.dumps({"sender": "x", "message": "ignored"}),
+                "2025-01-01 10:00:13.000000",
+            ),
+        ],
+    )
+    conn.execute(
+        "INSERT INTO function_calls VALUES (?, ?, ?)",
+        ("assistant", "search_web", "2025-01-01 10:00:05.000000"),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_generate_db_reports_matches_csv_route(tmp_path: Path) -> None:
+    """Test that the flow.db reports match the ones from the csv files."""
+    flow_db = tmp_path / "flow.db"
+    _create_flow_db(flow_db)
+
+    reports = generate_db_reports(flow_db, fetch_size=1)
+
+    assert reports is not None
+    assert reports.mermaid is not None
+    assert "user->>assistant: " in reports.mermaid
+    assert "note over user: Content: Hello" in reports.mermaid
+    assert "ignored" not in reports.mermaid
+    assert reports.timeline is not None
+
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    for table in ("agents", "chat_completions", "events", "function_calls"):
+        get_sqlite_out(str(flow_db), table, str(logs / f"{table}.csv"))
+    processor = TimelineProcessor()
+    files = TimelineProcessor.get_files(logs)
+    processor.load_csv_files(
+        agents_file=files["agents"],
+        chat_file=files["chat"],
+        events_file=files["events"],
+        functions_file=files["functions"],
+    )
+    expected = processor.process_timeline()
+    assert json.dumps(reports.timeline, default=str) == json.dumps(
+        expected, default=str
+    )
+    mmd_file = tmp_path / "expected.mmd"
+    generate_sequence_diagram(logs / "events.csv", mmd_file)
+    assert sorted(reports.mermaid.splitlines()) == sorted(
+        mmd_file.read_text(encoding="utf-8").splitlines()
+    )
+
+
+def test_generate_db_reports_partial(tmp_path: Path) -> None:
+    """Test generating only some (or none) of the reports."""
+    flow_db = tmp_path / "flow.db"
+    _create_flow_db(flow_db)
+
+    reports = generate_db_reports(flow_db, mermaid=False)
+    assert reports is not None
+    assert reports.mermaid is None
+    assert reports.timeline is not None
+
+    reports = generate_db_reports(flow_db, timeline=False)
+    assert reports is not None
+    assert reports.mermaid is not None
+    assert reports.timeline is None
+
+    empty_db = tmp_path / "empty.db"
+    sqlite3.connect(empty_db).close()
+    assert generate_db_reports(empty_db) is None
+
+
+def test_post_run_reports_without_db_exports(tmp_path: Path) -> None:
+    """Test the post-run reports straight from flow.db."""
+    _create_flow_db(tmp_path / "flow.db")
+
+    assert ResultsMixin.make_db_reports(
+        temp_dir=tmp_path,
+        output_file=tmp_path / "flow.py",
+        flow_name="flow",
+        mmd_dir=tmp_path,
+    )
+
+    assert (tmp_path / "flow.mmd").is_file()
+    timeline = json.loads((tmp_path / "timeline.json").read_text("utf-8"))
+    assert timeline["summary"]["total_sessions"] == 2
+    assert not (tmp_path / "logs").exists()
+    assert not ResultsMixin.make_db_reports(
+        temp_dir=tmp_path / "missing",
+        output_file=None,
+        flow_name="flow",
+        mmd_dir=tmp_path,
+    )
@@ -12,7 +12,12 @@ import sqlite3
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from waldiez.running.db_utils import a_get_sqlite_out, get_sqlite_out
+from waldiez.running.db_utils import (
+    a_export_sqlite_tables,
+    a_get_sqlite_out,
+    export_sqlite_tables,
+    get_sqlite_out,
+)
 
 
 class TestGetSqliteOut:
@@ -371,3 +376,88 @@ class TestAsyncGetSqliteOut:
         with open(json_path, "r", encoding="utf-8") as f:
             json_data = json.load(f)
         assert json_data == []
+
+
+def _create_numbers_db(db_path: Path, tables: int = 1) -> None:
+    """Create a database with some tables of numbers."""
+    conn = sqlite3.connect(db_path)
+    for index in range(tables):
+        conn.execute(
+            f"CREATE TABLE numbers_{index} (id INTEGER, label TEXT)"  # nosec
+        )
+        conn.executemany(
+            f"INSERT INTO numbers_{index} VALUES (?, ?)",  # nosec
+            [(i, f"Número\n{i}") for i in range(25)],
+        )
+    conn.commit()
+    conn.close()
+
+
+class TestStreamingExport:
+    """Tests for the batched / parallel exports."""
+
+    def test_batches_match_full_dump(self, tmp_path: Path) -> None:
+        """Test that writing in batches gives the same files."""
+        db_path = tmp_path / "test.db"
+        _create_numbers_db(db_path)
+
+        csv_path = tmp_path / "numbers.csv"
+        get_sqlite_out(str(db_path), "numbers_0", str(csv_path), fetch_size=7)
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT id, label FROM numbers_0").fetchall()
+        conn.close()
+        expected = [{"id": row[0], "label": row[1]} for row in rows]
+        json_text = (tmp_path / "numbers.json").read_text(encoding="utf-8")
+        assert json_text == json.dumps(expected, indent=4, ensure_ascii=False)
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            assert len(list(csv.DictReader(f))) == 25
+
+    async def test_async_batches_match_sync(self, tmp_path: Path) -> None:
+        """Test that the async export writes the same files."""
+        db_path = tmp_path / "test.db"
+        _create_numbers_db(db_path)
+
+        get_sqlite_out(str(db_path), "numbers_0", str(tmp_path / "sync.csv"))
+        await a_get_sqlite_out(
+            str(db_path), "numbers_0", str(tmp_path / "async.csv"), 4
+        )
+
+        for ext in ("csv", "json"):
+            assert (tmp_path / f"sync.{ext}").read_bytes() == (
+                tmp_path / f"async.{ext}"
+            ).read_bytes()
+
+    def test_export_sqlite_tables(self, tmp_path: Path) -> None:
+        """Test exporting several tables at once."""
+        db_path = tmp_path / "test.db"
+        _create_numbers_db(db_path, tables=3)
+        tables = ["numbers_0", "numbers_1", "numbers_2", "missing"]
+
+        export_sqlite_tables(str(db_path), tables, str(tmp_path))
+
+        for table in tables[:-1]:
+            with open(tmp_path / f"{table}.json", "r", encoding="utf-8") as f:
+                assert len(json.load(f)) == 25
+        assert not (tmp_path / "missing.json").exists()
+
+        one_by_one = tmp_path / "one_by_one"
+        one_by_one.mkdir()
+        export_sqlite_tables(
+            str(db_path), tables[:2], str(one_by_one), max_workers=1
+        )
+        assert (one_by_one / "numbers_1.csv").read_bytes() == (
+            tmp_path / "numbers_1.csv"
+        ).read_bytes()
+
+    async def test_a_export_sqlite_tables(self, tmp_path: Path) -> None:
+        """Test exporting several tables concurrently."""
+        db_path = tmp_path / "test.db"
+        _create_numbers_db(db_path, tables=2)
+
+        await a_export_sqlite_tables(
+            str(db_path), ["numbers_0", "numbers_1"], str(tmp_path)
+        )
+
+        assert (tmp_path / "numbers_0.json").exists()
+        assert (tmp_path / "numbers_1.csv").exists()
@@ -11,12 +11,14 @@
 """Tests for events_mixin module."""
 
 import asyncio
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, Mock, patch
 
 from waldiez.running.events_mixin import EventsMixin
 from waldiez.running.io_utils import input_async, input_sync
+from waldiez.storage import WaldiezCheckpoint
 
 
 class MockMessage:
@@ -469,3 +471,46 @@ class TestEventsMixin:
         EventsMixin.process_event(event, [], tmp_path)
 
         assert mock_send.call_count == 2
+
+    def test_save_history_appends_to_journal(self, tmp_path: Path) -> None:
+        """Test that each saved history entry is a single appended line."""
+        for idx in range(3):
+            EventsMixin.save_history(
+                tmp_path, state={"messages": [idx], "context_variables": {}}
+            )
+        EventsMixin.save_history(
+            tmp_path, state={"messages": [], "context_variables": {}}
+        )
+        lines = (tmp_path / "history.jsonl").read_text().splitlines()
+        assert len(lines) == 3
+        assert not (tmp_path / "history.json").exists()
+
+    def test_save_history_stores_deltas(self, tmp_path: Path) -> None:
+        """Test that appended messages are stored as deltas."""
+        messages: list[dict[str, Any]] = []
+        for idx in range(3):
+            messages.append({"content": str(idx)})
+            EventsMixin.save_history(
+                tmp_path,
+                state={"messages": list(messages), "context_variables": {}},
+            )
+        lines = (tmp_path / "history.jsonl").read_text().splitlines()
+        assert ['"delta"' in line for line in lines] == [False, True, True]
+        checkpoint = WaldiezCheckpoint(
+            "session", datetime.now(timezone.utc), tmp_path
+        )
+        assert checkpoint.history()[-1]["state"]["messages"] == messages
+
+    async def test_a_save_history_appends_to_journal(
+        self, tmp_path: Path
+    ) -> None:
+        """Test the async variant of saving history entries."""
+        (tmp_path / "state.json").write_text(
+            '{"messages": [1], "context_variables": {}}'
+        )
+        await EventsMixin.a_save_history(tmp_path)
+        await EventsMixin.a_save_history(
+            tmp_path, state={"messages": [1, 2], "context_variables": {}}
+        )
+        lines = (tmp_path / "history.jsonl").read_text().splitlines()
+        assert len(lines) == 2
@@ -18,6 +18,7 @@ from unittest.mock import MagicMock, Mock, patch
 import pytest
 
 from waldiez.running.results_mixin import ResultsMixin, WaldiezRunResults
+from waldiez.storage import StorageManager
 
 
 class TestResultsMixin:
@@ -461,25 +462,31 @@ class TestAsyncMethods:
 
     async def test_a_post_run(self, tmp_path: Path) -> None:
         """Test async post_run."""
-        with patch(
-            "waldiez.running.results_mixin.anyio.to_thread.run_sync"
-        ) as mock_run_sync:
-            mock_run_sync.return_value = tmp_path / "result"
-
-            waldiez_file = tmp_path / "test.waldiez"
-            waldiez_file.touch()
+        temp_dir = tmp_path / "tmp"
+        temp_dir.mkdir()
+        waldiez_file = tmp_path / "test.waldiez"
+        waldiez_file.write_text("content")
+        storage_manager = StorageManager(workspace_dir=tmp_path / "workspace")
 
-            result = await ResultsMixin.a_post_run(
-                results=[],
-                error=None,
-                temp_dir=tmp_path,
-                output_file=None,
-                flow_name="test",
-                waldiez_file=waldiez_file,
-            )
+        result = await ResultsMixin.a_post_run(
+            results=[{"test": "result"}],
+            error=None,
+            temp_dir=temp_dir,
+            output_file=tmp_path / "test.py",
+            flow_name="test",
+            waldiez_file=waldiez_file,
+            skip_mmd=True,
+            skip_timeline=True,
+            skip_db_exports=True,
+            storage_manager=storage_manager,
+        )
 
-            assert result == tmp_path / "result"
-            mock_run_sync.assert_called_once()
+        assert result is not None
+        assert (result / "results.json").is_file()
+        assert (result / "test.waldiez").read_text() == "content"
+        assert not temp_dir.exists()
+        checkpoint = storage_manager.get_latest_checkpoint("test")
+        assert checkpoint is not None
 
 
 class TestEdgeCases:
@@ -0,0 +1,177 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc,no-self-use
+# pylint: disable=protected-access,too-few-public-methods
+
+"""Tests for the state snapshot policy and writer."""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+from waldiez.running.events_mixin import EventsMixin
+from waldiez.running.snapshots import (
+    SnapshotPolicy,
+    StateSnapshot,
+    StateSnapshotter,
+)
+
+
+def _snapshot(output_dir: Path, count: int) -> StateSnapshot:
+    return StateSnapshot(
+        output_dir=output_dir,
+        state={"messages": list(range(count)), "context_variables": {}},
+        metadata={"type": "group"},
+    )
+
+
+class TestSnapshotPolicy:
+    """Tests for SnapshotPolicy."""
+
+    def test_default_policy_snapshots_every_event(self) -> None:
+        """Test the default (legacy) behavior."""
+        snapshotter = StateSnapshotter(writer=Mock())
+        assert all(snapshotter.should_snapshot("text") for _ in range(3))
+
+    def test_every_n_events(self) -> None:
+        """Test snapshotting every N events."""
+        snapshotter = StateSnapshotter(
+            writer=Mock(), policy=SnapshotPolicy.every(3, background=False)
+        )
+        decisions: list[bool] = []
+        for idx in range(6):
+            decision = snapshotter.should_snapshot("text")
+            decisions.append(decision)
+            if decision:
+                snapshotter.submit(_snapshot(Path("."), idx))
+        assert decisions == [False, False, True, False, False, True]
+
+    def test_forced_event_types(self) -> None:
+        """Test input requests and termination always trigger a snapshot."""
+        snapshotter = StateSnapshotter(
+            writer=Mock(), policy=SnapshotPolicy.on_input_or_termination()
+        )
+        assert not snapshotter.should_snapshot("text")
+        assert snapshotter.should_snapshot("input_request")
+        assert snapshotter.should_snapshot("termination")
+
+    def test_throttled(self) -> None:
+        """Test the interval based policy."""
+        snapshotter = StateSnapshotter(
+            writer=Mock(),
+            policy=SnapshotPolicy.throttled(10_000, background=False),
+        )
+        assert snapshotter.should_snapshot("text")
+        snapshotter.submit(_snapshot(Path("."), 1))
+        assert not snapshotter.should_snapshot("text")
+
+
+class TestStateSnapshotter:
+    """Tests for the background writer."""
+
+    def test_background_writer_coalesces(self, tmp_path: Path) -> None:
+        """Test that pending snapshots are coalesced."""
+        written: list[int] = []
+        release = threading.Event()
+
+        def writer(snapshot: StateSnapshot) -> None:
+            release.wait(timeout=5)
+            written.append(len(snapshot.state["messages"]))
+
+        snapshotter = StateSnapshotter(
+            writer=writer, policy=SnapshotPolicy.every(1)
+        )
+        snapshotter.submit(_snapshot(tmp_path, 1))
+        # let the writer pick up the first one
+        time.sleep(0.05)
+        for count in range(2, 6):
+            snapshotter.submit(_snapshot(tmp_path, count))
+        release.set()
+        assert snapshotter.flush(timeout=5)
+        assert written[0] == 1
+        assert written[-1] == 5
+        assert len(written) < 5
+        assert snapshotter.stats["coalesced"] > 0
+        snapshotter.close(timeout=5)
+
+    def test_wait_flushes(self, tmp_path: Path) -> None:
+        """Test that a forced snapshot is written before returning."""
+        writer = Mock()
+        snapshotter = StateSnapshotter(
+            writer=writer, policy=SnapshotPolicy.every(1)
+        )
+        snapshotter.submit(_snapshot(tmp_path, 1), wait=True)
+        writer.assert_called_once()
+        assert snapshotter.stats == {
+            "written": 1,
+            "coalesced": 0,
+            "pending": 0,
+        }
+        snapshotter.close(timeout=5)
+        # after closing, snapshots are written inline
+        snapshotter.submit(_snapshot(tmp_path, 2))
+        assert writer.call_count == 2
+
+
+class _GroupChat:
+    """A group chat stub."""
+
+    def __init__(self) -> None:
+        self.messages: list[dict[str, Any]] = []
+
+
+_GroupChat.__name__ = "GroupChat"
+
+
+def _manager() -> Mock:
+    manager = Mock()
+    manager.name = "manager"
+    manager._name = "manager"
+    manager._groupchat = _GroupChat()
+    manager.context_variables = {"key": "value"}
+    agent = Mock()
+    agent._group_manager = manager
+    return agent
+
+
+class TestEventsMixinSnapshots:
+    """Tests for snapshotting while processing events."""
+
+    def teardown_method(self) -> None:
+        """Reset the snapshot policy."""
+        EventsMixin.set_snapshot_policy(None)
+
+    def test_process_event_with_policy(self, tmp_path: Path) -> None:
+        """Test that the policy limits the history entries."""
+        EventsMixin.set_send_function(Mock())
+        EventsMixin.set_snapshot_policy(SnapshotPolicy.every(2))
+        agent = _manager()
+        for idx in range(4):
+            agent._group_manager._groupchat.messages.append({"idx": idx})
+            EventsMixin.process_event(Mock(type="text"), [agent], tmp_path)
+        EventsMixin.flush_snapshots(timeout=5)
+        assert (tmp_path / "state.json").exists()
+        assert (tmp_path / "metadata.json").exists()
+        lines = (tmp_path / "history.jsonl").read_text().splitlines()
+        assert 1 <= len(lines) <= 2
+
+    async def test_a_process_event_with_policy(self, tmp_path: Path) -> None:
+        """Test the async path with a background writer."""
+        EventsMixin.set_send_function(Mock())
+        EventsMixin.set_snapshot_policy(
+            SnapshotPolicy.on_input_or_termination(background=True)
+        )
+        agent = _manager()
+        agent._group_manager._groupchat.messages.append({"idx": 0})
+        await EventsMixin.a_process_event(Mock(type="text"), [agent], tmp_path)
+        assert not (tmp_path / "state.json").exists()
+        await EventsMixin.a_process_event(
+            Mock(type="termination"), [agent], tmp_path
+        )
+        # forced snapshots are flushed before returning
+        assert (tmp_path / "state.json").exists()
+        lines = (tmp_path / "history.jsonl").read_text().splitlines()
+        assert len(lines) == 1
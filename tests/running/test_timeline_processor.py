@@ -281,6 +281,42 @@ class TestTimelineProcessor:
         assert isinstance(total_cost, float)
         assert total_cost > 0
 
+    def test_categorize_gap_activity(
+        self, processor_with_data: TimelineProcessor
+    ) -> None:
+        """Test categorize_gap_activity with the indexed data."""
+        prev = {"source_name": "agent1", "end_time": "2024-01-01 10:00:03"}
+        current = {"source_name": "agent2", "start_time": "2024-01-01 10:00:05"}
+        # a user message is received right before the session
+        result = processor_with_data.categorize_gap_activity(prev, current, 2.0)
+        assert result["type"] == "agent_transition"
+        assert "transfer_to_agent" in result["detail"]
+
+        # the first function call (in file order) in the gap wins
+        processor_with_data.functions_data = pd.DataFrame(
+            {
+                "function_name": ["search_tool", "transfer_to_agent"],
+                "timestamp": [
+                    "2024-01-01 10:00:04.800",
+                    "2024-01-01 10:00:04.200",
+                ],
+            }
+        )
+        result = processor_with_data.categorize_gap_activity(prev, current, 2.0)
+        assert result["type"] == "tool_call"
+        assert result["label"] == "🛠️ search tool"
+
+        # replacing the events data invalidates the cached index
+        processor_with_data.events_data = pd.DataFrame(
+            {
+                "event_name": ["received_message"],
+                "timestamp": ["2024-01-01 10:00:05.500"],
+                "json_state": ['{"message": {"role": "user"}}'],
+            }
+        )
+        result = processor_with_data.categorize_gap_activity(prev, current, 2.0)
+        assert result["type"] == "human_input_waiting"
+
     def test_process_timeline(
         self, processor_with_data: TimelineProcessor
     ) -> None:
@@ -0,0 +1,143 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc,no-self-use
+# pylint: disable=protected-access
+
+"""Tests for the non-blocking storage access."""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from waldiez.storage import FilesystemStorage, StorageManager
+from waldiez.storage.async_storage import ThreadedAsyncStorage
+from waldiez.storage.checkpoint import WaldiezCheckpoint
+from waldiez.storage.protocol import AsyncStorage
+
+STARTED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _state(count: int) -> dict[str, Any]:
+    """Get a state with some messages."""
+    return {
+        "messages": [{"content": f"msg{i}"} for i in range(count)],
+        "context_variables": {},
+    }
+
+
+class TestThreadedAsyncStorage:
+    """Tests for the ThreadedAsyncStorage class."""
+
+    @pytest.fixture
+    def storage(self, tmp_path: Path) -> ThreadedAsyncStorage:
+        """Create an async storage over a filesystem one."""
+        return ThreadedAsyncStorage(FilesystemStorage(tmp_path / "workspace"))
+
+    def test_is_async_storage(self, storage: ThreadedAsyncStorage) -> None:
+        """Test that it implements the AsyncStorage protocol."""
+        assert isinstance(storage, AsyncStorage)
+        assert storage.workspace_dir == storage.storage.workspace_dir
+
+    @pytest.mark.asyncio
+    async def test_save_and_get(self, storage: ThreadedAsyncStorage) -> None:
+        """Test saving and getting (preloaded) checkpoints."""
+        await storage.save_checkpoint(
+            "session", _state(1), metadata={"a": 1}, timestamp=STARTED
+        )
+        assert await storage.list_sessions() == ["session"]
+
+        info = await storage.get_checkpoint("session")
+        assert info is not None
+        # already loaded in the worker thread
+        assert info.checkpoint._state == _state(1)
+        assert info.checkpoint._metadata == {"a": 1}
+        assert await storage.get_checkpoint("other") is None
+
+    @pytest.mark.asyncio
+    async def test_list_and_delete(self, storage: ThreadedAsyncStorage) -> None:
+        """Test listing and deleting checkpoints."""
+        for index in range(3):
+            await storage.save_checkpoint(
+                "session",
+                _state(index),
+                timestamp=STARTED + timedelta(seconds=index),
+            )
+        assert len(await storage.list_checkpoints("session")) == 3
+
+        await storage.delete_checkpoint("session", STARTED)
+        assert await storage.cleanup_old_checkpoints("session", 1) == 1
+        remaining = await storage.list_checkpoints()
+        assert [info.timestamp for info in remaining] == [
+            STARTED + timedelta(seconds=2)
+        ]
+
+        await storage.delete_session("session")
+        assert not await storage.list_sessions()
+
+
+class TestStorageManagerAsync:
+    """Tests for the async methods of the storage manager."""
+
+    @pytest.fixture
+    def manager(self, tmp_path: Path) -> StorageManager:
+        """Create a storage manager."""
+        return StorageManager(workspace_dir=tmp_path / "workspace")
+
+    @pytest.mark.asyncio
+    async def test_history_keeps_order(self, manager: StorageManager) -> None:
+        """Test that the concurrently loaded histories keep their order."""
+        storage = manager.storage
+        for index in range(4):
+            storage.save_checkpoint(
+                "session",
+                _state(index),
+                timestamp=STARTED + timedelta(seconds=index),
+            )
+        for info in storage.list_checkpoints("session"):
+            info.checkpoint.history_journal_file.write_text(
+                WaldiezCheckpoint.dump_history_entry(
+                    {"timestamp": str(info.timestamp), "state": _state(1)}
+                ),
+                encoding="utf-8",
+            )
+        expected = manager.history("session")
+        loaded = await manager.a_history("session")
+        assert list(loaded.items()) == list(expected.items())
+        assert len(expected) == 4
+
+    @pytest.mark.asyncio
+    async def test_get_update_delete(self, manager: StorageManager) -> None:
+        """Test updating and deleting a checkpoint."""
+        manager.storage.save_checkpoint("session", _state(1), timestamp=STARTED)
+        await manager.a_update("session", STARTED, _state(2))
+
+        latest = await manager.a_get("session")
+        assert latest is not None
+        assert latest.checkpoint.state == _state(2)
+        assert await manager.a_get("session", STARTED) is not None
+
+        await manager.a_delete("session", STARTED)
+        assert await manager.a_get("session") is None
+
+    @pytest.mark.asyncio
+    async def test_finalize(
+        self, manager: StorageManager, tmp_path: Path
+    ) -> None:
+        """Test finalizing a run in the storage's threads."""
+        tmp_dir = tmp_path / "tmp"
+        tmp_dir.mkdir()
+        (tmp_dir / "results.json").write_text("{}")
+
+        checkpoint_path, link = await manager.a_finalize(
+            session_name="session",
+            output_file=tmp_path / "flow.waldiez",
+            tmp_dir=tmp_dir,
+            timestamp=STARTED,
+            link_root=tmp_path / "out",
+        )
+        assert (checkpoint_path / "results.json").is_file()
+        assert link.exists()
+        assert not tmp_dir.exists()
@@ -0,0 +1,164 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc,no-self-use
+
+"""Tests for the content-addressed store of checkpoint artifacts."""
+
+import os
+import stat
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from waldiez.storage import FilesystemStorage, StorageManager
+from waldiez.storage.blobs import MIN_BLOB_SIZE, BlobStore
+from waldiez.storage.utils import copy_results
+
+STARTED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+LARGE = b"x" * MIN_BLOB_SIZE
+
+
+class TestBlobStore:
+    """Tests for the BlobStore class."""
+
+    @pytest.fixture
+    def store(self, tmp_path: Path) -> BlobStore:
+        """Create an empty store."""
+        return BlobStore(tmp_path / "objects")
+
+    def test_identical_files_are_shared(
+        self, store: BlobStore, tmp_path: Path
+    ) -> None:
+        """Test that identical files link to the same object."""
+        first = tmp_path / "first.bin"
+        second = tmp_path / "second.bin"
+        first.write_bytes(LARGE)
+        second.write_bytes(LARGE)
+
+        digest = store.store(first, tmp_path / "a" / "first.bin")
+        assert digest is not None
+        assert store.store(second, tmp_path / "b" / "second.bin") == digest
+        assert store.object_path(digest).stat().st_nlink == 3
+        assert (tmp_path / "b" / "second.bin").read_bytes() == LARGE
+        # the sources are kept (copied, not moved)
+        assert first.exists()
+        assert second.exists()
+
+        store.remove(digest)
+        assert not store.object_path(digest).exists()
+        assert not store.object_path(digest).parent.exists()
+        assert (tmp_path / "a" / "first.bin").read_bytes() == LARGE
+
+    def test_small_and_mutable_files_are_copied(
+        self, store: BlobStore, tmp_path: Path
+    ) -> None:
+        """Test that small or rewritten-in-place files are not shared."""
+        small = tmp_path / "small.txt"
+        small.write_text("small")
+        state = tmp_path / "state.json"
+        state.write_bytes(LARGE)
+        (tmp_path / "out").mkdir()
+
+        assert store.store(small, tmp_path / "out" / "small.txt") is None
+        assert store.store(state, tmp_path / "out" / "state.json") is None
+        assert (tmp_path / "out" / "state.json").stat().st_nlink == 1
+        assert not store.root.exists()
+
+    def test_move(self, store: BlobStore, tmp_path: Path) -> None:
+        """Test moving files into the store."""
+        source = tmp_path / "data.bin"
+        source.write_bytes(LARGE)
+        destination = tmp_path / "out" / "data.bin"
+
+        digest = store.store(source, destination, move=True)
+        assert digest == BlobStore.hash_file(destination)
+        assert not source.exists()
+        if os.name != "nt":
+            mode = store.object_path(digest).stat().st_mode
+            assert not mode & stat.S_IWUSR
+
+    def test_copy_results(self, store: BlobStore, tmp_path: Path) -> None:
+        """Test copying a run's results through the store."""
+        temp_dir = tmp_path / "tmp"
+        (temp_dir / "nested").mkdir(parents=True)
+        (temp_dir / "top.bin").write_bytes(LARGE)
+        (temp_dir / "nested" / "inner.bin").write_bytes(LARGE)
+        (temp_dir / "small.txt").write_text("small")
+
+        blobs = copy_results(
+            temp_dir=temp_dir,
+            output_file=tmp_path / "flow.waldiez",
+            destination_dir=tmp_path / "dest",
+            blob_store=store,
+        )
+        digest = BlobStore.hash_file(temp_dir / "top.bin")
+        assert blobs == [(digest, MIN_BLOB_SIZE), (digest, MIN_BLOB_SIZE)]
+        assert (tmp_path / "dest" / "nested" / "inner.bin").is_file()
+        assert (tmp_path / "dest" / "small.txt").read_text() == "small"
+
+
+class TestFilesystemStorageBlobs:
+    """Tests for sharing the files of finalized checkpoints."""
+
+    @pytest.fixture
+    def manager(self, tmp_path: Path) -> StorageManager:
+        """Create a storage manager with a filesystem storage."""
+        return StorageManager(FilesystemStorage(tmp_path / "workspace"))
+
+    def _finalize(
+        self, manager: StorageManager, tmp_path: Path, index: int
+    ) -> Path:
+        """Finalize a run with one large (identical) result file."""
+        tmp_dir = tmp_path / f"tmp{index}"
+        tmp_dir.mkdir()
+        (tmp_dir / "results.bin").write_bytes(LARGE)
+        checkpoint_path, _ = manager.finalize(
+            session_name="session",
+            output_file=tmp_path / "flow.waldiez",
+            tmp_dir=tmp_dir,
+            timestamp=STARTED + timedelta(seconds=index),
+            link_root=tmp_path / "out",
+        )
+        assert not tmp_dir.exists()
+        return checkpoint_path
+
+    def test_runs_share_identical_results(
+        self, manager: StorageManager, tmp_path: Path
+    ) -> None:
+        """Test that identical results of two runs are stored once."""
+        storage = manager.storage
+        assert isinstance(storage, FilesystemStorage)
+        first = self._finalize(manager, tmp_path, 0)
+        second = self._finalize(manager, tmp_path, 1)
+        assert (first / "results.bin").samefile(second / "results.bin")
+
+        digest = BlobStore.hash_file(first / "results.bin")
+        object_path = storage.blob_store.object_path(digest)
+        assert storage.catalog.blob_refs(digest) == 2
+        assert storage.catalog.blobs_size() == (
+            MIN_BLOB_SIZE,
+            2 * MIN_BLOB_SIZE,
+        )
+
+        storage.delete_checkpoint("session", STARTED)
+        assert storage.catalog.blob_refs(digest) == 1
+        assert object_path.is_file()
+
+        assert storage.cleanup_old_checkpoints("session", keep_count=0) == 1
+        assert storage.catalog.blob_refs(digest) == 0
+        assert not object_path.exists()
+
+    def test_delete_session_collects_blobs(
+        self, manager: StorageManager, tmp_path: Path
+    ) -> None:
+        """Test that deleting a session removes its unused objects."""
+        storage = manager.storage
+        assert isinstance(storage, FilesystemStorage)
+        checkpoint = self._finalize(manager, tmp_path, 0)
+        digest = BlobStore.hash_file(checkpoint / "results.bin")
+
+        storage.delete_session("session")
+        assert not storage.blob_store.object_path(digest).exists()
+        assert storage.list_sessions() == []
@@ -0,0 +1,245 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc,protected-access
+# pylint: disable=no-self-use
+# pyright: reportPrivateUsage=false
+
+"""Tests for the checkpoints catalog."""
+
+import json
+import shutil
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from waldiez.storage import CheckpointCatalog, FilesystemStorage
+from waldiez.storage.catalog import CATALOG_FILE, CatalogEntry
+
+STARTED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class TestCheckpointCatalog:
+    """Tests for the CheckpointCatalog class."""
+
+    @pytest.fixture
+    def catalog(self, tmp_path: Path) -> CheckpointCatalog:
+        """Create an empty catalog."""
+        return CheckpointCatalog(tmp_path / CATALOG_FILE)
+
+    def test_created(self, tmp_path: Path) -> None:
+        """Test that a new database file is reported as created."""
+        path = tmp_path / CATALOG_FILE
+        assert CheckpointCatalog(path).created
+        assert not CheckpointCatalog(path).created
+
+    def test_checkpoints_and_latest(self, catalog: CheckpointCatalog) -> None:
+        """Test recording checkpoints and getting the latest one."""
+        for timestamp in (3, 1, 2):
+            catalog.add_checkpoint(CatalogEntry("s1", timestamp, size=10))
+        catalog.add_checkpoint(CatalogEntry("s2", 5))
+
+        assert [e.timestamp for e in catalog.checkpoints("s1")] == [3, 2, 1]
+        assert len(catalog.checkpoints()) == 4
+        latest = catalog.latest("s1")
+        assert latest is not None
+        assert latest.timestamp == 3
+        assert latest.size == 10
+        assert catalog.latest("missing") is None
+        assert catalog.sessions() == ["s2", "s1"]
+
+        catalog.remove_checkpoint("s1", 3)
+        latest = catalog.latest("s1")
+        assert latest is not None
+        assert latest.timestamp == 2
+
+        catalog.remove_session("s1")
+        assert not catalog.checkpoints("s1")
+        assert catalog.sessions() == ["s2"]
+
+    def test_find_by_metadata(self, catalog: CheckpointCatalog) -> None:
+        """Test finding checkpoints by their metadata fields."""
+        catalog.add_checkpoint(
+            CatalogEntry("s1", 1, metadata={"flow": "a", "ok": True})
+        )
+        catalog.add_checkpoint(
+            CatalogEntry("s1", 2, metadata={"flow": "b", "ok": True})
+        )
+        catalog.add_checkpoint(CatalogEntry("s2", 3, metadata={"flow": "a"}))
+
+        assert [e.timestamp for e in catalog.find({"flow": "a"})] == [3, 1]
+        assert [
+            e.timestamp for e in catalog.find({"flow": "a"}, session="s1")
+        ] == [1]
+        assert [
+            e.timestamp for e in catalog.find({"flow": "b", "ok": True})
+        ] == [2]
+        assert not catalog.find({"ok": False})
+        assert not catalog.find({"flow": ["a"]})
+
+        # updating a checkpoint replaces its fields
+        catalog.add_checkpoint(CatalogEntry("s1", 1, metadata={"flow": "c"}))
+        assert [e.timestamp for e in catalog.find({"flow": "a"})] == [3]
+        entry = catalog.find({"flow": "c"})[0]
+        assert entry.metadata == {"flow": "c"}
+
+    def test_links(self, catalog: CheckpointCatalog) -> None:
+        """Test recording and removing external links."""
+        catalog.add_link("/cp/1", "/out/b")
+        catalog.add_link("/cp/1", "/out/a")
+        catalog.add_link("/cp/1", "/out/b")
+        catalog.add_link("/cp/2", "/out/c")
+
+        assert catalog.links() == {
+            "/cp/1": ["/out/b", "/out/a"],
+            "/cp/2": ["/out/c"],
+        }
+        assert catalog.pop_links("/cp/1") == ["/out/b", "/out/a"]
+        assert catalog.pop_links("/cp/1") == []
+
+        catalog.replace_links({"/cp/3": ["/out/d"]})
+        assert catalog.links() == {"/cp/3": ["/out/d"]}
+
+
+class TestFilesystemStorageCatalog:
+    """Tests for keeping the catalog in sync with the workspace."""
+
+    @pytest.fixture
+    def storage(self, tmp_path: Path) -> FilesystemStorage:
+        """Create a FilesystemStorage instance for testing."""
+        return FilesystemStorage(tmp_path / "workspace")
+
+    def test_save_and_delete_update_the_catalog(
+        self, storage: FilesystemStorage
+    ) -> None:
+        """Test that saving and deleting checkpoints updates the catalog."""
+        for index in range(3):
+            storage.save_checkpoint(
+                "session",
+                {"index": index},
+                metadata={"index": index},
+                timestamp=STARTED + timedelta(seconds=index),
+            )
+        entries = storage.catalog.checkpoints("session")
+        assert len(entries) == 3
+        assert all(entry.size > 0 for entry in entries)
+        assert entries[0].metadata == {"index": 2}
+
+        storage.delete_checkpoint("session", STARTED + timedelta(seconds=2))
+        info = storage.get_checkpoint("session")
+        assert info is not None
+        assert info.timestamp == STARTED + timedelta(seconds=1)
+        assert len(storage.catalog.checkpoints("session")) == 2
+
+        storage.delete_session("session")
+        assert not storage.catalog.checkpoints()
+        assert storage.list_sessions() == []
+
+    def test_find_checkpoints(self, storage: FilesystemStorage) -> None:
+        """Test finding checkpoints by metadata."""
+        storage.save_checkpoint(
+            "session", {}, metadata={"flow": "a"}, timestamp=STARTED
+        )
+        storage.save_checkpoint(
+            "session",
+            {},
+            metadata={"flow": "b"},
+            timestamp=STARTED + timedelta(seconds=1),
+        )
+        found = storage.find_checkpoints({"flow": "a"}, session_name="session")
+        assert [info.timestamp for info in found] == [STARTED]
+        assert found[0].session_name == "session"
+
+    def test_existing_workspace_is_indexed(self, tmp_path: Path) -> None:
+        """Test that a workspace without a catalog is indexed on open."""
+        workspace = tmp_path / "workspace"
+        checkpoint_dir = workspace / "session" / "1761725646601000"
+        checkpoint_dir.mkdir(parents=True)
+        (checkpoint_dir / "state.json").write_text("{}")
+        (checkpoint_dir / "metadata.json").write_text('{"flow": "x"}')
+        (workspace / "session" / "not-a-checkpoint").mkdir()
+
+        storage = FilesystemStorage(workspace)
+        checkpoints = storage.list_checkpoints("session")
+        assert [c.path for c in checkpoints] == [checkpoint_dir]
+        assert storage.find_checkpoints({"flow": "x"})
+        assert storage.list_sessions() == ["session"]
+
+    def test_rebuild_catalog(self, storage: FilesystemStorage) -> None:
+        """Test rebuilding the catalog after out of band changes."""
+        kept = storage.save_checkpoint("session", {}, timestamp=STARTED)
+        removed = storage.save_checkpoint(
+            "session", {}, timestamp=STARTED + timedelta(seconds=1)
+        )
+        copied = kept.parent / "1761725646601000"
+        shutil.copytree(kept, copied)
+        shutil.rmtree(removed)
+
+        assert storage.rebuild_catalog() == 2
+        assert [c.path for c in storage.list_checkpoints("session")] == [
+            copied,
+            kept,
+        ]
+
+    def test_out_of_band_changes_are_detected(
+        self, storage: FilesystemStorage
+    ) -> None:
+        """Test that copied (or removed) checkpoints show up without rebuild."""
+        kept = storage.save_checkpoint("session", {}, timestamp=STARTED)
+        removed = storage.save_checkpoint(
+            "session", {}, timestamp=STARTED + timedelta(seconds=1)
+        )
+        assert len(storage.list_checkpoints()) == 2
+        copied = kept.parent / "1761725646601000"
+        shutil.copytree(kept, copied)
+        shutil.rmtree(removed)
+        other = storage.workspace_dir / "other" / kept.name
+        shutil.copytree(kept, other)
+
+        assert storage.list_sessions() == ["session", "other"]
+        assert [c.path for c in storage.list_checkpoints("session")] == [
+            copied,
+            kept,
+        ]
+        assert [c.path for c in storage.list_checkpoints()] == [
+            copied,
+            kept,
+            other,
+        ]
+        latest = storage.get_checkpoint("other")
+        assert latest is not None
+        assert latest.checkpoint.path == other
+
+        shutil.rmtree(other.parent)
+        assert storage.list_sessions() == ["session"]
+        assert len(storage.list_checkpoints()) == 2
+
+    def test_stale_latest_is_skipped(self, storage: FilesystemStorage) -> None:
+        """Test that a removed latest checkpoint is dropped from the catalog."""
+        storage.save_checkpoint("session", {}, timestamp=STARTED)
+        latest = storage.save_checkpoint(
+            "session", {}, timestamp=STARTED + timedelta(seconds=1)
+        )
+        shutil.rmtree(latest)
+
+        info = storage.get_checkpoint("session")
+        assert info is not None
+        assert info.timestamp == STARTED
+        assert len(storage.catalog.checkpoints("session")) == 1
+
+    def test_legacy_links_registry_is_migrated(self, tmp_path: Path) -> None:
+        """Test moving a legacy .links_registry.json into the catalog."""
+        workspace = tmp_path / "workspace"
+        workspace.mkdir()
+        legacy = workspace / ".links_registry.json"
+        legacy.write_text(
+            json.dumps({"/cp/1": ["/out/a", 1], "/cp/2": "invalid"})
+        )
+
+        storage = FilesystemStorage(workspace)
+        assert not legacy.exists()
+        assert storage._links_registry == {"/cp/1": ["/out/a"]}
+        assert FilesystemStorage(workspace).catalog.links() == {
+            "/cp/1": ["/out/a"]
+        }
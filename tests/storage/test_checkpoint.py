@@ -6,10 +6,30 @@
 
 """Tests for checkpoint data structures."""
 
+import json
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any
 
-from waldiez.storage.checkpoint import WaldiezCheckpoint, WaldiezCheckpointInfo
+from waldiez.storage.checkpoint import (
+    HistoryEncoder,
+    WaldiezCheckpoint,
+    WaldiezCheckpointInfo,
+)
+
+
+def _append_states(
+    checkpoint: WaldiezCheckpoint,
+    states: list[dict[str, object]],
+    keyframe_interval: int = 4,
+) -> None:
+    """Append states to a checkpoint's journal as deltas."""
+    encoder = HistoryEncoder(keyframe_interval=keyframe_interval)
+    journal = checkpoint.history_journal_file
+    for idx, state in enumerate(states):
+        line = encoder.encode(journal, {"timestamp": str(idx), "state": state})
+        with open(journal, "a", encoding="utf-8") as f:
+            f.write(line)
 
 
 class TestWaldiezCheckpoint:
@@ -76,6 +96,154 @@ class TestWaldiezCheckpoint:
         invalid = WaldiezCheckpoint.parse_timestamp("invalid")
         assert not invalid
 
+    def test_history_journal(self, tmp_path: Path) -> None:
+        """Test appending to and reading the history journal."""
+        checkpoint = WaldiezCheckpoint(
+            session_name="test_session",
+            timestamp=datetime.now(timezone.utc),
+            path=tmp_path,
+        )
+        assert not checkpoint.history()
+        for idx in range(3):
+            WaldiezCheckpoint.append_history_entry(
+                checkpoint.history_journal_file,
+                {"timestamp": str(idx), "state": {"messages": [idx]}},
+            )
+        lines = checkpoint.history_journal_file.read_text().splitlines()
+        assert len(lines) == 3
+        history = checkpoint.history()
+        assert [entry["state"]["messages"] for entry in history] == [
+            [0],
+            [1],
+            [2],
+        ]
+
+    def test_history_skips_torn_lines(self, tmp_path: Path) -> None:
+        """Test that a partially written journal line is skipped."""
+        checkpoint = WaldiezCheckpoint(
+            session_name="test_session",
+            timestamp=datetime.now(timezone.utc),
+            path=tmp_path,
+        )
+        WaldiezCheckpoint.append_history_entry(
+            checkpoint.history_journal_file,
+            {"timestamp": "1", "state": {"messages": []}},
+        )
+        with open(checkpoint.history_journal_file, "a", encoding="utf-8") as f:
+            f.write('{"timestamp": "2", "sta')
+        assert len(checkpoint.history()) == 1
+        # reading does not drop the (maybe still being written) line
+        lines = checkpoint.history_journal_file.read_text().splitlines()
+        assert len(lines) == 2
+        with open(checkpoint.history_journal_file, "a", encoding="utf-8") as f:
+            f.write('te": {"messages": ["a"]}}\n')
+        assert len(checkpoint.history()) == 2
+
+    def test_history_with_legacy_file(self, tmp_path: Path) -> None:
+        """Test reading and compacting a legacy history.json."""
+        checkpoint = WaldiezCheckpoint(
+            session_name="test_session",
+            timestamp=datetime.now(timezone.utc),
+            path=tmp_path,
+        )
+        legacy: dict[str, Any] = {
+            "history": [{"timestamp": "1", "state": {"messages": ["a"]}}],
+            "metadata": {},
+        }
+        checkpoint.history_file.write_text(json.dumps(legacy))
+        # legacy only: read without rewriting
+        assert len(checkpoint.history()) == 1
+        assert checkpoint.history_file.exists()
+
+        WaldiezCheckpoint.append_history_entry(
+            checkpoint.history_journal_file,
+            {"timestamp": "2", "state": {"messages": ["a", "b"]}},
+        )
+        history = checkpoint.history()
+        assert [entry["timestamp"] for entry in history] == ["1", "2"]
+        assert checkpoint.history_file.exists()
+        assert checkpoint.compact_history() == 2
+        assert not checkpoint.history_file.exists()
+        assert len(checkpoint.history()) == 2
+
+    def test_delta_history(self, tmp_path: Path) -> None:
+        """Test that history entries are stored as deltas with keyframes."""
+        checkpoint = WaldiezCheckpoint(
+            session_name="test_session",
+            timestamp=datetime.now(timezone.utc),
+            path=tmp_path,
+        )
+        states: list[dict[str, object]] = [
+            {
+                "messages": [{"content": str(i)} for i in range(idx + 1)],
+                "context_variables": {"step": idx, "even": idx % 2 == 0},
+            }
+            for idx in range(10)
+        ]
+        # not an append: stored as a full state
+        states[6] = {"messages": [], "context_variables": {"step": 6}}
+        states[9]["context_variables"] = {"step": 9}
+        _append_states(checkpoint, states)
+
+        stored = checkpoint.history(decode=False)
+        assert ["state" in entry for entry in stored] == [
+            True,  # first
+            False,
+            False,
+            False,
+            True,  # interval
+            False,
+            True,  # messages were removed
+            False,
+            False,
+            False,
+        ]
+        assert stored[1]["delta"] == {
+            "base": 1,
+            "messages": [{"content": "1"}],
+            "context_variables": {"step": 1, "even": False},
+        }
+        assert stored[9]["delta"]["removed"] == ["even"]
+        assert [entry["state"] for entry in checkpoint.history()] == states
+
+        for index in (9, 5, 3, -1):
+            checkpoint.load_state(index)
+            assert checkpoint.state == states[index]
+        checkpoint.load_state(10)
+        assert checkpoint.state == states[-1]
+
+    def test_delta_history_after_external_change(self, tmp_path: Path) -> None:
+        """Test that a full state follows lines written by others."""
+        checkpoint = WaldiezCheckpoint(
+            session_name="test_session",
+            timestamp=datetime.now(timezone.utc),
+            path=tmp_path,
+        )
+        encoder = HistoryEncoder()
+        journal = checkpoint.history_journal_file
+        state: dict[str, Any] = {"messages": [1], "context_variables": {}}
+        with open(journal, "a", encoding="utf-8") as f:
+            f.write(encoder.encode(journal, {"state": state}))
+        WaldiezCheckpoint.append_history_entry(
+            journal, {"state": {"messages": [], "context_variables": {}}}
+        )
+        state = {"messages": [1, 2], "context_variables": {}}
+        assert '"state"' in encoder.encode(journal, {"state": state})
+
+    def test_orphan_deltas_are_skipped(self, tmp_path: Path) -> None:
+        """Test that deltas without a previous full state are dropped."""
+        checkpoint = WaldiezCheckpoint(
+            session_name="test_session",
+            timestamp=datetime.now(timezone.utc),
+            path=tmp_path,
+        )
+        WaldiezCheckpoint.append_history_entry(
+            checkpoint.history_journal_file,
+            {"delta": {"base": 0, "messages": [1]}},
+        )
+        assert not checkpoint.history()
+        assert len(checkpoint.history(decode=False)) == 1
+
 
 class TestWaldiezCheckpointInfo:
     """Tests for WaldiezCheckpointInfo class."""
@@ -8,7 +8,7 @@
 """Tests for storage CLI module."""
 
 from collections.abc import Generator
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
@@ -19,6 +19,11 @@ from typer.testing import CliRunner
 
 from waldiez.storage.checkpoint import WaldiezCheckpoint
 from waldiez.storage.cli import app, handle_checkpoints
+from waldiez.storage.retention import (
+    CheckpointUsage,
+    RetentionPolicy,
+    RetentionReport,
+)
 
 
 class MockWaldiezCheckpointInfo:
@@ -302,6 +307,169 @@ class TestStorageCLI:
             session_name="test_session", keep_count=5
         )
 
+    def test_rebuild_catalog(
+        self,
+        runner: CliRunner,
+        mock_storage_manager: MagicMock,
+        mock_workspace: MagicMock,
+    ) -> None:
+        """Test rebuilding the checkpoints catalog."""
+        mock_instance = Mock()
+        mock_instance.rebuild_catalog.return_value = 3
+        mock_storage_manager.return_value = mock_instance
+
+        result = runner.invoke(
+            app, ["--workspace", str(mock_workspace), "--rebuild"]
+        )
+
+        assert result.exit_code == 0
+        assert "Indexed 3 checkpoint(s)." in result.output
+        mock_instance.rebuild_catalog.assert_called_once_with()
+
+    def test_compact(
+        self,
+        runner: CliRunner,
+        mock_storage_manager: MagicMock,
+        mock_workspace: MagicMock,
+    ) -> None:
+        """Test compacting the checkpoints."""
+        mock_instance = Mock()
+        mock_instance.compact.return_value = (300, 100)
+        mock_storage_manager.return_value = mock_instance
+
+        result = runner.invoke(
+            app,
+            [
+                "--workspace",
+                str(mock_workspace),
+                "--compact",
+                "--session",
+                "test_session",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "300 -> 100 bytes" in result.output
+        mock_instance.compact.assert_called_once_with(
+            "test_session", compression="gzip"
+        )
+
+    def test_compact_invalid_compression(
+        self,
+        runner: CliRunner,
+        mock_storage_manager: MagicMock,
+        mock_workspace: MagicMock,
+    ) -> None:
+        """Test compacting with an unknown compression."""
+        mock_instance = Mock()
+        mock_storage_manager.return_value = mock_instance
+
+        result = runner.invoke(
+            app,
+            [
+                "--workspace",
+                str(mock_workspace),
+                "--compact",
+                "--compression",
+                "rar",
+            ],
+        )
+
+        assert result.exit_code == 1
+        mock_instance.compact.assert_not_called()
+
+    def test_migrate(
+        self,
+        runner: CliRunner,
+        mock_storage_manager: MagicMock,
+        mock_workspace: MagicMock,
+    ) -> None:
+        """Test migrating the checkpoints into a SQLite database."""
+        mock_instance = Mock()
+        mock_instance.migrate.return_value = 2
+        mock_storage_manager.return_value = mock_instance
+
+        result = runner.invoke(
+            app, ["--workspace", str(mock_workspace), "--migrate"]
+        )
+
+        assert result.exit_code == 0
+        assert "Migrated 2 checkpoint(s)." in result.output
+        assert mock_storage_manager.call_args.kwargs["backend"] == "sqlite"
+        mock_instance.migrate.assert_called_once_with()
+
+    def test_invalid_backend(
+        self,
+        runner: CliRunner,
+        mock_storage_manager: MagicMock,
+        mock_workspace: MagicMock,
+    ) -> None:
+        """Test using an unknown storage backend."""
+        result = runner.invoke(
+            app,
+            ["--workspace", str(mock_workspace), "--backend", "s3", "--list"],
+        )
+
+        assert result.exit_code == 1
+        mock_storage_manager.assert_not_called()
+
+    def test_gc(
+        self,
+        runner: CliRunner,
+        mock_storage_manager: MagicMock,
+        mock_workspace: MagicMock,
+    ) -> None:
+        """Test enforcing a retention policy on all sessions."""
+        mock_instance = Mock()
+        mock_instance.apply_retention.return_value = RetentionReport(
+            expired=[CheckpointUsage("session", datetime.now(timezone.utc), 5)],
+            deleted=1,
+        )
+        mock_storage_manager.return_value = mock_instance
+
+        result = runner.invoke(
+            app,
+            [
+                "--workspace",
+                str(mock_workspace),
+                "--gc",
+                "--keep",
+                "3",
+                "--max-age",
+                "7d",
+                "--max-size",
+                "1MB",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Removed 1 checkpoint(s), about 5 bytes." in result.output
+        mock_instance.apply_retention.assert_called_once_with(
+            RetentionPolicy(
+                max_checkpoints=3,
+                max_age=timedelta(days=7),
+                max_total_bytes=1024**2,
+            ),
+            dry_run=False,
+        )
+
+    def test_gc_invalid(
+        self,
+        runner: CliRunner,
+        mock_storage_manager: MagicMock,
+        mock_workspace: MagicMock,
+    ) -> None:
+        """Test garbage collection without (or with invalid) limits."""
+        mock_instance = Mock()
+        mock_storage_manager.return_value = mock_instance
+
+        for extra in ([], ["--max-age", "soon"]):
+            result = runner.invoke(
+                app, ["--workspace", str(mock_workspace), "--gc", *extra]
+            )
+            assert result.exit_code == 1
+        mock_instance.apply_retention.assert_not_called()
+
     def test_cleanup_all_sessions(
         self,
         runner: CliRunner,
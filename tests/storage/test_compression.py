@@ -0,0 +1,147 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc,no-self-use
+
+"""Tests for the compression of checkpoint files."""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from waldiez.storage import FilesystemStorage, StorageManager
+from waldiez.storage.compression import (
+    COMPRESSION_ENV,
+    compress,
+    decompress,
+    detect_compression,
+    dump_json,
+    file_compression,
+    get_compression,
+    load_json,
+    recompress,
+)
+
+STARTED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+STATE: dict[str, Any] = {
+    "messages": [{"content": "hi"}] * 50,
+    "context_variables": {},
+}
+
+
+class TestCompression:
+    """Tests for the compression helpers."""
+
+    def test_get_compression(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test validating a compression (and its default)."""
+        monkeypatch.delenv(COMPRESSION_ENV, raising=False)
+        assert get_compression() == "none"
+        monkeypatch.setenv(COMPRESSION_ENV, "GZIP")
+        assert get_compression() == "gzip"
+        assert get_compression("none") == "none"
+        with pytest.raises(ValueError):
+            get_compression("rar")
+
+    def test_gzip_round_trip(self, tmp_path: Path) -> None:
+        """Test writing and reading a gzip compressed file."""
+        data = b'{"key": "value"}'
+        compressed = compress(data, "gzip")
+        assert detect_compression(compressed) == "gzip"
+        assert decompress(compressed) == data
+        assert decompress(data) == data
+
+        path = tmp_path / "state.json"
+        dump_json(path, STATE, "gzip")
+        assert file_compression(path) == "gzip"
+        assert load_json(path) == STATE
+
+    def test_zstd_round_trip(self, tmp_path: Path) -> None:
+        """Test writing and reading a zstd compressed file."""
+        pytest.importorskip("zstandard")
+        path = tmp_path / "state.json"
+        dump_json(path, STATE, "zstd")
+        assert file_compression(path) == "zstd"
+        assert load_json(path) == STATE
+
+    def test_recompress(self, tmp_path: Path) -> None:
+        """Test rewriting a plain file compressed and back."""
+        path = tmp_path / "state.json"
+        dump_json(path, STATE)
+        assert json.loads(path.read_text("utf-8")) == STATE
+
+        before, after = recompress(path, "gzip")
+        assert after < before
+        assert recompress(path, "gzip") == (after, after)
+        recompress(path, "none")
+        assert json.loads(path.read_text("utf-8")) == STATE
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    def test_corrupted_data(self, tmp_path: Path) -> None:
+        """Test that corrupted files are reported (and left) as invalid."""
+        corrupted = compress(json.dumps(STATE).encode("utf-8"), "gzip")[:20]
+        with pytest.raises(ValueError, match="Invalid gzip data"):
+            decompress(corrupted)
+
+        storage = FilesystemStorage(tmp_path / "workspace")
+        path = storage.save_checkpoint("session", STATE, timestamp=STARTED)
+        (path / "state.json").write_bytes(corrupted)
+        assert storage.compress_checkpoint(path, "none") == (0, 0)
+        assert (path / "state.json").read_bytes() == corrupted
+
+
+class TestCompressedCheckpoints:
+    """Tests for storing compressed checkpoints."""
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """Test saving compressed checkpoints and reading them back."""
+        storage = FilesystemStorage(tmp_path / "workspace", compression="gzip")
+        path = storage.save_checkpoint(
+            "session", STATE, metadata={"flow": "a"}, timestamp=STARTED
+        )
+        assert file_compression(path / "state.json") == "gzip"
+        assert file_compression(path / "metadata.json") == "gzip"
+
+        info = storage.get_checkpoint("session")
+        assert info is not None
+        assert info.checkpoint.state == STATE
+        assert info.checkpoint.metadata == {"flow": "a"}
+        assert storage.find_checkpoints({"flow": "a"})
+
+        exported = info.checkpoint.export_state(tmp_path / "resume")
+        assert json.loads(exported.read_text("utf-8")) == STATE
+
+    def test_compact(self, tmp_path: Path) -> None:
+        """Test compressing the existing (plain) checkpoints."""
+        manager = StorageManager(workspace_dir=tmp_path / "workspace")
+        path = manager.save("session", STATE)
+
+        before, after = manager.compact(compression="gzip")
+        assert after < before
+        assert file_compression(path / "state.json") == "gzip"
+        checkpoint = manager.get_latest_checkpoint("session")
+        assert checkpoint is not None
+        assert checkpoint.checkpoint.state == STATE
+
+        manager.compact("session", compression="none")
+        assert file_compression(path / "state.json") == "none"
+
+    def test_finalize_compresses_results(self, tmp_path: Path) -> None:
+        """Test that a run's (plain) state is compressed when finalized."""
+        manager = StorageManager(
+            workspace_dir=tmp_path / "workspace", compression="gzip"
+        )
+        tmp_dir = tmp_path / "tmp"
+        tmp_dir.mkdir()
+        dump_json(tmp_dir / "state.json", STATE)
+        checkpoint_path, _ = manager.finalize(
+            session_name="session",
+            output_file=tmp_path / "flow.waldiez",
+            tmp_dir=tmp_dir,
+            timestamp=STARTED,
+            link_root=tmp_path / "out",
+        )
+        assert file_compression(checkpoint_path / "state.json") == "gzip"
+        assert load_json(checkpoint_path / "state.json") == STATE
@@ -0,0 +1,230 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc,no-self-use
+# pylint: disable=protected-access
+
+"""Tests for the offset index of the checkpoints' history."""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from waldiez.storage import SqliteStorage, StorageManager
+from waldiez.storage.checkpoint import (
+    HISTORY_INDEX_FILE,
+    HistoryEncoder,
+    WaldiezCheckpoint,
+)
+from waldiez.storage.history_index import HistoryIndex
+
+STARTED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _state(count: int) -> dict[str, Any]:
+    """Get a state with some messages."""
+    return {
+        "messages": [{"content": f"msg{i}"} for i in range(count)],
+        "context_variables": {"count": count},
+    }
+
+
+def _append(checkpoint: WaldiezCheckpoint, count: int) -> None:
+    """Append some (delta encoded) entries to the checkpoint's journal."""
+    encoder = HistoryEncoder(keyframe_interval=3)
+    journal = checkpoint.history_journal_file
+    for index in range(count):
+        line = encoder.encode(
+            journal, {"timestamp": str(100 + index), "state": _state(index)}
+        )
+        with open(journal, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+@pytest.fixture(name="checkpoint")
+def checkpoint_fixture(tmp_path: Path) -> WaldiezCheckpoint:
+    """Create a checkpoint with an empty history."""
+    path = tmp_path / "checkpoint"
+    path.mkdir()
+    (path / "state.json").write_text("{}", encoding="utf-8")
+    return WaldiezCheckpoint(
+        session_name="session", timestamp=STARTED, path=path
+    )
+
+
+class TestHistoryIndex:
+    """Tests for the HistoryIndex class."""
+
+    def test_lazy_and_incremental(self, checkpoint: WaldiezCheckpoint) -> None:
+        """Test that the index is built on read and extended on growth."""
+        _append(checkpoint, 5)
+        index_file = checkpoint.path / HISTORY_INDEX_FILE
+        assert not index_file.exists()
+
+        index = HistoryIndex(checkpoint.history_journal_file, index_file)
+        records = index.records()
+        assert len(records) == 5
+        assert index_file.is_file()
+        # keyframes every 3 entries
+        assert [record.keyframe for record in records] == [0, 0, 0, 3, 3]
+        assert [record.timestamp for record in records] == list(range(100, 105))
+
+        with open(checkpoint.history_journal_file, "a", encoding="utf-8") as f:
+            f.write(
+                WaldiezCheckpoint.dump_history_entry(
+                    {"timestamp": "x", "state": _state(9)}
+                )
+            )
+            # a line still being written
+            f.write('{"timestamp": "1')
+        # a new instance starts from the saved index
+        index = HistoryIndex(checkpoint.history_journal_file, index_file)
+        records = index.records()
+        assert len(records) == 6
+        assert records[-1].keyframe == 5
+        assert records[-1].timestamp == -1
+        entries = index.read(records, 5, 6)
+        assert [entry["state"] for entry in entries] == [_state(9)]
+
+    def test_skips_unusable_lines(self, checkpoint: WaldiezCheckpoint) -> None:
+        """Test that broken lines and leading deltas are not indexed."""
+        lines: list[Any] = [
+            {"timestamp": "1", "delta": {"base": 0, "messages": []}},
+            {"timestamp": "2", "state": _state(1)},
+            "not json",
+            [1, 2],
+            {"timestamp": "3", "delta": {"base": 1, "messages": []}},
+        ]
+        with open(checkpoint.history_journal_file, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(
+                    line + "\n"
+                    if isinstance(line, str)
+                    else json.dumps(line) + "\n"
+                )
+        assert checkpoint.history_timestamps() == ["2", "3"]
+        assert checkpoint.history_length() == len(checkpoint.history())
+
+    def test_rebuilt_when_invalid(self, checkpoint: WaldiezCheckpoint) -> None:
+        """Test that a stale or broken index file is rebuilt."""
+        _append(checkpoint, 4)
+        index_file = checkpoint.path / HISTORY_INDEX_FILE
+        assert checkpoint.history_length() == 4
+
+        index_file.write_bytes(b"garbage")
+        assert len(HistoryIndex(checkpoint.history_journal_file, index_file))
+        # the journal was replaced by a shorter one
+        checkpoint.history_journal_file.write_text(
+            WaldiezCheckpoint.dump_history_entry(
+                {"timestamp": "1", "state": _state(1)}
+            ),
+            encoding="utf-8",
+        )
+        assert len(HistoryIndex(checkpoint.history_journal_file, index_file))
+        assert checkpoint.history_timestamps() == ["1"]
+
+
+class TestIndexedHistory:
+    """Tests for reading the history through its index."""
+
+    def test_page_matches_history(self, checkpoint: WaldiezCheckpoint) -> None:
+        """Test that pages and entries match the fully decoded history."""
+        _append(checkpoint, 8)
+        history = checkpoint.history()
+        assert checkpoint.history_length() == 8
+        assert checkpoint.history_timestamps() == [
+            str(100 + index) for index in range(8)
+        ]
+        for offset in range(9):
+            for limit in (None, 0, 1, 3):
+                stop = None if limit is None else offset + limit
+                assert (
+                    checkpoint.history_page(offset, limit)
+                    == history[offset:stop]
+                )
+        assert checkpoint.history_entry(-1) == history[-1]
+        assert checkpoint.history_entry(4) == history[4]
+        assert checkpoint.history_entry(8) is None
+
+    def test_load_state(self, checkpoint: WaldiezCheckpoint) -> None:
+        """Test loading a state from the history."""
+        _append(checkpoint, 5)
+        checkpoint.load_state(4)
+        assert checkpoint.state == _state(4)
+        checkpoint.load_state(-4)
+        assert checkpoint.state == _state(1)
+
+    def test_compaction_invalidates(
+        self, checkpoint: WaldiezCheckpoint
+    ) -> None:
+        """Test that rewriting the journal drops the index."""
+        _append(checkpoint, 3)
+        legacy = {"history": [{"timestamp": "1", "state": _state(7)}]}
+        assert checkpoint.history_length() == 3
+        checkpoint.history_file.write_text(json.dumps(legacy), "utf-8")
+
+        # read as is (without the index) until compacted
+        assert checkpoint.history_length() == 4
+        assert checkpoint.history_file.exists()
+        assert checkpoint.history_entry(0) == legacy["history"][0]
+
+        checkpoint.compact_history()
+        assert not checkpoint.history_file.exists()
+        assert checkpoint.history_length() == 4
+        assert checkpoint.history_entry(0) == legacy["history"][0]
+
+
+class TestStorageManagerHistoryPage:
+    """Tests for the paginated history of a session."""
+
+    @pytest.fixture(params=["filesystem", "sqlite"])
+    def manager(
+        self, request: pytest.FixtureRequest, tmp_path: Path
+    ) -> StorageManager:
+        """Create a storage manager with a checkpoint that has history."""
+        manager = StorageManager(
+            workspace_dir=tmp_path / "workspace", backend=request.param
+        )
+        path = manager.storage.save_checkpoint(
+            "session", _state(0), timestamp=STARTED
+        )
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "state.json").write_text("{}", encoding="utf-8")
+        _append(
+            WaldiezCheckpoint(
+                session_name="session", timestamp=STARTED, path=path
+            ),
+            6,
+        )
+        if isinstance(manager.storage, SqliteStorage):
+            manager.storage.ingest_checkpoint("session", STARTED)
+        return manager
+
+    def test_history_page(self, manager: StorageManager) -> None:
+        """Test getting a page of each checkpoint's history."""
+        checkpoint_id = WaldiezCheckpoint.format_timestamp(STARTED)
+        pages = manager.history_page("session", offset=2, limit=2)
+        page = pages[checkpoint_id]
+        assert page["total"] == 6
+        assert page["offset"] == 2
+        assert page["timestamps"] == [str(100 + i) for i in range(6)]
+        assert [entry["state"] for entry in page["history"]] == [
+            _state(2),
+            _state(3),
+        ]
+
+        summary = manager.history_page("session", checkpoint_id, limit=0)
+        assert summary[checkpoint_id]["total"] == 6
+        assert not summary[checkpoint_id]["history"]
+
+    @pytest.mark.asyncio
+    async def test_a_history_page(self, manager: StorageManager) -> None:
+        """Test getting a page without blocking."""
+        expected = manager.history_page("session", offset=4)
+        assert await manager.a_history_page("session", offset=4) == expected
+        latest = await manager.a_history_page("session", "latest", limit=1)
+        assert len(latest) == 1
+        assert not await manager.a_history_page("other")
@@ -0,0 +1,195 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc,no-self-use
+
+"""Tests for the retention of checkpoints."""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from waldiez.storage import FilesystemStorage, SqliteStorage, StorageManager
+from waldiez.storage.retention import (
+    CheckpointUsage,
+    RetentionPolicy,
+    checkpoint_usage,
+    parse_duration,
+    parse_size,
+    select_expired,
+)
+
+STARTED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _at(seconds: int) -> datetime:
+    """Get a timestamp after the start."""
+    return STARTED + timedelta(seconds=seconds)
+
+
+def _state(count: int) -> dict[str, Any]:
+    """Get a state with some messages."""
+    return {
+        "messages": [{"content": f"msg{i}"} for i in range(count)],
+        "context_variables": {},
+    }
+
+
+def _usage(session: str, seconds: int, size: int = 10) -> CheckpointUsage:
+    """Get a checkpoint's usage."""
+    return CheckpointUsage(session, _at(seconds), size)
+
+
+class TestParsing:
+    """Tests for parsing the policy's limits."""
+
+    def test_parse_duration(self) -> None:
+        """Test parsing durations."""
+        assert parse_duration("90") == timedelta(seconds=90)
+        assert parse_duration("12h") == timedelta(hours=12)
+        assert parse_duration("7d") == timedelta(days=7)
+        assert parse_duration("1.5 m") == timedelta(seconds=90)
+        assert parse_duration(30) == timedelta(seconds=30)
+        with pytest.raises(ValueError):
+            parse_duration("7y")
+        with pytest.raises(ValueError):
+            parse_duration("soon")
+
+    def test_parse_size(self) -> None:
+        """Test parsing sizes."""
+        assert parse_size("100") == 100
+        assert parse_size("2k") == 2048
+        assert parse_size("500MB") == 500 * 1024**2
+        assert parse_size(42) == 42
+        with pytest.raises(ValueError):
+            parse_size("10 apples")
+
+
+class TestSelectExpired:
+    """Tests for computing the checkpoints to remove."""
+
+    def test_disabled(self) -> None:
+        """Test that a policy without limits keeps everything."""
+        usage = [_usage("a", index) for index in range(3)]
+        assert not RetentionPolicy().enabled
+        assert not select_expired(usage, RetentionPolicy())
+
+    def test_max_checkpoints(self) -> None:
+        """Test limiting the checkpoints per session."""
+        usage = [_usage("a", index) for index in range(4)]
+        usage.append(_usage("b", 0))
+        expired = select_expired(usage, RetentionPolicy(max_checkpoints=2))
+        assert expired == [_usage("a", 0), _usage("a", 1)]
+
+    def test_max_age_keeps_latest(self) -> None:
+        """Test that old checkpoints expire, except for the latest."""
+        usage = [_usage("a", 0), _usage("a", 10), _usage("b", 5)]
+        policy = RetentionPolicy(max_age=timedelta(seconds=60))
+        expired = select_expired(usage, policy, now=_at(100))
+        assert expired == [_usage("a", 0)]
+
+        policy = RetentionPolicy(
+            max_age=timedelta(seconds=60), keep_latest=False
+        )
+        expired = select_expired(usage, policy, now=_at(100))
+        assert len(expired) == 3
+
+    def test_max_total_bytes(self) -> None:
+        """Test removing the workspace's oldest checkpoints to fit."""
+        usage = [
+            _usage("a", 0, 100),
+            _usage("a", 3, 100),
+            _usage("b", 1, 100),
+            _usage("b", 2, 100),
+        ]
+        policy = RetentionPolicy(max_total_bytes=250)
+        assert select_expired(usage, policy) == [
+            _usage("a", 0, 100),
+            _usage("b", 1, 100),
+        ]
+        # the latest of each session are kept even if they do not fit
+        policy = RetentionPolicy(max_total_bytes=10)
+        assert len(select_expired(usage, policy)) == 2
+
+    def test_combined(self) -> None:
+        """Test that the count limit is applied before the size limit."""
+        usage = [_usage("a", index, 100) for index in range(5)]
+        policy = RetentionPolicy(max_checkpoints=3, max_total_bytes=200)
+        expired = select_expired(usage, policy)
+        assert [item.timestamp for item in expired] == [_at(0), _at(1), _at(2)]
+
+
+class TestApplyRetention:
+    """Tests for enforcing a policy on storage."""
+
+    @pytest.fixture(params=["filesystem", "sqlite"])
+    def manager(
+        self, request: pytest.FixtureRequest, tmp_path: Path
+    ) -> StorageManager:
+        """Create a storage manager with some checkpoints."""
+        manager = StorageManager(
+            workspace_dir=tmp_path / "workspace", backend=request.param
+        )
+        for index in range(4):
+            manager.storage.save_checkpoint(
+                "first", _state(index), timestamp=_at(index)
+            )
+        manager.storage.save_checkpoint("second", _state(1), timestamp=_at(1))
+        return manager
+
+    def test_usage(self, manager: StorageManager) -> None:
+        """Test getting the checkpoints' sizes."""
+        usage = checkpoint_usage(manager.storage)
+        assert len(usage) == 5
+        assert all(item.size > 0 for item in usage)
+        assert isinstance(manager.storage, (FilesystemStorage, SqliteStorage))
+        assert len(manager.storage.checkpoint_sizes("second")) == 1
+
+    def test_dry_run(self, manager: StorageManager) -> None:
+        """Test reporting without deleting."""
+        report = manager.apply_retention(
+            RetentionPolicy(max_checkpoints=1), dry_run=True
+        )
+        assert len(report.expired) == 3
+        assert report.deleted == 0
+        assert report.freed_bytes > 0
+        assert len(manager.checkpoints()) == 5
+
+    def test_apply(self, manager: StorageManager) -> None:
+        """Test deleting the expired checkpoints in one batch."""
+        report = manager.apply_retention(RetentionPolicy(max_checkpoints=2))
+        assert report.deleted == 2
+        assert [info.timestamp for info in manager.checkpoints("first")] == [
+            _at(3),
+            _at(2),
+        ]
+        assert len(manager.checkpoints("second")) == 1
+
+    @pytest.mark.asyncio
+    async def test_a_apply(self, manager: StorageManager) -> None:
+        """Test enforcing a policy in the storage's threads."""
+        report = await manager.a_apply_retention(
+            RetentionPolicy(max_age=timedelta(seconds=1))
+        )
+        # only the latest of each session are left
+        assert report.deleted == 3
+        assert len(manager.checkpoints()) == 2
+
+
+def test_batch_delete_relinks_latest(tmp_path: Path) -> None:
+    """Test that a batch delete repoints the session's latest link."""
+    storage = FilesystemStorage(tmp_path / "workspace")
+    paths = [
+        storage.save_checkpoint("session", _state(index), timestamp=_at(index))
+        for index in range(4)
+    ]
+    latest = paths[0].parent / "latest"
+    assert latest.resolve() == paths[-1].resolve()
+
+    deleted = storage.delete_checkpoints_batch(
+        [("session", _at(index)) for index in (1, 3, 2)]
+    )
+    assert deleted == 3
+    assert latest.resolve() == paths[0].resolve()
@@ -0,0 +1,234 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc,no-self-use
+# pylint: disable=protected-access
+
+"""Tests for the journaled (crash safe) checkpoint saves."""
+
+import json
+import subprocess
+import sys
+import textwrap
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from waldiez.storage import FilesystemStorage, WaldiezCheckpoint, save_journal
+from waldiez.storage.save_journal import (
+    SAVES_DIR,
+    PendingSave,
+    SaveJournal,
+    restore,
+    tmp_name,
+)
+
+STARTED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _at(seconds: int) -> datetime:
+    """Get a timestamp after the start."""
+    return STARTED + timedelta(seconds=seconds)
+
+
+def _dead_pid() -> int:
+    """Get the pid of a process that has exited."""
+    with subprocess.Popen([sys.executable, "-c", "pass"]) as process:
+        process.wait()
+    return process.pid
+
+
+def _write_journal(workspace: Path, records: list[dict[str, object]]) -> Path:
+    """Write the journal of a (crashed) process."""
+    journal = workspace / SAVES_DIR / f"{_dead_pid()}-crashed.jsonl"
+    journal.parent.mkdir(parents=True, exist_ok=True)
+    journal.write_text(
+        "".join(json.dumps(record) + "\n" for record in records),
+        encoding="utf-8",
+    )
+    return journal
+
+
+def _begin(path: Path, save_id: str = "1") -> dict[str, object]:
+    """Get the journal record of a started save."""
+    return {
+        "op": "begin",
+        "id": save_id,
+        "path": str(path),
+        "names": ["state.json", "metadata.json"],
+    }
+
+
+class TestSaveJournal:
+    """Tests for the SaveJournal class."""
+
+    def test_save_is_atomic(self, tmp_path: Path) -> None:
+        """Test that a save leaves no temporary files or pending records."""
+        storage = FilesystemStorage(tmp_path / "workspace")
+        path = storage.save_checkpoint(
+            "session", {"count": 1}, {"tag": "a"}, timestamp=STARTED
+        )
+        assert sorted(item.name for item in path.iterdir()) == [
+            "metadata.json",
+            "state.json",
+        ]
+        journal = storage._saves.path
+        assert journal.is_file()
+        assert not journal.read_text(encoding="utf-8")
+        assert not SaveJournal.pending(journal)
+
+    def test_pending(self, tmp_path: Path) -> None:
+        """Test reading the uncommitted saves of a journal."""
+        journal = _write_journal(
+            tmp_path,
+            [
+                _begin(tmp_path / "a", "1"),
+                _begin(tmp_path / "b", "2"),
+                {"op": "commit", "id": "1"},
+                {"op": "begin", "id": "3", "path": "c", "names": "bad"},
+            ],
+        )
+        with open(journal, "a", encoding="utf-8") as f:
+            f.write('{"op": "begin", "id": "4", "pa')
+        pending = SaveJournal.pending(journal)
+        assert [save.id for save in pending] == ["2", "3"]
+        assert pending[0].directory == tmp_path / "b"
+        assert not pending[1].names
+
+    def test_restore(self, tmp_path: Path) -> None:
+        """Test completing and rolling back the files of a save."""
+        (tmp_path / tmp_name("state.json")).write_text("{}", "utf-8")
+        (tmp_path / tmp_name("metadata.json")).write_text('{"a', "utf-8")
+        save = PendingSave("1", tmp_path, ("state.json", "metadata.json"))
+        assert not restore(save)
+        assert (tmp_path / "state.json").is_file()
+        assert not list(tmp_path.glob("*.tmp"))
+
+        (tmp_path / "state.json").write_text('{"trunc', "utf-8")
+        assert not restore(PendingSave("2", tmp_path, ("state.json",)))
+        assert not (tmp_path / "state.json").exists()
+
+    def test_group_defers_flushes(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the saves of a transaction are flushed together."""
+        storage = FilesystemStorage(tmp_path / "workspace")
+        storage.save_checkpoint("session", {"count": 0}, timestamp=_at(0))
+        flushed: list[Path] = []
+        monkeypatch.setattr(save_journal, "fsync_path", flushed.append)
+
+        with storage.transaction():
+            for index in range(1, 4):
+                storage.save_checkpoint(
+                    "session", {"count": index}, timestamp=_at(index)
+                )
+                # visible before the transaction ends
+                latest = storage.get_checkpoint("session")
+                assert latest and latest.checkpoint.state["count"] == index
+            assert not flushed
+            assert storage._saves.grouped
+        # each file and directory once
+        assert len(flushed) == len(set(flushed)) == 7
+        assert not storage._saves.grouped
+        assert not storage._saves.path.read_text(encoding="utf-8")
+
+
+class TestRecovery:
+    """Tests for recovering interrupted saves."""
+
+    @pytest.fixture(name="storage")
+    def storage_fixture(self, tmp_path: Path) -> FilesystemStorage:
+        """Create a storage with a (complete) checkpoint."""
+        storage = FilesystemStorage(tmp_path / "workspace")
+        storage.save_checkpoint("session", {"count": 0}, timestamp=_at(0))
+        return storage
+
+    def _checkpoint_path(
+        self, storage: FilesystemStorage, seconds: int
+    ) -> Path:
+        """Get the path of a checkpoint."""
+        return storage._get_checkpoint_path("session", _at(seconds))
+
+    def test_completes_written_save(self, storage: FilesystemStorage) -> None:
+        """Test completing a save whose files were fully written."""
+        path = self._checkpoint_path(storage, 1)
+        path.mkdir()
+        (path / tmp_name("state.json")).write_text('{"count": 1}', "utf-8")
+        journal = _write_journal(storage.workspace_dir, [_begin(path)])
+
+        recovered = FilesystemStorage(storage.workspace_dir)
+        assert not journal.exists()
+        info = recovered.get_checkpoint("session")
+        assert info is not None
+        assert info.checkpoint.state == {"count": 1}
+        latest = storage.workspace_dir / "session" / "latest"
+        assert latest.resolve() == path.resolve()
+
+    def test_rolls_back_partial_save(self, storage: FilesystemStorage) -> None:
+        """Test removing a save that was interrupted while writing."""
+        path = self._checkpoint_path(storage, 1)
+        path.mkdir()
+        (path / tmp_name("state.json")).write_text('{"count": ', "utf-8")
+        latest = storage.workspace_dir / "session" / "latest"
+        latest.unlink()
+        latest.symlink_to(path, target_is_directory=True)
+        _write_journal(storage.workspace_dir, [_begin(path)])
+
+        assert storage.recover_saves() == 1
+        assert not path.exists()
+        assert len(storage.list_checkpoints("session")) == 1
+        assert latest.resolve() == self._checkpoint_path(storage, 0).resolve()
+
+    def test_skips_live_journals(self, storage: FilesystemStorage) -> None:
+        """Test that the journals of running processes are left alone."""
+        path = self._checkpoint_path(storage, 1)
+        path.mkdir()
+        (path / tmp_name("state.json")).write_text("{}", "utf-8")
+        journal = storage.workspace_dir / SAVES_DIR / "1-init.jsonl"
+        journal.write_text(json.dumps(_begin(path)) + "\n", "utf-8")
+
+        assert storage.recover_saves() == 0
+        assert journal.is_file()
+        assert (path / tmp_name("state.json")).is_file()
+
+    def test_killed_process(self, tmp_path: Path) -> None:
+        """Test recovering after a process is killed during a save."""
+        workspace = tmp_path / "workspace"
+        storage_dir = Path(save_journal.__file__).parent
+        # only the storage modules (not the whole package) are imported
+        script = textwrap.dedent(
+            f"""
+            import os
+            import sys
+            import types
+
+            for name, path in (
+                ("waldiez", {str(storage_dir.parent)!r}),
+                ("waldiez.storage", {str(storage_dir)!r}),
+            ):
+                sys.modules[name] = types.ModuleType(name)
+                sys.modules[name].__path__ = [path]
+            from waldiez.storage.filesystem_storage import FilesystemStorage
+
+            storage = FilesystemStorage({str(workspace)!r})
+            storage.save_checkpoint("session", {{"count": 0}})
+            # killed after writing the new state, before renaming it
+            os.replace = lambda *args: os._exit(9)
+            storage.save_checkpoint("session", {{"count": 1}})
+            """
+        )
+        result = subprocess.run(  # nosec B603
+            [sys.executable, "-c", script], check=False, timeout=300
+        )
+        assert result.returncode == 9
+
+        storage = FilesystemStorage(workspace)
+        assert not list((workspace / SAVES_DIR).iterdir())
+        checkpoints = storage.list_checkpoints("session")
+        assert len(checkpoints) == 2
+        assert not list(workspace.rglob("*.tmp"))
+        info = storage.get_checkpoint("session")
+        assert info is not None
+        assert info.checkpoint.state == {"count": 1}
+        assert isinstance(info.checkpoint, WaldiezCheckpoint)
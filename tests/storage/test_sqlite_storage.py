@@ -0,0 +1,298 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-param-doc,missing-return-doc,no-self-use
+# pylint: disable=missing-raises-doc
+
+"""Tests for the SQLite storage backend."""
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from waldiez.storage import (
+    FilesystemStorage,
+    SqliteStorage,
+    Storage,
+    StorageManager,
+)
+from waldiez.storage.checkpoint import WaldiezCheckpoint
+from waldiez.storage.compression import dump_json
+from waldiez.storage.sqlite_storage import SQLITE_FILE, SqliteCheckpoint
+from waldiez.storage.storage_manager import STORAGE_BACKEND_ENV, get_backend
+
+STARTED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _state(count: int) -> dict[str, Any]:
+    """Get a state with some messages."""
+    return {
+        "messages": [{"content": f"msg{i}"} for i in range(count)],
+        "context_variables": {"count": count},
+    }
+
+
+def _at(seconds: int) -> datetime:
+    """Get a timestamp after the start."""
+    return STARTED + timedelta(seconds=seconds)
+
+
+class TestSqliteStorage:
+    """Tests for the SqliteStorage class."""
+
+    @pytest.fixture
+    def storage(self, tmp_path: Path) -> SqliteStorage:
+        """Create a SQLite storage."""
+        return SqliteStorage(tmp_path / "workspace")
+
+    def test_is_storage(self, storage: SqliteStorage) -> None:
+        """Test that it implements the Storage protocol in a single file."""
+        assert isinstance(storage, Storage)
+        assert storage.path == storage.workspace_dir / SQLITE_FILE
+        assert storage.path.is_file()
+
+    def test_save_and_get(self, storage: SqliteStorage) -> None:
+        """Test saving, updating and getting checkpoints."""
+        path = storage.save_checkpoint(
+            "session", _state(1), metadata={"flow": "a"}, timestamp=_at(0)
+        )
+        storage.save_checkpoint("session", _state(2), timestamp=_at(1))
+        # only the database is written
+        assert not path.exists()
+
+        info = storage.get_checkpoint("session")
+        assert info is not None
+        assert info.timestamp == _at(1)
+        assert isinstance(info.checkpoint, SqliteCheckpoint)
+        assert info.checkpoint.state == _state(2)
+        assert info.checkpoint.metadata == {}
+
+        storage.save_checkpoint("session", _state(3), timestamp=_at(0))
+        first = storage.get_checkpoint("session", _at(0))
+        assert first is not None
+        assert first.checkpoint.state == _state(3)
+        # kept when updating only the state
+        assert first.checkpoint.metadata == {"flow": "a"}
+        assert first.path == path
+
+        with pytest.raises(FileNotFoundError):
+            storage.get_checkpoint("other")
+        with pytest.raises(FileNotFoundError):
+            storage.get_checkpoint("session", _at(5))
+
+    def test_list_and_delete(self, storage: SqliteStorage) -> None:
+        """Test listing and deleting checkpoints."""
+        for index in range(4):
+            storage.save_checkpoint(
+                "first", _state(index), timestamp=_at(index)
+            )
+        storage.save_checkpoint("second", _state(0), timestamp=_at(0))
+
+        assert storage.list_sessions() == ["second", "first"]
+        listed = storage.list_checkpoints("first")
+        assert [info.timestamp for info in listed] == [
+            _at(3),
+            _at(2),
+            _at(1),
+            _at(0),
+        ]
+        assert len(storage.list_checkpoints()) == 5
+
+        storage.delete_checkpoint("first", _at(3))
+        with pytest.raises(FileNotFoundError):
+            storage.delete_checkpoint("first", _at(3))
+        assert storage.cleanup_old_checkpoints("first", keep_count=1) == 2
+        assert [
+            info.timestamp for info in storage.list_checkpoints("first")
+        ] == [_at(2)]
+
+        storage.delete_session("first")
+        assert storage.list_sessions() == ["second"]
+
+    def test_transaction(self, storage: SqliteStorage) -> None:
+        """Test that a failing transaction is rolled back."""
+        with pytest.raises(RuntimeError):
+            with storage.transaction():
+                storage.save_checkpoint("session", _state(1), timestamp=_at(0))
+                raise RuntimeError("failed")
+        assert not storage.list_sessions()
+
+        with storage.transaction():
+            storage.save_checkpoint("session", _state(1), timestamp=_at(0))
+            storage.save_checkpoint("session", _state(2), timestamp=_at(1))
+        assert len(storage.list_checkpoints("session")) == 2
+
+    def test_ingest_and_history(self, storage: SqliteStorage) -> None:
+        """Test moving a run's files into the database."""
+        path = storage.save_checkpoint("session", {}, timestamp=_at(0))
+        path.mkdir(parents=True)
+        dump_json(path / "state.json", _state(2))
+        (path / "results.json").write_text("{}", encoding="utf-8")
+        with open(path / "history.jsonl", "w", encoding="utf-8") as f:
+            for index in range(3):
+                f.write(
+                    WaldiezCheckpoint.dump_history_entry(
+                        {"timestamp": str(index), "state": _state(index)}
+                    )
+                )
+
+        storage.ingest_checkpoint("session", _at(0))
+        assert sorted(item.name for item in path.iterdir()) == ["results.json"]
+
+        info = storage.get_checkpoint("session")
+        assert info is not None
+        assert info.checkpoint.state == _state(2)
+        history = info.checkpoint.history()
+        assert [entry["state"] for entry in history] == [
+            _state(0),
+            _state(1),
+            _state(2),
+        ]
+
+        checkpoint = storage.load_checkpoint(info, history_index=1)
+        assert checkpoint.state == _state(1)
+        assert checkpoint.export_state(path / "resume").is_file()
+
+    def test_links(self, storage: SqliteStorage, tmp_path: Path) -> None:
+        """Test linking to a checkpoint and removing its links."""
+        storage.save_checkpoint("session", _state(1), timestamp=_at(0))
+        out = tmp_path / "out"
+        out.mkdir()
+        storage.link_checkpoint(out, "session")
+        link = out / WaldiezCheckpoint.format_timestamp(_at(0))
+        assert link.is_symlink()
+        assert not storage.verify_links()
+
+        storage.delete_checkpoint("session", _at(0))
+        assert not link.exists()
+        assert not link.is_symlink()
+        assert storage.compact_registry() == 0
+
+    def test_compact(self, storage: SqliteStorage) -> None:
+        """Test compressing the stored blobs."""
+        storage.save_checkpoint("session", _state(100), timestamp=_at(0))
+        before, after = storage.compact(compression="gzip")
+        assert after < before
+        info = storage.get_checkpoint("session")
+        assert info is not None
+        assert info.checkpoint.state == _state(100)
+
+
+class TestMigration:
+    """Tests for migrating filesystem checkpoints."""
+
+    def _filesystem(self, workspace: Path) -> FilesystemStorage:
+        """Create a filesystem storage with two checkpoints."""
+        storage = FilesystemStorage(workspace)
+        for index in range(2):
+            path = storage.save_checkpoint(
+                "session",
+                _state(index),
+                metadata={"index": index},
+                timestamp=_at(index),
+            )
+            (path / "results.json").write_text("{}", encoding="utf-8")
+        return storage
+
+    def test_migrate_in_place(self, tmp_path: Path) -> None:
+        """Test migrating the checkpoints of the same workspace."""
+        workspace = tmp_path / "workspace"
+        filesystem = self._filesystem(workspace)
+        manager = StorageManager(workspace_dir=workspace, backend="sqlite")
+
+        assert manager.migrate() == 2
+        assert manager.migrate() == 0
+        assert not filesystem.list_checkpoints()
+        info = manager.get_latest_checkpoint("session")
+        assert info is not None
+        assert info.checkpoint.state == _state(1)
+        assert info.checkpoint.metadata == {"index": 1}
+        assert not (info.path / "state.json").exists()
+        assert (info.path / "results.json").is_file()
+
+    def test_migrate_from_other_workspace(self, tmp_path: Path) -> None:
+        """Test importing the checkpoints of another workspace."""
+        source = tmp_path / "source"
+        filesystem = self._filesystem(source)
+        storage = SqliteStorage(tmp_path / "target")
+
+        assert storage.migrate_from(source) == 2
+        # the source is left as is
+        assert len(filesystem.list_checkpoints()) == 2
+        info = storage.get_checkpoint("session", _at(0))
+        assert info is not None
+        assert info.checkpoint.state == _state(0)
+        assert (info.path / "results.json").is_file()
+        assert not (info.path / "state.json").exists()
+
+    @pytest.mark.parametrize(
+        "session_name", ["My Flow (v2)!", "flow..name", "x" * 128, "x" * 129]
+    )
+    def test_session_names_match_filesystem(
+        self, tmp_path: Path, session_name: str
+    ) -> None:
+        """Test that both backends store a session under the same name."""
+        filesystem = FilesystemStorage(tmp_path / "fs")
+        storage = SqliteStorage(tmp_path / "db")
+        if len(session_name) > 128:
+            with pytest.raises(ValueError):
+                filesystem.save_checkpoint(session_name, {})
+            with pytest.raises(ValueError):
+                storage.save_checkpoint(session_name, {})
+            return
+        fs_path = filesystem.save_checkpoint(session_name, {}, timestamp=_at(0))
+        db_path = storage.save_checkpoint(session_name, {}, timestamp=_at(0))
+        assert fs_path.relative_to(tmp_path / "fs") == db_path.relative_to(
+            tmp_path / "db"
+        )
+        migrated = SqliteStorage(tmp_path / "migrated")
+        assert migrated.migrate_from(filesystem) == 1
+        assert migrated.list_sessions() == storage.list_sessions()
+        assert storage.list_sessions() == filesystem.list_sessions()
+
+
+class TestStorageManagerBackend:
+    """Tests for selecting the SQLite backend."""
+
+    def test_get_backend(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        """Test validating a backend (and its default)."""
+        monkeypatch.delenv(STORAGE_BACKEND_ENV, raising=False)
+        assert get_backend() == "filesystem"
+        monkeypatch.setenv(STORAGE_BACKEND_ENV, "SQLite")
+        assert get_backend() == "sqlite"
+        manager = StorageManager(workspace_dir=tmp_path / "workspace")
+        assert isinstance(manager.storage, SqliteStorage)
+        with pytest.raises(ValueError):
+            get_backend("s3")
+
+    def test_finalize(self, tmp_path: Path) -> None:
+        """Test that a finalized run's state is stored in the database."""
+        manager = StorageManager(
+            workspace_dir=tmp_path / "workspace", backend="sqlite"
+        )
+        tmp_dir = tmp_path / "tmp"
+        tmp_dir.mkdir()
+        dump_json(tmp_dir / "state.json", _state(2))
+        (tmp_dir / "results.json").write_text(
+            json.dumps({"results": []}), encoding="utf-8"
+        )
+
+        checkpoint_path, link = manager.finalize(
+            session_name="session",
+            output_file=tmp_path / "flow.waldiez",
+            tmp_dir=tmp_dir,
+            metadata={"flow": "a"},
+            timestamp=STARTED,
+            link_root=tmp_path / "out",
+        )
+        assert not (checkpoint_path / "state.json").exists()
+        assert (link / "results.json").is_file()
+        info = manager.get_latest_checkpoint("session")
+        assert info is not None
+        assert info.checkpoint.state == _state(2)
+        assert info.checkpoint.metadata == {"flow": "a"}
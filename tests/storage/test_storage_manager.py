@@ -7,7 +7,10 @@
 """Tests for storage manager."""
 
 import json
+import os
 import shutil
+import sqlite3
+import time
 from collections.abc import Generator
 from datetime import datetime, timezone
 from pathlib import Path
@@ -16,6 +19,8 @@ from unittest.mock import Mock, patch
 import pytest
 
 from waldiez.storage import FilesystemStorage, Storage, StorageManager
+from waldiez.storage.retention import RetentionPolicy
+from waldiez.storage.storage_manager import TMP_DIR, TMP_OWNER_FILE
 
 
 class TestStorageManager:
@@ -35,6 +40,22 @@ class TestStorageManager:
         assert isinstance(manager.storage, FilesystemStorage)
         assert manager.workspace_dir == (tmp_path / "workspace").resolve()
 
+    @pytest.mark.parametrize("backend", ["filesystem", "sqlite"])
+    def test_close(self, tmp_path: Path, backend: str) -> None:
+        """Test closing the storage backend the manager created."""
+        with StorageManager(
+            workspace_dir=tmp_path / "workspace", backend=backend
+        ) as manager:
+            manager.save("session", {"a": 1})
+        with pytest.raises(sqlite3.ProgrammingError):
+            manager.sessions()
+
+        storage = FilesystemStorage(tmp_path / "other")
+        with StorageManager(storage=storage) as manager:
+            manager.save("session", {"a": 1})
+        # not created by the manager: left open
+        assert storage.list_sessions() == ["session"]
+
     def test_init_custom_storage(self, tmp_path: Path) -> None:
         """Test initialization with custom storage."""
         mock_storage = Mock(spec=Storage)
@@ -323,6 +344,64 @@ class TestStorageManager:
         # Verify tmp_dir was not removed
         assert tmp_dir.exists()
 
+    def test_finalize_moves_workspace_tmp(
+        self, manager: StorageManager, tmp_path: Path
+    ) -> None:
+        """Test that a run's artifacts in the workspace are not copied."""
+        tmp_dir = manager.make_tmp_dir()
+        assert tmp_dir.parent == manager.workspace_dir / TMP_DIR
+        (tmp_dir / "logs").mkdir()
+        (tmp_dir / "logs" / "events.csv").write_text("a,b")
+        inode = (tmp_dir / "logs" / "events.csv").stat().st_ino
+
+        checkpoint_path, _ = manager.finalize(
+            session_name="test_run",
+            output_file=tmp_path / "script.py",
+            tmp_dir=tmp_dir,
+            link_root=tmp_path / "out",
+        )
+
+        moved = checkpoint_path / "logs" / "events.csv"
+        assert moved.stat().st_ino == inode
+        assert not (checkpoint_path / TMP_OWNER_FILE).exists()
+        assert not tmp_dir.exists()
+        assert manager.sessions() == ["test_run"]
+
+    def test_clean_tmp_dirs(self, manager: StorageManager) -> None:
+        """Test removing the stale temporary directories of runs."""
+        assert manager.clean_tmp_dirs() == 0
+        stale = manager.make_tmp_dir()
+        (stale / "flow.py").write_text("print('hi')")
+        running = manager.make_tmp_dir()
+        (running / "logs").mkdir()
+        (running / "logs" / "events.csv").write_text("a,b")
+        other = manager.workspace_dir / TMP_DIR / "other"
+        other.mkdir()
+        day_ago = time.time() - 2 * 86400
+        for path in (*stale.iterdir(), stale, running, other):
+            os.utime(path, (day_ago, day_ago))
+
+        # the runs' process (this one) is alive
+        assert (stale / TMP_OWNER_FILE).read_text() == str(os.getpid())
+        assert manager.clean_tmp_dirs(max_age=-1) == 0
+        assert stale.exists()
+
+        with patch(
+            "waldiez.storage.storage_manager.psutil.pid_exists",
+            return_value=False,
+        ):
+            assert manager.clean_tmp_dirs() == 1
+            assert not stale.exists()
+            # a file in the tree changed recently
+            assert running.exists()
+            assert other.exists()
+
+            manager.apply_retention(RetentionPolicy(max_checkpoints=1))
+            assert running.exists()
+            manager.apply_retention(RetentionPolicy(max_checkpoints=1), True)
+            assert manager.clean_tmp_dirs(max_age=-1) == 1
+            assert not running.exists()
+
     def test_finalize_custom_link_root(
         self, manager: StorageManager, tmp_path: Path
     ) -> None:
@@ -8,6 +8,7 @@
 """Tests for storage utility functions."""
 
 import builtins
+import errno
 import os
 import platform
 import sys
@@ -21,6 +22,7 @@ from waldiez.storage.utils import (
     get_root_dir,
     is_frozen,
     is_installed_package,
+    move_path,
     safe_name,
     symlink,
 )
@@ -490,6 +492,49 @@ class TestCopyResults:
             # Clean up permissions
             destination_dir.chmod(0o755)
 
+    def test_copy_results_move(self, tmp_path: Path) -> None:
+        """Test that moving the results renames them."""
+        temp_dir = tmp_path / "temp"
+        (temp_dir / "logs").mkdir(parents=True)
+        (temp_dir / "logs" / "events.csv").write_text("a,b")
+        (temp_dir / "results.json").write_text("{}")
+        inodes = {
+            name: (temp_dir / name).stat().st_ino
+            for name in ("logs", "results.json")
+        }
+        destination_dir = tmp_path / "dest"
+
+        copy_results(
+            temp_dir, tmp_path / "output.py", destination_dir, move=True
+        )
+
+        for name, inode in inodes.items():
+            assert (destination_dir / name).stat().st_ino == inode
+            assert not (temp_dir / name).exists()
+        assert (destination_dir / "logs" / "events.csv").read_text() == "a,b"
+
+    def test_move_path_across_devices(self, tmp_path: Path) -> None:
+        """Test that moving across devices falls back to copying."""
+        source = tmp_path / "source"
+        source.mkdir()
+        (source / "file.txt").write_text("content")
+        destination = tmp_path / "destination"
+
+        with patch(
+            "waldiez.storage.utils.os.replace",
+            side_effect=OSError(errno.EXDEV, "cross-device link"),
+        ):
+            move_path(source, destination)
+        assert not source.exists()
+        assert (destination / "file.txt").read_text() == "content"
+
+        with patch(
+            "waldiez.storage.utils.os.replace",
+            side_effect=OSError(errno.EACCES, "denied"),
+        ):
+            with pytest.raises(OSError):
+                move_path(destination, tmp_path / "back")
+
     def test_copy_results_merge_safe(self, tmp_path: Path) -> None:
         """Test that copy_results is merge-safe (dirs_exist_ok)."""
         # Setup
@@ -21,9 +21,11 @@ from waldiez.storage import (
     WaldiezCheckpoint,
     WaldiezCheckpointInfo,
 )
+from waldiez.storage.storage_manager import DEFAULT_HISTORY_PAGE_SIZE
 from waldiez.ws.checkpoints_handler import (
     CheckpointsHandler,
     _get_checkpoint_info,
+    _get_page,
     _get_payload_dict,
     _update_checkpoint,
 )
@@ -57,7 +59,7 @@ class TestCheckpointsHandler:
         flow_name = "test_flow"
         mock_checkpoints = {"checkpoint1": [{"data": "test"}]}
 
-        self.storage_manager.history.return_value = mock_checkpoints
+        self.storage_manager.a_history.return_value = mock_checkpoints
 
         request = GetCheckpointsRequest(
             request_id="req_123",
@@ -72,7 +74,7 @@ class TestCheckpointsHandler:
         assert response["request_id"] == "req_123"
         assert response["success"] is True
 
-        self.storage_manager.history.assert_called_once_with(flow_name)
+        self.storage_manager.a_history.assert_awaited_once_with(flow_name)
 
     @pytest.mark.asyncio
     async def test_handle_get_checkpoints_with_dict_payload_flow_name(
@@ -82,7 +84,7 @@ class TestCheckpointsHandler:
         flow_name = "test_flow"
         mock_checkpoints = {"checkpoint1": [{"data": "test"}]}
 
-        self.storage_manager.history.return_value = mock_checkpoints
+        self.storage_manager.a_history.return_value = mock_checkpoints
 
         request = GetCheckpointsRequest(
             request_id="req_123",
@@ -93,7 +95,7 @@ class TestCheckpointsHandler:
 
         assert response["type"] == "get_checkpoints"
         assert response["checkpoints"] == mock_checkpoints
-        self.storage_manager.history.assert_called_once_with(flow_name)
+        self.storage_manager.a_history.assert_awaited_once_with(flow_name)
 
     @pytest.mark.asyncio
     async def test_handle_get_checkpoints_with_dict_payload_flow_name_camelcase(
@@ -103,7 +105,7 @@ class TestCheckpointsHandler:
         flow_name = "test_flow"
         mock_checkpoints = {"checkpoint1": [{"data": "test"}]}
 
-        self.storage_manager.history.return_value = mock_checkpoints
+        self.storage_manager.a_history.return_value = mock_checkpoints
 
         request = GetCheckpointsRequest(
             request_id="req_123",
@@ -114,7 +116,48 @@ class TestCheckpointsHandler:
 
         assert response["type"] == "get_checkpoints"
         assert response["checkpoints"] == mock_checkpoints
-        self.storage_manager.history.assert_called_once_with(flow_name)
+        self.storage_manager.a_history.assert_awaited_once_with(flow_name)
+
+    @pytest.mark.asyncio
+    async def test_handle_get_checkpoints_paginated(self) -> None:
+        """Test getting a page of the checkpoints' history."""
+        mock_pages: dict[str, dict[str, Any]] = {
+            "1": {"total": 3, "offset": 1, "timestamps": [], "history": []}
+        }
+        self.storage_manager.a_history_page.return_value = mock_pages
+
+        request = GetCheckpointsRequest(
+            request_id="req_123",
+            payload={
+                "flow_name": "test_flow",
+                "checkpoint": "1",
+                "offset": 1,
+                "limit": "2",
+            },
+        )
+        response = await self.handler.handle_get_checkpoints(request)
+
+        assert response["checkpoints"] == mock_pages
+        self.storage_manager.a_history.assert_not_awaited()
+        self.storage_manager.a_history_page.assert_awaited_once_with(
+            "test_flow", checkpoint_name="1", offset=1, limit=2
+        )
+
+    def test_get_page(self) -> None:
+        """Test getting the pagination of a request."""
+        assert _get_page("test_flow") is None
+        assert _get_page({"flow_name": "test_flow"}) is None
+        assert _get_page({"limit": 0}) == (None, 0, 0)
+        assert _get_page({"offset": -3, "checkpoint": "latest"}) == (
+            "latest",
+            0,
+            DEFAULT_HISTORY_PAGE_SIZE,
+        )
+        assert _get_page({"offset": "x"}) == (
+            None,
+            0,
+            DEFAULT_HISTORY_PAGE_SIZE,
+        )
 
     @pytest.mark.asyncio
     async def test_handle_get_checkpoints_empty_flow_name(self) -> None:
@@ -169,7 +212,7 @@ class TestCheckpointsHandler:
         }
 
         # Setup storage manager mocks
-        self.storage_manager.get.return_value = mock_checkpoint_info
+        self.storage_manager.a_get.return_value = mock_checkpoint_info
 
         payload = {
             "flow_name": flow_name,
@@ -253,7 +296,7 @@ class TestCheckpointsHandler:
         mock_checkpoint_info.timestamp = timestamp
         mock_checkpoint_info.checkpoint = mock_checkpoint
 
-        self.storage_manager.get.return_value = mock_checkpoint_info
+        self.storage_manager.a_get.return_value = mock_checkpoint_info
 
         payload = {
             "flow_name": "test_flow",
@@ -282,7 +325,7 @@ class TestCheckpointsHandler:
         mock_checkpoint_info.timestamp = timestamp
         mock_checkpoint_info.checkpoint = mock_checkpoint
 
-        self.storage_manager.get.return_value = mock_checkpoint_info
+        self.storage_manager.a_get.return_value = mock_checkpoint_info
         mock_checkpoint_info.to_dict.return_value = {
             "id": checkpoint_id,
             "state": {"messages": ["msg1", "msg2"], "context_variables": {}},
@@ -323,11 +366,7 @@ class TestCheckpointsHandler:
         mock_checkpoint_info.timestamp = timestamp
         mock_checkpoint_info.checkpoint = mock_checkpoint
 
-        # Mock both get_latest_checkpoint and get to return the mock
-        self.storage_manager.get_latest_checkpoint.return_value = (
-            mock_checkpoint_info
-        )
-        self.storage_manager.get.return_value = mock_checkpoint_info
+        self.storage_manager.a_get.return_value = mock_checkpoint_info
         mock_checkpoint_info.to_dict.return_value = {
             "id": checkpoint_id,
             "state": {"messages": ["msg1", "msg2"], "context_variables": {}},
@@ -351,9 +390,7 @@ class TestCheckpointsHandler:
 
         assert response["type"] == "set_checkpoint"
         assert response["success"] is True
-        self.storage_manager.get_latest_checkpoint.assert_called_once_with(
-            flow_name
-        )
+        self.storage_manager.a_get.assert_any_await(flow_name)
 
     @pytest.mark.asyncio
     async def test_handle_save_checkpoint_checkpoint_not_found(self) -> None:
@@ -362,7 +399,7 @@ class TestCheckpointsHandler:
         checkpoint_id = WaldiezCheckpoint.format_timestamp(timestamp)
 
         # Storage manager returns None
-        self.storage_manager.get.return_value = None
+        self.storage_manager.a_get.return_value = None
 
         payload = {
             "flow_name": "test_flow",
@@ -400,7 +437,7 @@ class TestCheckpointsHandler:
         mock_checkpoint_info.timestamp = timestamp
         mock_checkpoint_info.checkpoint = mock_checkpoint
 
-        self.storage_manager.get.return_value = mock_checkpoint_info
+        self.storage_manager.a_get.return_value = mock_checkpoint_info
         mock_checkpoint_info.to_dict.return_value = {
             "id": checkpoint_id,
             "state": {"messages": ["msg1", "msg2"], "context_variables": {}},
@@ -437,7 +474,7 @@ class TestCheckpointsHandler:
         mock_checkpoint_info.id = checkpoint_id
         mock_checkpoint_info.checkpoint = mock_checkpoint
 
-        self.storage_manager.get.return_value = mock_checkpoint_info
+        self.storage_manager.a_get.return_value = mock_checkpoint_info
 
         payload = {
             "flow_name": flow_name,
@@ -456,7 +493,7 @@ class TestCheckpointsHandler:
         assert response["checkpoint"] == checkpoint_id
         assert response["payload"] == checkpoint_id
 
-        self.storage_manager.delete.assert_called_once_with(
+        self.storage_manager.a_delete.assert_awaited_once_with(
             session_name=flow_name,
             timestamp=timestamp,
         )
@@ -499,7 +536,7 @@ class TestCheckpointsHandler:
         timestamp = datetime.now(timezone.utc)
         checkpoint_id = WaldiezCheckpoint.format_timestamp(timestamp)
 
-        self.storage_manager.get.return_value = None
+        self.storage_manager.a_get.return_value = None
 
         payload = {
             "flow_name": "test_flow",
@@ -529,7 +566,7 @@ class TestCheckpointsHandler:
         mock_checkpoint_info.id = checkpoint_id
         mock_checkpoint_info.checkpoint = mock_checkpoint
 
-        self.storage_manager.get.return_value = mock_checkpoint_info
+        self.storage_manager.a_get.return_value = mock_checkpoint_info
 
         payload = {
             "flow_name": flow_name,
@@ -560,7 +597,7 @@ class TestCheckpointsHandler:
         mock_checkpoint_info.id = checkpoint_id
         mock_checkpoint_info.checkpoint = mock_checkpoint
 
-        self.storage_manager.get.return_value = mock_checkpoint_info
+        self.storage_manager.a_get.return_value = mock_checkpoint_info
 
         payload = {
             "flow_name": flow_name,
@@ -602,7 +639,7 @@ class TestCheckpointsHandler:
             "state": {"messages": ["msg1", "msg2"], "context_variables": {}},
         }
 
-        self.storage_manager.get.return_value = mock_checkpoint_info
+        self.storage_manager.a_get.return_value = mock_checkpoint_info
         mock_checkpoint_info.to_dict.return_value = {
             "id": checkpoint_id,
             "state": {"messages": ["msg1", "msg2"], "context_variables": {}},
@@ -656,7 +693,7 @@ class TestCheckpointsHandler:
         flow_name = "test_flow"
 
         # Mock storage to return None for invalid timestamp
-        self.storage_manager.get.return_value = None
+        self.storage_manager.a_get.return_value = None
 
         payload = {
             "flow_name": flow_name,
@@ -689,7 +726,7 @@ class TestCheckpointsHandler:
         mock_checkpoint_info.id = checkpoint_id
         mock_checkpoint_info.checkpoint = mock_checkpoint
 
-        self.storage_manager.get.return_value = mock_checkpoint_info
+        self.storage_manager.a_get.return_value = mock_checkpoint_info
 
         payload_dict = {
             "flow_name": flow_name,
@@ -736,7 +773,8 @@ class TestCheckpointsHandler:
 
         assert not result
 
-    def test_get_checkpoint_info_with_latest(self) -> None:
+    @pytest.mark.asyncio
+    async def test_get_checkpoint_info_with_latest(self) -> None:
         """Test _get_checkpoint_info helper with 'latest' keyword."""
         flow_name = "test_flow"
         timestamp = datetime.now(timezone.utc)
@@ -747,21 +785,20 @@ class TestCheckpointsHandler:
         mock_checkpoint_info.timestamp = timestamp
 
         storage_manager = MagicMock(spec=StorageManager)
-        storage_manager.get_latest_checkpoint.return_value = (
-            mock_checkpoint_info
-        )
+        storage_manager.a_get.return_value = mock_checkpoint_info
 
         payload_dict = {
             "flow_name": flow_name,
             "checkpoint": "latest",
         }
 
-        result = _get_checkpoint_info(payload_dict, storage_manager)
+        result = await _get_checkpoint_info(payload_dict, storage_manager)
 
         assert result is mock_checkpoint_info
-        storage_manager.get_latest_checkpoint.assert_called_once_with(flow_name)
+        storage_manager.a_get.assert_awaited_once_with(flow_name)
 
-    def test_get_checkpoint_info_with_timestamp_id(self) -> None:
+    @pytest.mark.asyncio
+    async def test_get_checkpoint_info_with_timestamp_id(self) -> None:
         """Test _get_checkpoint_info helper with timestamp ID."""
         flow_name = "test_flow"
         timestamp = datetime.now(timezone.utc)
@@ -770,18 +807,19 @@ class TestCheckpointsHandler:
         mock_checkpoint_info = MagicMock(spec=WaldiezCheckpointInfo)
 
         storage_manager = MagicMock(spec=StorageManager)
-        storage_manager.get.return_value = mock_checkpoint_info
+        storage_manager.a_get.return_value = mock_checkpoint_info
 
         payload_dict = {
             "flow_name": flow_name,
             "checkpoint": checkpoint_id,
         }
 
-        result = _get_checkpoint_info(payload_dict, storage_manager)
+        result = await _get_checkpoint_info(payload_dict, storage_manager)
 
         assert result is mock_checkpoint_info
 
-    def test_get_checkpoint_info_missing_flow_name(self) -> None:
+    @pytest.mark.asyncio
+    async def test_get_checkpoint_info_missing_flow_name(self) -> None:
         """Test _get_checkpoint_info helper without flow name."""
         storage_manager = MagicMock(spec=StorageManager)
 
@@ -789,11 +827,12 @@ class TestCheckpointsHandler:
             "checkpoint": "some_id",
         }
 
-        result = _get_checkpoint_info(payload_dict, storage_manager)
+        result = await _get_checkpoint_info(payload_dict, storage_manager)
 
         assert result is None
 
-    def test_get_checkpoint_info_missing_checkpoint(self) -> None:
+    @pytest.mark.asyncio
+    async def test_get_checkpoint_info_missing_checkpoint(self) -> None:
         """Test _get_checkpoint_info helper without checkpoint."""
         storage_manager = MagicMock(spec=StorageManager)
 
@@ -801,11 +840,12 @@ class TestCheckpointsHandler:
             "flow_name": "test_flow",
         }
 
-        result = _get_checkpoint_info(payload_dict, storage_manager)
+        result = await _get_checkpoint_info(payload_dict, storage_manager)
 
         assert result is None
 
-    def test_get_checkpoint_info_invalid_checkpoint_type(self) -> None:
+    @pytest.mark.asyncio
+    async def test_get_checkpoint_info_invalid_checkpoint_type(self) -> None:
         """Test _get_checkpoint_info helper with invalid checkpoint type."""
         storage_manager = MagicMock(spec=StorageManager)
 
@@ -814,11 +854,12 @@ class TestCheckpointsHandler:
             "checkpoint": 123,  # Invalid type
         }
 
-        result = _get_checkpoint_info(payload_dict, storage_manager)
+        result = await _get_checkpoint_info(payload_dict, storage_manager)
 
         assert result is None
 
-    def test_get_checkpoint_info_invalid_timestamp_format(self) -> None:
+    @pytest.mark.asyncio
+    async def test_get_checkpoint_info_invalid_timestamp_format(self) -> None:
         """Test _get_checkpoint_info helper with invalid timestamp format."""
         storage_manager = MagicMock(spec=StorageManager)
 
@@ -831,7 +872,7 @@ class TestCheckpointsHandler:
         with patch.object(
             WaldiezCheckpoint, "parse_timestamp", return_value=None
         ):
-            result = _get_checkpoint_info(payload_dict, storage_manager)
+            result = await _get_checkpoint_info(payload_dict, storage_manager)
 
         assert result is None
 
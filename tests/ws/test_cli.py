@@ -7,12 +7,14 @@
 
 import logging
 import re
+from datetime import timedelta
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 from typer.testing import CliRunner
 
+from waldiez.storage.retention import RetentionPolicy
 from waldiez.ws.cli import app, setup_logging
 
 
@@ -168,6 +170,40 @@ class TestCLICommands:
         assert result.exit_code == 1
         assert "Invalid regex pattern" in result.output
 
+    def test_serve_command_checkpoints_retention(self) -> None:
+        """Test serve command with a checkpoint retention policy."""
+        with (
+            patch("waldiez.ws.cli.asyncio.run"),
+            patch(
+                "waldiez.ws.cli.run_server", new_callable=MagicMock()
+            ) as mock_serve,
+        ):
+            result = self.runner.invoke(
+                app,
+                [
+                    "serve",
+                    "--keep-checkpoints",
+                    "10",
+                    "--max-checkpoint-age",
+                    "30d",
+                    "--gc-interval",
+                    "60",
+                ],
+            )
+
+            assert result.exit_code == 0
+            kwargs = mock_serve.call_args.kwargs
+            assert kwargs["retention_policy"] == RetentionPolicy(
+                max_checkpoints=10, max_age=timedelta(days=30)
+            )
+            assert kwargs["gc_interval"] == 60.0
+
+        result = self.runner.invoke(
+            app, ["serve", "--max-checkpoints-size", "lots"]
+        )
+        assert result.exit_code == 1
+        assert "Invalid checkpoint retention" in result.output
+
     def test_serve_command_watch_directories(self, tmp_path: Path) -> None:
         """Test serve command with watch directories."""
         with (
@@ -33,6 +33,7 @@ except ImportError:  # pragma: no cover
         websockets,
     )
 
+from waldiez.storage.retention import RetentionPolicy, RetentionReport
 from waldiez.ws.server import HAS_WATCHDOG, WaldiezWsServer, run_server
 from waldiez.ws.utils import get_available_port
 
@@ -140,6 +141,22 @@ class TestWaldiezWsServer:
         assert server.max_queue == 64
         assert server.write_limit == 8192
 
+    @pytest.mark.asyncio
+    async def test_server_checkpoints_gc(self) -> None:
+        """Test the background checkpoint garbage collection."""
+        policy = RetentionPolicy(max_checkpoints=2)
+        assert WaldiezWsServer()._gc_task is None  # disabled by default
+        server = WaldiezWsServer(retention_policy=policy, gc_interval=0.01)
+        with patch("waldiez.ws.server.StorageManager") as storage_manager:
+            apply = AsyncMock(return_value=RetentionReport(deleted=1))
+            storage_manager.return_value.a_apply_retention = apply
+            server._start_gc()
+            await asyncio.sleep(0.05)
+            await server._stop_gc()
+
+        assert server._gc_task is None
+        apply.assert_awaited_with(policy)
+
     @pytest.mark.asyncio
     async def test_server_start_stop(self) -> None:
         """Test basic server start and stop."""
@@ -19,6 +19,7 @@ from dotenv import load_dotenv
 from typing_extensions import Annotated
 
 from .cli_extras import add_cli_extras
+from .exporting.cache import add_export_cache_app
 from .logger import get_logger
 from .models import Waldiez
 from .storage import add_checkpoints_app
@@ -411,6 +412,7 @@ def _do_run(
 add_cli_extras(app)
 add_ws_app(app)
 add_checkpoints_app(app)
+add_export_cache_app(app)
 
 if __name__ == "__main__":
     app()
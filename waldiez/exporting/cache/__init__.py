@@ -0,0 +1,46 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+"""Content-addressed cache of exported flows."""
+
+import typer
+from typer.models import CommandInfo
+
+from .cli import handle_export_cache
+from .export_cache import (
+    EXPORT_CACHE_DIR_ENV,
+    EXPORT_CACHE_ENV,
+    ExportCache,
+    ExportCacheEntry,
+    get_default_cache_dir,
+    get_export_key,
+)
+
+
+def add_export_cache_app(app: typer.Typer) -> None:
+    """Add the export cache management command to the CLI.
+
+    Parameters
+    ----------
+    app : typer.Typer
+        The Typer application instance.
+    """
+    app.registered_commands.append(
+        CommandInfo(
+            name="export-cache",
+            help="Inspect or purge the waldiez export cache.",
+            callback=handle_export_cache,
+        )
+    )
+
+
+__all__ = [
+    "EXPORT_CACHE_DIR_ENV",
+    "EXPORT_CACHE_ENV",
+    "ExportCache",
+    "ExportCacheEntry",
+    "add_export_cache_app",
+    "get_default_cache_dir",
+    "get_export_key",
+    "handle_export_cache",
+]
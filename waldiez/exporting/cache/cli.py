@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=missing-function-docstring, missing-param-doc
+# pylint: disable=missing-raises-doc,too-many-arguments
+# pylint: disable=too-many-positional-arguments
+# pyright: reportCallInDefaultInitializer=false
+
+"""CLI interface for the Waldiez export cache."""
+
+from pathlib import Path
+
+import typer
+from rich import print as pretty_print
+from typing_extensions import Annotated
+
+from .export_cache import DEFAULT_MAX_SIZE, ExportCache
+
+app = typer.Typer(
+    name="waldiez-export-cache",
+    help="Waldiez export cache management",
+    add_completion=False,
+    pretty_exceptions_enable=False,
+    context_settings={
+        "help_option_names": ["-h", "--help"],
+        "allow_extra_args": True,
+        "ignore_unknown_options": True,
+    },
+)
+
+
+@app.command(name="export-cache")
+def handle_export_cache(
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(
+            "--dir",
+            help=(
+                "The cache directory (default: $WALDIEZ_EXPORT_CACHE_DIR "
+                "or ~/.cache/waldiez/exports)."
+            ),
+            file_okay=False,
+            resolve_path=True,
+        ),
+    ] = None,
+    list_entries: Annotated[
+        bool, typer.Option("--list", "-l", help="List the cached exports.")
+    ] = False,
+    purge: Annotated[
+        bool, typer.Option("--purge", help="Remove all the cached exports.")
+    ] = False,
+    prune: Annotated[
+        bool,
+        typer.Option(
+            "--prune",
+            help=(
+                "Remove the least recently used exports "
+                "over --max-size / --max-entries."
+            ),
+        ),
+    ] = False,
+    remove: Annotated[
+        str | None,
+        typer.Option("--remove", help="Remove the export with this key."),
+    ] = None,
+    max_size: Annotated[
+        int,
+        typer.Option("--max-size", help="The cache size limit in bytes."),
+    ] = DEFAULT_MAX_SIZE,
+    max_entries: Annotated[
+        int | None,
+        typer.Option("--max-entries", help="The cache entries limit."),
+    ] = None,
+) -> None:
+    """Inspect or purge the waldiez export cache (shows stats by default)."""
+    cache = ExportCache(
+        root=cache_dir, max_size=max_size, max_entries=max_entries
+    )
+    if remove:
+        if not cache.remove(remove):
+            typer.echo(f"No cached export with key: {remove}", err=True)
+            raise typer.Exit(1)
+        typer.echo(f"Removed: {remove}")
+        raise typer.Exit(0)
+    if purge:
+        typer.echo(f"Removed {cache.purge()} cached export(s).")
+        raise typer.Exit(0)
+    if prune:
+        typer.echo(f"Removed {cache.evict()} cached export(s).")
+        raise typer.Exit(0)
+    if list_entries:
+        pretty_print([entry.to_dict() for entry in cache.entries()])
+        raise typer.Exit(0)
+    pretty_print(cache.stats())
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,638 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pyright: reportUnknownMemberType=false, reportUnknownArgumentType=false
+# pyright: reportUnknownVariableType=false
+# pylint: disable=broad-exception-caught,too-many-try-statements
+"""Content-addressed cache of exported flows.
+
+An export is keyed by the flow's json, the export options and the
+exporter's own version, so a flow that did not change is not exported
+again. Each entry keeps the files the export wrote (the main
+``.py``/``.ipynb`` file and any side files), except the api keys module:
+it holds the models' (raw) keys, so it is written again on each restore
+instead of being stored in the (shared) cache, whose directory is only
+accessible by its owner. Absolute references to the export directory are
+stored relocatable, so an entry can be restored in any directory.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from waldiez.utils.version import get_waldiez_version
+
+from ..core.errors import ExporterContentError
+from ..models.processor import ModelProcessor
+
+if TYPE_CHECKING:
+    from waldiez.exporter import WaldiezExporter
+
+EXPORT_CACHE_ENV = "WALDIEZ_EXPORT_CACHE"
+EXPORT_CACHE_DIR_ENV = "WALDIEZ_EXPORT_CACHE_DIR"
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+CACHEABLE_EXTENSIONS = (".py", ".ipynb")
+ENTRY_FILE = "entry.json"
+FILES_DIR = "files"
+# the (not cached) module with the models' api keys
+API_KEYS_SUFFIX = "_api_keys.py"
+CACHE_DIR_MODE = 0o700
+EXPORT_DIR_PLACEHOLDER = "__WALDIEZ_EXPORT_DIR__"
+FALSY = ("", "0", "false", "no", "off")
+TRUTHY = ("1", "true", "yes", "on")
+# staging (and trash) directories of other exports are
+# only removed when they are older than this (in seconds)
+STALE_TMP_AGE = 3600.0
+
+
+def get_default_cache_dir() -> Path:
+    """Get the default export cache directory.
+
+    Returns
+    -------
+    Path
+        ``$WALDIEZ_EXPORT_CACHE_DIR`` if set,
+        else ``$XDG_CACHE_HOME/waldiez/exports`` (``~/.cache/...``).
+    """
+    from_env = os.environ.get(EXPORT_CACHE_DIR_ENV, "")
+    if from_env:
+        return Path(from_env)
+    cache_home = os.environ.get("XDG_CACHE_HOME", "")
+    base = Path(cache_home) if cache_home else Path.home() / ".cache"
+    return base / "waldiez" / "exports"
+
+
+def _get_ag2_version() -> str:
+    for package in ("ag2", "autogen"):
+        try:
+            return version(package)
+        except PackageNotFoundError:
+            continue
+    return "unknown"  # pragma: no cover
+
+
+@cache
+def get_exporter_signature() -> str:
+    """Get a signature of the exporter's code.
+
+    Besides the waldiez and ag2 versions, it includes the size and the
+    modification time of the exporter's sources, so that (development)
+    changes to the exporter do not reuse stale exports.
+
+    Returns
+    -------
+    str
+        The exporter's signature.
+    """
+    package_root = Path(__file__).resolve().parents[2]
+    sources = [package_root / "exporter.py"]
+    sources.extend(sorted((package_root / "exporting").rglob("*.py")))
+    digest = hashlib.sha256()
+    digest.update(get_waldiez_version().encode("utf-8"))
+    digest.update(_get_ag2_version().encode("utf-8"))
+    for source in sources:
+        try:
+            stat = source.stat()
+        except OSError:  # pragma: no cover
+            continue
+        name = source.relative_to(package_root)
+        digest.update(
+            f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8")
+        )
+    return digest.hexdigest()
+
+
+def get_export_key(
+    flow_json: str,
+    file_name: str,
+    structured_io: bool = False,
+    uploads_root: Path | None = None,
+    debug: bool = False,
+) -> str:
+    """Get the cache key of an export.
+
+    Parameters
+    ----------
+    flow_json : str
+        The flow's json dump.
+    file_name : str
+        The name of the exported (main) file.
+    structured_io : bool
+        Whether structured IO is used.
+    uploads_root : Path | None
+        The uploads root.
+    debug : bool
+        Whether debug mode is enabled.
+
+    Returns
+    -------
+    str
+        The (sha256) cache key.
+    """
+    options = json.dumps(
+        {
+            "file_name": file_name,
+            "structured_io": structured_io,
+            "uploads_root": str(uploads_root) if uploads_root else None,
+            "debug": debug,
+            "exporter": get_exporter_signature(),
+        },
+        sort_keys=True,
+    )
+    digest = hashlib.sha256()
+    digest.update(options.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(flow_json.encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class ExportCacheEntry:
+    """A cached export."""
+
+    key: str
+    path: Path
+    main_file: str
+    files: list[str] = field(default_factory=list[str])
+    api_keys_file: str | None = None
+    size: int = 0
+    created_at: float = 0.0
+    last_used_at: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the entry to a dictionary.
+
+        Returns
+        -------
+        dict[str, Any]
+            The entry as a dictionary.
+        """
+        return {
+            "key": self.key,
+            "path": str(self.path),
+            "main_file": self.main_file,
+            "files": self.files,
+            "api_keys_file": self.api_keys_file,
+            "size": self.size,
+            "created_at": self.created_at,
+            "last_used_at": self.last_used_at,
+        }
+
+    @classmethod
+    def load(cls, path: Path) -> "ExportCacheEntry | None":
+        """Load an entry from its directory.
+
+        Parameters
+        ----------
+        path : Path
+            The entry's directory.
+
+        Returns
+        -------
+        ExportCacheEntry | None
+            The entry, or None if it is not a valid one.
+        """
+        entry_file = path / ENTRY_FILE
+        try:
+            data = json.loads(entry_file.read_text(encoding="utf-8"))
+            last_used_at = entry_file.stat().st_mtime
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or not data.get("main_file"):
+            return None
+        return cls(
+            key=path.name,
+            path=path,
+            main_file=str(data["main_file"]),
+            files=[str(name) for name in data.get("files", [])],
+            api_keys_file=data.get("api_keys_file") or None,
+            size=int(data.get("size", 0)),
+            created_at=float(data.get("created_at", 0.0)),
+            last_used_at=last_used_at,
+        )
+
+
+class ExportCache:
+    """Size-bounded, least-recently-used cache of exported flows."""
+
+    def __init__(
+        self,
+        root: str | Path | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_entries: int | None = None,
+    ) -> None:
+        """Initialize the export cache.
+
+        Parameters
+        ----------
+        root : str | Path | None
+            The cache directory (defaults to ``get_default_cache_dir()``).
+        max_size : int
+            The maximum total size of the cached files in bytes.
+        max_entries : int | None
+            Optional maximum number of entries.
+        """
+        self.root = Path(root) if root else get_default_cache_dir()
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_option(
+        cls, option: "ExportCache | bool | str | Path | None"
+    ) -> "ExportCache | None":
+        """Get the export cache to use for a runner option.
+
+        Parameters
+        ----------
+        option : ExportCache | bool | str | Path | None
+            An export cache, True for the default one, a directory,
+            False to disable it, or None to check the
+            ``WALDIEZ_EXPORT_CACHE`` environment variable
+            ("1"/"true" for the default cache, or a directory).
+
+        Returns
+        -------
+        ExportCache | None
+            The export cache, or None if caching is disabled.
+        """
+        if isinstance(option, ExportCache):
+            return option
+        if option is None:
+            from_env = os.environ.get(EXPORT_CACHE_ENV, "").strip()
+            if from_env.lower() in FALSY:
+                return None
+            return cls() if from_env.lower() in TRUTHY else cls(from_env)
+        if isinstance(option, bool):
+            return cls() if option else None
+        return cls(option)
+
+    def export(
+        self,
+        exporter: "WaldiezExporter",
+        path: str | Path,
+        structured_io: bool = False,
+        uploads_root: Path | None = None,
+        force: bool = False,
+        debug: bool = False,
+    ) -> bool:
+        """Export a flow, reusing a cached export if possible.
+
+        Same arguments and errors as ``WaldiezExporter.export``.
+
+        Parameters
+        ----------
+        exporter : WaldiezExporter
+            The flow's exporter.
+        path : str | Path
+            The path to export to.
+        structured_io : bool
+            Whether to use structured IO.
+        uploads_root : Path | None
+            The uploads root.
+        force : bool
+            Override the output file if it already exists.
+        debug : bool
+            Whether to enable debug mode.
+
+        Returns
+        -------
+        bool
+            True if a cached export was used.
+
+        Raises
+        ------
+        FileExistsError
+            If the file already exists, and force is False.
+        IsADirectoryError
+            If the output is a directory.
+        """
+        path = Path(path).resolve()
+        if (
+            path.suffix not in CACHEABLE_EXTENSIONS
+            # doc agents touch files outside the export directory
+            or exporter.waldiez.has_doc_agents
+        ):
+            exporter.export(
+                path,
+                structured_io=structured_io,
+                uploads_root=uploads_root,
+                force=force,
+                debug=debug,
+            )
+            return False
+        if path.is_dir():
+            raise IsADirectoryError(f"Output is a directory: {path}")
+        if path.exists() and not force:
+            raise FileExistsError(f"File already exists: {path}")
+        key = get_export_key(
+            exporter.waldiez.model_dump_json(),
+            file_name=path.name,
+            structured_io=structured_io,
+            uploads_root=uploads_root,
+            debug=debug,
+        )
+        if self.restore(key, path.parent, exporter):
+            self.hits += 1
+            return True
+        self.misses += 1
+        self.root.mkdir(parents=True, exist_ok=True, mode=CACHE_DIR_MODE)
+        staging = Path(tempfile.mkdtemp(prefix=".export-", dir=self.root))
+        try:
+            exporter.export(
+                staging / path.name,
+                structured_io=structured_io,
+                uploads_root=uploads_root,
+                force=True,
+                debug=debug,
+            )
+            self.put(key, staging.resolve(), main_file=path.name)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        if not self.restore(key, path.parent, exporter):  # pragma: no cover
+            # could not cache it, export in place
+            exporter.export(
+                path,
+                structured_io=structured_io,
+                uploads_root=uploads_root,
+                force=True,
+                debug=debug,
+            )
+        return False
+
+    def get(self, key: str) -> ExportCacheEntry | None:
+        """Get a cached entry.
+
+        Parameters
+        ----------
+        key : str
+            The entry's key.
+
+        Returns
+        -------
+        ExportCacheEntry | None
+            The entry, or None if not cached.
+        """
+        return ExportCacheEntry.load(self.root / key)
+
+    def restore(
+        self,
+        key: str,
+        output_dir: Path,
+        exporter: "WaldiezExporter | None" = None,
+    ) -> bool:
+        """Copy a cached export to a directory.
+
+        Parameters
+        ----------
+        key : str
+            The entry's key.
+        output_dir : Path
+            The directory to copy the export to.
+        exporter : WaldiezExporter | None
+            The flow's exporter, to write the (not cached) api keys
+            module of the export, if it had one.
+
+        Returns
+        -------
+        bool
+            True if the entry was found and restored.
+        """
+        entry = self.get(key)
+        if entry is None or (entry.api_keys_file and exporter is None):
+            return False
+        output_dir = output_dir.resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        shutil.rmtree(output_dir / ".cache", ignore_errors=True)
+        files_dir = entry.path / FILES_DIR
+        try:
+            for name in entry.files:
+                source = files_dir / name
+                destination = output_dir / name
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                _copy_relocated(source, destination, str(output_dir))
+            if entry.api_keys_file and exporter is not None:
+                _write_api_keys(exporter, output_dir)
+            os.utime(entry.path / ENTRY_FILE)
+        except (OSError, ExporterContentError):
+            return False
+        return True
+
+    def put(
+        self, key: str, export_dir: Path, main_file: str
+    ) -> ExportCacheEntry | None:
+        """Cache the files of an export.
+
+        Parameters
+        ----------
+        key : str
+            The entry's key.
+        export_dir : Path
+            The directory the flow was exported to (only the export's
+            files should be in it).
+        main_file : str
+            The name of the exported ``.py``/``.ipynb`` file.
+
+        Returns
+        -------
+        ExportCacheEntry | None
+            The new entry, or None if it could not be stored.
+        """
+        self.root.mkdir(parents=True, exist_ok=True, mode=CACHE_DIR_MODE)
+        tmp_dir = self.root / f".tmp-{uuid.uuid4().hex}"
+        files: list[str] = []
+        api_keys_file: str | None = None
+        size = 0
+        try:
+            for source in sorted(export_dir.rglob("*")):
+                if not source.is_file():
+                    continue
+                name = source.relative_to(export_dir).as_posix()
+                if name.endswith(API_KEYS_SUFFIX) and "/" not in name:
+                    api_keys_file = name
+                    continue
+                destination = tmp_dir / FILES_DIR / name
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                _copy_relocatable(source, destination, str(export_dir))
+                files.append(name)
+                size += destination.stat().st_size
+            now = time.time()
+            (tmp_dir / ENTRY_FILE).write_text(
+                json.dumps(
+                    {
+                        "main_file": main_file,
+                        "files": files,
+                        "api_keys_file": api_keys_file,
+                        "size": size,
+                        "created_at": now,
+                    }
+                ),
+                encoding="utf-8",
+            )
+            os.replace(tmp_dir, self.root / key)
+        except OSError:
+            # e.g. a concurrent export already stored it
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict()
+        return self.get(key)
+
+    def entries(self) -> list[ExportCacheEntry]:
+        """Get the cached entries, most recently used first.
+
+        Returns
+        -------
+        list[ExportCacheEntry]
+            The cached entries.
+        """
+        if not self.root.is_dir():
+            return []
+        entries: list[ExportCacheEntry] = []
+        for path in self.root.iterdir():
+            if not path.is_dir() or path.name.startswith("."):
+                continue
+            entry = ExportCacheEntry.load(path)
+            if entry is not None:
+                entries.append(entry)
+        entries.sort(key=lambda item: item.last_used_at, reverse=True)
+        return entries
+
+    def stats(self) -> dict[str, Any]:
+        """Get the cache's statistics.
+
+        Returns
+        -------
+        dict[str, Any]
+            The cache's directory, size, entries, hits and misses.
+        """
+        entries = self.entries()
+        return {
+            "path": str(self.root),
+            "entries": len(entries),
+            "size": sum(entry.size for entry in entries),
+            "max_size": self.max_size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def evict(
+        self, max_size: int | None = None, max_entries: int | None = None
+    ) -> int:
+        """Remove the least recently used entries over the limits.
+
+        Parameters
+        ----------
+        max_size : int | None
+            The size limit (defaults to the cache's one).
+        max_entries : int | None
+            The entries limit (defaults to the cache's one).
+
+        Returns
+        -------
+        int
+            The number of removed entries.
+        """
+        max_size = self.max_size if max_size is None else max_size
+        max_entries = self.max_entries if max_entries is None else max_entries
+        kept = 0
+        total = 0
+        removed = 0
+        for entry in self.entries():
+            within_limits = total + entry.size <= max_size and (
+                max_entries is None or kept < max_entries
+            )
+            if within_limits:
+                kept += 1
+                total += entry.size
+                continue
+            if self.remove(entry.key):
+                removed += 1
+        return removed
+
+    def remove(self, key: str) -> bool:
+        """Remove an entry.
+
+        Parameters
+        ----------
+        key : str
+            The entry's key.
+
+        Returns
+        -------
+        bool
+            True if the entry was removed.
+        """
+        path = self.root / key
+        if not path.is_dir():
+            return False
+        trash = self.root / f".trash-{uuid.uuid4().hex}"
+        try:
+            os.replace(path, trash)
+        except OSError:  # pragma: no cover
+            return False
+        shutil.rmtree(trash, ignore_errors=True)
+        return True
+
+    def purge(self) -> int:
+        """Remove all the entries.
+
+        The temporary directories of (maybe still running) exports
+        are only removed if they are older than ``STALE_TMP_AGE``.
+
+        Returns
+        -------
+        int
+            The number of removed entries.
+        """
+        removed = sum(1 for entry in self.entries() if self.remove(entry.key))
+        if self.root.is_dir():
+            stale_before = time.time() - STALE_TMP_AGE
+            for path in self.root.glob(".*"):
+                try:
+                    is_stale = path.stat().st_mtime < stale_before
+                except OSError:  # e.g. removed meanwhile
+                    continue
+                if is_stale:
+                    shutil.rmtree(path, ignore_errors=True)
+        return removed
+
+
+def _write_api_keys(exporter: "WaldiezExporter", output_dir: Path) -> None:
+    """Write the api keys module of a flow's export."""
+    unique_names = exporter.waldiez.flow.unique_names
+    ModelProcessor(
+        flow_name=unique_names["flow_name"],
+        models=unique_names["models"],
+        model_names=unique_names["model_names"],
+        output_dir=output_dir,
+    ).write_api_keys()
+
+
+def _copy_relocatable(source: Path, destination: Path, export_dir: str) -> None:
+    """Copy a file, replacing the export directory with a placeholder."""
+    _copy_replacing(source, destination, export_dir, EXPORT_DIR_PLACEHOLDER)
+
+
+def _copy_relocated(source: Path, destination: Path, output_dir: str) -> None:
+    """Copy a file, replacing the placeholder with the output directory."""
+    _copy_replacing(source, destination, EXPORT_DIR_PLACEHOLDER, output_dir)
+
+
+def _copy_replacing(
+    source: Path, destination: Path, old: str, new: str
+) -> None:
+    data = source.read_bytes()
+    old_bytes = old.encode("utf-8")
+    if old_bytes in data:
+        data = data.replace(old_bytes, new.encode("utf-8"))
+    destination.write_bytes(data)
@@ -4,8 +4,17 @@
 
 from .exporter import FlowExporter
 from .factory import create_flow_exporter
+from .memo import ExportMemo, get_export_memo
+from .merger import ContentMerger, MergeStatistics
+from .parallel import PARALLEL_MODES, ParallelMode
 
 __all__ = [
+    "ContentMerger",
+    "ExportMemo",
     "FlowExporter",
+    "MergeStatistics",
+    "PARALLEL_MODES",
+    "ParallelMode",
     "create_flow_exporter",
+    "get_export_memo",
 ]
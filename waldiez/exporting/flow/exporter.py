@@ -10,7 +10,9 @@ from waldiez.models import Waldiez
 from ..core import Exporter, ExporterContext
 from ..core.extras import FlowExtras
 from .file_generator import FileGenerator
+from .memo import ExportMemo
 from .orchestrator import ExportOrchestrator
+from .parallel import ParallelMode
 
 
 class FlowExporter(Exporter[FlowExtras]):
@@ -22,6 +24,9 @@ class FlowExporter(Exporter[FlowExtras]):
         output_dir: Path | None,
         for_notebook: bool,
         context: ExporterContext | None = None,
+        memo: ExportMemo | None = None,
+        parallel: ParallelMode = "off",
+        max_workers: int | None = None,
         **kwargs: Any,
     ) -> None:
         """Initialize the chats exporter.
@@ -36,12 +41,23 @@ class FlowExporter(Exporter[FlowExtras]):
             Whether the export is intended for a notebook environment.
         context : Optional[ExporterContext], optional
             Exporter context with dependencies, by default None
+        memo : ExportMemo | None, optional
+            Where to memoize the agents' export results,
+            by default the process-wide memo.
+        parallel : ParallelMode, optional
+            How to export the agents: sequentially ("off", the default),
+            in a thread pool ("thread") or in a process pool ("process").
+        max_workers : int | None, optional
+            The size of the agents' export pool, by default the cpu count.
         **kwargs : Any
             Additional keyword arguments for the exporter.
         """
         super().__init__(context, **kwargs)
 
         self.waldiez = waldiez
+        self.memo = memo
+        self.parallel: ParallelMode = parallel
+        self.max_workers = max_workers
         self.output_dir = Path(output_dir) if output_dir is not None else None
         self.flow_config = self.context.get_config(
             name=waldiez.name,
@@ -94,6 +110,9 @@ class FlowExporter(Exporter[FlowExtras]):
         orchestrator = ExportOrchestrator(
             waldiez=self.waldiez,
             context=self.context,
+            memo=self.memo,
+            parallel=self.parallel,
+            max_workers=self.max_workers,
         )
         merged_result = orchestrator.orchestrate()
         after_run = orchestrator.get_after_run_content()
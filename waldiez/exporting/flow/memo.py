@@ -0,0 +1,231 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pyright: reportUnknownVariableType=false
+
+"""In-process memoization of per-entity export results.
+
+Exporting the same flow again (e.g. on every edit in the studio) only
+needs to re-run the exporters of the entities that changed. Each result
+is keyed by the entity's serialized data and the data of everything it
+is exported against (names, models, chats, config, its arguments), so a
+change in any of those is a miss.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, replace
+from typing import Any
+
+from pydantic import BaseModel
+
+from waldiez.models import Waldiez, WaldiezAgent
+
+from ..core import ExportConfig, ExportResult
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+def _digest(*parts: Any) -> str:
+    """Get the sha256 hex digest of models, lists of models or json data."""
+    digest = hashlib.sha256()
+    for part in parts:
+        items = part if isinstance(part, list) else [part]
+        for item in items:
+            if isinstance(item, BaseModel):
+                data = item.model_dump_json()
+            else:
+                data = json.dumps(item, sort_keys=True, default=str)
+            digest.update(data.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(b"\1")
+    return digest.hexdigest()
+
+
+def _copy_result(result: ExportResult) -> ExportResult:
+    """Copy a result's containers (the content items are not modified)."""
+    return replace(
+        result,
+        imports=set(result.imports),
+        positioned_content=list(result.positioned_content),
+        instance_arguments=list(result.instance_arguments),
+        environment_variables=list(result.environment_variables),
+        metadata=dict(result.metadata),
+    )
+
+
+def get_shared_key(waldiez: Waldiez, config: ExportConfig) -> str:
+    """Get the part of the key that is shared by all the agents of a flow.
+
+    Parameters
+    ----------
+    waldiez : Waldiez
+        The flow being exported.
+    config : ExportConfig
+        The export configuration.
+
+    Returns
+    -------
+    str
+        The shared key.
+    """
+    unique_names = waldiez.flow.unique_names
+    initial_chats = [
+        (
+            connection["source"].id,
+            connection["target"].id,
+            connection["chat"].id,
+        )
+        for connection in waldiez.initial_chats
+    ]
+    return _digest(
+        unique_names["models"],
+        unique_names["tools"],
+        unique_names["chats"],
+        unique_names["agent_names"],
+        unique_names["model_names"],
+        unique_names["tool_names"],
+        unique_names["chat_names"],
+        initial_chats,
+        waldiez.cache_seed,
+        waldiez.is_async,
+        asdict(config),
+    )
+
+
+def get_agent_key(
+    shared_key: str,
+    agent: WaldiezAgent,
+    group_chat_members: list[WaldiezAgent],
+    arguments: list[str],
+) -> str | None:
+    """Get the memo key of an agent's export.
+
+    Parameters
+    ----------
+    shared_key : str
+        The flow's shared key (see :func:`get_shared_key`).
+    agent : WaldiezAgent
+        The agent.
+    group_chat_members : list[WaldiezAgent]
+        The agent's group members (if it is a group manager).
+    arguments : list[str]
+        The extra arguments (from tools, models and chats) of the agent.
+
+    Returns
+    -------
+    str | None
+        The key, or None if the agent's export cannot be memoized
+        (it reads or writes files outside its result).
+    """
+    if agent.is_captain or agent.is_doc_agent:
+        return None
+    return _digest(
+        shared_key,
+        agent,
+        group_chat_members,
+        arguments,
+    )
+
+
+class ExportMemo:
+    """Bounded, least-recently-used store of export results."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Initialize the memo.
+
+        Parameters
+        ----------
+        max_entries : int
+            The maximum number of results to keep (0 disables the memo).
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[str, ExportResult] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of memoized results.
+
+        Returns
+        -------
+        int
+            The number of memoized results.
+        """
+        return len(self._results)
+
+    @property
+    def enabled(self) -> bool:
+        """Check if the memo keeps any results.
+
+        Returns
+        -------
+        bool
+            True if results are memoized.
+        """
+        return self.max_entries > 0
+
+    def get(self, key: str) -> ExportResult | None:
+        """Get a copy of a memoized result.
+
+        Parameters
+        ----------
+        key : str
+            The result's key.
+
+        Returns
+        -------
+        ExportResult | None
+            A copy of the result, or None if it is not memoized.
+        """
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+        return _copy_result(result)
+
+    def put(self, key: str, result: ExportResult) -> None:
+        """Memoize (a copy of) a result.
+
+        Parameters
+        ----------
+        key : str
+            The result's key.
+        result : ExportResult
+            The result to memoize.
+        """
+        if not self.enabled:
+            return
+        stored = _copy_result(result)
+        with self._lock:
+            self._results[key] = stored
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget all the memoized results and reset the counters."""
+        with self._lock:
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_EXPORT_MEMO = ExportMemo()
+
+
+def get_export_memo() -> ExportMemo:
+    """Get the process-wide export memo.
+
+    Returns
+    -------
+    ExportMemo
+        The memo shared by all the flow exports of this process.
+    """
+    return _EXPORT_MEMO
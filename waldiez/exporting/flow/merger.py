@@ -28,6 +28,8 @@ class MergeStatistics:
     total_env_vars: int = 0
     deduplicated_env_vars: int = 0
     conflicts_found: list[str] = field(default_factory=list)
+    memo_hits: int = 0
+    memo_misses: int = 0
 
 
 class ContentMerger:
@@ -216,7 +218,7 @@ class ContentMerger:
         2. ContentOrder within position (EARLY_SETUP, SETUP, MAIN_CONTENT, etc.)
         3. Agent ID (for agent-specific content)
         4. AgentPosition (BEFORE_ALL, BEFORE, AS_ARGUMENT, AFTER, AFTER_ALL)
-        5. Original order (for stability)
+        5. Original order (the sort is stable)
 
         Parameters
         ----------
@@ -240,7 +242,6 @@ class ContentMerger:
                 (
                     pc.agent_position.value if pc.agent_position else 0
                 ),  # 4. AgentPosition
-                id(pc),  # 5. Original object ID for stability
             ),
         )
 
@@ -379,6 +380,19 @@ class ContentMerger:
 
         return "\n\n".join(main_contents) if main_contents else None
 
+    def record_memo_statistics(self, hits: int, misses: int) -> None:
+        """Record how many of the merged results were memoized.
+
+        Parameters
+        ----------
+        hits : int
+            The number of results reused from a previous export.
+        misses : int
+            The number of memoizable results that were exported again.
+        """
+        self.statistics.memo_hits = hits
+        self.statistics.memo_misses = misses
+
     def get_merge_statistics(self) -> MergeStatistics:
         """Get statistics about the last merge operation.
 
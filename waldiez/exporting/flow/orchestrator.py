@@ -2,11 +2,10 @@
 # Copyright (c) 2024 - 2025 Waldiez and contributors.
 """Flow export orchestrator."""
 
-from typing import Any, Callable
+from typing import Any
 
-from waldiez.models import Waldiez, WaldiezAgent, WaldiezGroupManager
+from waldiez.models import Waldiez, WaldiezGroupManager
 
-from ..agent import AgentExporter, create_agent_exporter
 from ..chats import ChatsExporter, create_chats_exporter
 from ..core import (
     AgentPosition,
@@ -18,7 +17,14 @@ from ..core import (
 )
 from ..models import ModelsExporter, create_models_exporter
 from ..tools import ToolsExporter, create_tools_exporter
-from .merger import ContentMerger
+from .memo import ExportMemo, get_agent_key, get_export_memo, get_shared_key
+from .merger import ContentMerger, MergeStatistics
+from .parallel import (
+    AgentExportInputs,
+    AgentExportJob,
+    ParallelMode,
+    export_agents,
+)
 from .utils import (
     generate_header,
     get_after_run_content,
@@ -40,6 +46,9 @@ class ExportOrchestrator:
         self,
         waldiez: Waldiez,
         context: ExporterContext,
+        memo: ExportMemo | None = None,
+        parallel: ParallelMode = "off",
+        max_workers: int | None = None,
     ) -> None:
         """Initialize the export orchestrator.
 
@@ -49,10 +58,24 @@ class ExportOrchestrator:
             The Waldiez instance containing the flow to export.
         context : ExporterContext
             The exporter context containing dependencies and configuration.
+        memo : ExportMemo | None
+            Where to memoize the agents' export results,
+            by default the process-wide memo.
+        parallel : ParallelMode
+            Export the agents sequentially ("off", the default),
+            in a thread pool ("thread") or in a process pool ("process").
+        max_workers : int | None
+            The size of the agents' export pool, by default the cpu count.
         """
         self.waldiez = waldiez
+        self.parallel: ParallelMode = parallel
+        self.max_workers = max_workers
         self.context = context
         self.config = context.get_config()
+        self.memo = memo if memo is not None else get_export_memo()
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.merge_statistics: MergeStatistics | None = None
         self._tools_exporter: ToolsExporter | None = None
         self._models_exporter: ModelsExporter | None = None
         self._chats_exporter: ChatsExporter | None = None
@@ -138,12 +161,19 @@ class ExportOrchestrator:
         # 5. Merge everything
         merger = ContentMerger(self.context)
         merged_result = merger.merge_results(results)
+        merger.record_memo_statistics(self.memo_hits, self.memo_misses)
         # Check for issues
         stats = merger.get_merge_statistics()
+        self.merge_statistics = stats
         if stats.conflicts_found:
             self.logger.warning(
                 "Resolved %d merge conflicts", len(stats.conflicts_found)
             )
+        self.logger.debug(
+            "Agent results reused: %d, exported: %d",
+            stats.memo_hits,
+            stats.memo_misses,
+        )
         self.logger.debug("Merged result: %s", merged_result)
         return self._finalize_export(merged_result)
 
@@ -354,68 +384,6 @@ def _get_known_agents() -> list[ConversableAgent]:
             )
         return self._chats_exporter
 
-    # pylint: disable=no-self-use
-    def _create_agent_arguments_resolver(
-        self, exported_arguments: dict[str, Any]
-    ) -> Callable[[WaldiezAgent], list[str]]:
-        """Create an arguments resolver function for a specific agent.
-
-        Parameters
-        ----------
-        exported_arguments : dict[str, Any]
-            A dictionary containing exported arguments for agents,
-            models, and tools.
-
-        Returns
-        -------
-        Callable[[WaldiezAgent], list[str]]
-            A function that takes a WaldiezAgent and returns a list of
-            arguments to be used for that agent.
-        """
-
-        def arguments_resolver(target_agent: WaldiezAgent) -> list[str]:
-            """Resolve arguments for the target agent.
-
-            Parameters
-            ----------
-            target_agent : WaldiezAgent
-                The agent for which to resolve arguments.
-
-            Returns
-            -------
-            list[str]
-                A list of arguments to be used for the agent.
-            """
-            # Extract arguments from exported_arguments
-            return exported_arguments.get(target_agent.id, [])
-
-        return arguments_resolver
-
-    def _create_agent_exporter(
-        self,
-        agent: WaldiezAgent,
-        agent_arguments: dict[str, list[str]],
-    ) -> AgentExporter:
-        """Create an exporter for a specific agent."""
-        # noinspection PyTypeChecker
-        return create_agent_exporter(
-            agent=agent,
-            agent_names=self.agent_names,
-            models=(self.models, self.model_names),
-            chats=(self.chats, self.chat_names),
-            initial_chats=self.waldiez.initial_chats,
-            tool_names=self.tool_names,
-            cache_seed=self.waldiez.cache_seed,
-            is_async=self.waldiez.is_async,
-            for_notebook=self.config.for_notebook,
-            output_dir=self.config.output_directory,
-            context=self.context,
-            group_chat_members=self.waldiez.get_group_chat_members(agent),
-            arguments_resolver=self._create_agent_arguments_resolver(
-                exported_arguments=agent_arguments,
-            ),
-        )
-
     # noinspection PyMethodMayBeStatic
     def _extract_agent_arguments_from_result(
         self, result: ExportResult
@@ -467,6 +435,11 @@ def _get_known_agents() -> list[ConversableAgent]:
     ) -> list[ExportResult]:
         """Export all agents in dependency order.
 
+        An agent whose data and dependencies did not change since
+        a previous export reuses that export's (memoized) result.
+        The rest are exported (optionally concurrently) and their
+        results are kept in the agents' order.
+
         Parameters
         ----------
         exported_arguments : dict[str, Any]
@@ -478,14 +451,71 @@ def _get_known_agents() -> list[ConversableAgent]:
         list[ExportResult]
             A list of export results for each agent.
         """
-        results: list[ExportResult] = []
+        shared_key = (
+            get_shared_key(self.waldiez, self.config)
+            if self.memo.enabled
+            else None
+        )
+        results: list[ExportResult | None] = []
+        keys: list[str | None] = []
+        jobs: list[AgentExportJob] = []
         for agent in self.waldiez.agents:
-            agent_exporter = self._create_agent_exporter(
-                agent, exported_arguments
+            job = AgentExportJob(
+                agent=agent,
+                group_chat_members=self.waldiez.get_group_chat_members(agent),
+                arguments=exported_arguments.get(agent.id, []),
             )
-            agent_result = agent_exporter.export()
+            key = (
+                get_agent_key(
+                    shared_key,
+                    agent=agent,
+                    group_chat_members=job.group_chat_members,
+                    arguments=job.arguments,
+                )
+                if shared_key
+                else None
+            )
+            agent_result = self.memo.get(key) if key else None
+            if agent_result is not None:
+                self.memo_hits += 1
+            else:
+                jobs.append(job)
+                keys.append(key)
             results.append(agent_result)
-        return results
+        exported = iter(
+            export_agents(
+                jobs,
+                inputs=self._get_agent_export_inputs(),
+                mode=self.parallel,
+                max_workers=self.max_workers,
+            )
+        )
+        exported_keys = iter(keys)
+        for index, agent_result in enumerate(results):
+            if agent_result is not None:
+                continue
+            agent_result = next(exported)
+            key = next(exported_keys)
+            if key:
+                self.memo_misses += 1
+                self.memo.put(key, agent_result)
+            results[index] = agent_result
+        return [result for result in results if result is not None]
+
+    def _get_agent_export_inputs(self) -> AgentExportInputs:
+        """Get what all the agents are exported against."""
+        return AgentExportInputs(
+            agent_names=self.agent_names,
+            models=(self.models, self.model_names),
+            chats=(self.chats, self.chat_names),
+            tool_names=self.tool_names,
+            initial_chats=self.waldiez.initial_chats,
+            cache_seed=self.waldiez.cache_seed,
+            is_async=self.waldiez.is_async,
+            for_notebook=self.config.for_notebook,
+            output_dir=self.config.output_directory,
+            context=self.context,
+        )
 
     def should_skip_logging(self) -> bool:
         """Determine if logging should be skipped.
@@ -0,0 +1,181 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pyright: reportUnusedParameter=false
+
+"""Concurrent export of a flow's agents.
+
+Agents are exported independently of each other (their dependencies,
+the tools/models/chats arguments, are resolved before), so they can
+be exported in a thread or process pool. The results are always
+returned in the order of the jobs, so merging them is deterministic.
+"""
+
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
+from pathlib import Path
+from typing import Literal
+
+from waldiez.models import (
+    WaldiezAgent,
+    WaldiezAgentConnection,
+    WaldiezChat,
+    WaldiezModel,
+)
+
+from ..agent import create_agent_exporter
+from ..core import ExporterContext, ExportResult
+
+ParallelMode = Literal["off", "thread", "process"]
+PARALLEL_MODES: tuple[ParallelMode, ...] = ("off", "thread", "process")
+
+
+@dataclass
+class AgentExportInputs:
+    """What every agent of a flow is exported against."""
+
+    agent_names: dict[str, str]
+    models: tuple[list[WaldiezModel], dict[str, str]]
+    chats: tuple[list[WaldiezChat], dict[str, str]]
+    tool_names: dict[str, str]
+    initial_chats: list[WaldiezAgentConnection]
+    cache_seed: int | None
+    is_async: bool
+    for_notebook: bool
+    output_dir: str | Path | None
+    context: ExporterContext
+
+
+@dataclass
+class AgentExportJob:
+    """A single agent to export."""
+
+    agent: WaldiezAgent
+    group_chat_members: list[WaldiezAgent]
+    arguments: list[str]
+
+
+def export_agent(
+    job: AgentExportJob, inputs: AgentExportInputs
+) -> ExportResult:
+    """Export a single agent.
+
+    Parameters
+    ----------
+    job : AgentExportJob
+        The agent to export.
+    inputs : AgentExportInputs
+        What the agent is exported against.
+
+    Returns
+    -------
+    ExportResult
+        The agent's export result.
+    """
+    arguments = job.arguments
+
+    # pylint: disable=unused-argument
+    def arguments_resolver(target_agent: WaldiezAgent) -> list[str]:
+        """Resolve the (already gathered) arguments of the agent.
+
+        Parameters
+        ----------
+        target_agent : WaldiezAgent
+            The agent for which to resolve arguments.
+
+        Returns
+        -------
+        list[str]
+            A list of arguments to be used for the agent.
+        """
+        return arguments
+
+    # noinspection PyTypeChecker
+    exporter = create_agent_exporter(
+        agent=job.agent,
+        agent_names=inputs.agent_names,
+        models=inputs.models,
+        chats=inputs.chats,
+        initial_chats=inputs.initial_chats,
+        tool_names=inputs.tool_names,
+        cache_seed=inputs.cache_seed,
+        is_async=inputs.is_async,
+        for_notebook=inputs.for_notebook,
+        output_dir=inputs.output_dir,
+        context=inputs.context,
+        group_chat_members=job.group_chat_members,
+        arguments_resolver=arguments_resolver,
+    )
+    return exporter.export()
+
+
+_WORKER_INPUTS: dict[str, AgentExportInputs] = {}
+
+
+def _init_worker(inputs: AgentExportInputs) -> None:
+    """Keep the shared inputs in a pool process (sent once per process)."""
+    _WORKER_INPUTS["inputs"] = inputs
+
+
+def _export_in_worker(job: AgentExportJob) -> ExportResult:
+    """Export an agent in a pool process."""
+    inputs = _WORKER_INPUTS.get("inputs")
+    if inputs is None:  # pragma: no cover
+        raise RuntimeError("The export worker is not initialized")
+    return export_agent(job, inputs)
+
+
+def export_agents(
+    jobs: list[AgentExportJob],
+    inputs: AgentExportInputs,
+    mode: ParallelMode = "off",
+    max_workers: int | None = None,
+) -> list[ExportResult]:
+    """Export agents, sequentially or in a thread/process pool.
+
+    Parameters
+    ----------
+    jobs : list[AgentExportJob]
+        The agents to export.
+    inputs : AgentExportInputs
+        What the agents are exported against.
+    mode : ParallelMode
+        "off" (sequential), "thread" or "process", by default "off".
+    max_workers : int | None
+        The pool's size, by default the number of cpus.
+
+    Returns
+    -------
+    list[ExportResult]
+        The results, in the order of the jobs.
+
+    Raises
+    ------
+    ValueError
+        If the mode is not valid.
+    """
+    if mode not in PARALLEL_MODES:
+        raise ValueError(f"Invalid parallel export mode: {mode}")
+    workers = max_workers or os.cpu_count() or 1
+    if mode == "off" or len(jobs) < 2 or workers < 2:
+        return [export_agent(job, inputs) for job in jobs]
+    workers = min(workers, len(jobs))
+    executor: Executor
+    if mode == "thread":
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(partial(export_agent, inputs=inputs), jobs)
+            )
+    # the logger is not picklable, each process uses its own
+    worker_inputs = replace(
+        inputs, context=replace(inputs.context, logger=None)
+    )
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(worker_inputs,),
+    ) as executor:
+        return list(executor.map(_export_in_worker, jobs, chunksize=chunksize))
@@ -82,6 +82,43 @@ def get_start_logging(is_async: bool, for_notebook: bool) -> str:
 '''
 
 
+def get_json_array_items_helper() -> str:
+    """Get the code of the helper that writes the rows as JSON.
+
+    Both the sync and the async ``get_sqlite_out`` use it to write
+    each batch of rows to the (streamed) JSON array.
+
+    Returns
+    -------
+    str
+        The helper's code string.
+    """
+    # fmt: off
+    # pylint: disable=line-too-long
+    content = "\n\n"
+    content += "def get_json_array_items(data: list[dict[str, Any]], count: int) -> str:\n"
+    content += '    """Get the (indented) JSON array items of a batch of rows.\n\n'
+    content += "    Parameters\n"
+    content += "    ----------\n"
+    content += "    data : list[dict[str, Any]]\n"
+    content += "        The rows (column name -> value).\n"
+    content += "    count : int\n"
+    content += "        The number of rows already in the array.\n\n"
+    content += "    Returns\n"
+    content += "    -------\n"
+    content += "    str\n"
+    content += "        The rows' JSON, to append to the array.\n"
+    content += '    """\n'
+    content += '    chunk = ""\n'
+    content += "    for index, item in enumerate(data, start=count):\n"
+    content += "        item_json = json.dumps(item, indent=4, ensure_ascii=False)\n"
+    content += '        chunk += ",\\n    " if index else "[\\n    "\n'
+    content += '        chunk += item_json.replace("\\n", "\\n    ")\n'
+    content += "    return chunk\n"
+    # fmt: on
+    return content
+
+
 def get_sync_sqlite_out() -> str:
     """Get the sqlite to csv and json conversion code string.
 
@@ -92,11 +129,13 @@ def get_sync_sqlite_out() -> str:
     """
     # fmt: off
     # pylint: disable=line-too-long
-    content = "\n\n"
+    content = get_json_array_items_helper() + "\n\n"
     content += (
-        "def get_sqlite_out(dbname: str, table: str, csv_file: str) -> None:\n"
+        "def get_sqlite_out(dbname: str, table: str, csv_file: str, fetch_size: int = 1000) -> None:\n"
     )
     content += '    """Convert a sqlite table to csv and json files.\n\n'
+    content += "    The rows are fetched and written in batches,\n"
+    content += "    so the memory used does not depend on the table's size.\n\n"
     content += "    Parameters\n"
     content += "    ----------\n"
     content += "    dbname : str\n"
@@ -105,6 +144,8 @@ def get_sync_sqlite_out() -> str:
     content += "        The table name.\n"
     content += "    csv_file : str\n"
     content += "        The csv file name.\n"
+    content += "    fetch_size : int\n"
+    content += "        The number of rows to fetch (and write) at a time.\n"
     content += '    """\n'
     content += "    # pylint: disable=broad-exception-caught,too-many-try-statements\n"
     content += "    try:\n"
@@ -117,29 +158,27 @@ def get_sync_sqlite_out() -> str:
     content += "    except BaseException:\n"
     content += "        conn.close()\n"
     content += "        return\n"
+    content += '    json_file = csv_file.replace(".csv", ".json")\n'
     content += "    try:\n"
-    content += "        rows = cursor.fetchall()\n"
     content += "        column_names = [description[0] for description in cursor.description]\n"
-    content += "        data = [dict(zip(column_names, row, strict=True)) for row in rows]\n"
-    content += "        cursor.close()\n"
-    content += "        conn.close()\n"
-    content += "    except BaseException:\n"
-    content += "        try:\n"
-    content += "            cursor.close()\n"
-    content += "            conn.close()\n"
-    content += "        except BaseException:\n"
-    content += "            pass\n"
-    content += "        return\n"
-    content += "    try:\n"
-    content += '        with open(csv_file, "w", newline="", encoding="utf-8") as file:\n'
+    content += "        with (\n"
+    content += '            open(csv_file, "w", newline="", encoding="utf-8") as file,\n'
+    content += '            open(json_file, "w", encoding="utf-8", newline="\\n") as json_out,\n'
+    content += "        ):\n"
     content += "            csv_writer = csv.DictWriter(file, fieldnames=column_names)\n"
     content += "            csv_writer.writeheader()\n"
-    content += "            csv_writer.writerows(data)\n"
-    content += '        json_file = csv_file.replace(".csv", ".json")\n'
-    content += '        with open(json_file, "w", encoding="utf-8", newline="\\n") as file:\n'
-    content += "            json.dump(data, file, indent=4, ensure_ascii=False)\n"
+    content += "            count = 0\n"
+    content += "            for rows in iter(lambda: cursor.fetchmany(fetch_size), []):\n"
+    content += "                data = [dict(zip(column_names, row, strict=True)) for row in rows]\n"
+    content += "                csv_writer.writerows(data)\n"
+    content += "                json_out.write(get_json_array_items(data, count))\n"
+    content += "                count += len(data)\n"
+    content += '            json_out.write("\\n]" if count else "[]")\n'
     content += "    except BaseException:\n"
-    content += "        return\n"
+    content += "        pass\n"
+    content += "    finally:\n"
+    content += "        cursor.close()\n"
+    content += "        conn.close()\n"
     content += "\n"
     # fmt: on
     return content
@@ -155,9 +194,11 @@ def get_async_sqlite_out() -> str:
         The sqlite to csv and json conversion code string.
     """
     # fmt: off
-    content = "\n\n"
-    content += "async def get_sqlite_out(dbname: str, table: str, csv_file: str) -> None:\n"
+    content = get_json_array_items_helper() + "\n\n"
+    content += "async def get_sqlite_out(dbname: str, table: str, csv_file: str, fetch_size: int = 1000) -> None:\n"
     content += '    """Convert a sqlite table to csv and json files.\n\n'
+    content += "    The rows are fetched and written in batches,\n"
+    content += "    so the memory used does not depend on the table's size.\n\n"
     content += "    Parameters\n"
     content += "    ----------\n"
     content += "    dbname : str\n"
@@ -166,6 +207,8 @@ def get_async_sqlite_out() -> str:
     content += "        The table name.\n"
     content += "    csv_file : str\n"
     content += "        The csv file name.\n"
+    content += "    fetch_size : int\n"
+    content += "        The number of rows to fetch (and write) at a time.\n"
     content += '    """\n'
     content += "    # pylint: disable=broad-exception-caught,too-many-try-statements\n"
     content += "    try:\n"
@@ -178,29 +221,27 @@ def get_async_sqlite_out() -> str:
     content += "    except BaseException:\n"
     content += "        await conn.close()\n"
     content += "        return\n"
+    content += '    json_file = csv_file.replace(".csv", ".json")\n'
     content += "    try:\n"
-    content += "        rows = await cursor.fetchall()\n"
     content += "        column_names = [description[0] for description in cursor.description]\n"
-    content += "        data = [dict(zip(column_names, row, strict=True)) for row in rows]\n"
-    content += "        await cursor.close()\n"
-    content += "        await conn.close()\n"
-    content += "    except BaseException:\n"
-    content += "        try:\n"
-    content += "            await cursor.close()\n"
-    content += "            await conn.close()\n"
-    content += "        except BaseException:\n"
-    content += "            pass\n"
-    content += "        return\n"
-    content += "    try:\n"
-    content += '        async with aiofiles.open(csv_file, "w", newline="", encoding="utf-8") as file:\n'
+    content += "        async with (\n"
+    content += '            aiofiles.open(csv_file, "w", newline="", encoding="utf-8") as file,\n'
+    content += '            aiofiles.open(json_file, "w", encoding="utf-8", newline="\\n") as json_out,\n'
+    content += "        ):\n"
     content += "            csv_writer = AsyncDictWriter(file, fieldnames=column_names)\n"
     content += "            await csv_writer.writeheader()\n"
-    content += "            await csv_writer.writerows(data)\n"
-    content += '        json_file = csv_file.replace(".csv", ".json")\n'
-    content += '        async with aiofiles.open(json_file, "w", encoding="utf-8", newline="\\n") as file:\n'
-    content += "            await file.write(json.dumps(data, indent=4, ensure_ascii=False))\n"
+    content += "            count = 0\n"
+    content += "            while rows := await cursor.fetchmany(fetch_size):\n"
+    content += "                data = [dict(zip(column_names, row, strict=True)) for row in rows]\n"
+    content += "                await csv_writer.writerows(data)\n"
+    content += "                await json_out.write(get_json_array_items(data, count))\n"
+    content += "                count += len(data)\n"
+    content += '            await json_out.write("\\n]" if count else "[]")\n'
     content += "    except BaseException:\n"
-    content += "        return\n"
+    content += "        pass\n"
+    content += "    finally:\n"
+    content += "        await cursor.close()\n"
+    content += "        await conn.close()\n"
     content += "\n"
     # fmt: on
     return content
@@ -73,12 +73,18 @@ class ModelProcessor:
         if self.output_dir:
             self.output_dir = Path(self.output_dir)
             self.output_dir.mkdir(parents=True, exist_ok=True)
-            self._write_api_keys()
+            self.write_api_keys()
 
         return content
 
-    def _write_api_keys(self) -> None:
-        """Write API keys file."""
+    def write_api_keys(self) -> None:
+        """Write API keys file.
+
+        Raises
+        ------
+        ExporterContentError
+            If the file cannot be written.
+        """
         flow_name_upper = self.flow_name.upper()
         api_keys_content = f'''{FILE_HEADER}
 # flake8: noqa: E501
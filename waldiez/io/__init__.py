@@ -13,6 +13,7 @@ and have them in the optional requirements in the package.
 
 from typing import Any
 
+from .codec import PayloadCodec, decode_payload, get_codec
 from .models import (
     AudioContent,
     AudioMediaContent,
@@ -57,6 +58,58 @@ except ImportError:  # pragma: no cover
             raise ImportError(msg)
 
 
+try:
+    from .async_redis import (
+        AsyncRedisIOStream,  # type: ignore[no-redef,unused-ignore]
+    )
+except ImportError:  # pragma: no cover
+
+    class AsyncRedisIOStream:  # type: ignore[no-redef,unused-ignore]
+        """Dummy class for AsyncRedisIOStream."""
+
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            """Initialize the AsyncRedisIOStream.
+
+            Parameters
+            ----------
+            args : tuple
+                Positional arguments.
+            kwargs : dict
+                Keyword arguments.
+            """
+            msg = (
+                "AsyncRedisIOStream is not available. "
+                "Please install the required package."
+            )
+            raise ImportError(msg)
+
+
+try:
+    from .redis_manager import (  # type: ignore[no-redef,unused-ignore]
+        RedisConnectionManager,
+    )
+except ImportError:  # pragma: no cover
+
+    class RedisConnectionManager:  # type: ignore[no-redef,unused-ignore]
+        """Dummy class for RedisConnectionManager."""
+
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            """Initialize the RedisConnectionManager.
+
+            Parameters
+            ----------
+            args : tuple
+                Positional arguments.
+            kwargs : dict
+                Keyword arguments.
+            """
+            msg = (
+                "RedisConnectionManager is not available. "
+                "Please install the required package."
+            )
+            raise ImportError(msg)
+
+
 try:
     from .ws import (
         AsyncWebsocketsIOStream,  # type: ignore[no-redef,unused-ignore]
@@ -110,7 +163,12 @@ except ImportError:  # pragma: no cover
 __all__ = [
     "AsyncWebsocketsIOStream",
     "StructuredIOStream",
+    "PayloadCodec",
+    "get_codec",
+    "decode_payload",
     "RedisIOStream",
+    "AsyncRedisIOStream",
+    "RedisConnectionManager",
     "MqttIOStream",
     "UserInputData",
     "UserResponse",
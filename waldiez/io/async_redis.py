@@ -0,0 +1,675 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# flake8: noqa: E501
+# pylint: disable=too-many-try-statements,broad-exception-caught
+# pylint: disable=line-too-long,duplicate-code
+# pylint: disable=too-many-arguments,too-many-instance-attributes
+# pyright: reportMissingTypeStubs=false,reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false,reportUnknownVariableType=false
+# pyright: reportImportCycles=false
+
+"""An asyncio Redis I/O stream for handling print and input messages.
+
+Unlike :class:`RedisIOStream`, printing never waits for Redis: the
+messages are buffered and sent (in one pipeline per batch) by a
+background task of the event loop. The streams of the same process
+(and event loop) share their connection pools.
+"""
+
+import asyncio
+import inspect
+import logging
+import threading
+import time
+import traceback as tb
+import uuid
+import weakref
+from collections.abc import Coroutine
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+try:
+    import redis.asyncio as a_redis
+except ImportError as error:  # pragma: no cover
+    raise ImportError(
+        "Redis client not installed. Please install redis-py with `pip install redis`."
+    ) from error
+from autogen.events import BaseEvent  # type: ignore
+from autogen.io import IOStream  # type: ignore
+from autogen.messages import BaseMessage  # type: ignore
+
+from .codec import PayloadCodec, get_codec
+from .models import UserResponse
+from .redis import (
+    AsyncRedis,
+    RedisIOStream,
+    event_payload,
+    input_request_payload,
+    input_response_payload,
+    print_payload,
+    stamp_payload,
+)
+from .utils import gen_id
+
+if TYPE_CHECKING:
+    from .redis_manager import InputWaiter, RedisConnectionManager
+
+    ConnectionPool = a_redis.ConnectionPool[Any]
+else:
+    ConnectionPool = a_redis.ConnectionPool
+
+LOG = logging.getLogger(__name__)
+T = TypeVar("T")
+
+# the connection pools of each event loop
+_POOLS: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple[str, str], ConnectionPool]
+] = weakref.WeakKeyDictionary()
+# the ones created outside of a running loop
+_NO_LOOP_POOLS: dict[tuple[str, str], ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def shared_connection_pool(
+    redis_url: str,
+    connection_kwargs: dict[str, Any] | None = None,
+) -> ConnectionPool:
+    """Get the process' connection pool for a Redis URL.
+
+    Asyncio connections belong to the event loop that opened them,
+    so there is one pool per URL (and connection kwargs) per loop.
+
+    Parameters
+    ----------
+    redis_url : str
+        The Redis URL.
+    connection_kwargs : dict[str, Any] | None
+        Additional kwargs for ``ConnectionPool.from_url``
+        (e.g. ``max_connections``).
+
+    Returns
+    -------
+    ConnectionPool
+        The shared pool.
+    """
+    key = (redis_url, repr(sorted((connection_kwargs or {}).items())))
+    try:
+        loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    with _POOLS_LOCK:
+        pools = _NO_LOOP_POOLS if loop is None else _POOLS.setdefault(loop, {})
+        pool = pools.get(key)
+        if pool is None:
+            pool = ConnectionPool.from_url(redis_url, **connection_kwargs or {})
+            pools[key] = pool
+        return pool
+
+
+# noinspection PyBroadException
+class AsyncRedisIOStream(IOStream):
+    """Asyncio Redis I/O stream."""
+
+    task_id: str
+    input_timeout: int
+    on_input_request: Callable[[str, str, str], Any] | None
+    on_input_response: Callable[[str, str], Any] | None
+    max_stream_size: int
+    task_output_stream: str
+    input_request_channel: str
+    input_response_channel: str
+
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/0",
+        task_id: str | None = None,
+        input_timeout: int = 120,
+        max_stream_size: int = 1000,
+        on_input_request: Callable[[str, str, str], Any] | None = None,
+        on_input_response: Callable[[str, str], Any] | None = None,
+        redis_connection_kwargs: dict[str, Any] | None = None,
+        uploads_root: Path | str | None = None,
+        *,
+        max_batch_size: int = 100,
+        flush_interval: float = 0.05,
+        connection_manager: "RedisConnectionManager | None" = None,
+        codec: str | PayloadCodec | None = None,
+    ) -> None:
+        """Initialize the asyncio Redis I/O stream.
+
+        Parameters
+        ----------
+        redis_url : str, optional
+            The Redis URL, by default "redis://localhost:6379/0".
+        task_id : str, optional
+            An ID to use for the input channel and the output stream. If not provided,
+            a random UUID will be generated.
+        input_timeout : int, optional
+            The time to wait for user input in seconds, by default 120.
+        max_stream_size : int, optional
+            The maximum number of entries per stream, by default 1000.
+        on_input_request : Optional[Callable[[str, str, str], Any]], optional
+            Callback (sync or async) for input request, by default None
+            parameters: prompt, request_id, task_id
+        on_input_response : Optional[Callable[[str, str], Any]], optional
+            Callback (sync or async) for input response, by default None.
+            parameters: user_input, task_id
+        redis_connection_kwargs : dict[str, Any] | None, optional
+            Additional kwargs for the (shared) connection pool,
+            by default None.
+        uploads_root : Path | str | None, optional
+            The root directory for uploads, by default None.
+            If provided, it will be resolved to an absolute path.
+        max_batch_size : int, optional
+            The buffered messages that trigger an immediate flush,
+            by default 100.
+        flush_interval : float, optional
+            The maximum time (in seconds) a message stays buffered,
+            by default 0.05.
+        connection_manager : RedisConnectionManager | None, optional
+            Wait for the input responses on the (shared) subscriber of a
+            connection manager, instead of the stream's own one,
+            by default None.
+        codec : str | PayloadCodec | None, optional
+            The encoding of the nested data and the Pub/Sub messages
+            (see :mod:`waldiez.io.codec`), by default the
+            ``WALDIEZ_IO_CODEC`` environment variable's (or plain JSON).
+        """
+        self.codec = get_codec(codec)
+        self.connection_manager = connection_manager
+        self._redis_url = redis_url
+        self._connection_kwargs = dict(redis_connection_kwargs or {})
+        self._redis: AsyncRedis | None = None
+        self.task_id = task_id or uuid.uuid4().hex
+        self.input_timeout = input_timeout
+        self.on_input_request = on_input_request
+        self.on_input_response = on_input_response
+        self.max_stream_size = max_stream_size
+        self.task_output_stream = f"task:{self.task_id}:output"
+        self.input_request_channel = f"task:{self.task_id}:input_request"
+        self.input_response_channel = f"task:{self.task_id}:input_response"
+        self.common_output_stream = "task-output"
+        self.uploads_root = (
+            Path(uploads_root).resolve() if uploads_root else None
+        )
+        if self.uploads_root and not self.uploads_root.exists():
+            self.uploads_root.mkdir(parents=True, exist_ok=True)
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval = flush_interval
+        self._buffer: list[dict[str, Any]] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pubsub: Any = None
+        self._stats: dict[str, float] = {
+            "messages": 0,
+            "batches": 0,
+            "largest_batch": 0,
+            "errors": 0,
+            "flush_seconds": 0.0,
+            "last_flush_seconds": 0.0,
+        }
+
+    @property
+    def redis(self) -> AsyncRedis:
+        """The client (using the process' shared connection pool)."""
+        if self._redis is None:
+            self._redis = AsyncRedis(
+                connection_pool=shared_connection_pool(
+                    self._redis_url, self._connection_kwargs
+                )
+            )
+        return self._redis
+
+    @redis.setter
+    def redis(self, value: AsyncRedis) -> None:
+        """Use another client.
+
+        Parameters
+        ----------
+        value : AsyncRedis
+            The client to use.
+        """
+        self._redis = value
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Counters of the sent batches and their latency."""
+        with self._buffer_lock:
+            batches = self._stats["batches"]
+            return {
+                **self._stats,
+                "pending": len(self._buffer),
+                "average_batch": (
+                    self._stats["messages"] / batches if batches else 0.0
+                ),
+                "average_flush_seconds": (
+                    self._stats["flush_seconds"] / batches if batches else 0.0
+                ),
+            }
+
+    async def __aenter__(self) -> "AsyncRedisIOStream":
+        """Enable async context manager usage."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[Exception] | None,
+        exc_value: Exception | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Exit the async context manager.
+
+        Parameters
+        ----------
+        exc_type : Type[Exception] | None
+            The exception type.
+        exc_value : Exception | None
+            The exception value.
+        traceback : TracebackType | None
+            The traceback.
+        """
+        await self.flush()
+        await RedisIOStream.a_cleanup_processed_task_requests(
+            self.redis, self.task_id, retention_period=86400
+        )
+        await RedisIOStream.a_trim_task_output_streams(self.redis)
+        await RedisIOStream.a_cleanup_processed_requests(self.redis)
+        await self.a_close()
+
+    async def a_close(self) -> None:
+        """Send the buffered messages and release the connections.
+
+        The shared connection pool stays open for the other streams.
+        """
+        await self.flush()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._close_subscriber()
+        LOG.debug("Output stats of task %s: %s", self.task_id, self.stats)
+        if self._redis is not None:
+            # (the installed type stubs predate aclose)
+            client: Any = self._redis
+            await RedisIOStream.a_try_do(client.aclose)
+
+    async def flush(self) -> None:
+        """Send the buffered messages (in one pipeline)."""
+        async with self._flush_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+            if batch:
+                await self._send_batch(batch)
+
+    async def _send_batch(self, batch: list[dict[str, Any]]) -> None:
+        """Add messages to both output streams in a single round trip.
+
+        Parameters
+        ----------
+        batch : list[dict[str, Any]]
+            The messages to send.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        for payload in batch:
+            LOG.debug("Sending print message: %s", payload)
+            for stream in (self.task_output_stream, self.common_output_stream):
+                pipe.xadd(
+                    stream,
+                    payload,
+                    maxlen=self.max_stream_size,
+                    approximate=True,
+                )
+        started = time.perf_counter()
+        try:
+            results = await pipe.execute(raise_on_error=False)
+        except BaseException as error:  # pragma: no cover
+            LOG.error("Error sending output batch: %s", tb.format_exc())
+            results = [error] * (2 * len(batch))
+        elapsed = time.perf_counter() - started
+        errors = sum(
+            1 for result in results if isinstance(result, BaseException)
+        )
+        with self._buffer_lock:
+            self._stats["messages"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["largest_batch"] = max(
+                self._stats["largest_batch"], len(batch)
+            )
+            self._stats["errors"] += errors
+            self._stats["flush_seconds"] += elapsed
+            self._stats["last_flush_seconds"] = elapsed
+
+    def _print(self, payload: dict[str, Any]) -> None:
+        """Buffer a message for the background flush.
+
+        Parameters
+        ----------
+        payload : dict[str, Any]
+            The message to print.
+        """
+        stamp_payload(payload, self.task_id)
+        with self._buffer_lock:
+            self._buffer.append(payload)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None:
+            self._loop = running
+            self._schedule_flush()
+        elif self._loop is not None and self._loop.is_running():
+            # e.g. from a thread of asyncio.to_thread
+            self._loop.call_soon_threadsafe(self._schedule_flush)
+        else:
+            # no event loop: send it now
+            asyncio.run(self._detached(self.flush()))
+
+    async def _detached(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine in a temporary event loop.
+
+        The connections it opened cannot be used by other loops,
+        so the (idle) ones are closed before the loop ends.
+
+        Parameters
+        ----------
+        coro : Coroutine[Any, Any, T]
+            The coroutine to run.
+
+        Returns
+        -------
+        T
+            The coroutine's result.
+        """
+        try:
+            return await coro
+        finally:
+            await RedisIOStream.a_try_do(
+                self.redis.connection_pool.disconnect,
+                inuse_connections=False,
+            )
+
+    def _schedule_flush(self) -> None:
+        """Start (if needed) the task that flushes the buffer."""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._flush_task = asyncio.get_running_loop().create_task(
+            self._flush_soon()
+        )
+
+    async def _flush_soon(self) -> None:
+        """Flush the buffer when full or after the flush interval."""
+        with self._buffer_lock:
+            pending = len(self._buffer)
+        if pending < self.max_batch_size:
+            await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    def print(self, *args: Any, **kwargs: Any) -> None:
+        """Print message to the Redis streams (without blocking).
+
+        Parameters
+        ----------
+        args : Any
+            The message to print.
+        kwargs : Any
+            Additional keyword arguments.
+        """
+        self._print(print_payload(*args, **kwargs))
+
+    def send(self, message: BaseEvent | BaseMessage) -> None:
+        """Send a structured message to Redis (without blocking).
+
+        Parameters
+        ----------
+        message : BaseEvent | BaseMessage
+            The message to send.
+        """
+        self._print(event_payload(message, self.codec))
+
+    def input(
+        self,
+        prompt: str = "",
+        *,
+        password: bool = False,
+    ) -> str:
+        """Sync-compatible input (runs :meth:`a_input` in the stream's loop).
+
+        Async agents call it from a worker thread, so only the
+        thread waits for the response, not the event loop.
+
+        Parameters
+        ----------
+        prompt : str, optional
+            The prompt message, by default "".
+        password : bool, optional
+            Whether input is masked, by default False.
+
+        Returns
+        -------
+        str
+            The received user input, or empty string if timeout occurs.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            LOG.error("input() cannot block the event loop, use a_input()")
+            return ""
+        coro = self.a_input(prompt, password=password)
+        if self._loop is not None and self._loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+            return future.result()
+        return asyncio.run(self._detached(coro))
+
+    async def a_input(
+        self,
+        prompt: str = "",
+        *,
+        password: bool = False,
+        request_id: str | None = None,
+    ) -> str:
+        """Request input via Redis Pub/Sub and wait for the response.
+
+        Parameters
+        ----------
+        prompt : str, optional
+            The prompt message, by default "".
+        password : bool, optional
+            Whether input is masked, by default False.
+        request_id : str, optional
+            The request ID (for testing), by default None.
+
+        Returns
+        -------
+        str
+            The received user input, or empty string if timeout occurs.
+        """
+        self._loop = asyncio.get_running_loop()
+        request_id = request_id or gen_id()
+        payload = input_request_payload(
+            request_id, prompt, password, self.task_id
+        )
+        LOG.debug("Requesting input via Pub/Sub: %s", payload)
+        self._print(payload)
+        # everything printed before the prompt is visible when it is shown
+        await self.flush()
+        # subscribe before requesting, not to miss a fast response
+        waiter = None
+        if self.connection_manager:
+            waiter = await self.connection_manager.a_expect(
+                self.task_id, request_id
+            )
+        else:
+            await RedisIOStream.a_try_do(self._subscriber)
+        await RedisIOStream.a_try_do(
+            self.redis.publish,
+            self.input_request_channel,
+            self.codec.dumps(payload),
+        )
+        if self.on_input_request:
+            await _maybe_await(
+                self.on_input_request(prompt, request_id, self.task_id)
+            )
+        user_input = await (
+            self._wait_for_dispatched_input(waiter)
+            if waiter
+            else self._wait_for_input(request_id)
+        )
+        if self.on_input_response:
+            await _maybe_await(self.on_input_response(user_input, self.task_id))
+        payload = input_response_payload(
+            request_id, user_input, self.task_id, self.codec
+        )
+        LOG.debug("Sending input response: %s", payload)
+        self._print(payload)
+        return user_input
+
+    async def _subscriber(self) -> Any:
+        """Get the (long-lived) subscriber of the input responses.
+
+        Returns
+        -------
+        Any
+            The subscribed pubsub.
+        """
+        if self._pubsub is None:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(self.input_response_channel)
+            self._pubsub = pubsub
+        return self._pubsub
+
+    async def _close_subscriber(self) -> None:
+        """Unsubscribe and close the subscriber (if any)."""
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            await RedisIOStream.a_try_do(pubsub.unsubscribe)
+            await RedisIOStream.a_try_do(pubsub.aclose)
+
+    async def _wait_for_input(self, input_request_id: str) -> str:
+        """Wait (without polling) for the response to an input request.
+
+        Parameters
+        ----------
+        input_request_id : str
+            The request ID.
+
+        Returns
+        -------
+        str
+            The user input.
+        """
+        deadline = time.monotonic() + self.input_timeout
+        try:
+            pubsub = await self._subscriber()
+            while (remaining := deadline - time.monotonic()) > 0:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=remaining
+                )
+                if not message:
+                    continue
+                LOG.debug("Received message: %s", message)
+                response = RedisIOStream.parse_input_message(message)
+                if not response or response.request_id != input_request_id:
+                    continue
+                # one atomic step: another consumer may have taken it
+                if await self._claim_request(response.request_id):
+                    return self._get_user_input(response)
+        except asyncio.CancelledError:
+            raise
+        except BaseException:  # pragma: no cover
+            LOG.error("Error in _wait_for_input: %s", tb.format_exc())
+            await self._close_subscriber()
+
+        LOG.warning(
+            "No input received for %ds on task %s, assuming empty string",
+            self.input_timeout,
+            self.task_id,
+        )
+        return ""
+
+    async def _wait_for_dispatched_input(self, waiter: "InputWaiter") -> str:
+        """Wait for the connection manager to pass the user input.
+
+        Parameters
+        ----------
+        waiter : InputWaiter
+            The registered wait for the input request.
+
+        Returns
+        -------
+        str
+            The user input.
+        """
+        deadline = time.monotonic() + self.input_timeout
+        try:
+            while (remaining := deadline - time.monotonic()) > 0:
+                response = await waiter.a_get(timeout=remaining)
+                # one atomic step: another consumer may have taken it
+                if response and await self._claim_request(response.request_id):
+                    return self._get_user_input(response)
+        finally:
+            if self.connection_manager:
+                self.connection_manager.discard(waiter)
+        LOG.warning(
+            "No input received for %ds on task %s, assuming empty string",
+            self.input_timeout,
+            self.task_id,
+        )
+        return ""
+
+    async def _claim_request(self, request_id: str) -> bool:
+        """Mark a request as processed, unless it already is.
+
+        Parameters
+        ----------
+        request_id : str
+            The request ID.
+
+        Returns
+        -------
+        bool
+            True if the request was not processed before.
+        """
+        try:
+            added = await self.redis.zadd(
+                f"processed_requests:{self.task_id}",
+                {request_id: int(time.time() * 1_000_000)},
+                nx=True,
+            )
+        except BaseException as e:  # pragma: no cover
+            LOG.error("Error on claim request: %s", e)
+            return False
+        return bool(added)
+
+    def _get_user_input(self, response: UserResponse) -> str:
+        """Get user input from the response.
+
+        Parameters
+        ----------
+        response : UserResponse
+            The user response.
+
+        Returns
+        -------
+        str
+            The user input.
+        """
+        if not response.data:  # pragma: no cover
+            return ""
+        if isinstance(response.data, str):  # pragma: no cover
+            return response.data
+        return response.to_string(
+            uploads_root=self.uploads_root,
+            base_name=response.request_id,
+        )
+
+
+async def _maybe_await(result: Any) -> Any:
+    """Await the result of a (sync or async) callback."""
+    if inspect.isawaitable(result):
+        return await result
+    return result
@@ -0,0 +1,317 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pyright: reportUnknownVariableType=false,reportUnknownMemberType=false
+# pyright: reportUnknownArgumentType=false
+
+"""Encoding of the messages that the I/O streams send.
+
+By default, messages are plain JSON (as they always were). Other codecs
+can be selected per stream, or for the process with the
+``WALDIEZ_IO_CODEC`` environment variable, as ``<format>[+zstd]``:
+
+- ``json``: the standard library's JSON.
+- ``orjson``: the same JSON, encoded faster (requires ``orjson``).
+- ``msgpack``: compact binary encoding (requires ``msgpack``).
+- ``+zstd``: compress the messages that are larger than
+  ``min_compress_size`` bytes (requires ``zstandard``).
+
+Binary (or compressed) messages are sent in a JSON envelope whose
+``codec`` field tells the receiver how to decode its (base64) ``payload``,
+so :func:`decode_payload` reads any message, whatever the sender's codec.
+The optional packages are installed with ``pip install waldiez[codecs]``.
+
+The envelope keeps every message valid text (for stdout, websockets and
+Redis alike), at the cost of base64's 33% overhead on the payload. For
+the (mostly text) chat messages, that makes ``msgpack`` alone about 30%
+larger than plain JSON (and no faster), so it is only worth it with
+``+zstd``: compressed, a 20 KB message becomes about 300 bytes with
+either format. ``benchmarks/bench_codec.py`` measures the trade-off.
+"""
+
+import base64
+import importlib
+import json
+import os
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+CODEC_ENV = "WALDIEZ_IO_CODEC"
+CODEC_FORMATS = ("json", "orjson", "msgpack")
+CODEC_FIELD = "codec"
+PAYLOAD_FIELD = "payload"
+_ENVELOPE_PREFIX = '{"codec":'
+_FORMAT_MODULES = {"orjson": "orjson", "msgpack": "msgpack"}
+# the largest (decompressed) message that is accepted
+MAX_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+_READ_SIZE = 1024 * 1024
+
+
+@cache
+def _optional(module: str) -> Any:
+    """Get an (optional) module, None if not installed.
+
+    The lookup is cached: a missing module is not searched again
+    on every message.
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        return None
+
+
+def _zstd() -> Any:
+    """Get the (optional) zstandard module."""
+    return _optional("zstandard")
+
+
+def _loads_json(data: str | bytes) -> Any:
+    """Parse JSON (with orjson, if installed)."""
+    orjson = _optional("orjson")
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # e.g. NaN, that only the standard library accepts
+            pass
+    return json.loads(data)
+
+
+@dataclass(frozen=True)
+class PayloadCodec:
+    """The encoding of the messages of a stream."""
+
+    format: str = "json"
+    compress: bool = False
+    min_compress_size: int = 1024
+
+    @property
+    def name(self) -> str:
+        """The codec's name, as in its envelopes."""
+        return f"{self.format}+zstd" if self.compress else self.format
+
+    @property
+    def is_plain(self) -> bool:
+        """Whether the messages are always plain JSON."""
+        return self.format != "msgpack" and not self.compress
+
+    def dumps(self, data: Any, **json_kwargs: Any) -> str:
+        """Encode a message.
+
+        Parameters
+        ----------
+        data : Any
+            The message.
+        **json_kwargs : Any
+            The ``json.dumps`` kwargs (of the ``json`` format).
+
+        Returns
+        -------
+        str
+            The (JSON or enveloped) message.
+        """
+        if self.format == "msgpack":
+            packed = bytes(
+                _optional("msgpack").packb(data, default=str, use_bin_type=True)
+            )
+            return self._envelope(packed, self.format)
+        dumped = self._dumps_json(data, **json_kwargs)
+        if not self.compress:
+            return dumped
+        encoded = dumped.encode("utf-8")
+        if len(encoded) < self.min_compress_size:
+            return dumped
+        return self._envelope(encoded, "json")
+
+    def _dumps_json(self, data: Any, **json_kwargs: Any) -> str:
+        """Encode a message as JSON."""
+        if self.format == "orjson":
+            orjson = _optional("orjson")
+            try:
+                return str(
+                    orjson.dumps(
+                        data, default=str, option=orjson.OPT_NON_STR_KEYS
+                    ).decode("utf-8")
+                )
+            except TypeError:  # e.g. integers larger than 64 bits
+                pass
+        json_kwargs.setdefault("default", str)
+        return json.dumps(data, **json_kwargs)
+
+    def _envelope(self, data: bytes, data_format: str) -> str:
+        """Wrap (and maybe compress) binary data in a JSON envelope."""
+        codec = data_format
+        if self.compress and len(data) >= self.min_compress_size:
+            data = bytes(_zstd().ZstdCompressor(level=3).compress(data))
+            codec = f"{data_format}+zstd"
+        payload = base64.b64encode(data).decode("ascii")
+        # (the field order is what the receivers' prefix check looks for)
+        return json.dumps({CODEC_FIELD: codec, PAYLOAD_FIELD: payload})
+
+
+def get_codec(
+    codec: "str | PayloadCodec | None" = None,
+    min_compress_size: int = 1024,
+) -> PayloadCodec:
+    """Get (and validate) a codec.
+
+    Parameters
+    ----------
+    codec : str | PayloadCodec | None
+        The codec, or its name (``<format>[+zstd]``). If None, the
+        ``WALDIEZ_IO_CODEC`` environment variable (or ``json``) is used.
+    min_compress_size : int
+        The size (in bytes) from which messages are compressed.
+
+    Returns
+    -------
+    PayloadCodec
+        The codec.
+
+    Raises
+    ------
+    ValueError
+        If the codec is unknown or its packages are not installed.
+    """
+    if isinstance(codec, PayloadCodec):
+        return codec
+    if codec is None:
+        codec = os.environ.get(CODEC_ENV, "json")
+    name = codec.strip().lower() or "json"
+    data_format, _, compression = name.partition("+")
+    if data_format not in CODEC_FORMATS or compression not in ("", "zstd"):
+        msg = (
+            f"Unknown codec: {codec} (expected one of: "
+            f"{', '.join(CODEC_FORMATS)}, optionally with +zstd)"
+        )
+        raise ValueError(msg)
+    module = _FORMAT_MODULES.get(data_format)
+    if module and _optional(module) is None:
+        msg = f"The {data_format} codec requires the `{module}` package"
+        raise ValueError(msg)
+    if compression and _zstd() is None:
+        msg = "zstd compression requires the `zstandard` package"
+        raise ValueError(msg)
+    return PayloadCodec(
+        format=data_format,
+        compress=bool(compression),
+        min_compress_size=min_compress_size,
+    )
+
+
+def envelope_codec(data: Any) -> str | None:
+    """Get the codec of an enveloped message.
+
+    Parameters
+    ----------
+    data : Any
+        The (raw or parsed) message.
+
+    Returns
+    -------
+    str | None
+        The codec's name, None if the message is not enveloped.
+    """
+    if isinstance(data, bytes):
+        data = data.decode("utf-8", errors="replace")
+    if isinstance(data, str):
+        if not data.lstrip().startswith(_ENVELOPE_PREFIX):
+            return None
+        try:
+            data = _loads_json(data)
+        except ValueError:
+            return None
+    if (
+        isinstance(data, dict)
+        and len(data) == 2
+        and isinstance(data.get(CODEC_FIELD), str)
+        and isinstance(data.get(PAYLOAD_FIELD), str)
+    ):
+        return str(data[CODEC_FIELD])
+    return None
+
+
+def decode_payload(data: Any) -> Any:
+    """Decode a message (of any codec).
+
+    Parameters
+    ----------
+    data : Any
+        The raw message (str or bytes), or an already parsed one.
+
+    Returns
+    -------
+    Any
+        The message.
+
+    Raises
+    ------
+    ValueError
+        If the message is not valid, or its codec's
+        packages are not installed.
+    """
+    if isinstance(data, (str, bytes, bytearray)):
+        data = _loads_json(bytes(data) if isinstance(data, bytearray) else data)
+    codec = envelope_codec(data)
+    if codec is None:
+        return data
+    data_format, _, compression = codec.partition("+")
+    raw = _unpack(codec, data[PAYLOAD_FIELD], compression)
+    if data_format == "msgpack":
+        msgpack = _optional("msgpack")
+        if msgpack is None:
+            msg = "Reading msgpack messages requires `msgpack`"
+            raise ValueError(msg)
+        return msgpack.unpackb(raw, raw=False)
+    if data_format in ("json", "orjson"):
+        return _loads_json(raw)
+    raise ValueError(f"Unknown message format: {data_format}")
+
+
+def _unpack(codec: str, payload: str, compression: str) -> bytes:
+    """Get the (decompressed) bytes of an envelope's payload."""
+    try:
+        raw = base64.b64decode(payload, validate=True)
+    except ValueError as error:
+        raise ValueError(f"Invalid {codec} payload: {error}") from error
+    if compression == "zstd":
+        zstd = _zstd()
+        if zstd is None:
+            msg = "Reading zstd compressed messages requires `zstandard`"
+            raise ValueError(msg)
+        return _zstd_decompress(zstd, codec, raw)
+    if compression:
+        raise ValueError(f"Unknown message compression: {compression}")
+    return raw
+
+
+def _zstd_decompress(zstd: Any, codec: str, raw: bytes) -> bytes:
+    """Decompress a payload, up to ``MAX_DECOMPRESSED_SIZE`` bytes.
+
+    The messages may come from untrusted clients: a small payload
+    must not expand to (gigabytes of) memory.
+    """
+    try:
+        data = _read_at_most(
+            zstd.ZstdDecompressor().stream_reader(raw), MAX_DECOMPRESSED_SIZE
+        )
+    except zstd.ZstdError as error:
+        raise ValueError(f"Invalid {codec} payload: {error}") from error
+    if data is None:
+        msg = f"Invalid {codec} payload: over {MAX_DECOMPRESSED_SIZE} bytes"
+        raise ValueError(msg)
+    return data
+
+
+def _read_at_most(reader: Any, limit: int) -> bytes | None:
+    """Read a (decompressing) stream, None if it is over ``limit`` bytes."""
+    chunks: list[bytes] = []
+    size = 0
+    with reader:
+        while chunk := reader.read(_READ_SIZE):
+            size += len(chunk)
+            if size > limit:
+                return None
+            chunks.append(bytes(chunk))
+    return b"".join(chunks)
@@ -35,6 +35,7 @@ from autogen.events import BaseEvent  # type: ignore
 from autogen.io import IOStream  # type: ignore
 from autogen.messages import BaseMessage  # type: ignore
 
+from .codec import PayloadCodec, decode_payload, get_codec
 from .models import (
     PrintMessage,
     TextMediaContent,
@@ -93,6 +94,7 @@ class MqttIOStream(IOStream):
         password: str | None = None,
         use_tls: bool = False,
         ca_cert_path: str | None = None,
+        codec: str | PayloadCodec | None = None,
     ) -> None:
         """Initialize the MQTT I/O stream.
 
@@ -128,7 +130,12 @@ class MqttIOStream(IOStream):
             Whether to use TLS connection, by default False.
         ca_cert_path : str | None, optional
             Path to CA certificate file for TLS, by default None.
+        codec : str | PayloadCodec | None, optional
+            The encoding of the published messages (see
+            :mod:`waldiez.io.codec`), by default the ``WALDIEZ_IO_CODEC``
+            environment variable's (or plain JSON).
         """
+        self.codec = get_codec(codec)
         self.broker_host = broker_host
         self.broker_port = broker_port
         self.task_id = task_id or uuid.uuid4().hex
@@ -366,7 +373,7 @@ class MqttIOStream(IOStream):
     def _handle_input_response(self, payload: str) -> None:
         """Handle input response message."""
         try:
-            message_data = json.loads(payload)
+            message_data = decode_payload(payload)
             response = self._create_user_response(message_data)
 
             if not response or not response.request_id:
@@ -412,6 +419,24 @@ class MqttIOStream(IOStream):
             except Exception as e:
                 LOG.error("Error closing MQTT client: %s", e)
 
+    def _nested(self, data: Any) -> Any:
+        """Get the nested data of a message.
+
+        With plain JSON, they are (as they always were) JSON-dumped;
+        other codecs encode the whole message (once).
+
+        Parameters
+        ----------
+        data : Any
+            The nested data.
+
+        Returns
+        -------
+        Any
+            The data to include in the message.
+        """
+        return json.dumps(data) if self.codec.is_plain else data
+
     def _publish_message(
         self, topic: str, payload: dict[str, Any], retain: bool = False
     ) -> None:
@@ -427,7 +452,7 @@ class MqttIOStream(IOStream):
             Whether to retain the message, by default False.
         """
         try:
-            json_payload = json.dumps(payload)
+            json_payload = self.codec.dumps(payload)
             LOG.debug("Publishing to %s: %s", topic, json_payload)
 
             result = self.client.publish(
@@ -494,7 +519,7 @@ class MqttIOStream(IOStream):
         self._print(
             {
                 "type": message_type,
-                "data": json.dumps(message_dump),
+                "data": self._nested(message_dump),
             }
         )
 
@@ -567,7 +592,7 @@ class MqttIOStream(IOStream):
 
         payload = user_response.model_dump(mode="json")
         payload["task_id"] = self.task_id
-        payload["data"] = json.dumps(payload["data"])
+        payload["data"] = self._nested(payload["data"])
 
         LOG.debug("Sending input response: %s", payload)
         self._print(payload)
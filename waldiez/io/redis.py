@@ -4,13 +4,15 @@
 # flake8: noqa: E501
 # pylint: disable=too-many-try-statements,broad-exception-caught
 # pylint: disable=line-too-long,duplicate-code
+# pylint: disable=too-many-arguments,too-many-instance-attributes
+# pylint: disable=too-many-lines
 # pyright: reportMissingTypeStubs=false,reportUnknownArgumentType=false
-# pyright: reportUnknownMemberType=false
+# pyright: reportUnknownMemberType=false,reportImportCycles=false
 
 """A Redis I/O stream for handling print and input messages."""
 
-import json
 import logging
+import threading
 import time
 import traceback as tb
 import uuid
@@ -30,6 +32,7 @@ from autogen.events import BaseEvent  # type: ignore
 from autogen.io import IOStream  # type: ignore
 from autogen.messages import BaseMessage  # type: ignore
 
+from .codec import PayloadCodec, decode_payload, get_codec
 from .models import (
     PrintMessage,
     TextMediaContent,
@@ -40,6 +43,8 @@ from .models import (
 from .utils import gen_id, get_message_dump, now
 
 if TYPE_CHECKING:
+    from .redis_manager import InputWaiter, RedisConnectionManager
+
     Redis = redis.Redis[bytes]
     AsyncRedis = a_redis.Redis[bytes]
 else:
@@ -49,6 +54,148 @@ else:
 LOG = logging.getLogger(__name__)
 
 
+def stamp_payload(payload: dict[str, Any], task_id: str) -> None:
+    """Add the id, task id and timestamp fields of a stream entry.
+
+    Parameters
+    ----------
+    payload : dict[str, Any]
+        The entry's fields (updated in place).
+    task_id : str
+        The task ID.
+    """
+    if "id" not in payload:
+        payload["id"] = gen_id()
+    payload["task_id"] = task_id
+    if "timestamp" not in payload:
+        payload["timestamp"] = now()
+
+
+def print_payload(*args: Any, **kwargs: Any) -> dict[str, Any]:
+    """Get the stream entry of a print call.
+
+    Parameters
+    ----------
+    args : Any
+        The message to print.
+    kwargs : Any
+        Additional keyword arguments.
+
+    Returns
+    -------
+    dict[str, Any]
+        The entry's fields.
+    """
+    print_message = PrintMessage.create(*args, **kwargs)
+    try:
+        return print_message.model_dump(mode="json")
+    except Exception:  # pragma: no cover
+        return print_message.model_dump(
+            serialize_as_any=True, mode="json", fallback=str
+        )
+
+
+def event_payload(
+    message: BaseEvent | BaseMessage, codec: PayloadCodec | None = None
+) -> dict[str, Any]:
+    """Get the stream entry of a structured message.
+
+    Parameters
+    ----------
+    message : BaseEvent | BaseMessage
+        The message to send.
+    codec : PayloadCodec | None
+        The encoding of the (nested) message, by default plain JSON.
+
+    Returns
+    -------
+    dict[str, Any]
+        The entry's fields.
+    """
+    message_dump = get_message_dump(message)
+    message_type = message_dump.get("type", None)
+    if not message_type:
+        message_type = message.__class__.__name__
+    return {
+        "data": (codec or PayloadCodec()).dumps(message_dump),
+        "type": message_type,
+    }
+
+
+def input_request_payload(
+    request_id: str, prompt: str, password: bool, task_id: str
+) -> dict[str, Any]:
+    """Get the stream entry (and pubsub message) of an input request.
+
+    Parameters
+    ----------
+    request_id : str
+        The request ID.
+    prompt : str
+        The prompt message.
+    password : bool
+        Whether input is masked.
+    task_id : str
+        The task ID.
+
+    Returns
+    -------
+    dict[str, Any]
+        The entry's fields.
+    """
+    input_request = UserInputRequest(
+        request_id=request_id,
+        prompt=prompt,
+        password=password,
+    )
+    try:
+        payload = input_request.model_dump(mode="json")
+    except Exception:  # pragma: no cover
+        payload = input_request.model_dump(
+            serialize_as_any=True, mode="json", fallback=str
+        )
+    payload["password"] = str(password).lower()
+    payload["task_id"] = task_id
+    return payload
+
+
+def input_response_payload(
+    request_id: str,
+    user_input: str,
+    task_id: str,
+    codec: PayloadCodec | None = None,
+) -> dict[str, Any]:
+    """Get the stream entry of an input response.
+
+    Parameters
+    ----------
+    request_id : str
+        The request ID.
+    user_input : str
+        The received user input.
+    task_id : str
+        The task ID.
+    codec : PayloadCodec | None
+        The encoding of the (nested) data, by default plain JSON.
+
+    Returns
+    -------
+    dict[str, Any]
+        The entry's fields.
+    """
+    text_response = UserInputData(content=TextMediaContent(text=user_input))
+    user_response = UserResponse(
+        type="input_response",
+        request_id=request_id,
+        data=text_response,
+    )
+    payload = user_response.model_dump(mode="json")
+    # no nested dicts :(
+    payload["data"] = (codec or PayloadCodec()).dumps(payload["data"])
+    payload["task_id"] = task_id
+    return payload
+
+
 # noinspection PyBroadException
 class RedisIOStream(IOStream):
     """Redis I/O stream."""
@@ -73,6 +220,12 @@ class RedisIOStream(IOStream):
         on_input_response: Callable[[str, str], None] | None = None,
         redis_connection_kwargs: dict[str, Any] | None = None,
         uploads_root: Path | str | None = None,
+        *,
+        buffered: bool = False,
+        max_batch_size: int = 100,
+        flush_interval: float = 0.05,
+        connection_manager: "RedisConnectionManager | None" = None,
+        codec: str | PayloadCodec | None = None,
     ) -> None:
         """Initialize the Redis I/O stream.
 
@@ -100,8 +253,33 @@ class RedisIOStream(IOStream):
         uploads_root : Path | str | None, optional
             The root directory for uploads, by default None.
             If provided, it will be resolved to an absolute path.
+        buffered : bool, optional
+            Buffer the output messages and send them in batches (one pipeline
+            per batch), by default False. The buffer is flushed when it reaches
+            `max_batch_size`, after `flush_interval`, before an input request
+            and on close.
+        max_batch_size : int, optional
+            The maximum number of buffered messages, by default 100.
+        flush_interval : float, optional
+            The maximum time (in seconds) a message stays buffered,
+            by default 0.05.
+        connection_manager : RedisConnectionManager | None, optional
+            Use the (shared) client and input response subscriber of a
+            connection manager, instead of the stream's own ones,
+            by default None. `redis_url` and `redis_connection_kwargs`
+            are then ignored.
+        codec : str | PayloadCodec | None, optional
+            The encoding of the nested data and the Pub/Sub messages
+            (see :mod:`waldiez.io.codec`), by default the
+            ``WALDIEZ_IO_CODEC`` environment variable's (or plain JSON).
         """
-        self.redis = Redis.from_url(redis_url, **redis_connection_kwargs or {})
+        self.codec = get_codec(codec)
+        self.connection_manager = connection_manager
+        self.redis = (
+            connection_manager.client
+            if connection_manager
+            else Redis.from_url(redis_url, **redis_connection_kwargs or {})
+        )
         self.task_id = task_id or uuid.uuid4().hex
         self.input_timeout = input_timeout
         self.on_input_request = on_input_request
@@ -116,6 +294,37 @@ class RedisIOStream(IOStream):
         )
         if self.uploads_root and not self.uploads_root.exists():
             self.uploads_root.mkdir(parents=True, exist_ok=True)
+        self.buffered = buffered
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval = flush_interval
+        self._buffer: list[dict[str, Any]] = []
+        self._buffer_lock = threading.RLock()
+        self._flush_timer: threading.Timer | None = None
+        self._pubsub: Any = None
+        self._stats: dict[str, float] = {
+            "messages": 0,
+            "batches": 0,
+            "largest_batch": 0,
+            "errors": 0,
+            "flush_seconds": 0.0,
+            "last_flush_seconds": 0.0,
+        }
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Counters of the sent batches and their latency."""
+        with self._buffer_lock:
+            batches = self._stats["batches"]
+            return {
+                **self._stats,
+                "pending": len(self._buffer),
+                "average_batch": (
+                    self._stats["messages"] / batches if batches else 0.0
+                ),
+                "average_flush_seconds": (
+                    self._stats["flush_seconds"] / batches if batches else 0.0
+                ),
+            }
 
     def __enter__(self) -> "RedisIOStream":
         """Enable context manager usage."""
@@ -138,6 +347,7 @@ class RedisIOStream(IOStream):
         traceback : TracebackType | None
             The traceback.
         """
+        self.flush()
         # cleanup
         RedisIOStream.cleanup_processed_task_requests(
             self.redis, self.task_id, retention_period=86400
@@ -148,37 +358,115 @@ class RedisIOStream(IOStream):
         self.close()
 
     def close(self) -> None:
-        """Close the Redis client."""
-        RedisIOStream.try_do(self.redis.close)
+        """Send the buffered messages and close the Redis client.
+
+        A connection manager's client is left open for the other streams.
+        """
+        self.flush()
+        LOG.debug("Output stats of task %s: %s", self.task_id, self.stats)
+        self._close_subscriber()
+        if self.connection_manager is None:
+            RedisIOStream.try_do(self.redis.close)
+
+    def _subscriber(self) -> Any:
+        """Get the (long-lived) subscriber of the input responses.
+
+        Returns
+        -------
+        Any
+            The subscribed pubsub.
+        """
+        if self._pubsub is None:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(self.input_response_channel)
+            self._pubsub = pubsub
+        return self._pubsub
+
+    def _close_subscriber(self) -> None:
+        """Unsubscribe and close the subscriber (if any)."""
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            RedisIOStream.try_do(pubsub.unsubscribe)
+            RedisIOStream.try_do(pubsub.close)
+
+    def flush(self) -> None:
+        """Send the buffered messages (in one pipeline)."""
+        with self._buffer_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            batch, self._buffer = self._buffer, []
+            if batch:
+                self._send_batch(batch)
+
+    def _send_batch(self, batch: list[dict[str, Any]]) -> None:
+        """Add messages to both output streams in a single round trip.
+
+        Parameters
+        ----------
+        batch : list[dict[str, Any]]
+            The messages to send.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        for payload in batch:
+            self._print_to_task_output(payload, pipe)
+            self._print_to_common_output(payload, pipe)
+        started = time.perf_counter()
+        try:
+            results = pipe.execute(raise_on_error=False)
+        except BaseException as error:  # pragma: no cover
+            LOG.error("Error sending output batch: %s", tb.format_exc())
+            results = [error] * (2 * len(batch))
+        elapsed = time.perf_counter() - started
+        errors = sum(
+            1 for result in results if isinstance(result, BaseException)
+        )
+        with self._buffer_lock:
+            self._stats["messages"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["largest_batch"] = max(
+                self._stats["largest_batch"], len(batch)
+            )
+            self._stats["errors"] += errors
+            self._stats["flush_seconds"] += elapsed
+            self._stats["last_flush_seconds"] = elapsed
 
-    def _print_to_task_output(self, payload: dict[str, Any]) -> None:
+    def _print_to_task_output(
+        self, payload: dict[str, Any], client: Any = None
+    ) -> None:
         """Print message to the task output stream.
 
         Parameters
         ----------
         payload : dict[str, Any]
             The message to print.
+        client : Any
+            The client (or pipeline) to use, by default the stream's client.
         """
         LOG.debug("Sending print message: %s", payload)
         RedisIOStream.try_do(
-            self.redis.xadd,
+            (client or self.redis).xadd,
             self.task_output_stream,
             payload,
             maxlen=self.max_stream_size,
             approximate=True,
         )
 
-    def _print_to_common_output(self, payload: dict[str, Any]) -> None:
+    def _print_to_common_output(
+        self, payload: dict[str, Any], client: Any = None
+    ) -> None:
         """Print message to the common output stream.
 
         Parameters
         ----------
         payload : dict[str, Any]
             The message to print.
+        client : Any
+            The client (or pipeline) to use, by default the stream's client.
         """
         LOG.debug("Sending print message: %s", payload)
         RedisIOStream.try_do(
-            self.redis.xadd,
+            (client or self.redis).xadd,
             self.common_output_stream,
             payload,
             maxlen=self.max_stream_size,
@@ -193,13 +481,20 @@ class RedisIOStream(IOStream):
         payload : dict[str, Any]
             The message to print.
         """
-        if "id" not in payload:
-            payload["id"] = gen_id()
-        payload["task_id"] = self.task_id
-        if "timestamp" not in payload:
-            payload["timestamp"] = now()
-        self._print_to_task_output(payload)
-        self._print_to_common_output(payload)
+        stamp_payload(payload, self.task_id)
+        if not self.buffered:
+            self._send_batch([payload])
+            return
+        with self._buffer_lock:
+            self._buffer.append(payload)
+            if len(self._buffer) >= self.max_batch_size:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(
+                    self.flush_interval, self.flush
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
 
     def print(self, *args: Any, **kwargs: Any) -> None:
         """Print message to Redis stream.
@@ -211,14 +506,7 @@ class RedisIOStream(IOStream):
         kwargs : Any
             Additional keyword arguments.
         """
-        print_message = PrintMessage.create(*args, **kwargs)
-        try:
-            payload = print_message.model_dump(mode="json")
-        except Exception:  # pragma: no cover
-            payload = print_message.model_dump(
-                serialize_as_any=True, mode="json", fallback=str
-            )
-        self._print(payload)
+        self._print(print_payload(*args, **kwargs))
 
     def input(
         self,
@@ -244,41 +532,36 @@ class RedisIOStream(IOStream):
             The received user input, or empty string if timeout occurs.
         """
         request_id = request_id or gen_id()
-        input_request = UserInputRequest(
-            request_id=request_id,
-            prompt=prompt,
-            password=password,
+        payload = input_request_payload(
+            request_id, prompt, password, self.task_id
         )
-        try:
-            payload = input_request.model_dump(mode="json")
-        except Exception:  # pragma: no cover
-            payload = input_request.model_dump(
-                serialize_as_any=True, mode="json", fallback=str
-            )
-        payload["password"] = str(password).lower()
-        payload["task_id"] = self.task_id
         LOG.debug("Requesting input via Pub/Sub: %s", payload)
         self._print(payload)
+        # everything printed before the prompt is visible when it is shown
+        self.flush()
+        # subscribe before requesting, not to miss a fast response
+        waiter = None
+        if self.connection_manager:
+            waiter = self.connection_manager.expect(self.task_id, request_id)
+        else:
+            RedisIOStream.try_do(self._subscriber)
         RedisIOStream.try_do(
             self.redis.publish,
             self.input_request_channel,
-            json.dumps(payload),
+            self.codec.dumps(payload),
         )
         if self.on_input_request:
             self.on_input_request(prompt, request_id, self.task_id)
-        user_input = self._wait_for_input(request_id)
+        user_input = (
+            self._wait_for_dispatched_input(waiter)
+            if waiter
+            else self._wait_for_input(request_id)
+        )
         if self.on_input_response:
             self.on_input_response(user_input, self.task_id)
-        text_response = UserInputData(content=TextMediaContent(text=user_input))
-        user_response = UserResponse(
-            type="input_response",
-            request_id=request_id,
-            data=text_response,
+        payload = input_response_payload(
+            request_id, user_input, self.task_id, self.codec
         )
-        payload = user_response.model_dump(mode="json")
-        # no nested dicts :(
-        payload["data"] = json.dumps(payload["data"])
-        payload["task_id"] = self.task_id
         LOG.debug("Sending input response: %s", payload)
         self._print(payload)
         return user_input
@@ -291,20 +574,14 @@ class RedisIOStream(IOStream):
         message : BaseEvent | BaseMessage
             The message to send.
         """
-        message_dump = get_message_dump(message)
-        message_type = message_dump.get("type", None)
-        if not message_type:
-            message_type = message.__class__.__name__
-        self._print(
-            {
-                "data": json.dumps(message_dump),
-                "type": message_type,
-            }
-        )
+        self._print(event_payload(message, self.codec))
 
     def _wait_for_input(self, input_request_id: str) -> str:
         """Wait for user input.
 
+        Blocks on the stream's subscriber until a response arrives
+        (or the input timeout passes), without polling.
+
         Parameters
         ----------
         input_request_id : str
@@ -315,35 +592,26 @@ class RedisIOStream(IOStream):
         str
             The user input.
         """
-        lock_key = f"lock:{self.task_id}"
-        start_time = time.time()
-
-        pubsub = self.redis.pubsub()
-        pubsub.subscribe(self.input_response_channel)
+        deadline = time.monotonic() + self.input_timeout
         try:
-            while (time.time() - start_time) <= self.input_timeout:
-                message = pubsub.get_message(ignore_subscribe_messages=True)
+            pubsub = self._subscriber()
+            while (remaining := deadline - time.monotonic()) > 0:
+                message = pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=remaining
+                )
                 if not message:
-                    time.sleep(0.1)
                     continue
                 LOG.debug("Received message: %s", message)
                 response = self.parse_pubsub_input(message)
                 if not response or response.request_id != input_request_id:
                     continue
-
-                if self._acquire_lock(lock_key):  # pragma: no branch
-                    try:
-                        if self._is_request_processed(response.request_id):
-                            continue
-
-                        self._mark_request_processed(response.request_id)
-                        return self._get_user_input(response)
-                    finally:
-                        self._release_lock(lock_key)
+                # one atomic step: another consumer may have taken it
+                if self._claim_request(response.request_id):
+                    return self._get_user_input(response)
         except BaseException:  # pragma: no cover
             LOG.error("Error in _wait_for_input: %s", tb.format_exc())
-        finally:
-            pubsub.unsubscribe(self.input_response_channel)
+            # reconnect on the next wait
+            self._close_subscriber()
 
         LOG.warning(
             "No input received for %ds on task %s, assuming empty string",
@@ -352,6 +620,36 @@ class RedisIOStream(IOStream):
         )
         return ""
 
+    def _wait_for_dispatched_input(self, waiter: "InputWaiter") -> str:
+        """Wait for the connection manager to pass the user input.
+
+        Parameters
+        ----------
+        waiter : InputWaiter
+            The registered wait for the input request.
+
+        Returns
+        -------
+        str
+            The user input.
+        """
+        deadline = time.monotonic() + self.input_timeout
+        try:
+            while (remaining := deadline - time.monotonic()) > 0:
+                response = waiter.get(timeout=remaining)
+                # one atomic step: another consumer may have taken it
+                if response and self._claim_request(response.request_id):
+                    return self._get_user_input(response)
+        finally:
+            if self.connection_manager:
+                self.connection_manager.discard(waiter)
+        LOG.warning(
+            "No input received for %ds on task %s, assuming empty string",
+            self.input_timeout,
+            self.task_id,
+        )
+        return ""
+
     # pylint:disable=no-self-use
     def _get_user_input(self, response: UserResponse) -> str:
         """Get user input from the response.
@@ -377,48 +675,40 @@ class RedisIOStream(IOStream):
             base_name=response.request_id,
         )
 
-    def _acquire_lock(self, lock_key: str, lock_expiry: int = 10) -> bool:
-        """Try to acquire a lock, returns True if acquired, False otherwise."""
+    def _claim_request(self, request_id: str) -> bool:
+        """Mark a request as processed, unless it already is.
+
+        Parameters
+        ----------
+        request_id : str
+            The request ID.
+
+        Returns
+        -------
+        bool
+            True if the request was not processed before.
+        """
         try:
-            return (
-                self.redis.set(lock_key, "locked", ex=lock_expiry, nx=True)
-                is True
+            added = self.redis.zadd(
+                f"processed_requests:{self.task_id}",
+                {request_id: int(time.time() * 1_000_000)},
+                nx=True,
             )
-        except redis.RedisError as e:  # pragma: no cover
-            LOG.error("Redis error on acquire lock: %s", e)
+        except BaseException as e:
+            LOG.error("Error on claim request: %s", e)
             return False
-        except BaseException as e:  # pragma: no cover
-            LOG.error("Error on acquire lock: %s", e)
-            return False
-
-    def _release_lock(self, lock_key: str) -> None:
-        """Release a lock."""
-        RedisIOStream.try_do(self.redis.delete, lock_key)
-
-    def _is_request_processed(self, request_id: str) -> bool:
-        """Check if a request is processed for a task."""
-        return RedisIOStream.is_request_processed(
-            self.redis, task_id=self.task_id, request_id=request_id
-        )
-
-    def _mark_request_processed(self, request_id: str) -> None:
-        """Mark a request as processed for a task."""
-        RedisIOStream.try_do(
-            self.redis.zadd,
-            f"processed_requests:{self.task_id}",
-            {request_id: int(time.time() * 1_000_000)},
-        )
+        return bool(added)
 
     @staticmethod
     def _extract_message_data(data: Any) -> dict[str, Any] | None:
         """Extract and parse the message data field."""
         message_data = data
 
-        # Handle string-encoded JSON
-        if isinstance(message_data, str):
+        # Handle string-encoded JSON (of any codec)
+        if isinstance(message_data, (str, bytes)):
             try:
-                message_data = json.loads(message_data)
-            except json.JSONDecodeError:
+                message_data = decode_payload(message_data)
+            except ValueError:
                 LOG.error("Invalid JSON in message data: %s", message_data)
                 return None
 
@@ -451,8 +741,8 @@ class RedisIOStream(IOStream):
             processed_data["data"], str
         ):  # pragma: no branch
             try:
-                processed_data["data"] = json.loads(processed_data["data"])
-            except json.JSONDecodeError:
+                processed_data["data"] = decode_payload(processed_data["data"])
+            except ValueError:
                 LOG.error(
                     "Invalid JSON in nested data field: %s", processed_data
                 )
@@ -481,6 +771,24 @@ class RedisIOStream(IOStream):
     ) -> UserResponse | None:
         """Extract request ID and user input from a message.
 
+        Parameters
+        ----------
+        message : dict[str, Any]
+            The message to parse.
+
+        Returns
+        -------
+        UserResponse
+            The parsed user response.
+        """
+        return RedisIOStream.parse_input_message(message)
+
+    @staticmethod
+    def parse_input_message(
+        message: dict[str, Any] | None,
+    ) -> UserResponse | None:
+        """Parse an input response received via Pub/Sub.
+
         Parameters
         ----------
         message : dict[str, Any]
@@ -494,20 +802,20 @@ class RedisIOStream(IOStream):
         if not isinstance(message, dict) or "data" not in message:
             LOG.error("Invalid message format or missing 'data': %s", message)
             return None
-        message_data = self._extract_message_data(message["data"])
+        message_data = RedisIOStream._extract_message_data(message["data"])
         if message_data is None:  # pragma: no cover
             return None
 
-        if not self._message_has_required_fields(
+        if not RedisIOStream._message_has_required_fields(
             message_data
         ):  # pragma: no cover
             return None
 
-        processed_data = self._process_nested_data(message_data)
+        processed_data = RedisIOStream._process_nested_data(message_data)
         if processed_data is None:  # pragma: no cover
             return None
 
-        return self._create_user_response(processed_data)
+        return RedisIOStream._create_user_response(processed_data)
 
     @staticmethod
     def try_do(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
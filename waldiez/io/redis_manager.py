@@ -0,0 +1,473 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=broad-exception-caught,too-many-instance-attributes
+# pyright: reportMissingTypeStubs=false,reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false,reportUnknownVariableType=false
+
+"""Process-wide Redis connections of the Redis I/O streams.
+
+Without it, each stream has its own client (and connection pool) and
+its own subscriber of the input responses: a process with hundreds of
+tasks holds hundreds of sockets. With a :class:`RedisConnectionManager`,
+the streams share one (bounded) connection pool and a single
+subscriber, whose thread dispatches each response to the task waiting
+for it. The subscriber only subscribes to the (exact) input response
+channels of the tasks that are waiting for input in this process, so
+it does not receive the responses of the other workers' tasks.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import traceback as tb
+from collections import deque
+from concurrent.futures import (
+    Future,
+    TimeoutError as FutureTimeoutError,
+)
+from typing import Any
+
+import redis
+
+from .models import UserResponse
+from .redis import Redis, RedisIOStream
+
+LOG = logging.getLogger(__name__)
+
+RESPONSE_CHANNEL = "task:{task_id}:input_response"
+# how often (in seconds) the subscriber applies the channel changes
+SUBSCRIBE_POLL_INTERVAL = 0.05
+
+
+class InputWaiter:
+    """The responses to an input request, as the subscriber receives them."""
+
+    def __init__(self, task_id: str, request_id: str) -> None:
+        """Initialize the waiter.
+
+        Parameters
+        ----------
+        task_id : str
+            The task ID.
+        request_id : str
+            The input request ID.
+        """
+        self.task_id = task_id
+        self.request_id = request_id
+        self._lock = threading.Lock()
+        self._responses: deque[UserResponse] = deque()
+        self._received: Future[None] = Future()
+
+    def put(self, response: UserResponse) -> None:
+        """Add a received response (called by the subscriber's thread).
+
+        Parameters
+        ----------
+        response : UserResponse
+            The response.
+        """
+        with self._lock:
+            self._responses.append(response)
+            if not self._received.done():
+                self._received.set_result(None)
+
+    def get(self, timeout: float) -> UserResponse | None:
+        """Wait for the next response.
+
+        Parameters
+        ----------
+        timeout : float
+            The maximum time to wait, in seconds.
+
+        Returns
+        -------
+        UserResponse | None
+            The response, or None if none arrived in time.
+        """
+        response, received = self._next()
+        if response is not None:
+            return response
+        try:
+            received.result(timeout=max(timeout, 0))
+        except FutureTimeoutError:
+            return None
+        return self._next()[0]
+
+    async def a_get(self, timeout: float) -> UserResponse | None:
+        """Wait for the next response without blocking the event loop.
+
+        Parameters
+        ----------
+        timeout : float
+            The maximum time to wait, in seconds.
+
+        Returns
+        -------
+        UserResponse | None
+            The response, or None if none arrived in time.
+        """
+        response, received = self._next()
+        if response is not None:
+            return response
+        try:
+            # shielded: a timeout must not cancel the shared future
+            await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(received)),
+                timeout=max(timeout, 0),
+            )
+        except asyncio.TimeoutError:
+            return None
+        return self._next()[0]
+
+    def _next(self) -> tuple[UserResponse | None, "Future[None]"]:
+        """Pop a received response, or get the future of the next one."""
+        with self._lock:
+            if not self._responses:
+                return None, self._received
+            response = self._responses.popleft()
+            if not self._responses:
+                self._received = Future()
+            return response, self._received
+
+
+class RedisConnectionManager:
+    """Shared connection pool and input response subscriber."""
+
+    _shared: dict[tuple[int, str, str], "RedisConnectionManager"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/0",
+        *,
+        max_connections: int = 50,
+        pool_timeout: float = 20.0,
+        subscribe_timeout: float = 5.0,
+        client: Redis | None = None,
+        **connection_kwargs: Any,
+    ) -> None:
+        """Initialize the connection manager.
+
+        Parameters
+        ----------
+        redis_url : str, optional
+            The Redis URL, by default "redis://localhost:6379/0".
+        max_connections : int, optional
+            The size of the connection pool, by default 50. When all
+            the connections are in use, commands wait for a free one.
+        pool_timeout : float, optional
+            The maximum time (in seconds) to wait for a free connection,
+            by default 20.
+        subscribe_timeout : float, optional
+            The maximum time (in seconds) to wait for the subscriber
+            before an input request, by default 5.
+        client : Redis | None, optional
+            A client to use instead of creating one (e.g. for testing).
+        **connection_kwargs : Any
+            Additional kwargs of the connection pool (see
+            ``redis.BlockingConnectionPool``).
+        """
+        self.redis_url = redis_url
+        self.max_connections = max_connections
+        self.subscribe_timeout = subscribe_timeout
+        self._owns_client = client is None
+        if client is None:
+            pool = redis.BlockingConnectionPool.from_url(
+                redis_url,
+                max_connections=max_connections,
+                timeout=pool_timeout,
+                **connection_kwargs,
+            )
+            client = Redis(connection_pool=pool)
+        self.client: Redis = client
+        self._lock = threading.Lock()
+        self._channels_changed = threading.Condition(self._lock)
+        self._waiters: dict[tuple[str, str], InputWaiter] = {}
+        # the subscribed channels (and their waiters), and the confirmed ones
+        self._channels: dict[str, int] = {}
+        self._ready: set[str] = set()
+        self._listener: threading.Thread | None = None
+        self._subscribed = threading.Event()
+        self._closed = threading.Event()
+        self._stats: dict[str, int] = {
+            "dispatched": 0,
+            "dropped": 0,
+            "errors": 0,
+        }
+
+    @classmethod
+    def shared(
+        cls,
+        redis_url: str = "redis://localhost:6379/0",
+        **kwargs: Any,
+    ) -> "RedisConnectionManager":
+        """Get the process' manager for a Redis URL.
+
+        Parameters
+        ----------
+        redis_url : str, optional
+            The Redis URL, by default "redis://localhost:6379/0".
+        **kwargs : Any
+            The manager's options (if it needs to be created).
+
+        Returns
+        -------
+        RedisConnectionManager
+            The shared manager.
+        """
+        # (threads and sockets are not inherited by forked processes)
+        key = (os.getpid(), redis_url, repr(sorted(kwargs.items())))
+        with cls._shared_lock:
+            manager = cls._shared.get(key)
+            if manager is None or manager.closed:
+                manager = cls(redis_url, **kwargs)
+                cls._shared[key] = manager
+            return manager
+
+    @property
+    def closed(self) -> bool:
+        """Whether the manager was closed."""
+        return self._closed.is_set()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters of the dispatched responses and the connections."""
+        pool = self.client.connection_pool
+        with self._lock:
+            return {
+                **self._stats,
+                "waiters": len(self._waiters),
+                "channels": len(self._channels),
+                "subscribed": int(self._subscribed.is_set()),
+                "max_connections": int(
+                    getattr(pool, "max_connections", self.max_connections)
+                ),
+                "created_connections": _created_connections(pool),
+            }
+
+    def expect(self, task_id: str, request_id: str) -> InputWaiter:
+        """Register (before requesting it) the wait for an input response.
+
+        Parameters
+        ----------
+        task_id : str
+            The task ID.
+        request_id : str
+            The input request ID.
+
+        Returns
+        -------
+        InputWaiter
+            The waiter that gets the responses to the request.
+        """
+        waiter = self._register(task_id, request_id)
+        if not self._wait_subscribed(task_id):
+            LOG.warning("The input response subscriber is not ready")
+        return waiter
+
+    async def a_expect(self, task_id: str, request_id: str) -> InputWaiter:
+        """Async version of :meth:`expect`.
+
+        Parameters
+        ----------
+        task_id : str
+            The task ID.
+        request_id : str
+            The input request ID.
+
+        Returns
+        -------
+        InputWaiter
+            The waiter that gets the responses to the request.
+        """
+        waiter = self._register(task_id, request_id)
+        if not self._is_subscribed(task_id) and not await asyncio.to_thread(
+            self._wait_subscribed, task_id
+        ):
+            LOG.warning("The input response subscriber is not ready")
+        return waiter
+
+    def discard(self, waiter: InputWaiter) -> None:
+        """Stop dispatching responses to a waiter.
+
+        Parameters
+        ----------
+        waiter : InputWaiter
+            The waiter returned by :meth:`expect`.
+        """
+        key = (waiter.task_id, waiter.request_id)
+        channel = RESPONSE_CHANNEL.format(task_id=waiter.task_id)
+        with self._lock:
+            if self._waiters.get(key) is not waiter:
+                return
+            del self._waiters[key]
+            self._channels[channel] -= 1
+            if not self._channels[channel]:
+                # (unsubscribed by the subscriber's thread)
+                del self._channels[channel]
+
+    def dispatch(self, message: dict[str, Any]) -> bool:
+        """Pass a received input response to its waiter.
+
+        Parameters
+        ----------
+        message : dict[str, Any]
+            The Pub/Sub message.
+
+        Returns
+        -------
+        bool
+            Whether a task was waiting for it.
+        """
+        channel = _channel_name(message)
+        task_id = channel.removeprefix("task:").removesuffix(":input_response")
+        response = RedisIOStream.parse_input_message(message)
+        with self._lock:
+            waiter = (
+                self._waiters.get((task_id, response.request_id))
+                if response
+                else None
+            )
+            self._stats["dispatched" if waiter else "dropped"] += 1
+        if waiter is None or response is None:
+            return False
+        waiter.put(response)
+        return True
+
+    def close(self) -> None:
+        """Stop the subscriber and close the connections."""
+        self._closed.set()
+        with self._channels_changed:
+            self._channels_changed.notify_all()
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.join(timeout=5)
+        with self._lock:
+            self._waiters.clear()
+            self._channels.clear()
+        if self._owns_client:
+            RedisIOStream.try_do(self.client.close)
+            RedisIOStream.try_do(self.client.connection_pool.disconnect)
+
+    def _register(self, task_id: str, request_id: str) -> InputWaiter:
+        """Add a waiter and start the subscriber (if not running)."""
+        waiter = InputWaiter(task_id, request_id)
+        channel = RESPONSE_CHANNEL.format(task_id=task_id)
+        with self._lock:
+            previous = self._waiters.get((task_id, request_id))
+            self._waiters[(task_id, request_id)] = waiter
+            if previous is None:
+                self._channels[channel] = self._channels.get(channel, 0) + 1
+        self._ensure_listener()
+        return waiter
+
+    def _is_subscribed(self, task_id: str) -> bool:
+        """Check if a task's input responses are received."""
+        channel = RESPONSE_CHANNEL.format(task_id=task_id)
+        with self._lock:
+            return channel in self._ready
+
+    def _wait_subscribed(self, task_id: str) -> bool:
+        """Wait until a task's input responses are received."""
+        channel = RESPONSE_CHANNEL.format(task_id=task_id)
+        with self._channels_changed:
+            return (
+                self._channels_changed.wait_for(
+                    lambda: channel in self._ready or self.closed,
+                    timeout=self.subscribe_timeout,
+                )
+                and not self.closed
+            )
+
+    def _ensure_listener(self) -> None:
+        """Start the subscriber's thread (if not running)."""
+        with self._lock:
+            if self.closed or (
+                self._listener is not None and self._listener.is_alive()
+            ):
+                return
+            self._listener = threading.Thread(
+                target=self._listen,
+                name="waldiez-redis-subscriber",
+                daemon=True,
+            )
+            self._listener.start()
+
+    def _listen(self) -> None:
+        """Receive and dispatch the input responses until closed."""
+        backoff = 0.1
+        while not self.closed:
+            pubsub: Any = None
+            try:
+                # (the subscribe confirmations tell when a channel is ready)
+                pubsub = self.client.pubsub(ignore_subscribe_messages=False)
+                self._receive(pubsub)
+            except BaseException:
+                LOG.error("Error in the subscriber: %s", tb.format_exc())
+                with self._lock:
+                    self._stats["errors"] += 1
+                # back off while the reconnections fail
+                backoff = (
+                    0.1 if self._subscribed.is_set() else min(backoff * 2, 5.0)
+                )
+                self._subscribed.clear()
+                with self._lock:
+                    self._ready.clear()
+                self._closed.wait(backoff)
+            finally:
+                if pubsub is not None:
+                    RedisIOStream.try_do(pubsub.close)
+        self._subscribed.clear()
+
+    def _receive(self, pubsub: Any) -> None:
+        """Dispatch the messages of a pubsub until closed."""
+        self._subscribed.set()
+        subscribed: set[str] = set()
+        while not self.closed:
+            self._update_channels(pubsub, subscribed)
+            message = pubsub.get_message(timeout=SUBSCRIBE_POLL_INTERVAL)
+            if not message:
+                continue
+            if message.get("type") == "message":
+                self.dispatch(message)
+                continue
+            channel = _channel_name(message)
+            with self._channels_changed:
+                if message.get("type") == "subscribe":
+                    self._ready.add(channel)
+                    self._channels_changed.notify_all()
+                elif message.get("type") == "unsubscribe":
+                    self._ready.discard(channel)
+
+    def _update_channels(self, pubsub: Any, subscribed: set[str]) -> None:
+        """(Un)subscribe the channels of the tasks that (no longer) wait."""
+        with self._lock:
+            wanted = set(self._channels)
+        added = wanted - subscribed
+        removed = subscribed - wanted
+        if added:
+            pubsub.subscribe(*added)
+            subscribed.update(added)
+        if removed:
+            pubsub.unsubscribe(*removed)
+            subscribed.difference_update(removed)
+            with self._lock:
+                self._ready.difference_update(removed)
+
+
+def _channel_name(message: dict[str, Any]) -> str:
+    """Get the channel of a Pub/Sub message."""
+    channel = message.get("channel", "")
+    if isinstance(channel, bytes):  # a client without decode_responses
+        channel = channel.decode("utf-8", errors="replace")
+    return str(channel)
+
+
+def _created_connections(pool: Any) -> int:
+    """Get the number of connections a pool has opened."""
+    connections = getattr(pool, "_connections", None)
+    if isinstance(connections, list):  # BlockingConnectionPool
+        return sum(1 for connection in connections if connection)
+    return int(getattr(pool, "_created_connections", 0))
@@ -18,6 +18,7 @@ from autogen.events import BaseEvent  # type: ignore
 from autogen.io import IOStream  # type: ignore
 from autogen.messages import BaseMessage  # type: ignore
 
+from .codec import PayloadCodec, decode_payload, get_codec
 from .models import (
     PrintMessage,
     UserInputData,
@@ -41,15 +42,19 @@ class StructuredIOStream(IOStream):
     """Structured I/O stream using stdin and stdout."""
 
     uploads_root: Path | None = None
+    codec: PayloadCodec = PayloadCodec()
 
     def __init__(
         self,
         timeout: float = 120,
         uploads_root: Path | str | None = None,
         is_async: bool = False,
+        codec: str | PayloadCodec | None = None,
     ) -> None:
         self.timeout = timeout
         self.is_async = is_async
+        # e.g. from WALDIEZ_IO_CODEC (the runner decodes any codec)
+        self.codec = get_codec(codec)
         if uploads_root is not None:
             self.uploads_root = Path(uploads_root).resolve()
             if not self.uploads_root.exists():
@@ -98,7 +103,9 @@ class StructuredIOStream(IOStream):
             print_message = PrintMessage(data=message)
             payload = print_message.model_dump(mode="json", fallback=str)
             payload["type"] = payload_type
-        dumped = json.dumps(payload, default=str, ensure_ascii=False) + end
+        dumped = (
+            self.codec.dumps(payload, default=str, ensure_ascii=False) + end
+        )
         file = kwargs.get("file", None)
         if file and file in [
             sys.stderr,
@@ -181,7 +188,7 @@ class StructuredIOStream(IOStream):
                     inner_content
                 )
         message_dump["timestamp"] = now()
-        print(json.dumps(message_dump, default=str), flush=True)
+        print(self.codec.dumps(message_dump, default=str), flush=True)
 
     # noinspection PyMethodMayBeStatic
     # pylint: disable=no-self-use
@@ -203,7 +210,7 @@ class StructuredIOStream(IOStream):
             prompt=prompt,
             password=password,
         ).model_dump(mode="json")
-        print(json.dumps(payload, default=str), flush=True)
+        print(self.codec.dumps(payload, default=str), flush=True)
 
     def _read_user_input(
         self,
@@ -280,9 +287,9 @@ class StructuredIOStream(IOStream):
         """
         response: str | dict[str, Any]
         try:
-            # Attempt to parse the input as JSON
-            response = json.loads(user_input_raw)
-        except json.JSONDecodeError:
+            # Attempt to parse the input as JSON (of any codec)
+            response = decode_payload(user_input_raw)
+        except ValueError:
             # If it's not valid JSON, return as is
             # This allows for backwards compatibility with raw text input
             return user_input_raw
@@ -22,6 +22,7 @@ from ._ws import (
     create_websocket_adapter,
     is_websocket_available,
 )
+from .codec import PayloadCodec, decode_payload, get_codec
 from .models import UserResponse
 from .utils import (
     get_message_dump,
@@ -52,6 +53,7 @@ class AsyncWebsocketsIOStream(IOStream):
         uploads_root: str | Path | None = None,
         verbose: bool = False,
         receive_timeout: float | None = 120.0,
+        codec: str | PayloadCodec | None = None,
     ) -> None:
         """Initialize the AsyncWebsocketsIOStream instance.
 
@@ -68,6 +70,10 @@ class AsyncWebsocketsIOStream(IOStream):
         receive_timeout : float | None
             Default timeout for receiving messages in seconds.
             If None, defaults to 120 seconds.
+        codec : str | PayloadCodec | None
+            The encoding of the sent messages (see :mod:`waldiez.io.codec`).
+            If None, the ``WALDIEZ_IO_CODEC`` environment variable
+            (or plain JSON) is used.
         """
         super().__init__()
 
@@ -82,6 +88,7 @@ class AsyncWebsocketsIOStream(IOStream):
         self.is_async = is_async
         self.verbose = verbose
         self.receive_timeout = receive_timeout
+        self.codec = get_codec(codec)
 
         if isinstance(uploads_root, str):  # pragma: no cover
             uploads_root = Path(uploads_root)
@@ -128,7 +135,7 @@ class AsyncWebsocketsIOStream(IOStream):
         else:
             msg = f"{msg}{end}"
 
-        json_dump = json.dumps(
+        json_dump = self.codec.dumps(
             {
                 "type": "print",
                 "data": msg,
@@ -162,7 +169,7 @@ class AsyncWebsocketsIOStream(IOStream):
                 )
                 message_dump["content"] = content_block
 
-        json_dump = json.dumps(message_dump, ensure_ascii=False)
+        json_dump = self.codec.dumps(message_dump, ensure_ascii=False)
 
         if self.verbose:
             LOG.info("sending: \n%s\n", json_dump)
@@ -223,7 +230,7 @@ class AsyncWebsocketsIOStream(IOStream):
             timeout = self.receive_timeout or 120.0
 
         request_id = uuid.uuid4().hex
-        prompt_dump = json.dumps(
+        prompt_dump = self.codec.dumps(
             {
                 "id": request_id,
                 "timestamp": now(),
@@ -251,8 +258,8 @@ class AsyncWebsocketsIOStream(IOStream):
 
         response_dict: dict[str, Any] | str
         try:
-            response_dict = json.loads(response)
-        except json.JSONDecodeError:
+            response_dict = decode_payload(response)
+        except ValueError:
             return response
 
         if not isinstance(response_dict, dict):
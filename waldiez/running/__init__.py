@@ -4,11 +4,13 @@
 
 from .base_runner import WaldiezBaseRunner
 from .exceptions import StopRunningException
+from .snapshots import SnapshotPolicy
 from .standard_runner import WaldiezStandardRunner
 from .step_by_step import WaldiezStepByStepRunner
 from .subprocess_runner import WaldiezSubprocessRunner
 
 __all__ = [
+    "SnapshotPolicy",
     "StopRunningException",
     "WaldiezBaseRunner",
     "WaldiezStandardRunner",
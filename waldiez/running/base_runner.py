@@ -3,13 +3,13 @@
 
 # pyright: reportUnknownMemberType=false, reportAttributeAccessIssue=false
 # pyright: reportUnknownArgumentType=false, reportUnusedParameter=false
+# pylint: disable=too-many-lines,too-many-statements
 """Base runner for Waldiez workflows."""
 
 import importlib.util
 import json
 import shutil
 import sys
-import tempfile
 import threading
 import traceback as tb
 from pathlib import Path
@@ -17,14 +17,17 @@ from types import ModuleType, TracebackType
 from typing import Any
 
 import aiofiles
+import anyio.to_thread
 from aiofiles.os import wrap
 from anyio.from_thread import start_blocking_portal
 from typing_extensions import Self, override
 
 from waldiez.exporter import WaldiezExporter
+from waldiez.exporting.cache import ExportCache
 from waldiez.logger import WaldiezLogger, get_logger
 from waldiez.models import Waldiez
 from waldiez.storage import StorageManager, WaldiezCheckpoint, safe_name
+from waldiez.storage.compression import file_compression
 
 from .dir_utils import a_chdir, chdir
 from .environment import reset_env_vars, set_env_vars
@@ -77,9 +80,14 @@ class WaldiezBaseRunner(WaldiezRunnerProtocol, RequirementsMixin, ResultsMixin):
         EventsMixin.set_print_function(print)
         EventsMixin.set_send_function(print)
         EventsMixin.set_async(waldiez.is_async)
+        EventsMixin.set_snapshot_policy(kwargs.pop("snapshot_policy", None))
+        self._skip_db_exports = bool(kwargs.pop("skip_db_exports", False))
         RequirementsMixin.__init__(self)
         self._called_install_requirements = False
         self._exporter = WaldiezExporter(waldiez)
+        self._export_cache = ExportCache.from_option(
+            kwargs.pop("export_cache", None)
+        )
         self._stop_requested = threading.Event()
         self._last_results: list[dict[str, Any]] = []
         self._last_exception: Exception | None = None
@@ -264,6 +272,30 @@ class WaldiezBaseRunner(WaldiezRunnerProtocol, RequirementsMixin, ResultsMixin):
         self._loaded_module = module
         return module
 
+    def _export(
+        self,
+        file_name: str,
+        uploads_root: Path | None,
+        structured_io: bool,
+    ) -> None:
+        """Export the flow, reusing a cached export if enabled."""
+        if self._export_cache is None:
+            self._exporter.export(
+                path=file_name,
+                force=True,
+                uploads_root=uploads_root,
+                structured_io=structured_io,
+            )
+            return
+        if self._export_cache.export(
+            self._exporter,
+            path=file_name,
+            force=True,
+            uploads_root=uploads_root,
+            structured_io=structured_io,
+        ):
+            self.log.debug("Using the cached export of the flow")
+
     def _before_run(
         self,
         output_file: Path,
@@ -271,13 +303,12 @@ class WaldiezBaseRunner(WaldiezRunnerProtocol, RequirementsMixin, ResultsMixin):
     ) -> Path:
         """Run before the flow execution."""
         self.log.info("Preparing workflow file: %s", output_file)
-        temp_dir = Path(tempfile.mkdtemp(prefix="wlz-"))
+        temp_dir = WaldiezBaseRunner._storage_manager.make_tmp_dir()
         self._output_dir = temp_dir
         file_name = output_file.name
         with chdir(to=temp_dir):
-            self._exporter.export(
-                path=file_name,
-                force=True,
+            self._export(
+                file_name,
                 uploads_root=uploads_root,
                 structured_io=WaldiezBaseRunner._structured_io,
             )
@@ -294,15 +325,14 @@ class WaldiezBaseRunner(WaldiezRunnerProtocol, RequirementsMixin, ResultsMixin):
         uploads_root: Path | None,
     ) -> Path:
         """Run before the flow execution asynchronously."""
-        temp_dir = Path(tempfile.mkdtemp(prefix="wlz-"))
+        temp_dir = WaldiezBaseRunner._storage_manager.make_tmp_dir()
         self._output_dir = temp_dir
         file_name = output_file.name
         async with a_chdir(to=temp_dir):
-            self._exporter.export(
-                path=file_name,
+            self._export(
+                file_name,
                 uploads_root=uploads_root,
                 structured_io=self.structured_io,
-                force=True,
             )
             if self.dot_env_path and self.dot_env_path.is_file():
                 wrapped = wrap(shutil.copyfile)
@@ -354,6 +384,7 @@ class WaldiezBaseRunner(WaldiezRunnerProtocol, RequirementsMixin, ResultsMixin):
         """Run after the flow execution."""
         # Save results
         self._last_results = results
+        EventsMixin.flush_snapshots()
 
         # Reset stop flag for next run
         self._stop_requested.clear()
@@ -370,6 +401,7 @@ class WaldiezBaseRunner(WaldiezRunnerProtocol, RequirementsMixin, ResultsMixin):
                 skip_mmd=skip_mmd,
                 skip_timeline=skip_timeline,
                 storage_manager=WaldiezBaseRunner._storage_manager,
+                skip_db_exports=self._skip_db_exports,
             )
         except BaseException as exc:  # pragma: no cover
             self.log.warning("Error occurred during after_run: %s", exc)
@@ -389,6 +421,7 @@ class WaldiezBaseRunner(WaldiezRunnerProtocol, RequirementsMixin, ResultsMixin):
     ) -> Path | None:
         """Run after the flow execution asynchronously."""
         self._last_results = results
+        await anyio.to_thread.run_sync(EventsMixin.flush_snapshots)
         self._stop_requested.clear()
         # pylint: disable=broad-exception-caught
         try:
@@ -402,6 +435,7 @@ class WaldiezBaseRunner(WaldiezRunnerProtocol, RequirementsMixin, ResultsMixin):
                 uploads_root=uploads_root,
                 skip_mmd=skip_mmd,
                 skip_timeline=skip_timeline,
+                skip_db_exports=self._skip_db_exports,
             )
         except BaseException as exc:  # pragma: no cover
             self.log.warning("Error occurred during a_after_run: %s", exc)
@@ -886,10 +920,14 @@ class WaldiezBaseRunner(WaldiezRunnerProtocol, RequirementsMixin, ResultsMixin):
     @property
     def state_json(self) -> Path | None:
         """Get the state.json path to resume from if any."""
-        if WaldiezBaseRunner._checkpoint:
-            state_file = WaldiezBaseRunner._checkpoint.state_file
-            if state_file.is_file():
+        checkpoint = WaldiezBaseRunner._checkpoint
+        if checkpoint:
+            state_file = checkpoint.state_file
+            if state_file.is_file() and file_compression(state_file) == "none":
                 return state_file
+            if state_file.is_file() or checkpoint.exists:
+                # the flow reads plain json files: use (decompressed) copies
+                return checkpoint.export_state(self._output_dir)
         return None
 
     @classmethod
@@ -0,0 +1,146 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pyright: reportUnknownMemberType=false, reportUnknownVariableType=false
+# pyright: reportUnknownArgumentType=false
+
+"""Post-run reports generated straight from the sqlite runtime log."""
+
+import sqlite3
+from collections.abc import Callable
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .db_utils import DEFAULT_FETCH_SIZE, stream_sqlite_table
+from .gen_seq_diagram import SequenceDiagram
+from .timeline_processor import TimelineProcessor
+
+EVENTS_TABLE = "events"
+TIMELINE_TABLES = {
+    "agents": "agents",
+    "chat": "chat_completions",
+    "functions": "function_calls",
+}
+
+
+@dataclass
+class FlowDbReports:
+    """The reports generated from a flow.db file."""
+
+    mermaid: str | None = None
+    timeline: dict[str, Any] | None = None
+
+
+def read_table_frame(
+    conn: sqlite3.Connection,
+    table: str,
+    on_row: Callable[[dict[str, Any]], None] | None = None,
+    keep_rows: bool = True,
+    fetch_size: int = DEFAULT_FETCH_SIZE,
+) -> pd.DataFrame | None:
+    """Stream a sqlite table, optionally collecting it in a DataFrame.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The sqlite connection.
+    table : str
+        The table name.
+    on_row : Callable[[dict[str, Any]], None] | None
+        Optional callback to call with each row.
+    keep_rows : bool
+        Whether to collect the rows in a DataFrame.
+    fetch_size : int
+        The number of rows to fetch at a time.
+
+    Returns
+    -------
+    pd.DataFrame | None
+        The table's data (without any rows if not kept),
+        or None if the table could not be read.
+    """
+    try:
+        column_names, rows = stream_sqlite_table(conn, table, fetch_size)
+    except sqlite3.Error:
+        return None
+    columns: list[list[Any]] = [[] for _ in column_names]
+    for row in rows:
+        if on_row is not None:
+            on_row(dict(zip(column_names, row, strict=True)))
+        if keep_rows:
+            for column, value in zip(columns, row, strict=True):
+                column.append(value)
+    return pd.DataFrame(
+        dict(zip(column_names, columns, strict=True)), columns=column_names
+    )
+
+
+def generate_db_reports(
+    flow_db: Path,
+    mermaid: bool = True,
+    timeline: bool = True,
+    fetch_size: int = DEFAULT_FETCH_SIZE,
+) -> FlowDbReports | None:
+    """Generate the sequence diagram and the timeline from a flow.db file.
+
+    The events table is read once and fed both to the sequence diagram
+    and to the timeline processor, without any intermediate csv files.
+
+    Parameters
+    ----------
+    flow_db : Path
+        The path to the sqlite runtime log.
+    mermaid : bool
+        Whether to generate the mermaid sequence diagram.
+    timeline : bool
+        Whether to generate the timeline.
+    fetch_size : int
+        The number of rows to fetch at a time.
+
+    Returns
+    -------
+    FlowDbReports | None
+        The generated reports, or None if the log has no events table.
+        If the timeline processing fails, its entry is None.
+    """
+    with closing(sqlite3.connect(flow_db)) as conn:
+        diagram = SequenceDiagram() if mermaid else None
+
+        def _on_event(event: dict[str, Any]) -> None:
+            if diagram is not None:  # pragma: no branch
+                diagram.add_event(
+                    event.get("json_state"),
+                    event.get("event_name"),
+                    event.get("source_name"),
+                )
+
+        events = read_table_frame(
+            conn,
+            EVENTS_TABLE,
+            on_row=_on_event if diagram is not None else None,
+            keep_rows=timeline,
+            fetch_size=fetch_size,
+        )
+        if events is None:
+            return None
+        reports = FlowDbReports(
+            mermaid=diagram.render() if diagram is not None else None
+        )
+        if not timeline:
+            return reports
+        frames = {
+            key: read_table_frame(conn, table, fetch_size=fetch_size)
+            for key, table in TIMELINE_TABLES.items()
+        }
+    # pylint: disable=broad-exception-caught
+    try:
+        processor = TimelineProcessor()
+        processor.load_data_frames(events=events, **frames)
+        reports.timeline = processor.process_timeline()
+    except Exception:
+        reports.timeline = None
+    return reports
@@ -5,19 +5,97 @@
 
 """Db / sqlite related utils."""
 
+import asyncio
 import csv
 import json
+import os
 import sqlite3
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 import aiofiles
 import aiosqlite
 from aiocsv import AsyncDictWriter
 
+DEFAULT_FETCH_SIZE = 1000
+
+
+# noinspection SqlNoDataSourceInspection
+def stream_sqlite_table(
+    conn: sqlite3.Connection,
+    table: str,
+    fetch_size: int = DEFAULT_FETCH_SIZE,
+) -> tuple[list[str], Iterator[tuple[Any, ...]]]:
+    """Stream the rows of a sqlite table in batches.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The sqlite connection.
+    table : str
+        The table name.
+    fetch_size : int
+        The number of rows to fetch at a time.
+
+    Returns
+    -------
+    tuple[list[str], Iterator[tuple[Any, ...]]]
+        The column names and an iterator over the rows.
+
+    Raises
+    ------
+    sqlite3.Error
+        If the table cannot be queried (e.g. it does not exist).
+    """
+    cursor = conn.execute(f"SELECT * FROM {table}")  # nosec
+    column_names = [description[0] for description in cursor.description]
+
+    def _rows() -> Iterator[tuple[Any, ...]]:
+        try:
+            for batch in iter(lambda: cursor.fetchmany(fetch_size), []):
+                yield from batch
+        finally:
+            cursor.close()
+
+    return column_names, _rows()
+
+
+def _json_array_items(data: list[dict[str, Any]], count: int) -> str:
+    """Get the (indented) JSON array items of a batch of rows.
+
+    Parameters
+    ----------
+    data : list[dict[str, Any]]
+        The rows (column name -> value).
+    count : int
+        The number of rows already in the array.
+
+    Returns
+    -------
+    str
+        The rows' JSON, to append to the array.
+    """
+    chunk = ""
+    for index, item in enumerate(data, start=count):
+        item_json = json.dumps(item, indent=4, ensure_ascii=False)
+        chunk += ",\n    " if index else "[\n    "
+        chunk += item_json.replace("\n", "\n    ")
+    return chunk
+
 
 # noinspection PyBroadException,SqlNoDataSourceInspection
-def get_sqlite_out(dbname: str, table: str, csv_file: str) -> None:
+def get_sqlite_out(
+    dbname: str,
+    table: str,
+    csv_file: str,
+    fetch_size: int = DEFAULT_FETCH_SIZE,
+) -> None:
     """Convert a sqlite table to csv and json files.
 
+    The rows are fetched and written in batches,
+    so the memory used does not depend on the table's size.
+
     Parameters
     ----------
     dbname : str
@@ -26,6 +104,8 @@ def get_sqlite_out(dbname: str, table: str, csv_file: str) -> None:
         The table name.
     csv_file : str
         The csv file name.
+    fetch_size : int
+        The number of rows to fetch (and write) at a time.
     """
     # pylint: disable=broad-exception-caught,too-many-try-statements
     try:
@@ -38,35 +118,43 @@ def get_sqlite_out(dbname: str, table: str, csv_file: str) -> None:
     except BaseException:  # pragma: no cover
         conn.close()
         return
+    json_file = csv_file.replace(".csv", ".json")
     try:
-        rows = cursor.fetchall()
         column_names = [description[0] for description in cursor.description]
-        data = [dict(zip(column_names, row, strict=True)) for row in rows]
-        cursor.close()
-        conn.close()
-    except BaseException:  # pragma: no cover
-        try:
-            cursor.close()
-            conn.close()
-        except BaseException:
-            pass
-        return
-    try:
-        with open(csv_file, "w", newline="", encoding="utf-8") as file:
+        with (
+            open(csv_file, "w", newline="", encoding="utf-8") as file,
+            open(json_file, "w", encoding="utf-8", newline="\n") as json_out,
+        ):
             csv_writer = csv.DictWriter(file, fieldnames=column_names)
             csv_writer.writeheader()
-            csv_writer.writerows(data)
-        json_file = csv_file.replace(".csv", ".json")
-        with open(json_file, "w", encoding="utf-8", newline="\n") as file:
-            json.dump(data, file, indent=4, ensure_ascii=False)
+            count = 0
+            for rows in iter(lambda: cursor.fetchmany(fetch_size), []):
+                data = [
+                    dict(zip(column_names, row, strict=True)) for row in rows
+                ]
+                csv_writer.writerows(data)
+                json_out.write(_json_array_items(data, count))
+                count += len(data)
+            json_out.write("\n]" if count else "[]")
     except BaseException:  # pragma: no cover
-        return
+        pass
+    finally:
+        cursor.close()
+        conn.close()
 
 
 # noinspection PyBroadException,SqlNoDataSourceInspection
-async def a_get_sqlite_out(dbname: str, table: str, csv_file: str) -> None:
+async def a_get_sqlite_out(
+    dbname: str,
+    table: str,
+    csv_file: str,
+    fetch_size: int = DEFAULT_FETCH_SIZE,
+) -> None:
     """Convert a sqlite table to csv and json files.
 
+    The rows are fetched and written in batches,
+    so the memory used does not depend on the table's size.
+
     Parameters
     ----------
     dbname : str
@@ -75,6 +163,8 @@ async def a_get_sqlite_out(dbname: str, table: str, csv_file: str) -> None:
         The table name.
     csv_file : str
         The csv file name.
+    fetch_size : int
+        The number of rows to fetch (and write) at a time.
     """
     # pylint: disable=broad-exception-caught,too-many-try-statements
     try:
@@ -87,30 +177,93 @@ async def a_get_sqlite_out(dbname: str, table: str, csv_file: str) -> None:
     except BaseException:  # pragma: no cover
         await conn.close()
         return
+    json_file = csv_file.replace(".csv", ".json")
     try:
-        rows = await cursor.fetchall()
         column_names = [description[0] for description in cursor.description]
-        data = [dict(zip(column_names, row, strict=True)) for row in rows]
-        await cursor.close()
-        await conn.close()
-    except BaseException:  # pragma: no cover
-        try:
-            await cursor.close()
-            await conn.close()
-        except BaseException:
-            pass
-        return
-    try:
-        async with aiofiles.open(
-            csv_file, "w", newline="", encoding="utf-8"
-        ) as file:
+        async with (
+            aiofiles.open(csv_file, "w", newline="", encoding="utf-8") as file,
+            aiofiles.open(
+                json_file, "w", encoding="utf-8", newline="\n"
+            ) as json_out,
+        ):
             csv_writer = AsyncDictWriter(file, fieldnames=column_names)
             await csv_writer.writeheader()
-            await csv_writer.writerows(data)
-        json_file = csv_file.replace(".csv", ".json")
-        async with aiofiles.open(
-            json_file, "w", encoding="utf-8", newline="\n"
-        ) as file:
-            await file.write(json.dumps(data, indent=4, ensure_ascii=False))
+            count = 0
+            while rows := await cursor.fetchmany(fetch_size):
+                data = [
+                    dict(zip(column_names, row, strict=True)) for row in rows
+                ]
+                await csv_writer.writerows(data)
+                await json_out.write(_json_array_items(data, count))
+                count += len(data)
+            await json_out.write("\n]" if count else "[]")
     except BaseException:  # pragma: no cover
+        pass
+    finally:
+        await cursor.close()
+        await conn.close()
+
+
+def export_sqlite_tables(
+    dbname: str,
+    tables: Iterable[str],
+    dest_dir: str,
+    max_workers: int | None = None,
+) -> None:
+    """Export sqlite tables to csv and json files, in parallel.
+
+    Parameters
+    ----------
+    dbname : str
+        The sqlite database name.
+    tables : Iterable[str]
+        The names of the tables to export.
+    dest_dir : str
+        The directory to write the files to (``<table>.csv/json``).
+    max_workers : int | None
+        The maximum number of tables to export at the same time
+        (1 to export them one by one), by default one per table, up to 4.
+    """
+    jobs = [(table, os.path.join(dest_dir, f"{table}.csv")) for table in tables]
+    if not jobs:
+        return
+    workers = max_workers or min(len(jobs), 4)
+    if workers <= 1 or len(jobs) == 1:
+        for table, csv_file in jobs:
+            get_sqlite_out(dbname, table, csv_file)
         return
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="waldiez-sqlite-out"
+    ) as executor:
+        futures = [
+            executor.submit(get_sqlite_out, dbname, table, csv_file)
+            for table, csv_file in jobs
+        ]
+        for future in futures:
+            future.result()
+
+
+async def a_export_sqlite_tables(
+    dbname: str,
+    tables: Iterable[str],
+    dest_dir: str,
+) -> None:
+    """Export sqlite tables to csv and json files, concurrently.
+
+    Parameters
+    ----------
+    dbname : str
+        The sqlite database name.
+    tables : Iterable[str]
+        The names of the tables to export.
+    dest_dir : str
+        The directory to write the files to (``<table>.csv/json``).
+    """
+    await asyncio.gather(
+        *(
+            a_get_sqlite_out(
+                dbname, table, os.path.join(dest_dir, f"{table}.csv")
+            )
+            for table in tables
+        )
+    )
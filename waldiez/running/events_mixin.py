@@ -18,12 +18,15 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Optional, Union
 
 import aiofiles
+import anyio.to_thread
 
 from waldiez.storage import WaldiezCheckpoint
+from waldiez.storage.checkpoint import HISTORY_JOURNAL_FILE, HistoryEncoder
 from waldiez.storage.storage_manager import StorageManager
 
 from .async_utils import is_async_callable, syncify
 from .io_utils import input_async, input_sync
+from .snapshots import SnapshotPolicy, StateSnapshot, StateSnapshotter
 
 if TYPE_CHECKING:
     from autogen.agentchat import ConversableAgent  # type: ignore
@@ -38,6 +41,9 @@ class EventsMixin:
     _print: Callable[..., None]
     _send: Union[Callable[["BaseMessage"], None], Callable[["BaseEvent"], None]]
     _is_async: bool
+    _snapshotter: StateSnapshotter | None = None
+    # per journal file (of the most recent runs)
+    _history_encoders: dict[Path, HistoryEncoder] = {}
 
     @staticmethod
     def set_input_function(
@@ -89,6 +95,51 @@ class EventsMixin:
         """
         EventsMixin._is_async = value
 
+    @staticmethod
+    def set_snapshot_policy(policy: SnapshotPolicy | None) -> None:
+        """Set the policy for snapshotting the group chat state.
+
+        Any pending snapshots of the previous policy are flushed first.
+
+        Parameters
+        ----------
+        policy : SnapshotPolicy | None
+            The policy to use (None for the default: every event, inline).
+        """
+        if EventsMixin._snapshotter is not None:
+            EventsMixin._snapshotter.close()
+        EventsMixin._snapshotter = StateSnapshotter(
+            writer=EventsMixin._write_snapshot,
+            policy=policy if isinstance(policy, SnapshotPolicy) else None,
+        )
+
+    @staticmethod
+    def _get_snapshotter() -> StateSnapshotter:
+        """Get the state snapshotter.
+
+        Returns
+        -------
+        StateSnapshotter
+            The snapshotter to use when processing events.
+        """
+        snapshotter = EventsMixin._snapshotter
+        if snapshotter is None:
+            snapshotter = StateSnapshotter(writer=EventsMixin._write_snapshot)
+            EventsMixin._snapshotter = snapshotter
+        return snapshotter
+
+    @staticmethod
+    def flush_snapshots(timeout: float | None = None) -> None:
+        """Wait for any pending state snapshots to be written.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Optional maximum time to wait in seconds.
+        """
+        if EventsMixin._snapshotter is not None:
+            EventsMixin._snapshotter.flush(timeout=timeout)
+
     @staticmethod
     def do_print(*args: Any, **kwargs: Any) -> None:
         """Print a message to the output stream.
@@ -207,6 +258,69 @@ class EventsMixin:
         state["context_variables"] = context_variables
         return state
 
+    @staticmethod
+    def _get_metadata_to_save(manager: "ConversableAgent") -> dict[str, Any]:
+        return {
+            "type": "group",
+            "group": {
+                "manager": getattr(manager, "_name", manager.name),
+                "pattern": "",
+            },
+        }
+
+    @staticmethod
+    def _capture_snapshot(
+        manager: "ConversableAgent", output_dir: Path
+    ) -> StateSnapshot:
+        state = EventsMixin._get_state_to_save(manager)
+        # shallow copies: the group chat keeps mutating its own containers
+        state["messages"] = list(state["messages"])
+        return StateSnapshot(
+            output_dir=output_dir,
+            state=state,
+            metadata=EventsMixin._get_metadata_to_save(manager),
+        )
+
+    @staticmethod
+    def _write_snapshot(snapshot: StateSnapshot) -> None:
+        """Write a captured state snapshot.
+
+        Parameters
+        ----------
+        snapshot : StateSnapshot
+            The snapshot to write.
+        """
+        output_dir = snapshot.output_dir
+        state = snapshot.state
+        if state["context_variables"] or state["messages"]:
+            with open(output_dir / "state.json", "w", encoding="utf-8") as f:
+                f.write(json.dumps(state, default=str, indent=2))
+        with open(output_dir / "metadata.json", "w", encoding="utf-8") as f:
+            f.write(json.dumps(snapshot.metadata, default=str, indent=2))
+        EventsMixin.save_history(output_dir=output_dir, state=state)
+
+    @staticmethod
+    async def _a_write_snapshot(snapshot: StateSnapshot) -> None:
+        """Write a captured state snapshot (async).
+
+        Parameters
+        ----------
+        snapshot : StateSnapshot
+            The snapshot to write.
+        """
+        output_dir = snapshot.output_dir
+        state = snapshot.state
+        if state["context_variables"] or state["messages"]:
+            async with aiofiles.open(
+                output_dir / "state.json", "w", encoding="utf-8"
+            ) as f:
+                await f.write(json.dumps(state, default=str, indent=2))
+        async with aiofiles.open(
+            output_dir / "metadata.json", "w", encoding="utf-8"
+        ) as f:
+            await f.write(json.dumps(snapshot.metadata, default=str, indent=2))
+        await EventsMixin.a_save_history(output_dir=output_dir, state=state)
+
     @staticmethod
     async def a_save_state(
         manager: "ConversableAgent", output_dir: Path
@@ -240,77 +354,64 @@ class EventsMixin:
         output_dir : Path
             The output directory to save the state.
         """
-        metadata_dict = {
-            "type": "group",
-            "group": {
-                "manager": getattr(manager, "_name", manager.name),
-                "pattern": "",
-            },
-        }
+        metadata_dict = EventsMixin._get_metadata_to_save(manager)
         async with aiofiles.open(
             output_dir / "metadata.json", "w", encoding="utf-8"
         ) as f:
             await f.write(json.dumps(metadata_dict, default=str, indent=2))
 
     @staticmethod
-    async def a_save_history(output_dir: Path) -> None:
-        """Append the current state and metadata to history.json (async).
+    def _get_history_entry(
+        output_dir: Path, state: dict[str, Any] | None
+    ) -> dict[str, Any] | None:
+        if state is None:
+            state = StorageManager.load_dict(output_dir / "state.json")
+        if not state or not (
+            state.get("messages") or state.get("context_variables")
+        ):
+            return None
+        return {
+            "timestamp": WaldiezCheckpoint.format_timestamp(
+                datetime.now(timezone.utc)
+            ),
+            "state": state,
+        }
 
-        Reads the latest `state.json` and `metadata.json` (if present) and
-        appends them to a list in `history.json`. Each entry includes a UTC
-        ISO timestamp. Missing or malformed files are handled gracefully.
+    @staticmethod
+    def _encode_history_entry(journal_file: Path, entry: dict[str, Any]) -> str:
+        encoders = EventsMixin._history_encoders
+        encoder = encoders.get(journal_file)
+        if encoder is None:
+            while len(encoders) >= 8:
+                encoders.pop(next(iter(encoders)), None)
+            encoder = encoders.setdefault(journal_file, HistoryEncoder())
+        return encoder.encode(journal_file, entry)
+
+    @staticmethod
+    async def a_save_history(
+        output_dir: Path, state: dict[str, Any] | None = None
+    ) -> None:
+        """Append the current state to the history journal (async).
+
+        Each call appends a single line to `history.jsonl`, so the cost
+        does not grow with the number of entries already recorded.
+        Only the changes since the previous entry are stored,
+        with a full state every few entries.
 
         Parameters
         ----------
         output_dir : Path
             The output directory where the files are stored.
+        state : dict[str, Any] | None
+            The state to record (defaults to the contents of `state.json`).
         """
-        state_file = output_dir / "state.json"
-        metadata_file = output_dir / "metadata.json"
-        history_file = output_dir / "history.json"
-
-        # If either state or metadata is missing, there's nothing to record.
-        if not state_file.exists() or not metadata_file.exists():
+        entry = EventsMixin._get_history_entry(output_dir, state)
+        if entry is None:
             return
-
-        async def _read_json(path: Path) -> dict[str, Any] | list[Any] | None:
-            # pylint: disable=broad-exception-caught
-            # noinspection PyBroadException
-            try:
-                async with aiofiles.open(path, "r", encoding="utf-8") as f_in:
-                    text = await f_in.read()
-                return json.loads(text)
-            except Exception:
-                return None
-
-        state_data = await _read_json(state_file)
-        metadata_data = await _read_json(metadata_file)
-
-        if state_data is None or metadata_data is None:
-            # If either is unreadable, skip appending
-            return
-
-        entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "state": state_data,
-            "metadata": metadata_data,
-        }
-
-        # Load existing history (if present)
-        history: list[dict[str, Any]] = []
-        if history_file.exists():
-            existing = await _read_json(history_file)
-            if isinstance(existing, list):
-                history = existing
-            elif existing is not None:
-                # If someone wrote a non-list, wrap it to preserve data
-                history = [existing]
-
-        history.append(entry)
-
-        # Write back updated history
-        async with aiofiles.open(history_file, "w", encoding="utf-8") as f_out:
-            await f_out.write(json.dumps(history, default=str, indent=2))
+        journal_file = output_dir / HISTORY_JOURNAL_FILE
+        line = EventsMixin._encode_history_entry(journal_file, entry)
+        async with aiofiles.open(journal_file, "a", encoding="utf-8") as f:
+            await f.write(line)
 
     @staticmethod
     async def a_process_event(
@@ -334,11 +435,11 @@ class EventsMixin:
         """
         group_manager = EventsMixin._find_group_manager(agents)
         if group_manager:
-            await EventsMixin.a_save_state(group_manager, output_dir=output_dir)
-            await EventsMixin.a_save_metadata(
-                group_manager, output_dir=output_dir
+            await EventsMixin._a_snapshot(
+                group_manager,
+                output_dir=output_dir,
+                event_type=str(getattr(event, "type", "")),
             )
-            await EventsMixin.a_save_history(output_dir=output_dir)
         if hasattr(event, "type"):  # pragma: no branch
             if getattr(event, "type", "") == "input_request":
                 prompt = getattr(
@@ -383,55 +484,35 @@ class EventsMixin:
         output_dir : Path
             The output directory to save the state.
         """
-        metadata_dict = {
-            "type": "group",
-            "group": {
-                "manager": getattr(manager, "_name", manager.name),
-                "pattern": "",
-            },
-        }
+        metadata_dict = EventsMixin._get_metadata_to_save(manager)
         with open(output_dir / "metadata.json", "w", encoding="utf-8") as f:
             f.write(json.dumps(metadata_dict, default=str, indent=2))
 
     @staticmethod
-    def save_history(output_dir: Path) -> None:
-        """Append the current state and metadata to history.json.
+    def save_history(
+        output_dir: Path, state: dict[str, Any] | None = None
+    ) -> None:
+        """Append the current state to the history journal.
 
-        Reads the latest `state.json` and `metadata.json` (if present) and
-        appends them to a list in `history.json`. Each entry includes a UTC
-        ISO timestamp.
+        Each call appends a single line to `history.jsonl`, so the cost
+        does not grow with the number of entries already recorded.
+        Only the changes since the previous entry are stored,
+        with a full state every few entries.
 
         Parameters
         ----------
         output_dir : Path
             The output directory where the files are stored.
+        state : dict[str, Any] | None
+            The state to record (defaults to the contents of `state.json`).
         """
-        state_file = output_dir / "state.json"
-        metadata_file = output_dir / "metadata.json"
-        history_file = output_dir / "history.json"
-        # pylint: disable=broad-exception-caught
-        state = StorageManager.load_dict(state_file)
-        metadata = StorageManager.load_dict(metadata_file)
-        if not state:  # pragma: no cover
+        entry = EventsMixin._get_history_entry(output_dir, state)
+        if entry is None:
             return
-        history = StorageManager.load_list(history_file, "history")
-        # Compose the new history entry
-        entry = {
-            "timestamp": WaldiezCheckpoint.format_timestamp(
-                datetime.now(timezone.utc)
-            ),
-            "state": state,
-        }
-        # Append new entry and write back
-        history.append(entry)
-        with open(history_file, "w", encoding="utf-8") as f:
-            f.write(
-                json.dumps(
-                    {"history": history, "metadata": metadata},
-                    default=str,
-                    indent=2,
-                )
-            )
+        journal_file = output_dir / HISTORY_JOURNAL_FILE
+        line = EventsMixin._encode_history_entry(journal_file, entry)
+        with open(journal_file, "a", encoding="utf-8") as f:
+            f.write(line)
 
     @staticmethod
     def process_event(
@@ -455,9 +536,11 @@ class EventsMixin:
         """
         group_manager = EventsMixin._find_group_manager(agents)
         if group_manager:
-            EventsMixin.save_state(group_manager, output_dir=output_dir)
-            EventsMixin.save_metadata(group_manager, output_dir=output_dir)
-            EventsMixin.save_history(output_dir=output_dir)
+            EventsMixin._snapshot(
+                group_manager,
+                output_dir=output_dir,
+                event_type=str(getattr(event, "type", "")),
+            )
         if hasattr(event, "type"):  # pragma: no branch
             if event.type == "input_request":
                 prompt = getattr(
@@ -475,6 +558,34 @@ class EventsMixin:
             elif not skip_send:
                 EventsMixin._send(event)  # pyright: ignore[reportArgumentType]
 
+    @staticmethod
+    def _snapshot(
+        manager: "ConversableAgent", output_dir: Path, event_type: str
+    ) -> None:
+        snapshotter = EventsMixin._get_snapshotter()
+        if not snapshotter.should_snapshot(event_type):
+            return
+        snapshot = EventsMixin._capture_snapshot(manager, output_dir)
+        snapshotter.submit(
+            snapshot, wait=snapshotter.policy.is_forced(event_type)
+        )
+
+    @staticmethod
+    async def _a_snapshot(
+        manager: "ConversableAgent", output_dir: Path, event_type: str
+    ) -> None:
+        snapshotter = EventsMixin._get_snapshotter()
+        if not snapshotter.should_snapshot(event_type):
+            return
+        snapshot = EventsMixin._capture_snapshot(manager, output_dir)
+        if not snapshotter.policy.background:
+            await EventsMixin._a_write_snapshot(snapshot)
+            snapshotter.mark_written()
+            return
+        snapshotter.submit(snapshot)
+        if snapshotter.policy.is_forced(event_type):
+            await anyio.to_thread.run_sync(snapshotter.flush)
+
     @staticmethod
     def _find_group_manager(
         agents: list["ConversableAgent"],
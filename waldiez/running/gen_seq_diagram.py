@@ -64,7 +64,82 @@ def get_json_state(json_state: Any) -> dict[str, Any]:
     return {}
 
 
-# pylint: disable=too-many-locals
+class SequenceDiagram:
+    """Incrementally build a Mermaid sequence diagram from events."""
+
+    def __init__(self) -> None:
+        """Initialize an empty diagram."""
+        # Set to store participants (senders and recipients)
+        self._participants: set[str] = set()
+        self._lines: list[str] = []
+
+    def add_event(
+        self, json_state: Any, event_name: Any, source_name: Any
+    ) -> None:
+        """Add an event to the diagram.
+
+        Parameters
+        ----------
+        json_state : Any
+            The JSON state of the event (string or dict).
+        event_name : Any
+            The name of the event.
+        source_name : Any
+            The name of the event's source (the recipient).
+        """
+        # Parse the JSON state of the event
+        df_j = get_json_state(json_state)
+        # Skip events that are not relevant (e.g., replies or missing messages)
+        if "message" not in df_j.keys() or event_name == "reply_func_executed":
+            return
+        sender = df_j["sender"]
+        recipient = source_name
+
+        # Extract message content if available
+        if isinstance(df_j["message"], dict) and "content" in df_j["message"]:
+            content = str(df_j["message"]["content"])
+            message = "Content: " + content
+        else:
+            message = str(df_j["message"])
+
+        # Escape the message for Mermaid compatibility and
+        # truncate long messages
+        message = escape_mermaid_text(message)
+
+        # Add sender and recipient to participants set
+        self._participants.add(recipient)
+        self._participants.add(sender)
+
+        # Split into the main message and the context
+        # if "Content" is present
+        if "Content: " in message:
+            message_parts = message.split("Content: ")
+            main_message = message_parts[0].strip()
+            context = "Content: " + message_parts[1].strip()
+            self._lines.append(f"    {sender}->>{recipient}: {main_message}\n")
+            self._lines.append(f"    note over {recipient}: {context}\n")
+        else:
+            self._lines.append(f"    {sender}->>{recipient}: {message}\n")
+
+    def render(self) -> str:
+        """Get the Mermaid sequence diagram text.
+
+        Returns
+        -------
+        str
+            The Mermaid sequence diagram text.
+        """
+        # Add participants to the Mermaid diagram
+        participants_text = ""
+        for participant in self._participants:
+            participant_title = participant.replace("_", " ").title()
+            participants_text += (
+                f"    participant {participant} as {participant_title}" + "\n"
+            )
+        # Prepend the participants to the sequence diagram text
+        return SEQ_TXT + participants_text + "".join(self._lines)
+
+
 def process_events(df_events: pd.DataFrame) -> str:
     """Process the events DataFrame and generate a Mermaid sequence diagram.
 
@@ -78,64 +153,15 @@ def process_events(df_events: pd.DataFrame) -> str:
     str
         The Mermaid sequence diagram text.
     """
-    # Set to store participants (senders and recipients)
-    participants: set[str] = set()
-    recipient: str
-
-    # Initialize the sequence diagram text
-    seq_text = SEQ_TXT
-
+    diagram = SequenceDiagram()
     # Loop through each event in the DataFrame
     for i in range(len(df_events["json_state"])):
-        # Parse the JSON state of the event
-        df_j = get_json_state(df_events["json_state"][i])
-        # Skip events that are not relevant (e.g., replies or missing messages)
-        if ("message" in df_j.keys()) and (
-            df_events["event_name"][i] != "reply_func_executed"
-        ):
-            sender = df_j["sender"]
-            # noinspection PyTypeChecker
-            recipient = df_events["source_name"][i]
-
-            # Extract message content if available
-            if (
-                isinstance(df_j["message"], dict)
-                and "content" in df_j["message"]
-            ):
-                content = str(df_j["message"]["content"])
-                message = "Content: " + content
-            else:
-                message = str(df_j["message"])
-
-            # Escape the message for Mermaid compatibility and
-            # truncate long messages
-            message = escape_mermaid_text(message)
-
-            # Add sender and recipient to participants set
-            participants.add(recipient)
-            participants.add(sender)
-
-            # Split into the main message and the context
-            # if "Content" is present
-            if "Content: " in message:
-                message_parts = message.split("Content: ")
-                main_message = message_parts[0].strip()
-                context = "Content: " + message_parts[1].strip()
-                seq_text += f"    {sender}->>{recipient}: {main_message}\n"
-                seq_text += f"    note over {recipient}: {context}\n"
-            else:
-                seq_text += f"    {sender}->>{recipient}: {message}\n"
-
-    # Add participants to the Mermaid diagram
-    participants_text = ""
-    for participant in participants:
-        participant_title = participant.replace("_", " ").title()
-        participants_text += (
-            f"    participant {participant} as {participant_title}" + "\n"
+        diagram.add_event(
+            df_events["json_state"][i],
+            df_events["event_name"][i],
+            df_events["source_name"][i],
         )
-    # Prepend the participants to the sequence diagram text
-    mermaid_text = SEQ_TXT + participants_text + seq_text[len(SEQ_TXT) :]
-    return mermaid_text
+    return diagram.render()
 
 
 def save_diagram(mermaid_text: str, output_path: str | Path) -> None:
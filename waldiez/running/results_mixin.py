@@ -12,6 +12,7 @@ import json
 import shutil
 from collections.abc import Iterable
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from typing import Any, TypedDict
 
@@ -20,8 +21,9 @@ import anyio.to_thread
 
 from waldiez.storage import StorageManager, safe_name
 
-from .db_utils import a_get_sqlite_out, get_sqlite_out
-from .gen_seq_diagram import generate_sequence_diagram
+from .db_reports import generate_db_reports
+from .db_utils import a_export_sqlite_tables, export_sqlite_tables
+from .gen_seq_diagram import generate_sequence_diagram, save_diagram
 from .io_utils import get_printer
 from .post_run import (
     a_get_results_from_json,
@@ -153,6 +155,7 @@ class ResultsMixin:
             "reasoning_tree.json",
         ),
         ignore_names: Iterable[str] = (".cache", ".env"),
+        skip_db_exports: bool = False,
     ) -> Path | None:
         """Actions to perform after running the flow.
 
@@ -193,6 +196,9 @@ class ResultsMixin:
             File names (exact matches) to also copy into output_dir.
         ignore_names : Iterable[str]
             Directory/file names to skip entirely.
+        skip_db_exports : bool
+            Whether to skip exporting the flow.db tables
+            to csv and json files (under logs/), by default False.
 
         Returns
         -------
@@ -201,23 +207,84 @@ class ResultsMixin:
         """
         if isinstance(output_file, str):
             output_file = Path(output_file)
+        ResultsMixin._prepare_results(
+            results=results,
+            error=error,
+            temp_dir=temp_dir,
+            output_file=output_file,
+            flow_name=flow_name,
+            skip_mmd=skip_mmd,
+            skip_timeline=skip_timeline,
+            skip_db_exports=skip_db_exports,
+        )
+        owns_manager = storage_manager is None
+        if storage_manager is None:
+            storage_manager = StorageManager()
+        try:
+            _checkpoint_path, public_link_path = storage_manager.finalize(
+                **ResultsMixin._finalize_kwargs(
+                    temp_dir=temp_dir,
+                    output_file=output_file,
+                    flow_name=flow_name,
+                    waldiez_file=waldiez_file,
+                    metadata=metadata,
+                    copy_artifacts_into=copy_artifacts_into,
+                    keep_tmp=keep_tmp,
+                    link_latest=link_latest,
+                    promote_to_output=promote_to_output,
+                    ignore_names=ignore_names,
+                )
+            )
+        finally:
+            if owns_manager:  # created here: close its connections
+                storage_manager.close()
+        ResultsMixin._complete(
+            public_link_path, waldiez_file, temp_dir, keep_tmp
+        )
+        return public_link_path if output_file else None
+
+    @staticmethod
+    def _prepare_results(
+        results: list[dict[str, Any]],
+        error: BaseException | None,
+        temp_dir: Path,
+        output_file: Path | None,
+        flow_name: str,
+        skip_mmd: bool,
+        skip_timeline: bool,
+        skip_db_exports: bool,
+    ) -> None:
+        """Write the run's results and reports into the temp dir."""
         mmd_dir = output_file.parent if output_file else Path.cwd()
-        ResultsMixin.ensure_db_outputs(temp_dir)
+        if not skip_db_exports:
+            ResultsMixin.ensure_db_outputs(temp_dir)
         if error is not None:
             ResultsMixin.ensure_error_json(temp_dir, error)
         else:
             ResultsMixin.ensure_results_json(temp_dir, results)
-        if not skip_mmd:
-            ResultsMixin.make_mermaid_diagram(
-                temp_dir=temp_dir,
-                output_file=output_file,
-                flow_name=flow_name,
-                mmd_dir=mmd_dir,
-            )
-        if not skip_timeline:  # pragma: no branch
-            ResultsMixin.make_timeline_json(temp_dir)
-        if storage_manager is None:
-            storage_manager = StorageManager()
+        ResultsMixin._make_reports(
+            temp_dir=temp_dir,
+            output_file=output_file,
+            flow_name=flow_name,
+            mmd_dir=mmd_dir,
+            skip_mmd=skip_mmd,
+            skip_timeline=skip_timeline,
+        )
+
+    @staticmethod
+    def _finalize_kwargs(
+        temp_dir: Path,
+        output_file: Path | None,
+        flow_name: str,
+        waldiez_file: Path,
+        metadata: dict[str, Any] | None,
+        copy_artifacts_into: str | None,
+        keep_tmp: bool,
+        link_latest: bool,
+        promote_to_output: Iterable[str],
+        ignore_names: Iterable[str],
+    ) -> dict[str, Any]:
+        """Get the arguments of the storage manager's finalize."""
         link_root = (
             (output_file.parent / "waldiez_out")
             if output_file
@@ -226,23 +293,31 @@ class ResultsMixin:
         output_hint = (
             output_file if output_file else Path.cwd() / waldiez_file.name
         )
-        session_name = safe_name(flow_name)
         to_ignore = list(ignore_names)
         if ResultsMixin.RUN_DETAILS not in to_ignore:
             to_ignore.append(ResultsMixin.RUN_DETAILS)
-        _checkpoint_path, public_link_path = storage_manager.finalize(
-            session_name=session_name,
-            output_file=output_hint,
-            tmp_dir=temp_dir,
-            metadata=metadata or {},
-            timestamp=datetime.now(timezone.utc),
-            link_root=link_root,
-            link_latest=link_latest,
-            keep_tmp=keep_tmp,
-            copy_into_subdir=copy_artifacts_into,
-            promote_to_output=promote_to_output,
-            ignore_names=to_ignore,
-        )
+        return {
+            "session_name": safe_name(flow_name),
+            "output_file": output_hint,
+            "tmp_dir": temp_dir,
+            "metadata": metadata or {},
+            "timestamp": datetime.now(timezone.utc),
+            "link_root": link_root,
+            "link_latest": link_latest,
+            "keep_tmp": keep_tmp,
+            "copy_into_subdir": copy_artifacts_into,
+            "promote_to_output": promote_to_output,
+            "ignore_names": to_ignore,
+        }
+
+    @staticmethod
+    def _complete(
+        public_link_path: Path,
+        waldiez_file: Path,
+        temp_dir: Path,
+        keep_tmp: bool,
+    ) -> None:
+        """Copy the waldiez file next to the results and clean up."""
         try:
             dst_waldiez = public_link_path / waldiez_file.name
             if not dst_waldiez.exists() and waldiez_file.is_file():
@@ -250,7 +325,6 @@ class ResultsMixin:
         except BaseException:
             pass
         ResultsMixin._cleanup(None, None if keep_tmp else temp_dir)
-        return public_link_path if output_file else None
 
     @staticmethod
     async def a_post_run(
@@ -273,6 +347,7 @@ class ResultsMixin:
             "reasoning_tree.json",
         ),
         ignore_names: Iterable[str] = (".cache", ".env"),
+        skip_db_exports: bool = False,
     ) -> Path | None:
         """Actions to perform after running the flow.
 
@@ -313,31 +388,92 @@ class ResultsMixin:
             File names (exact matches) to also copy into output_dir.
         ignore_names : Iterable[str]
             Directory/file names to skip entirely.
+        skip_db_exports : bool
+            Whether to skip exporting the flow.db tables
+            to csv and json files (under logs/), by default False.
 
         Returns
         -------
         Path | None
             The destination directory if output file, else None
         """
-        return await anyio.to_thread.run_sync(
-            ResultsMixin.post_run,
-            results,
-            error,
-            temp_dir,
-            output_file,
-            flow_name,
-            waldiez_file,
-            uploads_root,
-            skip_mmd,
-            skip_timeline,
-            storage_manager,
-            metadata,
-            copy_artifacts_into,
-            keep_tmp,
-            link_latest,
-            promote_to_output,
-            ignore_names,
+        if isinstance(output_file, str):
+            output_file = Path(output_file)
+        # the reports are cpu/disk bound, the copying is done by the
+        # storage's own (bounded) worker threads.
+        await anyio.to_thread.run_sync(
+            partial(
+                ResultsMixin._prepare_results,
+                results=results,
+                error=error,
+                temp_dir=temp_dir,
+                output_file=output_file,
+                flow_name=flow_name,
+                skip_mmd=skip_mmd,
+                skip_timeline=skip_timeline,
+                skip_db_exports=skip_db_exports,
+            )
         )
+        owns_manager = storage_manager is None
+        if storage_manager is None:
+            storage_manager = StorageManager()
+        try:
+            _checkpoint_path, public_link_path = (
+                await storage_manager.a_finalize(
+                    **ResultsMixin._finalize_kwargs(
+                        temp_dir=temp_dir,
+                        output_file=output_file,
+                        flow_name=flow_name,
+                        waldiez_file=waldiez_file,
+                        metadata=metadata,
+                        copy_artifacts_into=copy_artifacts_into,
+                        keep_tmp=keep_tmp,
+                        link_latest=link_latest,
+                        promote_to_output=promote_to_output,
+                        ignore_names=ignore_names,
+                    )
+                )
+            )
+            await storage_manager.async_storage.run_sync(
+                ResultsMixin._complete,
+                public_link_path,
+                waldiez_file,
+                temp_dir,
+                keep_tmp,
+            )
+        finally:
+            if owns_manager:  # created here: close its connections
+                storage_manager.close()
+        return public_link_path if output_file else None
+
+    @staticmethod
+    def _make_reports(
+        temp_dir: Path,
+        output_file: Path | None,
+        flow_name: str,
+        mmd_dir: Path,
+        skip_mmd: bool,
+        skip_timeline: bool,
+    ) -> None:
+        if ResultsMixin.make_db_reports(
+            temp_dir=temp_dir,
+            output_file=output_file,
+            flow_name=flow_name,
+            mmd_dir=mmd_dir,
+            skip_mmd=skip_mmd,
+            skip_timeline=skip_timeline,
+        ):
+            return
+        # no flow.db, use the exported csv files
+        if not skip_mmd:
+            ResultsMixin.make_mermaid_diagram(
+                temp_dir=temp_dir,
+                output_file=output_file,
+                flow_name=flow_name,
+                mmd_dir=mmd_dir,
+            )
+        if not skip_timeline:  # pragma: no branch
+            ResultsMixin.make_timeline_json(temp_dir)
 
     @staticmethod
     def make_mermaid_diagram(
@@ -364,15 +500,100 @@ class ResultsMixin:
             print("Generating mermaid sequence diagram...")
             mmd_path = temp_dir / f"{flow_name}.mmd"
             generate_sequence_diagram(events_csv_path, mmd_path)
-            if (
-                not output_file
-                and mmd_path.exists()
-                and mmd_path != mmd_dir / f"{flow_name}.mmd"
-            ):
-                try:
-                    shutil.copyfile(mmd_path, mmd_dir / f"{flow_name}.mmd")
-                except BaseException:
-                    pass
+            ResultsMixin._copy_mmd(mmd_path, output_file, flow_name, mmd_dir)
+
+    @staticmethod
+    def _copy_mmd(
+        mmd_path: Path,
+        output_file: str | Path | None,
+        flow_name: str,
+        mmd_dir: Path,
+    ) -> None:
+        if (
+            not output_file
+            and mmd_path.exists()
+            and mmd_path != mmd_dir / f"{flow_name}.mmd"
+        ):
+            try:
+                shutil.copyfile(mmd_path, mmd_dir / f"{flow_name}.mmd")
+            except BaseException:
+                pass
+
+    @staticmethod
+    def make_db_reports(
+        temp_dir: Path,
+        output_file: str | Path | None,
+        flow_name: str,
+        mmd_dir: Path,
+        skip_mmd: bool = False,
+        skip_timeline: bool = False,
+    ) -> bool:
+        """Generate the mermaid diagram and the timeline from flow.db.
+
+        The sqlite log is streamed once, without going
+        through the exported csv files.
+
+        Parameters
+        ----------
+        temp_dir : Path
+            The directory to look for the flow.db file.
+        output_file : str | Path | None
+            The optional destination python file.
+        flow_name : str
+            The name of the flow.
+        mmd_dir : Path
+            The path to save the mmd file to.
+        skip_mmd : bool
+            Whether to skip the mermaid sequence diagram generation.
+        skip_timeline : bool
+            Whether to skip the timeline processing.
+
+        Returns
+        -------
+        bool
+            True if the flow.db was used, False if there is no (readable)
+            flow.db and the csv files should be used instead.
+        """
+        flow_db = temp_dir / "flow.db"
+        if not flow_db.is_file():
+            return False
+        if skip_mmd and skip_timeline:
+            return True
+        try:
+            reports = generate_db_reports(
+                flow_db, mermaid=not skip_mmd, timeline=not skip_timeline
+            )
+        except BaseException:
+            return False
+        if reports is None:
+            return True
+        if reports.mermaid is not None:
+            print("Generating mermaid sequence diagram...")
+            mmd_path = temp_dir / f"{flow_name}.mmd"
+            save_diagram(reports.mermaid, mmd_path)
+            ResultsMixin._copy_mmd(mmd_path, output_file, flow_name, mmd_dir)
+        if reports.timeline is not None:
+            ResultsMixin._save_timeline(reports.timeline, temp_dir)
+        return True
+
+    @staticmethod
+    def _save_timeline(results: dict[str, Any], output_dir: Path) -> None:
+        output_file = output_dir / "timeline.json"
+        # pylint: disable=too-many-try-statements
+        try:
+            with open(output_file, "w", encoding="utf-8", newline="\n") as f:
+                json.dump(results, f, indent=2, default=str)
+            short_results = TimelineProcessor.get_short_results(results)
+            printer = get_printer()
+            printer(
+                json.dumps(
+                    {"type": "timeline", "content": short_results},
+                    default=str,
+                ),
+                flush=True,
+            )
+        except BaseException:
+            pass
 
     @staticmethod
     def make_timeline_json(
@@ -389,8 +610,6 @@ class ResultsMixin:
         if events_csv_path.exists():
             log_files = TimelineProcessor.get_files(output_dir / "logs")
             if any(log_files.values()):  # pragma: no branch
-                output_file = output_dir / "timeline.json"
-                # pylint: disable=too-many-try-statements
                 try:
                     processor = TimelineProcessor()
                     processor.load_csv_files(
@@ -400,21 +619,9 @@ class ResultsMixin:
                         functions_file=log_files["functions"],
                     )
                     results = processor.process_timeline()
-                    with open(
-                        output_file, "w", encoding="utf-8", newline="\n"
-                    ) as f:
-                        json.dump(results, f, indent=2, default=str)
-                    short_results = TimelineProcessor.get_short_results(results)
-                    printer = get_printer()
-                    printer(
-                        json.dumps(
-                            {"type": "timeline", "content": short_results},
-                            default=str,
-                        ),
-                        flush=True,
-                    )
                 except BaseException:
-                    pass
+                    return
+                ResultsMixin._save_timeline(results, output_dir)
 
     @staticmethod
     def ensure_results_json(
@@ -687,11 +894,13 @@ class ResultsMixin:
         ]
         dest = output_dir / "logs"
         dest.mkdir(parents=True, exist_ok=True)
-        for table in tables:
-            table_csv = dest / f"{table}.csv"
-            table_json = dest / f"{table}.json"
-            if not table_csv.exists() or not table_json.exists():
-                get_sqlite_out(str(flow_db), table, str(table_csv))
+        missing = [
+            table
+            for table in tables
+            if not (dest / f"{table}.csv").exists()
+            or not (dest / f"{table}.json").exists()
+        ]
+        export_sqlite_tables(str(flow_db), missing, str(dest))
 
     @staticmethod
     async def a_ensure_db_outputs(output_dir: Path) -> None:
@@ -716,8 +925,10 @@ class ResultsMixin:
         ]
         dest = output_dir / "logs"
         dest.mkdir(parents=True, exist_ok=True)
-        for table in tables:
-            table_csv = dest / f"{table}.csv"
-            table_json = dest / f"{table}.json"
-            if not table_csv.exists() or not table_json.exists():
-                await a_get_sqlite_out(str(flow_db), table, str(table_csv))
+        missing = [
+            table
+            for table in tables
+            if not (dest / f"{table}.csv").exists()
+            or not (dest / f"{table}.json").exists()
+        ]
+        await a_export_sqlite_tables(str(flow_db), missing, str(dest))
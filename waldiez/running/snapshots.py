@@ -0,0 +1,307 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+"""Group chat state snapshot policy and background writer."""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+DEFAULT_FORCE_ON = frozenset({"input_request", "termination", "run_completion"})
+
+
+@dataclass(frozen=True)
+class SnapshotPolicy:
+    """When to snapshot the group chat state while processing events.
+
+    Attributes
+    ----------
+    every_n_events : int
+        Snapshot every N processed events (0 disables the counter).
+    interval_ms : float | None
+        Snapshot if at least this many milliseconds passed since the
+        last snapshot (None disables the timer).
+    force_on : frozenset[str]
+        Event types that always trigger (and flush) a snapshot.
+    background : bool
+        Write the snapshots from a background thread, coalescing
+        the ones that are still pending.
+    """
+
+    every_n_events: int = 1
+    interval_ms: float | None = None
+    force_on: frozenset[str] = field(default=DEFAULT_FORCE_ON)
+    background: bool = False
+
+    @classmethod
+    def every(
+        cls, n_events: int, *, background: bool = True
+    ) -> "SnapshotPolicy":
+        """Snapshot every N events.
+
+        Parameters
+        ----------
+        n_events : int
+            The number of events between snapshots.
+        background : bool
+            Whether to use a background writer.
+
+        Returns
+        -------
+        SnapshotPolicy
+            The policy.
+        """
+        return cls(every_n_events=n_events, background=background)
+
+    @classmethod
+    def throttled(
+        cls, interval_ms: float, *, background: bool = True
+    ) -> "SnapshotPolicy":
+        """Snapshot at most once every `interval_ms` milliseconds.
+
+        The first event after the interval takes the snapshot (there is
+        no trailing snapshot of the events in between): the latest state
+        is written by the next forced event (e.g. the run's completion).
+
+        Parameters
+        ----------
+        interval_ms : float
+            The minimum interval between snapshots.
+        background : bool
+            Whether to use a background writer.
+
+        Returns
+        -------
+        SnapshotPolicy
+            The policy.
+        """
+        return cls(
+            every_n_events=0, interval_ms=interval_ms, background=background
+        )
+
+    @classmethod
+    def on_input_or_termination(
+        cls, *, background: bool = False
+    ) -> "SnapshotPolicy":
+        """Snapshot only on input requests and on termination.
+
+        Parameters
+        ----------
+        background : bool
+            Whether to use a background writer.
+
+        Returns
+        -------
+        SnapshotPolicy
+            The policy.
+        """
+        return cls(every_n_events=0, interval_ms=None, background=background)
+
+    def is_forced(self, event_type: str) -> bool:
+        """Check if an event type always triggers a snapshot.
+
+        Parameters
+        ----------
+        event_type : str
+            The type of the event.
+
+        Returns
+        -------
+        bool
+            True if the event type forces a snapshot.
+        """
+        return event_type in self.force_on
+
+
+@dataclass
+class StateSnapshot:
+    """A captured group chat state, ready to be written."""
+
+    output_dir: Path
+    state: dict[str, Any]
+    metadata: dict[str, Any]
+
+
+SnapshotWriter = Callable[[StateSnapshot], None]
+
+
+class StateSnapshotter:
+    """Decide when to snapshot and write the snapshots.
+
+    With a background policy, snapshots are handed to a writer thread.
+    If a newer snapshot for the same output directory arrives before the
+    previous one is written, only the newest one is kept.
+    """
+
+    def __init__(
+        self,
+        writer: SnapshotWriter,
+        policy: SnapshotPolicy | None = None,
+    ) -> None:
+        """Initialize the snapshotter.
+
+        Parameters
+        ----------
+        writer : SnapshotWriter
+            The callable that persists a snapshot.
+        policy : SnapshotPolicy | None
+            The snapshot policy (defaults to every event, inline).
+        """
+        self._writer = writer
+        self._policy = policy or SnapshotPolicy()
+        self._events_since_snapshot = 0
+        self._last_snapshot_at: float | None = None
+        self._pending: dict[Path, StateSnapshot] = {}
+        self._condition = threading.Condition()
+        self._in_progress = 0
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._written = 0
+        self._coalesced = 0
+
+    @property
+    def policy(self) -> SnapshotPolicy:
+        """The snapshot policy in use."""
+        return self._policy
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters of written and coalesced (skipped) snapshots."""
+        with self._condition:
+            return {
+                "written": self._written,
+                "coalesced": self._coalesced,
+                "pending": len(self._pending),
+            }
+
+    def should_snapshot(self, event_type: str) -> bool:
+        """Register a processed event and check if we should snapshot.
+
+        Parameters
+        ----------
+        event_type : str
+            The type of the processed event.
+
+        Returns
+        -------
+        bool
+            True if a snapshot should be taken now.
+        """
+        self._events_since_snapshot += 1
+        policy = self._policy
+        if policy.is_forced(event_type):
+            return True
+        if (
+            policy.every_n_events > 0
+            and self._events_since_snapshot >= policy.every_n_events
+        ):
+            return True
+        if policy.interval_ms is not None:
+            if self._last_snapshot_at is None:
+                return True
+            elapsed_ms = (time.monotonic() - self._last_snapshot_at) * 1000
+            return elapsed_ms >= policy.interval_ms
+        return False
+
+    def submit(self, snapshot: StateSnapshot, *, wait: bool = False) -> None:
+        """Write (or schedule the writing of) a snapshot.
+
+        Parameters
+        ----------
+        snapshot : StateSnapshot
+            The captured state.
+        wait : bool
+            If using a background writer, block until it is written.
+        """
+        if not self._policy.background or self._closed:
+            self._writer(snapshot)
+            self.mark_written()
+            return
+        self._events_since_snapshot = 0
+        self._last_snapshot_at = time.monotonic()
+        with self._condition:
+            if snapshot.output_dir in self._pending:
+                self._coalesced += 1
+            self._pending[snapshot.output_dir] = snapshot
+            self._ensure_thread()
+            self._condition.notify_all()
+        if wait:
+            self.flush()
+
+    def mark_written(self) -> None:
+        """Record a snapshot that was written outside of the snapshotter."""
+        self._events_since_snapshot = 0
+        self._last_snapshot_at = time.monotonic()
+        with self._condition:
+            self._written += 1
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until all the pending snapshots are written.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Optional maximum time to wait in seconds.
+
+        Returns
+        -------
+        bool
+            True if nothing is pending anymore.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._in_progress,
+                timeout=timeout,
+            )
+
+    def close(self, timeout: float | None = None) -> None:
+        """Flush the pending snapshots and stop the writer thread.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Optional maximum time to wait in seconds.
+        """
+        self.flush(timeout=timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run,
+            name="waldiez-snapshot-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: bool(self._pending) or self._closed
+                )
+                if not self._pending and self._closed:
+                    return
+                batch = list(self._pending.values())
+                self._pending.clear()
+                self._in_progress = len(batch)
+            for snapshot in batch:
+                # pylint: disable=broad-exception-caught
+                try:
+                    self._writer(snapshot)
+                except Exception:  # pragma: no cover
+                    pass
+                with self._condition:
+                    self._in_progress -= 1
+                    self._written += 1
+                    self._condition.notify_all()
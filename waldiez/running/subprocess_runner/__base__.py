@@ -14,6 +14,8 @@ from typing import Any, Literal
 
 from waldiez.storage import WaldiezCheckpoint
 
+from .worker_pool import WorkerPool
+
 
 class BaseSubprocessRunner:
     """Base class with common logic for subprocess runners."""
@@ -44,7 +46,8 @@ class BaseSubprocessRunner:
         logger : logging.Logger | None
             Logger instance to use
         **kwargs : Any
-            Additional arguments
+            Additional arguments (breakpoints, checkpoint and
+            an optional warm ``worker_pool`` to run the flow in)
         """
         self.session_id = session_id or f"session_{uuid.uuid4().hex}"
         self.input_timeout = input_timeout
@@ -59,6 +62,7 @@ class BaseSubprocessRunner:
         self.checkpoint: WaldiezCheckpoint | None = kwargs.get(
             "checkpoint", None
         )
+        self.worker_pool: WorkerPool | None = kwargs.get("worker_pool", None)
 
     def build_command(
         self,
@@ -88,15 +92,55 @@ class BaseSubprocessRunner:
         list[str]
             Command arguments list
         """
+        cmd = [
+            sys.executable,
+            "-m",
+            "waldiez",
+            *self.build_args(
+                flow_path,
+                output_path=output_path,
+                mode=mode,
+                structured=structured,
+                force=force,
+            ),
+        ]
+        self.logger.debug("Runner command: %s", " ".join(cmd))
+        return cmd
+
+    def build_args(
+        self,
+        flow_path: Path,
+        output_path: str | Path | None = None,
+        mode: Literal["debug", "run"] = "run",
+        structured: bool = True,
+        force: bool = True,
+    ) -> list[str]:
+        """Build the ``waldiez`` cli arguments for running the flow.
+
+        Parameters
+        ----------
+        flow_path : Path
+            Path to the waldiez flow file
+        output_path : str | Path | None
+            Path to the output file
+        mode : Literal["debug", "run"]
+            Execution mode ('debug', 'run', etc.)
+        structured : bool
+            Whether to use structured I/O
+        force : bool
+            Whether to force overwrite outputs
+
+        Returns
+        -------
+        list[str]
+            The cli arguments (without the program name)
+        """
         _output_path = (
             str(output_path)
             if output_path
             else str(flow_path.with_suffix(".py"))
         )
         cmd = [
-            sys.executable,
-            "-m",
-            "waldiez",
             "run",
             "--file",
             str(flow_path),
@@ -124,7 +168,6 @@ class BaseSubprocessRunner:
                 cmd.extend(["--breakpoints", entry])
         if self.checkpoint:
             cmd.extend(["--checkpoint", self.checkpoint.id])
-        self.logger.debug("Runner command: %s", " ".join(cmd))
         return cmd
 
     def parse_output(
@@ -146,15 +189,19 @@ class BaseSubprocessRunner:
         dict[str, Any]
             Parsed JSON data if valid, empty dict otherwise
         """
+        # pylint: disable=import-outside-toplevel
+        from waldiez.io.codec import decode_payload
+
         line = line.strip()
         if not line:
             return {}
 
         try:
-            data = json.loads(line)
+            # (of any codec the subprocess' I/O stream uses)
+            data = decode_payload(line)
             if isinstance(data, dict):
                 return data  # pyright: ignore[reportUnknownVariableType]
-        except json.JSONDecodeError:
+        except ValueError:
             return self.create_output_message(stream=stream, content=line)
         return self.create_output_message(
             stream=stream, content=line
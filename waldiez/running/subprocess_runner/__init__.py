@@ -7,10 +7,13 @@ from .__base__ import BaseSubprocessRunner
 from ._async_runner import AsyncSubprocessRunner
 from ._sync_runner import SyncSubprocessRunner
 from .runner import WaldiezSubprocessRunner
+from .worker_pool import PooledProcess, WorkerPool
 
 __all__ = [
     "SyncSubprocessRunner",
     "AsyncSubprocessRunner",
     "BaseSubprocessRunner",
     "WaldiezSubprocessRunner",
+    "PooledProcess",
+    "WorkerPool",
 ]
@@ -15,6 +15,7 @@ from pathlib import Path
 from typing import Any, Callable, Literal
 
 from .__base__ import BaseSubprocessRunner
+from .worker_pool import PooledProcess
 
 
 # noinspection PyUnusedLocal
@@ -57,7 +58,7 @@ class SyncSubprocessRunner(BaseSubprocessRunner):
         self.waiting_for_input = False
         self.on_output = on_output
         self.on_input_request = on_input_request
-        self.process: subprocess.Popen[Any] | None = None
+        self.process: subprocess.Popen[Any] | PooledProcess | None = None
         self.input_queue: queue.Queue[str] = queue.Queue()
         self.output_queue: queue.Queue[dict[str, Any]] = queue.Queue()
         self._stop_event = threading.Event()
@@ -83,21 +84,8 @@ class SyncSubprocessRunner(BaseSubprocessRunner):
             True if subprocess completed successfully, False otherwise
         """
         try:
-            # Build command
-            cmd = self.build_command(flow_path, mode=mode)
-            self.log_subprocess_start(cmd)
-
-            # Start subprocess
-            # pylint: disable=consider-using-with
-            self.process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                encoding="utf-8",
-                text=True,
-                bufsize=1,  # Line buffered
-            )
+            # Start subprocess (or hand the run to a warm worker)
+            self.process = self._start_process(flow_path, mode=mode)
 
             # Start monitoring threads
             self._start_monitoring()
@@ -127,6 +115,45 @@ class SyncSubprocessRunner(BaseSubprocessRunner):
         finally:
             self._cleanup()
 
+    def _start_process(
+        self,
+        flow_path: Path,
+        mode: Literal["debug", "run"],
+    ) -> "subprocess.Popen[Any] | PooledProcess":
+        """Start the flow in a warm worker if possible, else in a subprocess.
+
+        Parameters
+        ----------
+        flow_path : Path
+            Path to the waldiez flow file
+        mode : Literal["debug", "run"]
+            Execution mode ('debug', 'run')
+
+        Returns
+        -------
+        subprocess.Popen[Any] | PooledProcess
+            The started process
+        """
+        if self.worker_pool is not None:
+            args = self.build_args(flow_path, mode=mode)
+            self.log_subprocess_start(["waldiez", *args])
+            pooled = self.worker_pool.submit(args)
+            if pooled is not None:
+                return pooled
+            self.logger.warning("No warm worker available, spawning one")
+        cmd = self.build_command(flow_path, mode=mode)
+        self.log_subprocess_start(cmd)
+        # pylint: disable=consider-using-with
+        return subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+            text=True,
+            bufsize=1,  # Line buffered
+        )
+
     @staticmethod
     def gather() -> tuple[bool, str]:
         """Gather any results after run.
@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+"""Messages between the worker pool and its warm workers.
+
+Each message is a length-prefixed json document sent over a unix
+socket. Job messages also carry the job's stdio file descriptors.
+"""
+
+import json
+import socket
+import struct
+from typing import Any
+
+HEADER = struct.Struct(">I")
+MAX_FDS = 3
+
+
+def send_message(
+    sock: socket.socket,
+    message: dict[str, Any],
+    fds: list[int] | None = None,
+) -> None:
+    """Send a length-prefixed json message, optionally with fds.
+
+    Parameters
+    ----------
+    sock : socket.socket
+        The unix socket to send to.
+    message : dict[str, Any]
+        The message to send.
+    fds : list[int] | None
+        Optional file descriptors to pass along with the message.
+    """
+    payload = json.dumps(message, default=str).encode("utf-8")
+    frame = HEADER.pack(len(payload)) + payload
+    if fds:
+        sent = socket.send_fds(sock, [frame], fds)
+        if sent < len(frame):  # pragma: no cover
+            sock.sendall(frame[sent:])
+    else:
+        sock.sendall(frame)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes | None:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def receive_message(
+    sock: socket.socket,
+) -> tuple[dict[str, Any] | None, list[int]]:
+    """Receive a message sent with :func:`send_message`.
+
+    Parameters
+    ----------
+    sock : socket.socket
+        The unix socket to receive from.
+
+    Returns
+    -------
+    tuple[dict[str, Any] | None, list[int]]
+        The message (None if the other end closed the socket)
+        and any file descriptors that came with it.
+    """
+    header, fds, _, _ = socket.recv_fds(sock, HEADER.size, MAX_FDS)
+    if not header:
+        return None, fds
+    if len(header) < HEADER.size:  # pragma: no cover
+        rest = _recv_exact(sock, HEADER.size - len(header))
+        if rest is None:
+            return None, fds
+        header += rest
+    (size,) = HEADER.unpack(header)
+    payload = _recv_exact(sock, size)
+    if payload is None:  # pragma: no cover
+        return None, fds
+    return json.loads(payload.decode("utf-8")), fds
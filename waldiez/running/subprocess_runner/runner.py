@@ -18,8 +18,10 @@ from ..base_runner import WaldiezBaseRunner
 from ..step_by_step.breakpoints_mixin import BreakpointsMixin
 from ._async_runner import AsyncSubprocessRunner
 from ._sync_runner import SyncSubprocessRunner
+from .worker_pool import WorkerPool
 
 
+# pylint: disable=too-many-instance-attributes
 # noinspection PyUnusedLocal,PyBroadException
 class WaldiezSubprocessRunner(WaldiezBaseRunner):
     """Waldiez runner that uses subprocess execution via standalone runners."""
@@ -64,7 +66,9 @@ class WaldiezSubprocessRunner(WaldiezBaseRunner):
             Timeout for user input in seconds
         **kwargs : Any
             Additional arguments for BaseRunner
+            (and an optional warm ``worker_pool`` to run the flow in)
         """
+        self.worker_pool: WorkerPool | None = kwargs.pop("worker_pool", None)
         super().__init__(
             waldiez=waldiez,
             output_path=output_path,
@@ -155,6 +159,7 @@ class WaldiezSubprocessRunner(WaldiezBaseRunner):
             logger=self.log,
             breakpoints=self.breakpoints,
             checkpoint=WaldiezBaseRunner._checkpoint,
+            worker_pool=self.worker_pool,
         )
         return self.async_runner
 
@@ -169,6 +174,7 @@ class WaldiezSubprocessRunner(WaldiezBaseRunner):
             logger=self.log,
             breakpoints=self.breakpoints,
             checkpoint=WaldiezBaseRunner._checkpoint,
+            worker_pool=self.worker_pool,
         )
         return self.sync_runner
 
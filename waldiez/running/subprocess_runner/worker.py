@@ -0,0 +1,177 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+# pylint: disable=broad-exception-caught,import-outside-toplevel
+# pylint: disable=unused-import,too-many-try-statements
+# pyright: reportUnusedImport=false,reportMissingTypeStubs=false
+"""Warm worker process for the subprocess runner's worker pool.
+
+The worker imports waldiez (and ag2) once, then waits for jobs on a
+unix socket. Each job carries the ``waldiez`` cli arguments and the
+file descriptors to use as the job's stdin, stdout and stderr. The job
+runs in a forked child, so nothing it does leaks into the next job.
+
+Usage: ``python -m waldiez.running.subprocess_runner.worker --fd <fd>``
+"""
+
+import argparse
+import os
+import socket
+import sys
+from typing import Any
+
+from ._worker_protocol import (
+    MAX_FDS,
+    receive_message,
+    send_message,
+)
+
+
+def warm_up() -> None:
+    """Import (and patch) everything a flow run needs."""
+    import waldiez  # noqa: F401  # check_conflicts() and patch_ag2()
+    import waldiez.cli  # noqa: F401
+
+    try:
+        import autogen  # type: ignore[import-untyped] # noqa: F401
+    except ImportError:  # pragma: no cover
+        pass
+
+
+def run_cli(args: list[str]) -> int:
+    """Run the waldiez cli in this process.
+
+    Parameters
+    ----------
+    args : list[str]
+        The cli arguments (without the program name).
+
+    Returns
+    -------
+    int
+        The exit code.
+    """
+    from waldiez.cli import app
+
+    try:
+        app(args=args, prog_name="waldiez")
+    except SystemExit as exit_:
+        if exit_.code is None:
+            return 0
+        return exit_.code if isinstance(exit_.code, int) else 1
+    except BaseException:
+        return 1
+    return 0
+
+
+def _run_job_in_child(job: dict[str, Any], fds: list[int]) -> None:
+    """Set up the job's stdio, cwd and env and run it (never returns)."""
+    exit_code = 1
+    try:
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+        for fd in fds:
+            if fd > 2:
+                os.close(fd)
+        cwd = job.get("cwd")
+        if cwd:
+            os.chdir(cwd)
+        env: dict[str, Any] | None = job.get("env")
+        if isinstance(env, dict):
+            os.environ.clear()
+            os.environ.update({key: str(value) for key, value in env.items()})
+        args = [str(arg) for arg in job.get("args", [])]
+        sys.argv = ["waldiez", *args]
+        exit_code = run_cli(args)
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except BaseException:
+                pass
+        os._exit(exit_code)  # pylint: disable=protected-access
+
+
+def _run_job(sock: socket.socket, job: dict[str, Any], fds: list[int]) -> None:
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        pid = os.fork()
+    except OSError as error:
+        for fd in fds:
+            os.close(fd)
+        send_message(sock, {"type": "error", "error": str(error)})
+        return
+    if pid == 0:  # pragma: no cover
+        sock.close()
+        _run_job_in_child(job, fds)
+    for fd in fds:
+        os.close(fd)
+    send_message(sock, {"type": "started", "pid": pid})
+    _, status = os.waitpid(pid, 0)
+    send_message(
+        sock, {"type": "exited", "exit_code": os.waitstatus_to_exitcode(status)}
+    )
+
+
+def serve(sock: socket.socket) -> int:
+    """Serve jobs until the pool closes the socket or asks us to stop.
+
+    Parameters
+    ----------
+    sock : socket.socket
+        The socket connected to the pool.
+
+    Returns
+    -------
+    int
+        The worker's exit code.
+    """
+    jobs = 0
+    send_message(sock, {"type": "ready", "pid": os.getpid()})
+    while True:
+        message, fds = receive_message(sock)
+        if message is None:
+            return 0
+        msg_type = message.get("type")
+        if msg_type == "job" and len(fds) == MAX_FDS:
+            _run_job(sock, message, fds)
+            jobs += 1
+            continue
+        for fd in fds:
+            os.close(fd)
+        if msg_type == "ping":
+            send_message(sock, {"type": "pong", "jobs": jobs})
+        elif msg_type == "shutdown":
+            return 0
+        else:
+            send_message(sock, {"type": "error", "error": "invalid message"})
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Start a warm worker.
+
+    Parameters
+    ----------
+    argv : list[str] | None
+        The command line arguments.
+
+    Returns
+    -------
+    int
+        The worker's exit code.
+    """
+    parser = argparse.ArgumentParser(prog="waldiez-worker")
+    parser.add_argument("--fd", type=int, required=True)
+    args = parser.parse_args(argv)
+    sock = socket.socket(fileno=args.fd)
+    try:
+        warm_up()
+        return serve(sock)
+    except (KeyboardInterrupt, BrokenPipeError, ConnectionError):
+        return 0
+    finally:
+        sock.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,652 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+# pylint: disable=broad-exception-caught,consider-using-with
+# pylint: disable=logging-fstring-interpolation
+# flake8: noqa: G004
+"""Pool of warm worker processes for the subprocess runner.
+
+Starting a flow with ``python -m waldiez run`` pays the interpreter
+start-up, ``import autogen``, ``check_conflicts()`` and ``patch_ag2()``
+on every run. The pool keeps a few workers that have already done all
+that, and hands each flow run to one of them over a unix socket. The
+job gets its own stdin/stdout/stderr pipes, so the caller talks to it
+just like it would to a ``subprocess.Popen`` process.
+
+Only available on posix (it relies on ``fork`` and fd passing).
+"""
+
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+from ._worker_protocol import receive_message, send_message
+
+WORKER_MODULE = "waldiez.running.subprocess_runner.worker"
+
+
+@dataclass
+class _Worker:
+    """A warm worker process and its control socket."""
+
+    process: subprocess.Popen[bytes]
+    sock: socket.socket
+    jobs: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def pid(self) -> int:
+        """The worker's process id."""
+        return self.process.pid
+
+    def is_alive(self) -> bool:
+        """Check if the worker process is still running.
+
+        Returns
+        -------
+        bool
+            True if the process has not exited.
+        """
+        return self.process.poll() is None
+
+    def receive(self, timeout: float | None) -> dict[str, Any] | None:
+        """Receive the next message from the worker.
+
+        Parameters
+        ----------
+        timeout : float | None
+            The maximum time to wait in seconds.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            The message, or None on timeout or if the worker is gone.
+        """
+        try:
+            self.sock.settimeout(timeout)
+            message, fds = receive_message(self.sock)
+        except (OSError, ValueError):
+            return None
+        for fd in fds:  # pragma: no cover
+            os.close(fd)
+        return message
+
+    def request(
+        self, message: dict[str, Any], timeout: float | None
+    ) -> dict[str, Any] | None:
+        """Send a message and wait for the reply.
+
+        Parameters
+        ----------
+        message : dict[str, Any]
+            The message to send.
+        timeout : float | None
+            The maximum time to wait for the reply in seconds.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            The reply, or None on timeout or if the worker is gone.
+        """
+        try:
+            self.sock.settimeout(timeout)
+            send_message(self.sock, message)
+        except OSError:
+            return None
+        return self.receive(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ask the worker to exit, killing it if it does not.
+
+        Parameters
+        ----------
+        timeout : float
+            How long to wait for the worker to exit.
+        """
+        try:
+            self.sock.settimeout(timeout)
+            send_message(self.sock, {"type": "shutdown"})
+        except OSError:
+            pass
+        self.sock.close()
+        try:
+            self.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+class PooledProcess:
+    """A flow run inside a warm worker.
+
+    It exposes the part of the ``subprocess.Popen`` api that the
+    subprocess runners use: ``stdin``, ``stdout``, ``stderr``,
+    ``poll()``, ``wait()``, ``terminate()`` and ``kill()``.
+    The worker goes back to the pool when the run exits.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        pool: "WorkerPool",
+        worker: _Worker,
+        args: list[str],
+        pid: int,
+        stdio_fds: tuple[int, int, int],
+    ) -> None:
+        """Initialize the pooled process.
+
+        Parameters
+        ----------
+        pool : WorkerPool
+            The pool the worker belongs to.
+        worker : _Worker
+            The worker running the job.
+        args : list[str]
+            The cli arguments of the job.
+        pid : int
+            The process id of the job.
+        stdio_fds : tuple[int, int, int]
+            Our ends of the job's stdin, stdout and stderr pipes.
+        """
+        self.args = args
+        self.pid = pid
+        self.returncode: int | None = None
+        stdin_fd, stdout_fd, stderr_fd = stdio_fds
+        self.stdin: IO[str] | None = open(
+            stdin_fd, "w", encoding="utf-8", buffering=1
+        )
+        self.stdout: IO[str] | None = open(stdout_fd, encoding="utf-8")
+        self.stderr: IO[str] | None = open(stderr_fd, encoding="utf-8")
+        self._pool = pool
+        self._worker = worker
+        self._exited = threading.Event()
+        self._waiter = threading.Thread(
+            target=self._wait_for_exit,
+            name=f"waldiez-pooled-{pid}",
+            daemon=True,
+        )
+        self._waiter.start()
+
+    def _wait_for_exit(self) -> None:
+        message = self._worker.receive(timeout=None)
+        if message is not None and message.get("type") == "exited":
+            self.returncode = int(message.get("exit_code", 1))
+            self._exited.set()
+            self._pool.release(self._worker)
+            return
+        # the worker itself is gone (or out of sync)
+        self.returncode = -1
+        self._exited.set()
+        self._pool.discard(self._worker)
+
+    def poll(self) -> int | None:
+        """Check if the run has exited.
+
+        Returns
+        -------
+        int | None
+            The exit code, or None if still running.
+        """
+        return self.returncode
+
+    def wait(self, timeout: float | None = None) -> int:
+        """Wait for the run to exit.
+
+        Parameters
+        ----------
+        timeout : float | None
+            The maximum time to wait in seconds.
+
+        Returns
+        -------
+        int
+            The exit code.
+
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            If the run did not exit in time.
+        """
+        if not self._exited.wait(timeout) or self.returncode is None:
+            raise subprocess.TimeoutExpired(self.args, timeout or 0.0)
+        return self.returncode
+
+    def send_signal(self, sig: int) -> None:
+        """Send a signal to the run (not to the worker).
+
+        Parameters
+        ----------
+        sig : int
+            The signal to send.
+        """
+        if self.returncode is not None:
+            return
+        try:
+            os.kill(self.pid, sig)
+        except (ProcessLookupError, PermissionError):  # pragma: no cover
+            pass
+
+    def terminate(self) -> None:
+        """Terminate the run."""
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        """Kill the run."""
+        self.send_signal(getattr(signal, "SIGKILL", signal.SIGTERM))
+
+
+# pylint: disable=too-many-instance-attributes
+class WorkerPool:
+    """A pool of warm worker processes that run waldiez flows."""
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        size: int = 2,
+        max_jobs_per_worker: int = 50,
+        start_timeout: float = 120.0,
+        health_check_timeout: float = 5.0,
+        health_check_interval: float | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Parameters
+        ----------
+        size : int
+            The number of warm workers to keep.
+        max_jobs_per_worker : int
+            Replace a worker after it has run this many jobs.
+        start_timeout : float
+            How long to wait for a new worker to finish its imports.
+        health_check_timeout : float
+            How long to wait for a worker to answer a ping.
+        health_check_interval : float | None
+            If set, ping the idle workers in the background every
+            this many seconds, replacing the ones that do not answer.
+        logger : logging.Logger | None
+            Logger instance to use.
+
+        Raises
+        ------
+        ValueError
+            If the size or the max jobs per worker are not positive.
+        """
+        if size < 1:
+            raise ValueError("The pool size must be at least 1")
+        if max_jobs_per_worker < 1:
+            raise ValueError("The max jobs per worker must be at least 1")
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.start_timeout = start_timeout
+        self.health_check_timeout = health_check_timeout
+        self.health_check_interval = health_check_interval
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._idle: deque[_Worker] = deque()
+        self._busy: set[int] = set()
+        self._starting = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._health_thread: threading.Thread | None = None
+        self._stats = {"jobs": 0, "recycled": 0, "replaced": 0}
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Check if the pool can be used on this platform.
+
+        Returns
+        -------
+        bool
+            True if fork and fd passing are available.
+        """
+        return (
+            os.name == "posix"
+            and hasattr(os, "fork")
+            and hasattr(socket, "send_fds")
+        )
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters of the pool's workers and jobs."""
+        with self._condition:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "busy": len(self._busy),
+                "starting": self._starting,
+                **self._stats,
+            }
+
+    def start(self) -> None:
+        """Start the warm workers (blocks until they are ready).
+
+        Raises
+        ------
+        RuntimeError
+            If the pool is not supported on this platform.
+        """
+        if not self.is_supported():
+            raise RuntimeError("The worker pool requires a posix platform")
+        with self._condition:
+            missing = self.size - self._total()
+            self._starting += missing
+        workers = [self._spawn() for _ in range(missing)]
+        for worker in workers:
+            ready = self._await_ready(worker)
+            with self._condition:
+                self._starting -= 1
+                if ready and not self._closed:
+                    self._idle.append(worker)
+                    self._condition.notify_all()
+                    continue
+            worker.stop()
+        if self.health_check_interval and self._health_thread is None:
+            self._health_thread = threading.Thread(
+                target=self._health_loop,
+                name="waldiez-worker-pool-health",
+                daemon=True,
+            )
+            self._health_thread.start()
+
+    def submit(
+        self,
+        args: list[str],
+        cwd: str | None = None,
+        env: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> PooledProcess | None:
+        """Run the ``waldiez`` cli with the given arguments in a worker.
+
+        Parameters
+        ----------
+        args : list[str]
+            The cli arguments (e.g. ``["run", "--file", "flow.waldiez"]``).
+        cwd : str | None
+            The working directory of the run (defaults to ours).
+        env : dict[str, str] | None
+            The environment of the run (defaults to ours).
+        timeout : float | None
+            How long to wait for a free worker.
+
+        Returns
+        -------
+        PooledProcess | None
+            The running job, or None if no worker could take it.
+        """
+        worker = self._acquire(timeout)
+        if worker is None:
+            return None
+        job = {
+            "type": "job",
+            "args": args,
+            "cwd": cwd or os.getcwd(),
+            "env": dict(os.environ) if env is None else env,
+        }
+        return self._start_job(worker, job)
+
+    def release(self, worker: _Worker) -> None:
+        """Give a worker back after its job exited.
+
+        Parameters
+        ----------
+        worker : _Worker
+            The worker whose job exited.
+        """
+        worker.jobs += 1
+        with self._condition:
+            self._busy.discard(worker.pid)
+            self._stats["jobs"] += 1
+            keep = (
+                not self._closed
+                and worker.jobs < self.max_jobs_per_worker
+                and worker.is_alive()
+            )
+            if keep:
+                self._idle.append(worker)
+                self._condition.notify_all()
+                return
+            if not self._closed:
+                self._stats["recycled"] += 1
+        self.logger.debug(f"Recycling worker {worker.pid}")
+        worker.stop()
+        self._replenish()
+
+    def discard(self, worker: _Worker) -> None:
+        """Drop a broken worker and start a replacement.
+
+        Parameters
+        ----------
+        worker : _Worker
+            The worker to drop.
+        """
+        with self._condition:
+            self._busy.discard(worker.pid)
+            if worker in self._idle:  # pragma: no cover
+                self._idle.remove(worker)
+            if not self._closed:
+                self._stats["replaced"] += 1
+        self.logger.warning(f"Replacing unhealthy worker {worker.pid}")
+        worker.stop(timeout=1.0)
+        self._replenish()
+
+    def health_check(self) -> int:
+        """Ping the idle workers, replacing the ones that do not answer.
+
+        Returns
+        -------
+        int
+            The number of healthy idle workers.
+        """
+        with self._condition:
+            workers = list(self._idle)
+            self._idle.clear()
+            self._busy.update(worker.pid for worker in workers)
+        healthy = 0
+        for worker in workers:
+            if not self._is_healthy(worker):
+                self.discard(worker)
+                continue
+            healthy += 1
+            with self._condition:
+                self._busy.discard(worker.pid)
+                self._idle.append(worker)
+                self._condition.notify_all()
+        self._replenish()
+        return healthy
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the idle workers; busy ones stop when their job exits.
+
+        Parameters
+        ----------
+        timeout : float
+            How long to wait for each worker to exit.
+        """
+        with self._condition:
+            self._closed = True
+            workers = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        self._stop_event.set()
+        for worker in workers:
+            worker.stop(timeout=timeout)
+        if self._health_thread is not None:
+            self._health_thread.join(timeout=timeout)
+            self._health_thread = None
+
+    def __enter__(self) -> "WorkerPool":
+        """Start the pool.
+
+        Returns
+        -------
+        WorkerPool
+            The started pool.
+        """
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the pool.
+
+        Parameters
+        ----------
+        *args : Any
+            The exception info (if any).
+        """
+        self.close()
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._busy) + self._starting
+
+    def _acquire(self, timeout: float | None) -> _Worker | None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            worker: _Worker | None = None
+            spawn = False
+            with self._condition:
+                if self._closed:
+                    return None
+                if self._idle:
+                    worker = self._idle.popleft()
+                    self._busy.add(worker.pid)
+                elif self._total() < self.size:
+                    self._starting += 1
+                    spawn = True
+                else:
+                    remaining = (
+                        None
+                        if deadline is None
+                        else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        return None
+                    self._condition.wait(remaining)
+                    continue
+            if spawn:
+                return self._start_busy_worker()
+            if worker is not None and self._is_healthy(worker):
+                return worker
+            if worker is not None:
+                self.discard(worker)
+
+    def _start_busy_worker(self) -> _Worker | None:
+        try:
+            worker = self._spawn()
+        except OSError as error:
+            self.logger.error(f"Could not start a worker: {error}")
+            with self._condition:
+                self._starting -= 1
+            return None
+        ready = self._await_ready(worker)
+        with self._condition:
+            self._starting -= 1
+            if ready and not self._closed:
+                self._busy.add(worker.pid)
+                return worker
+        worker.stop()
+        return None
+
+    def _start_job(
+        self, worker: _Worker, job: dict[str, Any]
+    ) -> PooledProcess | None:
+        stdin_r, stdin_w = os.pipe()
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        ours = (stdin_w, stdout_r, stderr_r)
+        reply: dict[str, Any] | None = None
+        try:
+            worker.sock.settimeout(self.health_check_timeout)
+            send_message(worker.sock, job, [stdin_r, stdout_w, stderr_w])
+            reply = worker.receive(timeout=self.health_check_timeout)
+        except OSError as error:
+            self.logger.warning(f"Could not submit job: {error}")
+        finally:
+            for fd in (stdin_r, stdout_w, stderr_w):
+                os.close(fd)
+        if reply is None or reply.get("type") != "started":
+            for fd in ours:
+                os.close(fd)
+            self.discard(worker)
+            return None
+        pid = int(reply["pid"])
+        self.logger.debug(f"Job {pid} started in worker {worker.pid}")
+        return PooledProcess(self, worker, job["args"], pid, ours)
+
+    def _is_healthy(self, worker: _Worker) -> bool:
+        if not worker.is_alive():
+            return False
+        reply = worker.request({"type": "ping"}, self.health_check_timeout)
+        return reply is not None and reply.get("type") == "pong"
+
+    @staticmethod
+    def _spawn() -> _Worker:
+        ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        fd = theirs.fileno()
+        env = {**os.environ, "PYTHONIOENCODING": "utf-8"}
+        try:
+            process = subprocess.Popen(
+                [sys.executable, "-m", WORKER_MODULE, "--fd", str(fd)],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                pass_fds=(fd,),
+                env=env,
+            )
+        except BaseException:
+            ours.close()
+            raise
+        finally:
+            theirs.close()
+        return _Worker(process=process, sock=ours)
+
+    def _await_ready(self, worker: _Worker) -> bool:
+        message = worker.receive(timeout=self.start_timeout)
+        if message is None or message.get("type") != "ready":
+            self.logger.error(f"Worker {worker.pid} failed to start")
+            return False
+        self.logger.debug(f"Worker {worker.pid} is ready")
+        return True
+
+    def _replenish(self) -> None:
+        with self._condition:
+            if self._closed or self._total() >= self.size:
+                return
+            self._starting += 1
+        threading.Thread(
+            target=self._add_worker,
+            name="waldiez-worker-pool-spawn",
+            daemon=True,
+        ).start()
+
+    def _add_worker(self) -> None:
+        try:
+            worker = self._spawn()
+        except Exception as error:  # pragma: no cover
+            self.logger.error(f"Could not start a worker: {error}")
+            with self._condition:
+                self._starting -= 1
+            return
+        ready = self._await_ready(worker)
+        with self._condition:
+            self._starting -= 1
+            if ready and not self._closed:
+                self._idle.append(worker)
+                self._condition.notify_all()
+                return
+        worker.stop()
+
+    def _health_loop(self) -> None:
+        interval = self.health_check_interval or 0.0
+        while not self._stop_event.wait(interval):
+            try:
+                self.health_check()
+            except Exception as error:  # pragma: no cover
+                self.logger.error(f"Worker pool health check failed: {error}")
@@ -13,9 +13,11 @@ Processes CSV files and outputs JSON structure for timeline visualization
 import json
 import os
 import re
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import pandas as pd
 
 from waldiez.logger import WaldiezLogger
@@ -64,6 +66,115 @@ DEFAULT_AGENT_COLOR = "#E5E7EB"
 LOG = WaldiezLogger()
 
 
+@dataclass
+class _TimeIndex:
+    """The timestamps of a frame, parsed once and sorted for range lookups."""
+
+    source: pd.DataFrame
+    times: pd.DatetimeIndex
+    positions: Any  # np.ndarray: the row positions in the source frame
+    counts: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, frame: pd.DataFrame) -> "_TimeIndex":
+        """Parse and sort the "timestamp" column of a frame.
+
+        Parameters
+        ----------
+        frame : pd.DataFrame
+            The frame to index.
+
+        Returns
+        -------
+        _TimeIndex
+            The index (rows without a valid timestamp are left out).
+        """
+        parsed = pd.to_datetime(frame["timestamp"])
+        positions = np.flatnonzero(parsed.notna().to_numpy(dtype=bool))
+        times = pd.DatetimeIndex(parsed.iloc[positions])
+        order = np.argsort(times.values, kind="stable")
+        return cls(
+            source=frame,
+            times=times[order],
+            positions=positions[order],
+        )
+
+    def add_counter(self, name: str, flags: Any) -> None:
+        """Add a cumulative counter over a per-row boolean flag.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        flags : Any
+            One boolean per row of the source frame.
+        """
+        sorted_flags = np.asarray(flags, dtype=np.int64)[self.positions]
+        self.counts[name] = np.concatenate(([0], np.cumsum(sorted_flags)))
+
+    def window(self, start: Any, end: Any) -> tuple[int, int]:
+        """Get the sorted range of the rows with start <= timestamp <= end.
+
+        Parameters
+        ----------
+        start : Any
+            The (inclusive) start of the window.
+        end : Any
+            The (inclusive) end of the window.
+
+        Returns
+        -------
+        tuple[int, int]
+            The [low, high) range in the sorted timestamps.
+        """
+        if pd.isna(start) or pd.isna(end):
+            return 0, 0
+        low = int(self.times.searchsorted(start, side="left"))
+        high = int(self.times.searchsorted(end, side="right"))
+        return low, max(low, high)
+
+    def count(self, name: str, start: Any, end: Any) -> int:
+        """Count the flagged rows in a time window.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        start : Any
+            The (inclusive) start of the window.
+        end : Any
+            The (inclusive) end of the window.
+
+        Returns
+        -------
+        int
+            The number of flagged rows in the window.
+        """
+        low, high = self.window(start, end)
+        counts = self.counts[name]
+        return int(counts[high] - counts[low])
+
+    def first(self, start: Any, end: Any) -> int | None:
+        """Get the first (in frame order) row position in a time window.
+
+        Parameters
+        ----------
+        start : Any
+            The (inclusive) start of the window.
+        end : Any
+            The (inclusive) end of the window.
+
+        Returns
+        -------
+        int | None
+            The row position or None if no row is in the window.
+        """
+        low, high = self.window(start, end)
+        if low >= high:
+            return None
+        return int(self.positions[low:high].min())
+
+
 # noinspection PyMethodMayBeStatic,PyTypeHints,PyTypeChecker
 # noinspection PyUnresolvedReferences
 class TimelineProcessor:
@@ -80,6 +191,9 @@ class TimelineProcessor:
         self.chat_data = None
         self.events_data = None
         self.functions_data = None
+        self._events_index: _TimeIndex | None = None
+        self._functions_index: _TimeIndex | None = None
+        self._agents_lookup: tuple[pd.DataFrame, dict[str, Any]] | None = None
 
     def is_missing_or_nan(self, value: Any) -> bool:
         """Check if a value is missing, NaN, or empty.
@@ -123,35 +237,23 @@ class TimelineProcessor:
             return data
 
         data = data.copy()
-        last_valid_name: str | None = None
-
-        for idx in range(len(data)):
-            current_name = data.iloc[idx][name_column]
-
-            if self.is_missing_or_nan(current_name):
-                if last_valid_name is not None:
-                    column = data.columns.get_loc(name_column)
-                    data.iloc[idx, column] = last_valid_name  # type: ignore[index]
-                    LOG.debug(
-                        "Row %d: Replaced missing agent name with '%s'",
-                        idx,
-                        last_valid_name,
-                    )
-                else:
-                    # If no previous valid name, use a default
-                    default_name = "unknown_agent"
-                    column = data.columns.get_loc(name_column)
-                    data.iloc[idx, column] = default_name  # type: ignore[index]
-                    last_valid_name = default_name
-                    LOG.debug(
-                        "Row %d: Used default agent name '%s'",
-                        idx,
-                        default_name,
-                    )
-            else:
-                # noinspection PyTypeChecker
-                last_valid_name = current_name
-
+        names = data[name_column]
+        missing = names.isna().to_numpy(dtype=bool, copy=True)
+        is_text = names.map(lambda value: isinstance(value, str)).to_numpy(
+            dtype=bool
+        )
+        if is_text.any():
+            texts = names[is_text].astype(str)
+            blank = texts.str.strip().eq("") | texts.str.lower().eq("nan")
+            missing[is_text] |= blank.to_numpy(dtype=bool)
+        if missing.any():
+            LOG.debug(
+                "Filling %d missing agent names in '%s'",
+                int(missing.sum()),
+                name_column,
+            )
+            filled = names.astype(object).mask(missing).ffill()
+            data[name_column] = filled.fillna("unknown_agent")
         return data
 
     def fill_missing_agent_data(self) -> None:
@@ -183,26 +285,53 @@ class TimelineProcessor:
         functions_file : str | None
             Path to the functions CSV file.
         """
-        if agents_file:
-            self.agents_data = pd.read_csv(agents_file)
+        self.load_data_frames(
+            agents=pd.read_csv(agents_file) if agents_file else None,
+            chat=pd.read_csv(chat_file) if chat_file else None,
+            events=pd.read_csv(events_file) if events_file else None,
+            functions=pd.read_csv(functions_file) if functions_file else None,
+        )
+
+    def load_data_frames(
+        self,
+        agents: pd.DataFrame | None = None,
+        chat: pd.DataFrame | None = None,
+        events: pd.DataFrame | None = None,
+        functions: pd.DataFrame | None = None,
+    ) -> None:
+        """Load already read (e.g. from the sqlite log) DataFrames.
+
+        Parameters
+        ----------
+        agents : pd.DataFrame | None
+            The agents data.
+        chat : pd.DataFrame | None
+            The chat completions data.
+        events : pd.DataFrame | None
+            The events data.
+        functions : pd.DataFrame | None
+            The function calls data.
+        """
+        if agents is not None:
+            self.agents_data = agents
             LOG.info("Loaded agents data: %d rows", len(self.agents_data))
             # Fill missing agent names
             self.fill_missing_agent_data()
 
-        if chat_file:
-            self.chat_data = pd.read_csv(chat_file)
+        if chat is not None:
+            self.chat_data = chat
             LOG.info("Loaded chat data: %d rows", len(self.chat_data))
             # Fill missing agent names in chat data
             self.chat_data = self.fill_missing_agent_names(
                 self.chat_data, "source_name"
             )
 
-        if events_file:
-            self.events_data = pd.read_csv(events_file)
+        if events is not None:
+            self.events_data = events
             LOG.info("Loaded events data: %d rows", len(self.events_data))
 
-        if functions_file:
-            self.functions_data = pd.read_csv(functions_file)
+        if functions is not None:
+            self.functions_data = functions
             LOG.info("Loaded functions data: %d rows", len(self.functions_data))
 
     def parse_date(self, date_str: str) -> pd.Timestamp:
@@ -348,16 +477,51 @@ class TimelineProcessor:
                 return model
 
         # Then try to extract from agents data
-        if self.agents_data is not None:
-            agent_row = self.agents_data[self.agents_data["name"] == agent_name]
-            if not agent_row.empty and "init_args" in agent_row.columns:
-                init_args = str(agent_row.iloc[0]["init_args"])
-                model = self._extract_model_from_text(init_args)
-                if model != "Unknown":
-                    return model
+        agent_models = self._get_agent_lookup("models")
+        if agent_models is not None:
+            if agent_name not in agent_models:
+                init_args = self._get_agent_lookup("init_args") or {}
+                agent_models[agent_name] = (
+                    self._extract_model_from_text(str(init_args[agent_name]))
+                    if agent_name in init_args
+                    else "Unknown"
+                )
+            return agent_models[agent_name]
 
         return "Unknown"
 
+    def _get_agent_lookup(self, key: str) -> dict[Any, Any] | None:
+        """Get a per agent name lookup, built once from the agents data.
+
+        Parameters
+        ----------
+        key : str
+            The agents column to look up ("class" or "init_args"),
+            or "models" for the (lazily filled) models of the agents.
+
+        Returns
+        -------
+        dict[Any, Any] | None
+            The first value of each agent name (only for the names
+            that have one), or None if no agents data is loaded.
+        """
+        agents = self.agents_data
+        if agents is None:
+            return None
+        if self._agents_lookup is None or self._agents_lookup[0] is not agents:
+            names = agents["name"].tolist()
+            lookups: dict[str, Any] = {"models": {}}
+            for column in ("class", "init_args"):
+                lookup: dict[Any, Any] = {}
+                if column in agents.columns:
+                    for name, value in zip(
+                        names, agents[column].tolist(), strict=True
+                    ):
+                        lookup.setdefault(name, value)
+                lookups[column] = lookup
+            self._agents_lookup = (agents, lookups)
+        return self._agents_lookup[1][key]
+
     def _extract_model_from_text(self, text: Any) -> str:
         """Extract model name from text using dynamic parsing.
 
@@ -532,17 +696,17 @@ class TimelineProcessor:
     # noinspection PyTypeChecker
     def is_human_input_waiting_period(
         self,
-        prev_session: Series,
-        current_session: Series,
+        prev_session: Series | dict[str, Any],
+        current_session: Series | dict[str, Any],
         gap_duration: float,
     ) -> bool:
         """Detect if gap represents human input waiting.
 
         Parameters
         ----------
-        prev_session : Series
+        prev_session : Series | dict[str, Any]
             The previous session data.
-        current_session : Series
+        current_session : Series | dict[str, Any]
             The current session data.
         gap_duration : float
             The duration of the gap to analyze.
@@ -558,30 +722,17 @@ class TimelineProcessor:
         if self.events_data is None:
             return False
 
+        events_index = self._get_events_index()
+
         # Get events around the gap period
         prev_end = self.parse_date(prev_session["end_time"])
         current_start = self.parse_date(current_session["start_time"])
 
         # Look for user message events right after the gap (within 1 second)
         after_gap_window = current_start + pd.Timedelta(seconds=1)
-
-        user_events_after_gap = self.events_data[
-            (pd.to_datetime(self.events_data["timestamp"]) >= current_start)
-            & (
-                pd.to_datetime(self.events_data["timestamp"])
-                <= after_gap_window
-            )
-            & (self.events_data["event_name"] == "received_message")
-        ]
-
-        # Check if any of these events contain user messages
-        user_message_found = False
-        for _, event in user_events_after_gap.iterrows():
-            if self.is_user_message_event(event):
-                user_message_found = True
-                break
-
-        if user_message_found:
+        if events_index.count(
+            "received_user_message", current_start, after_gap_window
+        ):
             return True
 
         # Alternative check: look for gaps that are longer and likely represent
@@ -592,24 +743,62 @@ class TimelineProcessor:
             # around this gap
             broader_window_start = prev_end - pd.Timedelta(seconds=2)
             broader_window_end = current_start + pd.Timedelta(seconds=5)
+            if events_index.count(
+                "user_message", broader_window_start, broader_window_end
+            ):
+                return True
 
-            broader_events = self.events_data[
-                (
-                    pd.to_datetime(self.events_data["timestamp"])
-                    >= broader_window_start
-                )
-                & (
-                    pd.to_datetime(self.events_data["timestamp"])
-                    <= broader_window_end
+        return False
+
+    def _get_events_index(self) -> _TimeIndex:
+        """Get the (cached) time index of the events data.
+
+        Returns
+        -------
+        _TimeIndex
+            The index, with the user message counters.
+        """
+        events = self.events_data
+        if events is None:  # pragma: no cover
+            raise ValueError("Events data is required")
+        if (
+            self._events_index is None
+            or self._events_index.source is not events
+        ):
+            index = _TimeIndex.build(events)
+            if "json_state" in events.columns:
+                user_messages = (
+                    events["json_state"]
+                    .map(self._is_user_message_state)
+                    .to_numpy(dtype=bool)
                 )
-            ]
+            else:
+                user_messages = np.zeros(len(events), dtype=bool)
+            received = (events["event_name"] == "received_message").to_numpy(
+                dtype=bool
+            )
+            index.add_counter("user_message", user_messages)
+            index.add_counter("received_user_message", user_messages & received)
+            self._events_index = index
+        return self._events_index
 
-            # Look for user message patterns
-            for _, event in broader_events.iterrows():
-                if self.is_user_message_event(event):
-                    return True
+    def _get_functions_index(self) -> _TimeIndex:
+        """Get the (cached) time index of the function calls data.
 
-        return False
+        Returns
+        -------
+        _TimeIndex
+            The index.
+        """
+        functions = self.functions_data
+        if functions is None:  # pragma: no cover
+            raise ValueError("Functions data is required")
+        if (
+            self._functions_index is None
+            or self._functions_index.source is not functions
+        ):
+            self._functions_index = _TimeIndex.build(functions)
+        return self._functions_index
 
     def is_user_message_event(self, event: Series) -> bool:
         """Check if an event represents a user message.
@@ -624,7 +813,22 @@ class TimelineProcessor:
         bool
             True if the event represents a user message, False otherwise.
         """
-        json_state = event.get("json_state", "")
+        return self._is_user_message_state(event.get("json_state", ""))
+
+    @staticmethod
+    def _is_user_message_state(json_state: Any) -> bool:
+        """Check if an event's json state represents a user message.
+
+        Parameters
+        ----------
+        json_state : Any
+            The "json_state" value of the event.
+
+        Returns
+        -------
+        bool
+            True if the event represents a user message, False otherwise.
+        """
         if not json_state or not isinstance(json_state, str):
             return False
 
@@ -644,17 +848,17 @@ class TimelineProcessor:
     # noinspection PyTypeChecker
     def categorize_gap_activity(
         self,
-        prev_session: Series,
-        current_session: Series,
+        prev_session: Series | dict[str, Any],
+        current_session: Series | dict[str, Any],
         gap_duration: float,
     ) -> dict[str, Any]:
         """Categorize what happened during a gap.
 
         Parameters
         ----------
-        prev_session : Series
+        prev_session : Series | dict[str, Any]
             The previous session data.
-        current_session : Series
+        current_session : Series | dict[str, Any]
             The current session data.
         gap_duration : float
             The duration of the gap in seconds.
@@ -679,16 +883,14 @@ class TimelineProcessor:
             prev_end = self.parse_date(prev_session["end_time"])
             current_start = self.parse_date(current_session["start_time"])
 
-            gap_functions = self.functions_data[
-                (pd.to_datetime(self.functions_data["timestamp"]) >= prev_end)
-                & (
-                    pd.to_datetime(self.functions_data["timestamp"])
-                    <= current_start
-                )
-            ]
+            first_function = self._get_functions_index().first(
+                prev_end, current_start
+            )
 
-            if not gap_functions.empty:
-                primary_function = gap_functions.iloc[0]["function_name"]
+            if first_function is not None:
+                primary_function = self.functions_data.iloc[first_function][
+                    "function_name"
+                ]
 
                 if (
                     "transfer" in primary_function.lower()
@@ -786,7 +988,8 @@ class TimelineProcessor:
         cumulative_cost = 0.0
         session_id = 1
 
-        for _i, (_idx, row) in enumerate(chat_sorted.iterrows()):
+        rows = chat_sorted.to_dict("records")
+        for row in rows:
             try:
                 # Get agent name and handle missing values
                 agent_name = row["source_name"]
@@ -803,7 +1006,7 @@ class TimelineProcessor:
                 gap_activity = None
 
                 if session_id > 1:  # Not the first session
-                    prev_row = chat_sorted.iloc[session_id - 2]  # Previous row
+                    prev_row = rows[session_id - 2]  # Previous row
                     gap_duration = (
                         row["start_time"] - prev_row["end_time"]
                     ).total_seconds()
@@ -980,6 +1183,7 @@ class TimelineProcessor:
             }
         )
         agent_colors = self.generate_agent_colors(agents_in_timeline)
+        agent_classes = self._get_agent_lookup("class")
 
         # Update timeline with colors and agent classes
         for item in timeline:
@@ -994,14 +1198,10 @@ class TimelineProcessor:
                 )
 
                 # Update agent class if agents data available
-                if self.agents_data is not None:
-                    agent_row = self.agents_data[
-                        self.agents_data["name"] == agent_name
-                    ]
-                    if not agent_row.empty and "class" in agent_row.columns:
-                        agent_class = agent_row.iloc[0]["class"]
-                        if not self.is_missing_or_nan(agent_class):
-                            item["agent_class"] = agent_class
+                if agent_classes and agent_name in agent_classes:
+                    agent_class = agent_classes[agent_name]
+                    if not self.is_missing_or_nan(agent_class):
+                        item["agent_class"] = agent_class
 
         # Create agents list
         agents: list[dict[str, Any]] = []
@@ -1010,14 +1210,10 @@ class TimelineProcessor:
                 continue
 
             agent_class = agent_name  # Default
-            if self.agents_data is not None:
-                agent_row = self.agents_data[
-                    self.agents_data["name"] == agent_name
-                ]
-                if not agent_row.empty and "class" in agent_row.columns:
-                    agent_class_value = agent_row.iloc[0]["class"]
-                    if not self.is_missing_or_nan(agent_class_value):
-                        agent_class = agent_class_value
+            if agent_classes and agent_name in agent_classes:
+                agent_class_value = agent_classes[agent_name]
+                if not self.is_missing_or_nan(agent_class_value):
+                    agent_class = agent_class_value
 
             agents.append(
                 {
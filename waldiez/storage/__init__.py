@@ -6,10 +6,12 @@
 import typer
 from typer.models import CommandInfo
 
+from .catalog import CheckpointCatalog
 from .checkpoint import WaldiezCheckpoint, WaldiezCheckpointInfo
 from .cli import handle_checkpoints
 from .filesystem_storage import FilesystemStorage
 from .protocol import Storage
+from .sqlite_storage import SqliteStorage
 from .storage_manager import StorageManager
 from .utils import get_root_dir, safe_name, symlink
 
@@ -36,6 +38,8 @@ __all__ = [
     "Storage",
     "StorageManager",
     "FilesystemStorage",
+    "SqliteStorage",
+    "CheckpointCatalog",
     "WaldiezCheckpoint",
     "WaldiezCheckpointInfo",
     "symlink",
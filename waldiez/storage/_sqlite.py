@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=broad-exception-caught
+
+"""Shared (fork safe) connection to the storage's SQLite databases."""
+
+import os
+import sqlite3
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+
+
+class SqliteConnection:
+    """A WAL mode database connection, shared by the threads of a process.
+
+    A forked process does not reuse its parent's handle: it reconnects
+    on its first query.
+    """
+
+    def __init__(self, path: Path, schema: str, schema_version: int) -> None:
+        """Open (or create) the database.
+
+        Parameters
+        ----------
+        path : Path
+            The database file.
+        schema : str
+            The (idempotent) script that creates the tables.
+        schema_version : int
+            The version to record as the database's ``user_version``.
+        """
+        self._path = path
+        self._schema = schema
+        self._schema_version = schema_version
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+        self._in_transaction = False
+        self._connection = self._connect()
+
+    @property
+    def in_transaction(self) -> bool:
+        """Whether a write transaction is open."""
+        return self._in_transaction
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock, suppress(Exception):
+            self._connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connect to the database and make sure the schema exists."""
+        connection = sqlite3.connect(
+            self._path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        with suppress(sqlite3.DatabaseError):
+            connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(self._schema)
+        connection.execute(f"PRAGMA user_version={self._schema_version}")
+        return connection
+
+    @contextmanager
+    def cursor(
+        self, write: bool = False
+    ) -> Generator[sqlite3.Cursor, None, None]:
+        """Get a cursor (in a transaction if writing).
+
+        Writes inside an open transaction join it.
+
+        Parameters
+        ----------
+        write : bool
+            Whether to write (in an immediate transaction).
+
+        Yields
+        ------
+        sqlite3.Cursor
+            The cursor.
+
+        Raises
+        ------
+        BaseException
+            Any error of the transaction (after rolling it back).
+        """
+        with self._lock:
+            if os.getpid() != self._pid:  # forked: do not share the handle
+                self._pid = os.getpid()
+                self._in_transaction = False
+                self._connection = self._connect()
+            cursor = self._connection.cursor()
+            if not write or self._in_transaction:
+                yield cursor
+                return
+            cursor.execute("BEGIN IMMEDIATE")
+            self._in_transaction = True
+            try:
+                yield cursor
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            finally:
+                self._in_transaction = False
+            cursor.execute("COMMIT")
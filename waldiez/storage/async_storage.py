@@ -0,0 +1,321 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+"""Non-blocking access to a (synchronous) storage backend."""
+
+from collections.abc import Iterable
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+import anyio.to_thread
+from anyio import CapacityLimiter
+
+from .checkpoint import WaldiezCheckpoint, WaldiezCheckpointInfo
+from .protocol import Storage
+
+T = TypeVar("T")
+
+# filesystem work is mostly waiting on the disk: a few threads are enough
+DEFAULT_MAX_THREADS = 4
+
+
+class ThreadedAsyncStorage:
+    """Run the operations of a storage backend in worker threads.
+
+    Implements :class:`~waldiez.storage.protocol.AsyncStorage`.
+    The threads are bounded by a limiter of their own, so storage
+    operations do not starve (or get starved by) other thread offloading
+    in the same event loop.
+    """
+
+    def __init__(
+        self, storage: Storage, max_threads: int = DEFAULT_MAX_THREADS
+    ) -> None:
+        """Initialize the async storage.
+
+        Parameters
+        ----------
+        storage : Storage
+            The (synchronous) storage backend to use.
+        max_threads : int
+            The maximum number of concurrent storage operations.
+        """
+        self._storage = storage
+        self._max_threads = max(1, max_threads)
+        self._limiter: CapacityLimiter | None = None
+
+    @property
+    def storage(self) -> Storage:
+        """The underlying storage backend."""
+        return self._storage
+
+    @property
+    def workspace_dir(self) -> Path:
+        """Base workspace directory."""
+        return self._storage.workspace_dir
+
+    async def run_sync(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking storage call in a worker thread.
+
+        Parameters
+        ----------
+        func : Callable[..., T]
+            The function to call.
+        *args : Any
+            The positional arguments of the call.
+
+        Returns
+        -------
+        T
+            The result of the call.
+        """
+        if self._limiter is None:
+            # created lazily: it needs a running event loop
+            self._limiter = CapacityLimiter(self._max_threads)
+        return await anyio.to_thread.run_sync(
+            func, *args, limiter=self._limiter
+        )
+
+    async def save_checkpoint(
+        self,
+        session_name: str,
+        state: dict[str, Any],
+        metadata: dict[str, Any] | None = None,
+        timestamp: datetime | None = None,
+    ) -> Path:
+        """Save a checkpoint for a session.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        state : dict[str, Any]
+            State data to save
+        metadata : dict[str, Any]
+            Optional metadata to include
+        timestamp: datetime
+            Optional timestamp (defaults to now)
+
+        Returns
+        -------
+        Path
+            The path of the checkpoint.
+        """
+        return await self.run_sync(
+            partial(
+                self._storage.save_checkpoint,
+                session_name,
+                state,
+                metadata=metadata,
+                timestamp=timestamp,
+            )
+        )
+
+    async def get_checkpoint(
+        self, session_name: str, timestamp: datetime | None = None
+    ) -> WaldiezCheckpointInfo | None:
+        """Load a checkpoint for a session.
+
+        The checkpoint's state and metadata are read in the worker
+        thread too, so accessing them afterwards does not block.
+        Unlike the synchronous backends, a missing session
+        gives None instead of raising.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        timestamp: datetime
+            Optional timestamp (defaults to latest)
+
+        Returns
+        -------
+        WaldiezCheckpointInfo | None
+            The checkpoint's info if found.
+        """
+        return await self.run_sync(self._get_loaded, session_name, timestamp)
+
+    async def load_checkpoint(
+        self, info: WaldiezCheckpointInfo, history_index: int | None
+    ) -> WaldiezCheckpoint:
+        """Load a checkpoint.
+
+        Parameters
+        ----------
+        info: WaldiezCheckpointInfo
+            The checkpoint info to get the path.
+        history_index: int | None
+            Optional history index to use.
+
+        Returns
+        -------
+        WaldiezCheckpoint
+            The loaded checkpoint.
+        """
+        return await self.run_sync(
+            self._storage.load_checkpoint, info, history_index
+        )
+
+    async def load_history(
+        self, info: WaldiezCheckpointInfo
+    ) -> list[dict[str, Any]]:
+        """Load the (decoded) history of a checkpoint.
+
+        Parameters
+        ----------
+        info: WaldiezCheckpointInfo
+            The checkpoint info.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The history entries.
+        """
+        return await self.run_sync(info.checkpoint.history)
+
+    async def link_checkpoint(
+        self,
+        to: Path,
+        session_name: str,
+        timestamp: datetime | None = None,
+    ) -> None:
+        """Create a symlink to a checkpoint.
+
+        Parameters
+        ----------
+        to: Path
+            Where to create the symlink to.
+        session_name : str
+            Name of the session
+        timestamp: datetime | None
+            Optional specific checkpoint timestamp (defaults to latest)
+        """
+        await self.run_sync(
+            self._storage.link_checkpoint, to, session_name, timestamp
+        )
+
+    async def list_checkpoints(
+        self, session_name: str | None = None
+    ) -> list[WaldiezCheckpointInfo]:
+        """List available checkpoints.
+
+        Parameters
+        ----------
+        session_name : str | None
+            Optional filter by session name
+
+        Returns
+        -------
+        list[WaldiezCheckpointInfo]
+            The checkpoints found.
+        """
+        return await self.run_sync(self._storage.list_checkpoints, session_name)
+
+    async def list_sessions(self) -> list[str]:
+        """List available sessions.
+
+        Returns
+        -------
+        list[str]
+            The sessions found.
+        """
+        return await self.run_sync(self._storage.list_sessions)
+
+    async def delete_session(self, session_name: str) -> None:
+        """Delete a session and all its checkpoints.
+
+        Parameters
+        ----------
+        session_name : str
+            The session to delete.
+        """
+        await self.run_sync(self._storage.delete_session, session_name)
+
+    async def delete_checkpoint(
+        self, session_name: str, timestamp: datetime
+    ) -> None:
+        """Delete a specific checkpoint.
+
+        Parameters
+        ----------
+        session_name : str
+            The name of the session
+        timestamp : datetime
+            Timestamp of the checkpoint to delete
+        """
+        await self.run_sync(
+            self._storage.delete_checkpoint, session_name, timestamp
+        )
+
+    async def cleanup_old_checkpoints(
+        self, session_name: str, keep_count: int = 5
+    ) -> int:
+        """Clean up old checkpoints, keeping only the most recent ones.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        keep_count : int
+            Number of recent checkpoints to keep
+
+        Returns
+        -------
+        int
+            The number of checkpoints deleted.
+        """
+        return await self.run_sync(
+            self._storage.cleanup_old_checkpoints, session_name, keep_count
+        )
+
+    async def clean_broken_symlinks(
+        self, session_name: str | None = None
+    ) -> int:
+        """Clean up broken symlinks.
+
+        Parameters
+        ----------
+        session_name : str | None
+            If provided, clean only in that session's directory.
+
+        Returns
+        -------
+        int
+            The number of symlinks removed.
+        """
+        return await self.run_sync(
+            self._storage.clean_broken_symlinks, session_name
+        )
+
+    async def delete_checkpoints_batch(
+        self, checkpoints: Iterable[tuple[str, datetime]]
+    ) -> int:
+        """Delete multiple checkpoints.
+
+        Parameters
+        ----------
+        checkpoints : Iterable[tuple[str, datetime]]
+            List of (session_name, timestamp) tuples
+
+        Returns
+        -------
+        int
+            The number of checkpoints deleted.
+        """
+        return await self.run_sync(
+            self._storage.delete_checkpoints_batch, list(checkpoints)
+        )
+
+    def _get_loaded(
+        self, session_name: str, timestamp: datetime | None
+    ) -> WaldiezCheckpointInfo | None:
+        try:
+            info = self._storage.get_checkpoint(session_name, timestamp)
+        except FileNotFoundError:
+            return None
+        if info is not None:
+            _ = info.checkpoint.state
+            _ = info.checkpoint.metadata
+        return info
@@ -0,0 +1,231 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+"""Content-addressed store for the (immutable) artifacts of checkpoints.
+
+Runs of the same flow produce mostly identical files (the generated
+code, requirements, unchanged uploads...). Instead of copying them into
+every checkpoint, each file is stored once, named by its sha256 digest,
+and hard-linked into the checkpoints that contain it. The catalog keeps
+the references of each checkpoint, so that an object is removed once
+no checkpoint uses it.
+"""
+
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+
+BLOBS_DIR = ".objects"
+# files that are rewritten in place, so they cannot be shared
+MUTABLE_NAMES = frozenset(
+    (
+        "state.json",
+        "metadata.json",
+        "history.json",
+        "history.jsonl",
+        "history.idx",
+    )
+)
+# smaller files take (at least) one block either way
+MIN_BLOB_SIZE = 4096
+_CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStore:
+    """Hash-named objects, hard-linked into checkpoint directories."""
+
+    def __init__(self, root: Path, min_size: int = MIN_BLOB_SIZE) -> None:
+        """Initialize the store.
+
+        Parameters
+        ----------
+        root : Path
+            The directory of the objects.
+        min_size : int
+            Files smaller than this (in bytes) are copied, not shared.
+        """
+        self._root = root
+        self.min_size = min_size
+
+    @property
+    def root(self) -> Path:
+        """The directory of the objects."""
+        return self._root
+
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        """Get the sha256 hex digest of a file's contents.
+
+        Parameters
+        ----------
+        path : Path
+            The file.
+
+        Returns
+        -------
+        str
+            The digest.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def object_path(self, digest: str) -> Path:
+        """Get the path of an object.
+
+        Parameters
+        ----------
+        digest : str
+            The object's digest.
+
+        Returns
+        -------
+        Path
+            The object's path.
+        """
+        return self._root / digest[:2] / digest[2:]
+
+    def shareable(self, path: Path) -> bool:
+        """Check if a file can be stored as a (shared) object.
+
+        Parameters
+        ----------
+        path : Path
+            The file.
+
+        Returns
+        -------
+        bool
+            True if the file is large enough and not rewritten in place.
+        """
+        if path.name in MUTABLE_NAMES or path.is_symlink():
+            return False
+        try:
+            return path.stat().st_size >= self.min_size
+        except OSError:
+            return False
+
+    def add(self, source: Path, move: bool = False) -> str:
+        """Store a file's contents (if not already stored).
+
+        Parameters
+        ----------
+        source : Path
+            The file to store.
+        move : bool
+            Move the file into the store (when possible) instead of
+            copying it. The source is removed either way.
+
+        Returns
+        -------
+        str
+            The object's digest.
+        """
+        digest = self.hash_file(source)
+        target = self.object_path(digest)
+        if target.is_file():
+            if move:
+                source.unlink(missing_ok=True)
+            return digest
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+        os.close(fd)
+        tmp = Path(tmp_name)
+        try:
+            self._place(source, tmp, move=move)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return digest
+
+    @staticmethod
+    def _place(source: Path, tmp: Path, move: bool) -> None:
+        """Move or copy a file to a (read-only) temporary object."""
+        if not move:
+            shutil.copy2(source, tmp)
+        else:
+            try:
+                os.replace(source, tmp)
+            except OSError:  # e.g. another filesystem
+                shutil.copy2(source, tmp)
+                source.unlink(missing_ok=True)
+        if os.name != "nt":
+            # hard links share the inode: writing to one would
+            # change every checkpoint that uses the object.
+            tmp.chmod(stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+    def link(self, digest: str, destination: Path) -> bool:
+        """Link (or copy, if linking is not possible) an object.
+
+        Parameters
+        ----------
+        digest : str
+            The object's digest.
+        destination : Path
+            Where to place the object's contents.
+
+        Returns
+        -------
+        bool
+            True if the destination shares the object (hard link),
+            False if it is an independent copy.
+        """
+        source = self.object_path(digest)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        with suppress(FileNotFoundError):
+            destination.unlink()
+        try:
+            os.link(source, destination)
+            return True
+        except OSError:
+            shutil.copyfile(source, destination)
+            return False
+
+    def store(
+        self, source: Path, destination: Path, move: bool = False
+    ) -> str | None:
+        """Store a file and place it at a destination.
+
+        Parameters
+        ----------
+        source : Path
+            The file to store.
+        destination : Path
+            Where to place the file.
+        move : bool
+            Move the source into the store instead of copying it.
+
+        Returns
+        -------
+        str | None
+            The digest of the object the destination shares,
+            or None if the file was copied (not shareable or no links).
+        """
+        if not self.shareable(source):
+            if move:
+                shutil.move(source, destination)
+            else:
+                shutil.copy2(source, destination)
+            return None
+        digest = self.add(source, move=move)
+        return digest if self.link(digest, destination) else None
+
+    def remove(self, digest: str) -> None:
+        """Remove an object.
+
+        Parameters
+        ----------
+        digest : str
+            The object's digest.
+        """
+        path = self.object_path(digest)
+        with suppress(OSError):
+            path.unlink(missing_ok=True)
+        with suppress(OSError):
+            path.parent.rmdir()  # only if empty
@@ -0,0 +1,614 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=broad-exception-caught,too-many-public-methods
+# pyright: reportUnknownVariableType=false,reportUnknownArgumentType=false
+
+"""SQLite catalog of a workspace's sessions, checkpoints and links.
+
+The catalog lives next to the session directories and mirrors them, so
+that listing the checkpoints of a session or finding the latest one is
+an index lookup instead of a walk over every checkpoint directory.
+"""
+
+import json
+import sqlite3
+from collections.abc import Iterable, Mapping
+from contextlib import AbstractContextManager, suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ._sqlite import SqliteConnection
+
+CATALOG_FILE = ".catalog.db"
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    name TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    session TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    PRIMARY KEY (session, timestamp)
+);
+CREATE TABLE IF NOT EXISTS metadata_fields (
+    session TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (session, timestamp, key)
+);
+CREATE INDEX IF NOT EXISTS metadata_fields_lookup
+    ON metadata_fields (key, value);
+CREATE TABLE IF NOT EXISTS links (
+    checkpoint TEXT NOT NULL,
+    link TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (checkpoint, link)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+    session TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    refs INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (session, timestamp, digest)
+);
+CREATE INDEX IF NOT EXISTS checkpoint_blobs_digest
+    ON checkpoint_blobs (digest);
+CREATE TABLE IF NOT EXISTS scanned (
+    name TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL
+);
+"""
+
+
+@dataclass
+class CatalogEntry:
+    """A checkpoint, as recorded in the catalog."""
+
+    session: str
+    timestamp: int
+    size: int = 0
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+def _field_value(value: Any) -> str | None:
+    """Get the indexed representation of a (scalar) metadata value."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return json.dumps(value)
+    return None
+
+
+# noinspection SqlNoDataSourceInspection,SqlResolve
+class CheckpointCatalog:
+    """SQLite index of the checkpoints (and external links) of a workspace.
+
+    Timestamps are the integer microseconds used for the checkpoint
+    directory names (see :meth:`WaldiezCheckpoint.format_timestamp`).
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Open (or create) the catalog.
+
+        Parameters
+        ----------
+        path : Path
+            The catalog's database file.
+        """
+        self._path = path
+        self._created = not path.exists()
+        self._db = SqliteConnection(path, _SCHEMA, SCHEMA_VERSION)
+
+    @property
+    def path(self) -> Path:
+        """The catalog's database file."""
+        return self._path
+
+    @property
+    def created(self) -> bool:
+        """Whether the database file did not exist before opening it."""
+        return self._created
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+    def _cursor(
+        self, write: bool = False
+    ) -> AbstractContextManager[sqlite3.Cursor]:
+        """Get a cursor (in a transaction if writing)."""
+        return self._db.cursor(write=write)
+
+    # sessions
+
+    def add_session(self, session: str) -> None:
+        """Record a session.
+
+        Parameters
+        ----------
+        session : str
+            The session (directory) name.
+        """
+        with self._cursor(write=True) as cursor:
+            cursor.execute(
+                "INSERT OR IGNORE INTO sessions (name) VALUES (?)", (session,)
+            )
+
+    def sessions(self) -> list[str]:
+        """Get the recorded sessions.
+
+        Returns
+        -------
+        list[str]
+            The session names, in reverse alphabetical order.
+        """
+        with self._cursor() as cursor:
+            rows = cursor.execute(
+                "SELECT name FROM sessions ORDER BY name DESC"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def remove_session(self, session: str) -> None:
+        """Forget a session and all its checkpoints.
+
+        Parameters
+        ----------
+        session : str
+            The session (directory) name.
+        """
+        with self._cursor(write=True) as cursor:
+            cursor.execute(
+                "DELETE FROM metadata_fields WHERE session = ?", (session,)
+            )
+            cursor.execute(
+                "DELETE FROM checkpoints WHERE session = ?", (session,)
+            )
+            cursor.execute(
+                "DELETE FROM checkpoint_blobs WHERE session = ?", (session,)
+            )
+            cursor.execute("DELETE FROM sessions WHERE name = ?", (session,))
+            cursor.execute("DELETE FROM scanned WHERE name = ?", (session,))
+
+    # checkpoints
+
+    def add_checkpoint(self, entry: CatalogEntry) -> None:
+        """Record (or update) a checkpoint.
+
+        Parameters
+        ----------
+        entry : CatalogEntry
+            The checkpoint to record.
+        """
+        with self._cursor(write=True) as cursor:
+            self._insert(cursor, entry)
+
+    def remove_checkpoint(self, session: str, timestamp: int) -> None:
+        """Forget a checkpoint (and release its blobs).
+
+        Parameters
+        ----------
+        session : str
+            The session (directory) name.
+        timestamp : int
+            The checkpoint's timestamp.
+        """
+        with self._cursor(write=True) as cursor:
+            self._delete(cursor, session, timestamp)
+            cursor.execute(
+                """
+                DELETE FROM checkpoint_blobs
+                WHERE session = ? AND timestamp = ?
+                """,
+                (session, timestamp),
+            )
+
+    def checkpoints(self, session: str | None = None) -> list[CatalogEntry]:
+        """Get the recorded checkpoints (newest first per session).
+
+        Parameters
+        ----------
+        session : str | None
+            Only get the checkpoints of this session.
+
+        Returns
+        -------
+        list[CatalogEntry]
+            The checkpoints.
+        """
+        query = "SELECT session, timestamp, size, metadata FROM checkpoints"
+        params: tuple[Any, ...] = ()
+        if session is not None:
+            query += " WHERE session = ?"
+            params = (session,)
+        query += " ORDER BY session DESC, timestamp DESC"
+        with self._cursor() as cursor:
+            rows = cursor.execute(query, params).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def latest(self, session: str) -> CatalogEntry | None:
+        """Get the latest checkpoint of a session.
+
+        Parameters
+        ----------
+        session : str
+            The session (directory) name.
+
+        Returns
+        -------
+        CatalogEntry | None
+            The latest checkpoint, if any.
+        """
+        with self._cursor() as cursor:
+            row = cursor.execute(
+                """
+                SELECT session, timestamp, size, metadata FROM checkpoints
+                WHERE session = ? ORDER BY timestamp DESC LIMIT 1
+                """,
+                (session,),
+            ).fetchone()
+        return self._entry(row) if row else None
+
+    def find(
+        self, metadata: Mapping[str, Any], session: str | None = None
+    ) -> list[CatalogEntry]:
+        """Find the checkpoints whose metadata match the given fields.
+
+        Only top-level scalar (str, number, bool, None) fields are indexed.
+
+        Parameters
+        ----------
+        metadata : Mapping[str, Any]
+            The fields (and values) to match.
+        session : str | None
+            Only search the checkpoints of this session.
+
+        Returns
+        -------
+        list[CatalogEntry]
+            The matching checkpoints (newest first per session).
+        """
+        query = "SELECT session, timestamp, size, metadata FROM checkpoints c"
+        conditions: list[str] = []
+        params: list[Any] = []
+        for key, value in metadata.items():
+            indexed = _field_value(value)
+            if indexed is None:
+                return []
+            conditions.append(
+                """
+                EXISTS (SELECT 1 FROM metadata_fields f WHERE
+                f.session = c.session AND f.timestamp = c.timestamp
+                AND f.key = ? AND f.value = ?)
+                """
+            )
+            params.extend((key, indexed))
+        if session is not None:
+            conditions.append("c.session = ?")
+            params.append(session)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY session DESC, timestamp DESC"
+        with self._cursor() as cursor:
+            rows = cursor.execute(query, params).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def replace_checkpoints(
+        self, sessions: Iterable[str], entries: Iterable[CatalogEntry]
+    ) -> None:
+        """Replace all the recorded sessions and checkpoints.
+
+        Parameters
+        ----------
+        sessions : Iterable[str]
+            The sessions.
+        entries : Iterable[CatalogEntry]
+            The checkpoints.
+        """
+        with self._cursor(write=True) as cursor:
+            cursor.execute("DELETE FROM metadata_fields")
+            cursor.execute("DELETE FROM checkpoints")
+            cursor.execute("DELETE FROM sessions")
+            cursor.executemany(
+                "INSERT OR IGNORE INTO sessions (name) VALUES (?)",
+                [(session,) for session in sessions],
+            )
+            for entry in entries:
+                self._insert(cursor, entry)
+            # release the blobs of the checkpoints that are gone
+            cursor.execute(
+                """
+                DELETE FROM checkpoint_blobs WHERE NOT EXISTS (
+                    SELECT 1 FROM checkpoints c
+                    WHERE c.session = checkpoint_blobs.session
+                    AND c.timestamp = checkpoint_blobs.timestamp
+                )
+                """
+            )
+
+    # scans
+
+    def scanned(self) -> dict[str, int]:
+        """Get the modification times of the directories when last scanned.
+
+        Returns
+        -------
+        dict[str, int]
+            The ``st_mtime_ns`` of each scanned directory, by name.
+        """
+        with self._cursor() as cursor:
+            rows = cursor.execute("SELECT name, mtime FROM scanned").fetchall()
+        return {str(name): int(mtime) for name, mtime in rows}
+
+    def set_scanned(
+        self, mtimes: Mapping[str, int], replace: bool = False
+    ) -> None:
+        """Record the modification times of scanned directories.
+
+        Parameters
+        ----------
+        mtimes : Mapping[str, int]
+            The ``st_mtime_ns`` of each directory (before it was scanned).
+        replace : bool
+            Forget the other directories' scans.
+        """
+        with self._cursor(write=True) as cursor:
+            if replace:
+                cursor.execute("DELETE FROM scanned")
+            cursor.executemany(
+                "INSERT OR REPLACE INTO scanned (name, mtime) VALUES (?, ?)",
+                list(mtimes.items()),
+            )
+
+    # blobs
+
+    def add_blobs(
+        self, session: str, timestamp: int, blobs: Iterable[tuple[str, int]]
+    ) -> None:
+        """Record the blobs (shared objects) a checkpoint uses.
+
+        Parameters
+        ----------
+        session : str
+            The session (directory) name.
+        timestamp : int
+            The checkpoint's timestamp.
+        blobs : Iterable[tuple[str, int]]
+            The (digest, size) of each used object (once per file).
+        """
+        with self._cursor(write=True) as cursor:
+            for digest, size in blobs:
+                cursor.execute(
+                    "INSERT OR IGNORE INTO blobs (digest, size) VALUES (?, ?)",
+                    (digest, size),
+                )
+                cursor.execute(
+                    """
+                    INSERT INTO checkpoint_blobs (session, timestamp, digest)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (session, timestamp, digest)
+                    DO UPDATE SET refs = refs + 1
+                    """,
+                    (session, timestamp, digest),
+                )
+
+    def blob_refs(self, digest: str) -> int:
+        """Get the number of references to a blob.
+
+        Parameters
+        ----------
+        digest : str
+            The object's digest.
+
+        Returns
+        -------
+        int
+            How many checkpoint files use the object.
+        """
+        with self._cursor() as cursor:
+            row = cursor.execute(
+                """
+                SELECT COALESCE(SUM(refs), 0) FROM checkpoint_blobs
+                WHERE digest = ?
+                """,
+                (digest,),
+            ).fetchone()
+        return int(row[0])
+
+    def pop_orphan_blobs(self) -> list[str]:
+        """Forget (and get) the blobs that no checkpoint uses.
+
+        Returns
+        -------
+        list[str]
+            The digests of the objects that can be removed.
+        """
+        with self._cursor(write=True) as cursor:
+            rows = cursor.execute(
+                """
+                SELECT digest FROM blobs WHERE NOT EXISTS (
+                    SELECT 1 FROM checkpoint_blobs cb
+                    WHERE cb.digest = blobs.digest
+                )
+                """
+            ).fetchall()
+            cursor.executemany(
+                "DELETE FROM blobs WHERE digest = ?", [tuple(r) for r in rows]
+            )
+        return [row[0] for row in rows]
+
+    def blobs_size(self) -> tuple[int, int]:
+        """Get the stored and the referenced size of the blobs.
+
+        Returns
+        -------
+        tuple[int, int]
+            The bytes stored once and the bytes the checkpoints would
+            take if each had its own copy.
+        """
+        with self._cursor() as cursor:
+            row = cursor.execute(
+                """
+                SELECT
+                    (SELECT COALESCE(SUM(size), 0) FROM blobs),
+                    (SELECT COALESCE(SUM(b.size * cb.refs), 0)
+                     FROM checkpoint_blobs cb JOIN blobs b
+                     ON b.digest = cb.digest)
+                """
+            ).fetchone()
+        return int(row[0]), int(row[1])
+
+    # links
+
+    def links(self) -> dict[str, list[str]]:
+        """Get the external links of all the checkpoints.
+
+        Returns
+        -------
+        dict[str, list[str]]
+            The link paths by checkpoint path.
+        """
+        registry: dict[str, list[str]] = {}
+        with self._cursor() as cursor:
+            rows = cursor.execute(
+                """
+                SELECT checkpoint, link FROM links
+                ORDER BY checkpoint, position
+                """
+            ).fetchall()
+        for checkpoint, link in rows:
+            registry.setdefault(checkpoint, []).append(link)
+        return registry
+
+    def add_link(self, checkpoint: str, link: str) -> None:
+        """Record an external link of a checkpoint.
+
+        Parameters
+        ----------
+        checkpoint : str
+            The checkpoint's path.
+        link : str
+            The link's path.
+        """
+        with self._cursor(write=True) as cursor:
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO links (checkpoint, link, position)
+                SELECT ?, ?, COALESCE(MAX(position), -1) + 1 FROM links
+                WHERE checkpoint = ?
+                """,
+                (checkpoint, link, checkpoint),
+            )
+
+    def pop_links(self, checkpoint: str) -> list[str]:
+        """Forget (and get) the external links of a checkpoint.
+
+        Parameters
+        ----------
+        checkpoint : str
+            The checkpoint's path.
+
+        Returns
+        -------
+        list[str]
+            The link paths.
+        """
+        with self._cursor(write=True) as cursor:
+            rows = cursor.execute(
+                "SELECT link FROM links WHERE checkpoint = ? ORDER BY position",
+                (checkpoint,),
+            ).fetchall()
+            cursor.execute(
+                "DELETE FROM links WHERE checkpoint = ?", (checkpoint,)
+            )
+        return [row[0] for row in rows]
+
+    def replace_links(self, registry: Mapping[str, Iterable[str]]) -> None:
+        """Replace all the recorded external links.
+
+        Parameters
+        ----------
+        registry : Mapping[str, Iterable[str]]
+            The link paths by checkpoint path.
+        """
+        with self._cursor(write=True) as cursor:
+            cursor.execute("DELETE FROM links")
+            cursor.executemany(
+                """
+                INSERT OR IGNORE INTO links (checkpoint, link, position)
+                VALUES (?, ?, ?)
+                """,
+                [
+                    (checkpoint, link, position)
+                    for checkpoint, links in registry.items()
+                    for position, link in enumerate(links)
+                ],
+            )
+
+    # helpers
+
+    @staticmethod
+    def _entry(row: tuple[Any, ...]) -> CatalogEntry:
+        """Get a catalog entry from a checkpoints row."""
+        metadata: Any = {}
+        with suppress(ValueError):
+            metadata = json.loads(row[3])
+        return CatalogEntry(
+            session=row[0],
+            timestamp=int(row[1]),
+            size=int(row[2]),
+            metadata=metadata if isinstance(metadata, dict) else {},
+        )
+
+    @staticmethod
+    def _insert(cursor: sqlite3.Cursor, entry: CatalogEntry) -> None:
+        """Insert (or replace) a checkpoint row and its metadata fields."""
+        CheckpointCatalog._delete(cursor, entry.session, entry.timestamp)
+        cursor.execute(
+            "INSERT OR IGNORE INTO sessions (name) VALUES (?)",
+            (entry.session,),
+        )
+        cursor.execute(
+            """
+            INSERT INTO checkpoints (session, timestamp, size, metadata)
+            VALUES (?, ?, ?, ?)
+            """,
+            (
+                entry.session,
+                entry.timestamp,
+                entry.size,
+                json.dumps(entry.metadata, default=str),
+            ),
+        )
+        fields: list[tuple[str, int, str, str]] = []
+        for key, value in entry.metadata.items():
+            indexed = _field_value(value)
+            if indexed is not None:
+                fields.append((entry.session, entry.timestamp, key, indexed))
+        cursor.executemany(
+            """
+            INSERT INTO metadata_fields (session, timestamp, key, value)
+            VALUES (?, ?, ?, ?)
+            """,
+            fields,
+        )
+
+    @staticmethod
+    def _delete(cursor: sqlite3.Cursor, session: str, timestamp: int) -> None:
+        """Delete a checkpoint row and its metadata fields."""
+        params = (session, timestamp)
+        cursor.execute(
+            "DELETE FROM metadata_fields WHERE session = ? AND timestamp = ?",
+            params,
+        )
+        cursor.execute(
+            "DELETE FROM checkpoints WHERE session = ? AND timestamp = ?",
+            params,
+        )
@@ -1,17 +1,188 @@
 # SPDX-License-Identifier: Apache-2.0.
 # Copyright (c) 2024 - 2025 Waldiez and contributors.
 
-# pyright: reportUnknownVariableType=false
+# pyright: reportUnknownVariableType=false, reportUnknownArgumentType=false
+# pyright: reportUnknownMemberType=false
+
+# pylint: disable=too-many-public-methods
 
 """WaldiezCheckpoint data structures."""
 
 import json
+import os
+import threading
 from contextlib import suppress
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from .compression import dump_json, file_compression, load_json
+from .history_index import HistoryIndex
+
+HISTORY_FILE = "history.json"
+HISTORY_JOURNAL_FILE = "history.jsonl"
+HISTORY_INDEX_FILE = "history.idx"
+# a full state is stored (at least) every that many history entries
+HISTORY_KEYFRAME_INTERVAL = 50
+
+
+def _state_delta(
+    previous: dict[str, Any], state: dict[str, Any]
+) -> dict[str, Any] | None:
+    """Get the changes from a previous state (None if not a delta)."""
+    if set(previous) != set(state) or any(
+        previous[key] != state[key]
+        for key in state
+        if key not in ("messages", "context_variables")
+    ):
+        return None
+    messages = state.get("messages", [])
+    old_messages = previous.get("messages", [])
+    context = state.get("context_variables", {})
+    old_context = previous.get("context_variables", {})
+    if not (
+        isinstance(messages, list)
+        and isinstance(old_messages, list)
+        and isinstance(context, dict)
+        and isinstance(old_context, dict)
+    ):
+        return None
+    base = len(old_messages)
+    # group chat messages are only appended
+    if messages[:base] != old_messages:
+        return None
+    delta: dict[str, Any] = {"base": base, "messages": messages[base:]}
+    changed = {
+        key: value
+        for key, value in context.items()
+        if key not in old_context or old_context[key] != value
+    }
+    if changed:
+        delta["context_variables"] = changed
+    removed = [key for key in old_context if key not in context]
+    if removed:
+        delta["removed"] = removed
+    return delta
+
+
+def _copy_state(state: dict[str, Any]) -> dict[str, Any]:
+    """Copy a state and its messages / context variables containers."""
+    copied = dict(state)
+    for key in ("messages", "context_variables"):
+        value = copied.get(key)
+        if isinstance(value, (list, dict)):
+            copied[key] = value.copy()
+    return copied
+
+
+def _apply_delta(
+    state: dict[str, Any], delta: dict[str, Any]
+) -> dict[str, Any]:
+    """Get the state after applying a delta to a previous one."""
+    messages = state.get("messages", [])
+    context = state.get("context_variables", {})
+    base = delta.get("base", len(messages))
+    new_context = {
+        key: value
+        for key, value in context.items()
+        if key not in delta.get("removed", [])
+    }
+    new_context.update(delta.get("context_variables", {}))
+    return {
+        **state,
+        "messages": messages[:base] + delta.get("messages", []),
+        "context_variables": new_context,
+    }
+
+
+def _usable_history(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Get the entries that can be resolved to a state.
+
+    Deltas before the first full state (keyframe) have nothing
+    to be applied to, so they are dropped.
+    """
+    usable: list[dict[str, Any]] = []
+    for entry in entries:
+        if isinstance(entry.get("state"), dict):
+            usable.append(entry)
+        elif usable and isinstance(entry.get("delta"), dict):
+            usable.append(entry)
+    return usable
+
+
+# pylint: disable=too-few-public-methods
+class HistoryEncoder:
+    """Encode successive history entries as deltas with keyframes.
+
+    Each entry of a journal only stores the messages appended and the
+    context variables changed since the previous entry, so the journal
+    grows linearly (not quadratically) with the conversation. A full
+    state (keyframe) is written every ``keyframe_interval`` entries,
+    whenever the state cannot be expressed as a delta, and whenever the
+    journal was changed by someone else since the last encoded entry.
+    """
+
+    def __init__(self, keyframe_interval: int = HISTORY_KEYFRAME_INTERVAL):
+        """Initialize the encoder.
+
+        Parameters
+        ----------
+        keyframe_interval : int
+            Write a full state at least every that many entries.
+        """
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._lock = threading.Lock()
+        self._previous: dict[str, Any] | None = None
+        self._deltas = 0
+        self._journal_size = -1
+
+    def encode(self, journal_file: Path, entry: dict[str, Any]) -> str:
+        """Get the journal line to append for a (full state) entry.
+
+        The caller is expected to append the returned line to the file.
+
+        Parameters
+        ----------
+        journal_file : Path
+            The ``history.jsonl`` file the line is for.
+        entry : dict[str, Any]
+            The history entry (with its full ``state``).
+
+        Returns
+        -------
+        str
+            The newline terminated JSON line.
+        """
+        state = entry.get("state")
+        with self._lock:
+            try:
+                size = journal_file.stat().st_size
+            except OSError:
+                size = 0
+            delta: dict[str, Any] | None = None
+            if (
+                self._previous is not None
+                and isinstance(state, dict)
+                and size == self._journal_size
+                and self._deltas + 1 < self.keyframe_interval
+            ):
+                delta = _state_delta(self._previous, state)
+            if delta is None:
+                line = WaldiezCheckpoint.dump_history_entry(entry)
+                self._deltas = 0
+            else:
+                encoded = {k: v for k, v in entry.items() if k != "state"}
+                encoded["delta"] = delta
+                line = WaldiezCheckpoint.dump_history_entry(encoded)
+                self._deltas += 1
+            # the caller may keep changing its containers
+            self._previous = (
+                _copy_state(state) if isinstance(state, dict) else None
+            )
+            self._journal_size = size + len(line.encode("utf-8"))
+        return line
+
 
 # noinspection PyBroadException
 @dataclass
@@ -23,6 +194,9 @@ class WaldiezCheckpoint:
     path: Path
     _state: dict[str, Any] | None = field(init=False, default=None)
     _metadata: dict[str, Any] | None = field(init=False, default=None)
+    _history_index: HistoryIndex | None = field(
+        init=False, default=None, repr=False, compare=False
+    )
 
     @property
     def id(self) -> str:
@@ -61,8 +235,18 @@ class WaldiezCheckpoint:
 
     @property
     def history_file(self) -> Path:
-        """Path to the history.json file."""
-        return self.path / "history.json"
+        """Path to the (legacy) history.json file."""
+        return self.path / HISTORY_FILE
+
+    @property
+    def history_journal_file(self) -> Path:
+        """Path to the append-only history.jsonl journal."""
+        return self.path / HISTORY_JOURNAL_FILE
+
+    @property
+    def history_index_file(self) -> Path:
+        """Path to the sidecar offset index of the history journal."""
+        return self.path / HISTORY_INDEX_FILE
 
     @property
     def exists(self) -> bool:
@@ -72,31 +256,295 @@ class WaldiezCheckpoint:
     def load_state(self, index: int) -> None:
         """Load a state from history from its index.
 
+        The state is rebuilt by replaying the deltas
+        since the nearest (previous) full state.
+
         Parameters
         ----------
         index : int
             The history index to use
         """
-        entries = self.history()
-        if len(entries) < index:
-            return
-        entry = entries[index]
-        state = entry.get("state", {})
-        if not isinstance(state, dict):
+        entry = self.history_entry(index)
+        if entry is None:
             return
+        state: dict[str, Any] = entry["state"]
         if "messages" in state or "context_variables" in state:
-            with open(self.state_file, "w", encoding="utf-8") as f:
-                json.dump(state, f)
+            self._store_state(state)
             self.refresh()
 
-    def history(self) -> list[dict[str, Any]]:
+    def history_length(self) -> int:
+        """Get the number of history entries (without decoding them).
+
+        Returns
+        -------
+        int
+            The number of entries.
+        """
+        index = self._get_history_index()
+        if index is None:
+            return len(_usable_history(self.history(decode=False)))
+        return len(index)
+
+    def history_timestamps(self) -> list[str]:
+        """Get the timestamps of the history entries.
+
+        Returns
+        -------
+        list[str]
+            Each entry's timestamp ("" if it has none).
+        """
+        index = self._get_history_index()
+        if index is None:
+            return [
+                str(entry.get("timestamp", ""))
+                for entry in _usable_history(self.history(decode=False))
+            ]
+        records = index.records()
+        timestamps: list[str] = []
+        for position, record in enumerate(records):
+            if record.timestamp >= 0:
+                timestamps.append(str(record.timestamp))
+                continue
+            # not an integer: read it from the entry itself
+            (entry,) = index.read(records, position, position + 1)
+            timestamps.append(str(entry.get("timestamp", "")))
+        return timestamps
+
+    def history_entry(self, index: int) -> dict[str, Any] | None:
+        """Get a single history entry (with its full state).
+
+        Only the entries since the nearest (previous) full state
+        are read and decoded.
+
+        Parameters
+        ----------
+        index : int
+            The entry's index (negative to count from the end).
+
+        Returns
+        -------
+        dict[str, Any] | None
+            The entry, if found.
+        """
+        total = self.history_length()
+        if not -total <= index < total:
+            return None
+        entries = self.history_page(index % total, 1)
+        return entries[0] if entries else None
+
+    def history_page(
+        self, offset: int = 0, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Get a range of the history entries (with their full states).
+
+        Parameters
+        ----------
+        offset : int
+            The index of the first entry.
+        limit : int | None
+            The maximum number of entries (all the rest if None).
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The entries.
+        """
+        offset = max(offset, 0)
+        stop = None if limit is None else offset + max(limit, 0)
+        index = self._get_history_index()
+        if index is None:
+            return self.history()[offset:stop]
+        records = index.records()
+        selected = records[offset:stop]
+        if not selected:
+            return []
+        start = selected[0].keyframe
+        stored = index.read(records, start, offset + len(selected))
+        return self.decode_history(stored)[offset - start :]
+
+    def _get_history_index(self) -> HistoryIndex | None:
+        """Get the (cached) offset index of the history journal.
+
+        Reading never modifies the history: while there is a legacy
+        history file (until :meth:`compact_history` merges it),
+        the (slower) full history is used instead.
+
+        Returns
+        -------
+        HistoryIndex | None
+            The index, None if the history is not (only) in the journal.
+        """
+        if self.history_file.is_file():
+            return None
+        if self._history_index is None:
+            self._history_index = HistoryIndex(
+                self.history_journal_file, self.history_index_file
+            )
+        return self._history_index
+
+    def _store_state(self, state: dict[str, Any]) -> None:
+        """Replace the stored state (keeping its compression)."""
+        dump_json(self.state_file, state, file_compression(self.state_file))
+
+    def export_state(self, directory: Path) -> Path:
+        """Write the state and metadata as plain JSON files.
+
+        Parameters
+        ----------
+        directory : Path
+            Where to write ``state.json`` and ``metadata.json``.
+
+        Returns
+        -------
+        Path
+            The written ``state.json`` file.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        dump_json(directory / "metadata.json", self.metadata)
+        state_file = directory / "state.json"
+        dump_json(state_file, self.state)
+        return state_file
+
+    def history(self, decode: bool = True) -> list[dict[str, Any]]:
         """Get the state history.
 
+        Entries from a legacy ``history.json`` come first, followed by
+        the entries of the ``history.jsonl`` journal. Unreadable (e.g.
+        still being written) journal lines are skipped. Reading never
+        modifies the files: see :meth:`compact_history` for that.
+
+        Parameters
+        ----------
+        decode : bool
+            Resolve the (delta) entries to full states. If False,
+            the entries are returned as stored.
+
         Returns
         -------
         list[dict[str, Any]]
-            The stored history entries
+            The history entries
         """
+        legacy_entries = self._load_legacy_history()
+        journal_entries, _ = WaldiezCheckpoint.read_history_journal(
+            self.history_journal_file
+        )
+        entries = legacy_entries + journal_entries
+        return self.decode_history(entries) if decode else entries
+
+    @staticmethod
+    def decode_history(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Resolve stored history entries to entries with full states.
+
+        Parameters
+        ----------
+        entries : list[dict[str, Any]]
+            The stored (full state or delta) entries.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The entries, each with its full ``state``.
+        """
+        decoded: list[dict[str, Any]] = []
+        state: dict[str, Any] = {}
+        for entry in _usable_history(entries):
+            if "state" in entry:
+                state = entry["state"]
+                decoded.append(entry)
+                continue
+            state = _apply_delta(state, entry["delta"])
+            resolved = {k: v for k, v in entry.items() if k != "delta"}
+            resolved["state"] = state
+            decoded.append(resolved)
+        return decoded
+
+    def compact_history(self) -> int:
+        """Compact the history into a single clean journal.
+
+        Merges any legacy ``history.json`` entries into the journal,
+        drops unreadable lines and removes the legacy file.
+
+        Returns
+        -------
+        int
+            The number of entries in the compacted journal.
+        """
+        legacy_entries = self._load_legacy_history()
+        journal_entries, _ = WaldiezCheckpoint.read_history_journal(
+            self.history_journal_file
+        )
+        entries = legacy_entries + journal_entries
+        if entries or self.history_journal_file.exists():
+            self._write_history_journal(entries)
+        return len(entries)
+
+    @staticmethod
+    def append_history_entry(journal_file: Path, entry: dict[str, Any]) -> None:
+        """Append a single entry to a history journal.
+
+        Parameters
+        ----------
+        journal_file : Path
+            The ``history.jsonl`` file to append to.
+        entry : dict[str, Any]
+            The history entry to append.
+        """
+        with open(journal_file, "a", encoding="utf-8") as f:
+            f.write(WaldiezCheckpoint.dump_history_entry(entry))
+
+    @staticmethod
+    def dump_history_entry(entry: dict[str, Any]) -> str:
+        """Serialize a history entry as a single journal line.
+
+        Parameters
+        ----------
+        entry : dict[str, Any]
+            The history entry to serialize.
+
+        Returns
+        -------
+        str
+            The newline terminated JSON line.
+        """
+        return json.dumps(entry, default=str, separators=(",", ":")) + "\n"
+
+    @staticmethod
+    def read_history_journal(
+        journal_file: Path,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Read the entries of a history journal.
+
+        Parameters
+        ----------
+        journal_file : Path
+            The ``history.jsonl`` file to read.
+
+        Returns
+        -------
+        tuple[list[dict[str, Any]], int]
+            The valid entries and the number of skipped (unreadable) lines.
+        """
+        entries: list[dict[str, Any]] = []
+        skipped = 0
+        if not journal_file.is_file():
+            return entries, skipped
+        with suppress(Exception):
+            with open(journal_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        skipped += 1
+                        continue
+                    if isinstance(entry, dict):
+                        entries.append(entry)
+                    else:
+                        skipped += 1
+        return entries, skipped
+
+    def _load_legacy_history(self) -> list[dict[str, Any]]:
         if not self.history_file.is_file():
             return []
         history_dict = self._load_json(self.history_file)
@@ -104,9 +552,21 @@ class WaldiezCheckpoint:
             return []
         history_entries = history_dict.get("history", [])
         if history_entries and isinstance(history_entries, list):
-            return history_entries
+            return [e for e in history_entries if isinstance(e, dict)]
         return []
 
+    def _write_history_journal(self, entries: list[dict[str, Any]]) -> None:
+        tmp_file = self.history_journal_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(WaldiezCheckpoint.dump_history_entry(entry))
+        os.replace(tmp_file, self.history_journal_file)
+        self.history_file.unlink(missing_ok=True)
+        if self._history_index is not None:
+            self._history_index.invalidate()
+        else:
+            self.history_index_file.unlink(missing_ok=True)
+
     def to_dict(self, include_history: bool = False) -> dict[str, Any]:
         """Get the dict representation of the checkpoint.
 
@@ -192,16 +652,11 @@ class WaldiezCheckpoint:
     @staticmethod
     def _load_json(path: Path) -> dict[str, Any] | None:
         with suppress(Exception):
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if isinstance(data, dict):
-                    return data
-                if (
-                    isinstance(data, list)
-                    and data
-                    and isinstance(data[0], dict)
-                ):
-                    return data[0]
+            data = load_json(path)
+            if isinstance(data, dict):
+                return data
+            if isinstance(data, list) and data and isinstance(data[0], dict):
+                return data[0]
         return None
 
 
@@ -266,8 +721,11 @@ class WaldiezCheckpointInfo:
         WaldiezCheckpointInfo
             The loaded checkpoint info.
         """
-        return cls(
+        info = cls(
             session_name=checkpoint.session_name,
             timestamp=checkpoint.timestamp,
             path=checkpoint.path,
         )
+        # keep it: it might not be a (plain) filesystem checkpoint
+        info._checkpoint = checkpoint
+        return info
@@ -3,6 +3,8 @@
 
 # pylint: disable=missing-function-docstring, missing-param-doc
 # pylint: disable=missing-raises-doc,too-complex,too-many-branches
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+# pylint: disable=too-many-locals
 
 """CLI interface for Waldiez checkpoints."""
 
@@ -15,7 +17,9 @@ from rich import print as pretty_print
 from typing_extensions import Annotated
 
 from .checkpoint import WaldiezCheckpoint
-from .storage_manager import StorageManager
+from .compression import COMPRESSIONS, get_compression
+from .retention import RetentionPolicy, parse_duration, parse_size
+from .storage_manager import STORAGE_BACKENDS, StorageManager, get_backend
 from .utils import get_root_dir, safe_name
 
 app = typer.Typer(
@@ -35,7 +39,7 @@ DEFAULT_WORKSPACE = get_root_dir()
 
 
 @app.command(name="checkpoints", no_args_is_help=True)
-def handle_checkpoints(
+def handle_checkpoints(  # noqa: C901
     workspace: Annotated[
         Path,
         typer.Option(
@@ -88,7 +92,8 @@ def handle_checkpoints(
         typer.Option(
             "--clean",
             help=(
-                "Cleanup a session's checkpoints. "
+                "Cleanup a session's checkpoints "
+                "(and the temporary files of interrupted runs). "
                 "NOTE: if no session is specified, "
                 "all sessions will be used."
             ),
@@ -108,9 +113,122 @@ def handle_checkpoints(
             ),
         ),
     ] = False,
+    compact: Annotated[
+        bool,
+        typer.Option(
+            "--compact",
+            help=(
+                "Compress the checkpoints' files and compact their history. "
+                "NOTE: if no session is specified, "
+                "all sessions will be used."
+            ),
+        ),
+    ] = False,
+    compression: Annotated[
+        str | None,
+        typer.Option(
+            "--compression",
+            help=(
+                "The compression to use when compacting: "
+                f"{', '.join(COMPRESSIONS)} (default: gzip)."
+            ),
+        ),
+    ] = None,
+    rebuild: Annotated[
+        bool,
+        typer.Option(
+            "--rebuild",
+            help=(
+                "Rebuild the checkpoints catalog from the workspace's "
+                "directories (e.g. after copying checkpoints into it)."
+            ),
+        ),
+    ] = False,
+    backend: Annotated[
+        str | None,
+        typer.Option(
+            "--backend",
+            help=(
+                "The storage backend of the workspace: "
+                f"{', '.join(STORAGE_BACKENDS)} "
+                "(default: the WALDIEZ_STORAGE_BACKEND environment "
+                "variable or filesystem)."
+            ),
+        ),
+    ] = None,
+    migrate: Annotated[
+        bool,
+        typer.Option(
+            "--migrate",
+            help=(
+                "Move the workspace's (filesystem) checkpoints "
+                "into its SQLite database."
+            ),
+        ),
+    ] = False,
+    gc: Annotated[
+        bool,
+        typer.Option(
+            "--gc",
+            help=(
+                "Remove the checkpoints of all sessions that exceed "
+                "the retention limits (--keep, --max-age, --max-size). "
+                "The latest checkpoint of each session is always kept."
+            ),
+        ),
+    ] = False,
+    max_age: Annotated[
+        str | None,
+        typer.Option(
+            "--max-age",
+            help="Remove checkpoints older than this (e.g. '12h', '7d').",
+        ),
+    ] = None,
+    max_size: Annotated[
+        str | None,
+        typer.Option(
+            "--max-size",
+            help=(
+                "Remove the oldest checkpoints until the workspace's "
+                "checkpoints fit in this size (e.g. '500MB', '2GB')."
+            ),
+        ),
+    ] = None,
+    dry_run: Annotated[
+        bool,
+        typer.Option(
+            "--dry-run",
+            help="Only list the checkpoints that --gc would remove.",
+        ),
+    ] = False,
 ) -> None:
     """Handle waldiez checkpoints."""
-    manager = StorageManager(workspace_dir=workspace)
+    try:
+        backend = get_backend("sqlite" if migrate else backend)
+    except ValueError as error:
+        typer.echo(str(error), err=True)
+        raise typer.Exit(1) from error
+    manager = StorageManager(workspace_dir=workspace, backend=backend)
+    if migrate:
+        count = manager.migrate()
+        typer.echo(f"Migrated {count} checkpoint(s).")
+        raise typer.Exit(0)
+    if rebuild:
+        count = manager.rebuild_catalog()
+        typer.echo(f"Indexed {count} checkpoint(s).")
+        raise typer.Exit(0)
+    if compact:
+        _compact(manager, session_name=session, compression=compression)
+        raise typer.Exit(0)
+    if gc:
+        _gc(
+            manager,
+            keep=keep,
+            max_age=max_age,
+            max_size=max_size,
+            dry_run=dry_run,
+        )
+        raise typer.Exit(0)
     if checkpoint:
         checkpoint = safe_name(checkpoint, fallback="latest")
     if history:
@@ -136,6 +254,54 @@ def handle_checkpoints(
         raise typer.Exit(0)
 
 
+def _compact(
+    manager: StorageManager, session_name: str | None, compression: str | None
+) -> None:
+    try:
+        compression = get_compression(compression or "gzip")
+    except ValueError as error:
+        typer.echo(str(error), err=True)
+        raise typer.Exit(1) from error
+    before, after = manager.compact(session_name, compression=compression)
+    typer.echo(f"Compacted checkpoints: {before} -> {after} bytes.")
+
+
+def _gc(
+    manager: StorageManager,
+    keep: int | None,
+    max_age: str | None,
+    max_size: str | None,
+    dry_run: bool,
+) -> None:
+    try:
+        policy = RetentionPolicy(
+            max_checkpoints=keep,
+            max_age=parse_duration(max_age) if max_age else None,
+            max_total_bytes=parse_size(max_size) if max_size else None,
+        )
+    except ValueError as error:
+        typer.echo(str(error), err=True)
+        raise typer.Exit(1) from error
+    if not policy.enabled:
+        typer.echo("Please provide --keep, --max-age or --max-size.", err=True)
+        raise typer.Exit(1)
+    report = manager.apply_retention(policy, dry_run=dry_run)
+    if dry_run:
+        pretty_print(
+            [
+                {
+                    "session_name": item.session_name,
+                    "timestamp": item.timestamp.isoformat(),
+                    "size": item.size,
+                }
+                for item in report.expired
+            ]
+        )
+        return
+    freed = report.freed_bytes
+    typer.echo(f"Removed {report.deleted} checkpoint(s), about {freed} bytes.")
+
+
 def _history(
     manager: StorageManager, session_name: str | None, checkpoint: str | None
 ) -> None:
@@ -188,6 +354,7 @@ def _cleanup(
         sessions = [session_name]
     for _session in sessions:
         manager.cleanup(session_name=_session, keep_count=keep_count)
+    manager.clean_tmp_dirs()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+"""Optional compression of the checkpoints' JSON files.
+
+The format of a file is detected from its first bytes when reading it,
+so plain (and older) checkpoints load the same way as compressed ones.
+``gzip`` is always available, ``zstd`` requires the ``zstandard`` package
+(``pip install waldiez[zstd]``).
+"""
+
+import gzip
+import importlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any
+
+COMPRESSION_ENV = "WALDIEZ_CHECKPOINT_COMPRESSION"
+COMPRESSIONS = ("none", "gzip", "zstd")
+# the JSON files of a checkpoint that are (re)written whole
+COMPRESSIBLE_NAMES = ("state.json", "metadata.json", "history.json")
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _zstd() -> Any:
+    """Get the (optional) zstandard module."""
+    try:
+        return importlib.import_module("zstandard")
+    except ImportError:
+        return None
+
+
+def get_compression(compression: str | None = None) -> str:
+    """Validate a compression (defaults to the environment's or "none").
+
+    Parameters
+    ----------
+    compression : str | None
+        The compression to use, one of :data:`COMPRESSIONS`.
+        If None, the ``WALDIEZ_CHECKPOINT_COMPRESSION``
+        environment variable is used.
+
+    Returns
+    -------
+    str
+        The compression.
+
+    Raises
+    ------
+    ValueError
+        If the compression is unknown or not available.
+    """
+    if compression is None:
+        compression = os.environ.get(COMPRESSION_ENV, "none")
+    compression = compression.strip().lower() or "none"
+    if compression not in COMPRESSIONS:
+        msg = (
+            f"Unknown compression: {compression} "
+            f"(expected one of: {', '.join(COMPRESSIONS)})"
+        )
+        raise ValueError(msg)
+    if compression == "zstd" and _zstd() is None:
+        msg = "zstd compression requires the `zstandard` package"
+        raise ValueError(msg)
+    return compression
+
+
+def detect_compression(data: bytes) -> str:
+    """Detect the compression of some data from its magic bytes.
+
+    Parameters
+    ----------
+    data : bytes
+        The (start of the) data.
+
+    Returns
+    -------
+    str
+        The compression ("none" if not compressed).
+    """
+    if data.startswith(_GZIP_MAGIC):
+        return "gzip"
+    if data.startswith(_ZSTD_MAGIC):
+        return "zstd"
+    return "none"
+
+
+def compress(data: bytes, compression: str) -> bytes:
+    """Compress data.
+
+    Parameters
+    ----------
+    data : bytes
+        The data to compress.
+    compression : str
+        The compression to use.
+
+    Returns
+    -------
+    bytes
+        The compressed data.
+    """
+    if compression == "gzip":
+        # no timestamp: identical contents give identical files
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if compression == "zstd":
+        return bytes(_zstd().ZstdCompressor(level=10).compress(data))
+    return data
+
+
+def decompress(data: bytes) -> bytes:
+    """Decompress data (if compressed).
+
+    Parameters
+    ----------
+    data : bytes
+        The (possibly compressed) data.
+
+    Returns
+    -------
+    bytes
+        The decompressed data.
+
+    Raises
+    ------
+    ValueError
+        If the data are corrupted, or zstd-compressed
+        and zstandard is not installed.
+    """
+    compression = detect_compression(data)
+    if compression == "gzip":
+        try:
+            return gzip.decompress(data)
+        except (OSError, EOFError, zlib.error) as error:
+            raise ValueError(f"Invalid gzip data: {error}") from error
+    if compression == "zstd":
+        zstd = _zstd()
+        if zstd is None:
+            msg = "Reading zstd compressed data requires `zstandard`"
+            raise ValueError(msg)
+        try:
+            decompressor = zstd.ZstdDecompressor().decompressobj()
+            return bytes(decompressor.decompress(data))
+        except zstd.ZstdError as error:
+            raise ValueError(f"Invalid zstd data: {error}") from error
+    return data
+
+
+def file_compression(path: Path) -> str:
+    """Get the compression of a file.
+
+    Parameters
+    ----------
+    path : Path
+        The file.
+
+    Returns
+    -------
+    str
+        The compression ("none" if not compressed or not readable).
+    """
+    try:
+        with open(path, "rb") as f:
+            return detect_compression(f.read(len(_ZSTD_MAGIC)))
+    except OSError:
+        return "none"
+
+
+def load_json(path: Path) -> Any:
+    """Load a (possibly compressed) JSON file.
+
+    Parameters
+    ----------
+    path : Path
+        The file to load.
+
+    Returns
+    -------
+    Any
+        The loaded data.
+    """
+    with open(path, "rb") as f:
+        return json.loads(decompress(f.read()))
+
+
+def dump_json(path: Path, data: Any, compression: str = "none") -> None:
+    """Write data to a JSON file.
+
+    Plain files are pretty-printed, compressed ones are compact.
+
+    Parameters
+    ----------
+    path : Path
+        The file to write.
+    data : Any
+        The data to write.
+    compression : str
+        The compression to use.
+    """
+    if compression == "none":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, default=str)
+        return
+    dumped = json.dumps(data, default=str, separators=(",", ":"))
+    with open(path, "wb") as f:
+        f.write(compress(dumped.encode("utf-8"), compression))
+
+
+def recompress(path: Path, compression: str) -> tuple[int, int]:
+    """Rewrite a JSON file with another compression (atomically).
+
+    Parameters
+    ----------
+    path : Path
+        The file to rewrite.
+    compression : str
+        The compression to use.
+
+    Returns
+    -------
+    tuple[int, int]
+        The size of the file before and after.
+    """
+    before = path.stat().st_size
+    if file_compression(path) == compression:
+        return before, before
+    data = load_json(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    dump_json(tmp, data, compression)
+    os.replace(tmp, path)
+    return before, path.stat().st_size
@@ -3,6 +3,7 @@
 
 # pylint: disable=broad-exception-caught,no-self-use,too-many-try-statements
 # pylint: disable=import-error,too-complex,possibly-used-before-assignment
+# pylint: disable=too-many-public-methods,too-many-lines
 # pyright: reportPossiblyUnboundVariable=false,reportUnknownVariableType=false
 # pyright: reportUnknownMemberType=false,reportUnknownArgumentType=false
 # flake8: noqa: C901
@@ -10,8 +11,7 @@
 """Filesystem-based implementation of the Storage protocol."""
 
 import json
-import os
-import re
+import logging
 import shutil
 import threading
 from collections.abc import Generator, Iterable, Mapping
@@ -22,32 +22,63 @@ from typing import Any
 
 from typing_extensions import Self
 
+from .blobs import BLOBS_DIR, BlobStore
+from .catalog import CATALOG_FILE, CatalogEntry, CheckpointCatalog
 from .checkpoint import WaldiezCheckpoint, WaldiezCheckpointInfo
-from .utils import safe_name, symlink
+from .compression import (
+    COMPRESSIBLE_NAMES,
+    get_compression,
+    load_json,
+    recompress,
+)
+from .save_journal import SAVES_DIR, PendingSave, SaveJournal
+from .utils import dir_size, session_dir_name, symlink
 
-_PATTERNS = r"^(?!.*\.\.)(?!\.)(?!.*\.$)[\w\-.]{1,128}$"
+LOG = logging.getLogger(__name__)
 
-_SAFE = re.compile(_PATTERNS, re.UNICODE)
+# the catalog's scan record of the workspace directory itself
+_WORKSPACE_SCAN = "."
 
 
 # noinspection PyBroadException,PyUnusedLocal,TryExceptPass,PyMethodMayBeStatic
 class FilesystemStorage:
     """Filesystem-based storage implementation."""
 
-    def __init__(self, workspace_dir: Path | str = "workspace"):
+    def __init__(
+        self,
+        workspace_dir: Path | str = "workspace",
+        compression: str | None = None,
+    ):
         """Initialize filesystem storage.
 
         Parameters
         ----------
         workspace_dir : str | Path
             Base directory for all workspace data
+        compression : str | None
+            Compression of the checkpoints' JSON files ("none", "gzip"
+            or "zstd"). Defaults to the ``WALDIEZ_CHECKPOINT_COMPRESSION``
+            environment variable (or "none"). Reading detects the format,
+            so checkpoints written with any compression can be loaded.
+
+        Saves interrupted by a crash (of another process)
+        are completed or rolled back (see :meth:`recover_saves`).
         """
+        self._compression = get_compression(compression)
         self._workspace_dir = Path(workspace_dir).resolve()
         self._workspace_dir.mkdir(parents=True, exist_ok=True)
+        # legacy registry of external links, moved into the catalog on load
         self._links_registry_file = self._workspace_dir / ".links_registry.json"
         self._links_registry: dict[str, list[str]] = {}
         self._registry_lock = threading.RLock()
-        self._load_links_registry()
+        self._catalog = CheckpointCatalog(self._workspace_dir / CATALOG_FILE)
+        self._blobs = BlobStore(self._workspace_dir / BLOBS_DIR)
+        self._saves = SaveJournal(self._workspace_dir / SAVES_DIR)
+        self.recover_saves()
+        if self._catalog.created:
+            self.rebuild_catalog()
+        else:
+            self._load_links_registry()
 
     @staticmethod
     def load_dict(json_file: Path) -> dict[str, Any]:
@@ -67,14 +98,13 @@ class FilesystemStorage:
             return {}
         # pylint: disable=broad-exception-caught,too-many-try-statements
         try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                loaded = json.load(f)
-                if isinstance(loaded, dict):
-                    return loaded
-                if isinstance(loaded, list):
-                    if len(loaded) == 1 and isinstance(loaded[0], dict):
-                        return loaded[1]
-                return {}
+            loaded = load_json(json_file)
+            if isinstance(loaded, dict):
+                return loaded
+            if isinstance(loaded, list):
+                if len(loaded) == 1 and isinstance(loaded[0], dict):
+                    return loaded[0]
+            return {}
         except Exception:
             return {}
 
@@ -100,8 +130,7 @@ class FilesystemStorage:
             return []
         # pylint: disable=broad-exception-caught,too-many-try-statements
         try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                entries = json.load(f)
+            entries = load_json(json_file)
             if isinstance(entries, list):
                 return entries
             if isinstance(entries, dict):
@@ -117,6 +146,25 @@ class FilesystemStorage:
         """Base workspace directory."""
         return self._workspace_dir
 
+    @property
+    def compression(self) -> str:
+        """The compression of the checkpoints' JSON files."""
+        return self._compression
+
+    def close(self) -> None:
+        """Close the catalog's database connection."""
+        self._catalog.close()
+
+    @property
+    def catalog(self) -> CheckpointCatalog:
+        """The catalog (index) of the workspace's checkpoints."""
+        return self._catalog
+
+    @property
+    def blob_store(self) -> BlobStore:
+        """The store of the (shared) files of the workspace's checkpoints."""
+        return self._blobs
+
     def save_checkpoint(
         self,
         session_name: str,
@@ -126,6 +174,9 @@ class FilesystemStorage:
     ) -> Path:
         """Save a checkpoint for a session.
 
+        The files are replaced atomically and flushed to disk before the
+        save returns (or, in a :meth:`transaction`, before it ends).
+
         Parameters
         ----------
         session_name : str
@@ -146,19 +197,219 @@ class FilesystemStorage:
             timestamp = datetime.now(timezone.utc)
 
         checkpoint_path = self._get_checkpoint_path(session_name, timestamp)
-        checkpoint_path.mkdir(parents=True, exist_ok=True)
-        state_file = checkpoint_path / "state.json"
-        with open(state_file, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2, default=str)
+        files: dict[str, Any] = {"state.json": state}
         if metadata:
-            metadata_file = checkpoint_path / "metadata.json"
-            with open(metadata_file, "w", encoding="utf-8") as f:
-                json.dump(metadata, f, indent=2, default=str)
+            files["metadata.json"] = metadata
+        save_id = self._saves.write(checkpoint_path, files, self._compression)
         latest_link = self._get_session_dir(session_name) / "latest"
         symlink(latest_link, checkpoint_path, overwrite=True)
-
+        self.index_checkpoint(session_name, timestamp)
+        self._saves.commit(save_id)
         return checkpoint_path
 
+    def index_checkpoint(
+        self,
+        session_name: str,
+        timestamp: datetime,
+        blobs: Iterable[tuple[str, int]] = (),
+    ) -> None:
+        """Update the catalog entry of a checkpoint from its directory.
+
+        Needed if the checkpoint's files are changed without
+        :meth:`save_checkpoint` (e.g. when copying a run's results into it).
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        timestamp : datetime
+            The checkpoint's timestamp
+        blobs : Iterable[tuple[str, int]]
+            The (digest, size) of the :attr:`blob_store` objects
+            that were linked into the checkpoint.
+        """
+        checkpoint_path = self._get_checkpoint_path(session_name, timestamp)
+        self._index_checkpoint_path(checkpoint_path, blobs)
+
+    def recover_saves(self) -> int:
+        """Complete or roll back the saves of crashed processes.
+
+        A save whose files were fully written is completed, otherwise
+        its (partial) files are removed. The catalog entries and the
+        ``latest`` links of the affected sessions are then updated.
+
+        Returns
+        -------
+        int
+            The number of interrupted saves.
+        """
+        with self._registry_lock:
+            return self._saves.recover(self._recover_save)
+
+    def _recover_save(self, save: PendingSave) -> None:
+        """Update the catalog after an interrupted save is restored."""
+        checkpoint_path = save.directory
+        session_dir = checkpoint_path.parent
+        if session_dir.parent != self._workspace_dir:
+            return  # the workspace was moved
+        if not (checkpoint_path / "state.json").is_file():
+            # rolled back: no metadata without a state
+            for name in save.names:
+                with suppress(OSError):
+                    (checkpoint_path / name).unlink(missing_ok=True)
+            with suppress(OSError):
+                checkpoint_path.rmdir()  # only if empty
+        with suppress(ValueError):
+            self._index_checkpoint_path(checkpoint_path)
+        latest = self._latest_checkpoint(session_dir.name)
+        latest_link = session_dir / "latest"
+        if latest is not None:
+            symlink(latest_link, latest.path, overwrite=True)
+        elif latest_link.is_symlink():
+            latest_link.unlink(missing_ok=True)
+
+    def _index_checkpoint_path(
+        self, checkpoint_path: Path, blobs: Iterable[tuple[str, int]] = ()
+    ) -> None:
+        """Update the catalog entry of a checkpoint directory."""
+        session = checkpoint_path.parent.name
+        checkpoint_timestamp = int(checkpoint_path.name)
+        if not (checkpoint_path / "state.json").is_file():
+            self._catalog.remove_checkpoint(session, checkpoint_timestamp)
+            return
+        self._catalog.add_checkpoint(
+            self._catalog_entry(session, checkpoint_timestamp, checkpoint_path)
+        )
+        self._catalog.add_blobs(session, checkpoint_timestamp, blobs)
+
+    def compress_checkpoint(
+        self, checkpoint_path: Path, compression: str | None = None
+    ) -> tuple[int, int]:
+        """Rewrite the JSON files of a checkpoint with a compression.
+
+        Parameters
+        ----------
+        checkpoint_path : Path
+            The checkpoint's directory.
+        compression : str | None
+            The compression to use (defaults to the storage's).
+
+        Returns
+        -------
+        tuple[int, int]
+            The size (in bytes) of the files before and after.
+        """
+        compression = (
+            self._compression
+            if compression is None
+            else get_compression(compression)
+        )
+        before = after = 0
+        for name in COMPRESSIBLE_NAMES:
+            path = checkpoint_path / name
+            if not path.is_file():
+                continue
+            try:
+                old_size, new_size = recompress(path, compression)
+            except (OSError, ValueError) as error:  # e.g. invalid json
+                LOG.debug("Left %s as is: %s", path, error)
+                continue
+            before += old_size
+            after += new_size
+        return before, after
+
+    def compact(
+        self, session_name: str | None = None, compression: str | None = None
+    ) -> tuple[int, int]:
+        """Compress the checkpoints' files and compact their history.
+
+        Parameters
+        ----------
+        session_name : str | None
+            Only compact this session's checkpoints.
+        compression : str | None
+            The compression to use (defaults to the storage's).
+
+        Returns
+        -------
+        tuple[int, int]
+            The size (in bytes) of the checkpoints' files before and after.
+        """
+        before = after = 0
+        for info in self.list_checkpoints(session_name):
+            checkpoint = info.checkpoint
+            if not checkpoint.exists:
+                continue
+            journal = checkpoint.history_journal_file
+            journal_size = journal.stat().st_size if journal.is_file() else 0
+            with suppress(Exception):
+                checkpoint.compact_history()
+            compressed = self.compress_checkpoint(checkpoint.path, compression)
+            before += compressed[0] + journal_size
+            after += compressed[1]
+            if journal.is_file():
+                after += journal.stat().st_size
+            self.index_checkpoint(info.session_name, info.timestamp)
+        return before, after
+
+    def rebuild_catalog(self) -> int:
+        """Rebuild the catalog from the workspace's directories.
+
+        Also moves the entries of a legacy ``.links_registry.json``
+        into the catalog.
+
+        Returns
+        -------
+        int
+            The number of checkpoints found.
+        """
+        sessions: list[str] = []
+        entries: list[CatalogEntry] = []
+        mtimes = {_WORKSPACE_SCAN: _mtime(self._workspace_dir) or 0}
+        with self._registry_lock:
+            for session_dir in sorted(self._workspace_dir.iterdir()):
+                if not session_dir.is_dir() or session_dir.name.startswith("."):
+                    continue
+                sessions.append(session_dir.name)
+                mtimes[session_dir.name] = _mtime(session_dir) or 0
+                for path, timestamp in self._scan_checkpoints(session_dir):
+                    entries.append(
+                        self._catalog_entry(session_dir.name, timestamp, path)
+                    )
+            self._catalog.replace_checkpoints(sessions, entries)
+            self._catalog.set_scanned(mtimes, replace=True)
+            self._load_links_registry()
+        self._collect_blobs()
+        return len(entries)
+
+    def find_checkpoints(
+        self, metadata: Mapping[str, Any], session_name: str | None = None
+    ) -> list[WaldiezCheckpointInfo]:
+        """Find the checkpoints whose metadata match the given fields.
+
+        Parameters
+        ----------
+        metadata : Mapping[str, Any]
+            The (top-level, scalar) metadata fields and values to match.
+        session_name : str | None
+            Optional filter by session name
+
+        Returns
+        -------
+        list[WaldiezCheckpointInfo]
+            The matching checkpoints (newest first per session).
+        """
+        session = (
+            self._get_session_dir(session_name).name if session_name else None
+        )
+        self._sync_catalog(session)
+        return [
+            WaldiezCheckpointInfo.from_checkpoint(
+                self._to_checkpoint(session_name or entry.session, entry)
+            )
+            for entry in self._catalog.find(metadata, session=session)
+        ]
+
     def get_checkpoint(
         self, session_name: str, timestamp: datetime | None = None
     ) -> WaldiezCheckpointInfo | None:
@@ -182,12 +433,12 @@ class FilesystemStorage:
             The loaded checkpoint info.
         """
         if timestamp is None:
-            checkpoints = self._find_checkpoints(session_name)
-            if not checkpoints:
+            latest = self._latest_checkpoint(session_name)
+            if latest is None:
                 raise FileNotFoundError(
                     f"No checkpoints found for session '{session_name}'"
                 )
-            checkpoint = checkpoints[0]
+            checkpoint = latest
         else:
             checkpoint_path = self._get_checkpoint_path(session_name, timestamp)
             if not checkpoint_path.exists():
@@ -256,12 +507,12 @@ class FilesystemStorage:
         """
         link_path = to
         if timestamp is None:
-            checkpoints = self._find_checkpoints(session_name)
-            if not checkpoints:
+            latest = self._latest_checkpoint(session_name)
+            if latest is None:
                 raise FileNotFoundError(
                     f"No checkpoints found for session '{session_name}'"
                 )
-            checkpoint = checkpoints[0]
+            checkpoint = latest
             link_path = to / checkpoint.path.name
         else:
             checkpoint_path = self._get_checkpoint_path(session_name, timestamp)
@@ -290,12 +541,7 @@ class FilesystemStorage:
         list[str]
             The workspace sessions.
         """
-        if not self._workspace_dir.exists():
-            return []
-        return sorted(
-            [p.name for p in self._workspace_dir.iterdir() if p.is_dir()],
-            reverse=True,
-        )
+        return self._sync_sessions(self._catalog.scanned())
 
     def delete_session(self, session_name: str) -> None:
         """Delete a session and all its checkpoints.
@@ -307,6 +553,7 @@ class FilesystemStorage:
         """
         session_dir = self._get_session_dir(session_name)
         if not session_dir.exists():
+            self._catalog.remove_session(session_dir.name)
             return
 
         checkpoints = self._find_checkpoints(session_name)
@@ -330,6 +577,8 @@ class FilesystemStorage:
                 shutil.rmtree(session_dir)
             except Exception:
                 pass
+        self._catalog.remove_session(session_dir.name)
+        self._collect_blobs()
 
         # remove any entries still pointing under this session.
         with self._registry_transaction():
@@ -359,21 +608,14 @@ class FilesystemStorage:
         list[WaldiezCheckpointInfo]
             The list of the checkpoints found.
         """
-        checkpoints: list[WaldiezCheckpoint] = []
-
         if session_name:
-            session_checkpoints = self._find_checkpoints(session_name)
-            checkpoints.extend(session_checkpoints)
+            checkpoints = self._find_checkpoints(session_name)
         else:
-            if self._workspace_dir.exists():
-                for session_dir in self._workspace_dir.iterdir():
-                    if session_dir.is_dir():
-                        session_checkpoints = self._find_checkpoints(
-                            session_dir.name
-                        )
-                        if session_checkpoints:
-                            checkpoints.extend(session_checkpoints)
-
+            self._sync_catalog()
+            checkpoints = [
+                self._to_checkpoint(entry.session, entry)
+                for entry in self._catalog.checkpoints()
+            ]
         return [WaldiezCheckpointInfo.from_checkpoint(c) for c in checkpoints]
 
     def delete_checkpoint(self, session_name: str, timestamp: datetime) -> None:
@@ -407,13 +649,11 @@ class FilesystemStorage:
                 except Exception:
                     pass
         shutil.rmtree(checkpoint_path)
-        latest_link = self._get_session_dir(session_name) / "latest"
-        if latest_link.exists() and latest_link.resolve() == checkpoint_path:
-            latest_link.unlink(missing_ok=True)
-            # Point to next latest if available
-            checkpoints = self._find_checkpoints(session_name)
-            if checkpoints:
-                symlink(latest_link, checkpoints[0].path, overwrite=True)
+        self._catalog.remove_checkpoint(
+            checkpoint_path.parent.name, int(checkpoint_path.name)
+        )
+        self._collect_blobs()
+        self._relink_latest(session_name)
 
     def cleanup_old_checkpoints(
         self, session_name: str, keep_count: int = 5
@@ -433,20 +673,38 @@ class FilesystemStorage:
             The number of deleted checkpoints.
         """
         checkpoints = self._find_checkpoints(session_name)
-
         if len(checkpoints) <= keep_count:
             return 0
-        checkpoints_to_delete = checkpoints[keep_count:]
-        deleted_count = 0
+        return self.delete_checkpoints_batch(
+            (session_name, checkpoint.timestamp)
+            for checkpoint in checkpoints[max(keep_count, 0) :]
+        )
 
-        for checkpoint in checkpoints_to_delete:
-            try:
-                self.delete_checkpoint(session_name, checkpoint.timestamp)
-                deleted_count += 1
-            except Exception:
-                pass
+    def checkpoint_sizes(
+        self, session_name: str | None = None
+    ) -> list[tuple[str, datetime, int]]:
+        """Get the (catalogued) sizes of the checkpoints.
 
-        return deleted_count
+        Parameters
+        ----------
+        session_name : str | None
+            Optional filter by session name
+
+        Returns
+        -------
+        list[tuple[str, datetime, int]]
+            The (session_name, timestamp, size in bytes)
+            of the checkpoints (newest first per session).
+        """
+        session = (
+            self._get_session_dir(session_name).name if session_name else None
+        )
+        self._sync_catalog(session)
+        sizes: list[tuple[str, datetime, int]] = []
+        for entry in self._catalog.checkpoints(session):
+            checkpoint = self._to_checkpoint(entry.session, entry)
+            sizes.append((entry.session, checkpoint.timestamp, entry.size))
+        return sizes
 
     # pylint: disable=too-many-branches
     def _remove_external_links(self) -> tuple[int, Iterable[str]]:
@@ -511,10 +769,18 @@ class FilesystemStorage:
         else:
             if self._workspace_dir.exists():
                 for session_dir in self._workspace_dir.iterdir():
-                    if session_dir.is_dir():
+                    if session_dir.is_dir() and not session_dir.name.startswith(
+                        "."
+                    ):
                         removed_count += self._clean_broken_symlinks(
                             session_dir
                         )
+        # forget the checkpoints that were removed outside of the storage
+        for checkpoint in self.list_checkpoints(session_name):
+            if not checkpoint.path.is_dir():
+                self._catalog.remove_checkpoint(
+                    checkpoint.path.parent.name, int(checkpoint.path.name)
+                )
 
         with self._registry_transaction():
             external_count, _ = self._remove_external_links()
@@ -621,14 +887,12 @@ class FilesystemStorage:
         """
         deleted = 0
         all_external_links: list[Path] = []
-        checkpoints_to_delete: list[tuple[str, datetime, Path]] = []
+        checkpoints_to_delete: list[tuple[str, Path]] = []
 
         for session_name, timestamp in checkpoints:
             checkpoint_path = self._get_checkpoint_path(session_name, timestamp)
             if checkpoint_path.exists():
-                checkpoints_to_delete.append(
-                    (session_name, timestamp, checkpoint_path)
-                )
+                checkpoints_to_delete.append((session_name, checkpoint_path))
                 external_links = self._unregister_checkpoint_links(
                     checkpoint_path
                 )
@@ -640,36 +904,30 @@ class FilesystemStorage:
                     link_path.unlink(missing_ok=True)
                 except Exception:
                     pass
-        for session_name, _, checkpoint_path in checkpoints_to_delete:
+        affected: dict[str, str] = {}
+        for session_name, checkpoint_path in checkpoints_to_delete:
             try:
                 shutil.rmtree(checkpoint_path)
-
-                # Update latest link if needed
-                latest_link = self._get_session_dir(session_name) / "latest"
-                if (
-                    latest_link.exists()
-                    and latest_link.resolve() == checkpoint_path
-                ):
-                    latest_link.unlink(missing_ok=True)
-                    # Point to next latest if available
-                    remaining_checkpoints = self._find_checkpoints(session_name)
-                    if remaining_checkpoints:
-                        symlink(
-                            latest_link,
-                            remaining_checkpoints[0].path,
-                            overwrite=True,
-                        )
-
+                self._catalog.remove_checkpoint(
+                    checkpoint_path.parent.name, int(checkpoint_path.name)
+                )
+                affected.setdefault(checkpoint_path.parent.name, session_name)
                 deleted += 1
             except Exception:
                 pass
-
+        # relink once per session, after all its deletions
+        for session_name in affected.values():
+            self._relink_latest(session_name)
+        self._collect_blobs()
         return deleted
 
     @contextmanager
     def transaction(self) -> Generator[Self, None, None]:
         """Batch multiple operations together.
 
+        The saves of the block are flushed to disk (and committed
+        to the save journal) together, when the block ends.
+
         Yields
         ------
         FilesystemStorage
@@ -692,7 +950,9 @@ class FilesystemStorage:
             original_registry = self._links_registry.copy()
 
         try:
-            yield self
+            # group commit: the saves are flushed to disk at the end
+            with self._saves.group():
+                yield self
         except Exception:
             # Rollback
             with self._registry_lock:
@@ -709,62 +969,66 @@ class FilesystemStorage:
             self._save_links_registry()
 
     def _load_links_registry(self) -> None:
-        """Load and validate the registry of external links."""
-        if self._links_registry_file.exists():
-            try:
-                with open(
-                    self._links_registry_file, "r", encoding="utf-8"
-                ) as f:
-                    data = json.load(f)
-                    if isinstance(data, dict):
-                        for key, value in data.items():
-                            if isinstance(value, list):
-                                valid_links = [
-                                    v for v in value if isinstance(v, str)
-                                ]
-                                if valid_links:
-                                    self._links_registry[key] = valid_links
-            except (json.JSONDecodeError, ValueError):
-                # Backup corrupted file
-                backup = self._links_registry_file.with_suffix(".corrupted")
-                shutil.copy2(self._links_registry_file, backup)
-                self._links_registry = {}
-            except Exception:
-                self._links_registry = {}
+        """Load the registry of external links from the catalog."""
+        with self._registry_lock:
+            self._migrate_links_registry()
+            self._links_registry = self._catalog.links()
 
-    def _save_links_registry(self) -> None:
-        """Save the registry with file locking."""
-        temp_file = self._links_registry_file.with_suffix(".tmp")
+    def _migrate_links_registry(self) -> None:
+        """Move the entries of a legacy registry file into the catalog."""
+        if not self._links_registry_file.exists():
+            return
+        legacy: dict[str, list[str]] = {}
         try:
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(self._links_registry, f, indent=2)
-            os.replace(temp_file, self._links_registry_file)
-        finally:
-            with suppress(FileNotFoundError):
-                temp_file.unlink(missing_ok=True)
+            with open(self._links_registry_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                for key, value in data.items():
+                    if isinstance(value, list):
+                        valid_links = [v for v in value if isinstance(v, str)]
+                        if valid_links:
+                            legacy[key] = valid_links
+        except (json.JSONDecodeError, ValueError):
+            # Backup corrupted file
+            backup = self._links_registry_file.with_suffix(".corrupted")
+            shutil.copy2(self._links_registry_file, backup)
+        except OSError:
+            legacy = {}
+        if legacy:
+            registry = self._catalog.links()
+            for key, links in legacy.items():
+                known = registry.setdefault(key, [])
+                known.extend(link for link in links if link not in known)
+            self._catalog.replace_links(registry)
+        with suppress(OSError):
+            self._links_registry_file.unlink(missing_ok=True)
+
+    def _save_links_registry(self) -> None:
+        """Save the registry of external links to the catalog."""
+        with self._registry_lock:
+            self._catalog.replace_links(self._links_registry)
 
     def _register_link(self, checkpoint_path: Path, link_path: Path) -> None:
         """Register an external link in the registry."""
         key = str(checkpoint_path)
         val = str(link_path)
-        with self._registry_transaction():
+        with self._registry_lock:
+            self._catalog.add_link(key, val)
             self._links_registry.setdefault(key, [])
             if val not in self._links_registry[key]:
                 self._links_registry[key].append(val)
 
     def _unregister_checkpoint_links(self, checkpoint_path: Path) -> list[Path]:
         """Get and remove all registered links for a checkpoint."""
-        with self._registry_transaction():
-            checkpoint_key = str(checkpoint_path)
-            links = self._links_registry.pop(checkpoint_key, [])
+        checkpoint_key = str(checkpoint_path)
+        with self._registry_lock:
+            links = self._catalog.pop_links(checkpoint_key)
+            self._links_registry.pop(checkpoint_key, None)
         return [Path(link) for link in links]
 
     def _get_session_dir(self, session_name: str) -> Path:
         """Get the directory for a session."""
-        name = safe_name(session_name)
-        if not _SAFE.match(name):
-            raise ValueError("Invalid session_name")
-        return self._workspace_dir / name
+        return self._workspace_dir / session_dir_name(session_name)
 
     def _get_checkpoint_path(
         self, session_name: str, timestamp: datetime
@@ -774,31 +1038,143 @@ class FilesystemStorage:
         return self._get_session_dir(session_name) / timestamp_str
 
     def _find_checkpoints(self, session_name: str) -> list[WaldiezCheckpoint]:
-        """Find all checkpoints for a session."""
-        session_dir = self._get_session_dir(session_name)
-        if not session_dir.exists():
-            return []
+        """Find all checkpoints for a session (newest first)."""
+        session = self._get_session_dir(session_name).name
+        self._sync_catalog(session)
+        return [
+            self._to_checkpoint(session_name, entry)
+            for entry in self._catalog.checkpoints(session)
+        ]
+
+    def _latest_checkpoint(self, session_name: str) -> WaldiezCheckpoint | None:
+        """Get the latest checkpoint of a session."""
+        session = self._get_session_dir(session_name).name
+        self._sync_catalog(session)
+        while True:
+            entry = self._catalog.latest(session)
+            if entry is None:
+                return None
+            checkpoint = self._to_checkpoint(session_name, entry)
+            if checkpoint.exists:
+                return checkpoint
+            # removed outside of the storage
+            self._catalog.remove_checkpoint(session, entry.timestamp)
+
+    def _sync_catalog(self, session: str | None = None) -> None:
+        """Catalog the checkpoints added or removed outside of the storage.
+
+        A directory is only scanned again if it was modified since its
+        last scan (e.g. by another waldiez version or by hand), so that
+        the catalog stays in sync without walking every checkpoint.
+        """
+        scanned = self._catalog.scanned()
+        sessions = [session] if session else self._sync_sessions(scanned)
+        removed = False
+        for name in sessions:
+            removed = self._sync_session(name, scanned.get(name)) or removed
+        if removed:
+            self._collect_blobs()
+
+    def _sync_sessions(self, scanned: Mapping[str, int]) -> list[str]:
+        """Catalog the session directories of the workspace."""
+        known = self._catalog.sessions()
+        mtime = _mtime(self._workspace_dir)
+        if mtime is None or scanned.get(_WORKSPACE_SCAN) == mtime:
+            return known
+        found = {
+            path.name
+            for path in self._workspace_dir.iterdir()
+            if path.is_dir() and not path.name.startswith(".")
+        }
+        for name in set(known) - found:
+            self._catalog.remove_session(name)
+        for name in found - set(known):
+            self._catalog.add_session(name)
+        self._catalog.set_scanned({_WORKSPACE_SCAN: mtime})
+        return sorted(found, reverse=True)
+
+    def _sync_session(self, session: str, scanned: int | None) -> bool:
+        """Catalog the checkpoint directories of a session.
+
+        Returns True if checkpoints were removed from the catalog.
+        """
+        session_dir = self._workspace_dir / session
+        mtime = _mtime(session_dir)
+        if mtime is None:
+            if scanned is None and not self._catalog.checkpoints(session):
+                return False
+            self._catalog.remove_session(session)
+            return True
+        if mtime == scanned:
+            return False
+        known = {
+            entry.timestamp for entry in self._catalog.checkpoints(session)
+        }
+        found = {
+            timestamp: path
+            for path, timestamp in self._scan_checkpoints(session_dir)
+        }
+        for timestamp in known - found.keys():
+            self._catalog.remove_checkpoint(session, timestamp)
+        for timestamp in found.keys() - known:
+            self._index_checkpoint_path(found[timestamp])
+        self._catalog.set_scanned({session: mtime})
+        return bool(known - found.keys())
+
+    def _to_checkpoint(
+        self, session_name: str, entry: CatalogEntry
+    ) -> WaldiezCheckpoint:
+        """Get the checkpoint of a catalog entry."""
+        name = str(entry.timestamp)
+        timestamp = WaldiezCheckpoint.parse_timestamp(name)
+        if timestamp is None:  # pragma: no cover
+            timestamp = datetime.fromtimestamp(0, tz=timezone.utc)
+        return WaldiezCheckpoint(
+            session_name=session_name,
+            timestamp=timestamp,
+            path=self._workspace_dir / entry.session / name,
+        )
+
+    def _catalog_entry(
+        self, session: str, timestamp: int, path: Path
+    ) -> CatalogEntry:
+        """Get the catalog entry of a checkpoint directory."""
+        return CatalogEntry(
+            session=session,
+            timestamp=timestamp,
+            size=dir_size(path),
+            metadata=self.load_dict(path / "metadata.json"),
+        )
+
+    def _relink_latest(self, session_name: str) -> None:
+        """Point a session's latest link to its latest checkpoint."""
+        latest_link = self._get_session_dir(session_name) / "latest"
+        if latest_link.exists() or not latest_link.is_symlink():
+            return
+        latest_link.unlink(missing_ok=True)
+        latest = self._latest_checkpoint(session_name)
+        if latest is not None:
+            symlink(latest_link, latest.path, overwrite=True)
 
-        checkpoints: list[WaldiezCheckpoint] = []
+    def _collect_blobs(self) -> None:
+        """Remove the objects that no checkpoint uses anymore."""
+        for digest in self._catalog.pop_orphan_blobs():
+            self._blobs.remove(digest)
+
+    @staticmethod
+    def _scan_checkpoints(session_dir: Path) -> list[tuple[Path, int]]:
+        """Find the checkpoint directories (and timestamps) of a session."""
+        found: list[tuple[Path, int]] = []
         for path in session_dir.iterdir():
-            if not path.is_dir():
+            if path.is_symlink() or not path.is_dir():
                 continue
-            try:
-                timestamp = WaldiezCheckpoint.parse_timestamp(path.name)
-                if not timestamp:
-                    continue
-                state_file = path / "state.json"
-                if state_file.exists():
-                    checkpoint = WaldiezCheckpoint(
-                        session_name=session_name,
-                        timestamp=timestamp,
-                        path=path,
-                    )
-                    checkpoints.append(checkpoint)
-            except ValueError:
+            if not WaldiezCheckpoint.parse_timestamp(path.name):
                 continue
-
-        return sorted(checkpoints, key=lambda c: c.timestamp, reverse=True)
+            if str(int(path.name)) != path.name:
+                continue
+            if (path / "state.json").exists():
+                found.append((path, int(path.name)))
+        return found
 
     def _clean_broken_symlinks(self, directory: Path) -> int:
         """Remove broken symlinks in a directory.
@@ -831,3 +1207,11 @@ class FilesystemStorage:
                     item.unlink(missing_ok=True)
                     removed += 1
         return removed
+
+
+def _mtime(path: Path) -> int | None:
+    """Get the modification time (ns) of a directory, None if missing."""
+    try:
+        return path.stat().st_mtime_ns if path.is_dir() else None
+    except OSError:
+        return None
@@ -0,0 +1,244 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+"""Offset index of a history journal.
+
+The index is a sidecar file next to a ``history.jsonl`` journal with a
+fixed size record for each (usable) journal line: where the line is,
+the index of the full state entry (keyframe) its delta chain starts from
+and the entry's timestamp. With it, the number of entries, their
+timestamps or a single entry can be read without decoding the rest
+of the journal. The index is built lazily (on the first read) and
+extended incrementally as the journal grows.
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+INDEX_MAGIC = b"WLZHIDX1"
+# magic, the journal size that is indexed
+_HEADER = struct.Struct("<8sQ")
+# offset, length, keyframe index, timestamp (-1 if not an integer)
+_RECORD = struct.Struct("<QIIq")
+
+
+@dataclass(frozen=True)
+class HistoryRecord:
+    """The location of a history entry in its journal."""
+
+    offset: int
+    length: int
+    keyframe: int
+    timestamp: int
+
+
+def _entry_timestamp(entry: dict[str, Any]) -> int:
+    """Get an entry's (integer) timestamp, -1 if it has none."""
+    value = entry.get("timestamp")
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return -1
+
+
+class HistoryIndex:
+    """Lazily built offset index of a history journal."""
+
+    def __init__(self, journal_file: Path, index_file: Path) -> None:
+        """Initialize the index.
+
+        Parameters
+        ----------
+        journal_file : Path
+            The ``history.jsonl`` journal.
+        index_file : Path
+            The sidecar index file.
+        """
+        self._journal_file = journal_file
+        self._index_file = index_file
+        self._lock = threading.Lock()
+        self._records: list[HistoryRecord] = []
+        self._indexed_size = 0
+
+    @property
+    def journal_file(self) -> Path:
+        """The indexed journal."""
+        return self._journal_file
+
+    @property
+    def index_file(self) -> Path:
+        """The sidecar index file."""
+        return self._index_file
+
+    def records(self) -> list[HistoryRecord]:
+        """Get the records of the journal's (usable) entries.
+
+        Returns
+        -------
+        list[HistoryRecord]
+            The records, in the journal's order.
+        """
+        with self._lock:
+            self._refresh()
+            return list(self._records)
+
+    def __len__(self) -> int:
+        """Get the number of (usable) entries.
+
+        Returns
+        -------
+        int
+            The number of entries.
+        """
+        return len(self.records())
+
+    def read(
+        self, records: list[HistoryRecord], start: int, stop: int
+    ) -> list[dict[str, Any]]:
+        """Read (as stored) the entries of a range of records.
+
+        Parameters
+        ----------
+        records : list[HistoryRecord]
+            The records (as returned by :meth:`records`).
+        start : int
+            The first record to read.
+        stop : int
+            The record to stop before.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The stored entries (full state or delta).
+        """
+        selected = records[start:stop]
+        if not selected:
+            return []
+        entries: list[dict[str, Any]] = []
+        with open(self._journal_file, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                for record in selected:
+                    line = view[record.offset : record.offset + record.length]
+                    entries.append(json.loads(line))
+        return entries
+
+    def invalidate(self) -> None:
+        """Forget the index (e.g. after the journal is rewritten)."""
+        with self._lock:
+            self._records = []
+            self._indexed_size = 0
+            with suppress(OSError):
+                self._index_file.unlink(missing_ok=True)
+
+    def _refresh(self) -> None:
+        """Load the index and extend it to the journal's end."""
+        try:
+            journal_size = self._journal_file.stat().st_size
+        except OSError:
+            self._records, self._indexed_size = [], 0
+            return
+        if not self._records and self._indexed_size == 0:
+            self._load()
+        if self._indexed_size > journal_size or not self._still_valid():
+            # rewritten (or truncated) since indexed
+            self._records, self._indexed_size = [], 0
+        if self._indexed_size < journal_size and self._extend():
+            self._save()
+
+    def _still_valid(self) -> bool:
+        """Check that the indexed part ends where a journal line ends."""
+        if self._indexed_size == 0:
+            return True
+        try:
+            with open(self._journal_file, "rb") as f:
+                f.seek(self._indexed_size - 1)
+                return f.read(1) == b"\n"
+        except OSError:
+            return False
+
+    def _extend(self) -> bool:
+        """Index the journal's lines after the indexed part."""
+        added = False
+        keyframe = self._records[-1].keyframe if self._records else -1
+        with open(self._journal_file, "rb") as f:
+            f.seek(self._indexed_size)
+            offset = self._indexed_size
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # still being written
+                    break
+                record_offset = offset
+                offset += len(line)
+                self._indexed_size = offset
+                added = True
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(entry, dict):
+                    continue
+                entry = cast(dict[str, Any], entry)
+                if isinstance(entry.get("state"), dict):
+                    keyframe = len(self._records)
+                elif keyframe < 0 or not isinstance(entry.get("delta"), dict):
+                    # nothing to apply the delta to
+                    continue
+                self._records.append(
+                    HistoryRecord(
+                        offset=record_offset,
+                        length=len(line),
+                        keyframe=keyframe,
+                        timestamp=_entry_timestamp(entry),
+                    )
+                )
+        return added
+
+    def _load(self) -> None:
+        """Load the records of the index file (if valid)."""
+        try:
+            data = self._index_file.read_bytes()
+        except OSError:
+            return
+        if len(data) < _HEADER.size:
+            return
+        magic, indexed_size = _HEADER.unpack_from(data)
+        body = memoryview(data)[_HEADER.size :]
+        if magic != INDEX_MAGIC or len(body) % _RECORD.size:
+            return
+        self._records = [
+            HistoryRecord(*fields) for fields in _RECORD.iter_unpack(body)
+        ]
+        self._indexed_size = indexed_size
+
+    def _save(self) -> None:
+        """Write the index file (atomically, best effort)."""
+        data = bytearray(_HEADER.pack(INDEX_MAGIC, self._indexed_size))
+        for record in self._records:
+            data += _RECORD.pack(
+                record.offset,
+                record.length,
+                record.keyframe,
+                record.timestamp,
+            )
+        with suppress(OSError):
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=f".{self._index_file.name}.",
+                suffix=".tmp",
+                dir=self._index_file.parent,
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_name, self._index_file)
+            except OSError:
+                with suppress(OSError):
+                    os.unlink(tmp_name)
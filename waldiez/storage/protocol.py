@@ -247,3 +247,176 @@ class Storage(Protocol):  # pragma: no cover
             Number of checkpoints successfully deleted
         """
         ...
+
+
+@runtime_checkable
+class AsyncStorage(Protocol):  # pragma: no cover
+    """Protocol for non-blocking workspace and checkpoints management.
+
+    The async counterpart of :class:`Storage`, for callers running
+    in an event loop (e.g. the websocket server).
+    """
+
+    @property
+    def workspace_dir(self) -> Path:
+        """Base workspace directory."""
+        ...
+
+    async def save_checkpoint(
+        self,
+        session_name: str,
+        state: dict[str, Any],
+        metadata: dict[str, Any] | None = None,
+        timestamp: datetime | None = None,
+    ) -> Path:
+        """Save a checkpoint for a session.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        state : dict[str, Any]
+            State data to save
+        metadata : dict[str, Any]
+            Optional metadata to include
+        timestamp: datetime
+            Optional timestamp (defaults to now)
+        """
+        ...
+
+    async def get_checkpoint(
+        self, session_name: str, timestamp: datetime | None = None
+    ) -> WaldiezCheckpointInfo | None:
+        """Load a checkpoint for a session.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        timestamp: datetime
+            Optional timestamp (defaults to latest)
+        """
+        ...
+
+    async def load_checkpoint(
+        self, info: WaldiezCheckpointInfo, history_index: int | None
+    ) -> WaldiezCheckpoint:
+        """Load a checkpoint.
+
+        Parameters
+        ----------
+        info: WaldiezCheckpointInfo
+            The checkpoint info to get the path.
+        history_index: int | None
+            Optional history index to use.
+        """
+        ...
+
+    async def load_history(
+        self, info: WaldiezCheckpointInfo
+    ) -> list[dict[str, Any]]:
+        """Load the (decoded) history of a checkpoint.
+
+        Parameters
+        ----------
+        info: WaldiezCheckpointInfo
+            The checkpoint info.
+        """
+        ...
+
+    async def link_checkpoint(
+        self,
+        to: Path,
+        session_name: str,
+        timestamp: datetime | None = None,
+    ) -> None:
+        """Create a symlink to a checkpoint.
+
+        Parameters
+        ----------
+        to: Path
+            Where to create the symlink to.
+        session_name : str
+            Name of the session
+        timestamp: datetime | None
+            Optional specific checkpoint timestamp (defaults to latest)
+        """
+        ...
+
+    async def list_checkpoints(
+        self, session_name: str | None = None
+    ) -> list[WaldiezCheckpointInfo]:
+        """List available checkpoints.
+
+        Parameters
+        ----------
+        session_name : str | None
+            Optional filter by session name
+        """
+        ...
+
+    async def list_sessions(self) -> list[str]:
+        """List available sessions."""
+        ...
+
+    async def delete_session(self, session_name: str) -> None:
+        """Delete a session and all its checkpoints.
+
+        Parameters
+        ----------
+        session_name : str
+            The session to delete.
+        """
+        ...
+
+    async def delete_checkpoint(
+        self, session_name: str, timestamp: datetime
+    ) -> None:
+        """Delete a specific checkpoint.
+
+        Parameters
+        ----------
+        session_name : str
+            The name of the session
+        timestamp : datetime
+            Timestamp of the checkpoint to delete
+        """
+        ...
+
+    async def cleanup_old_checkpoints(
+        self, session_name: str, keep_count: int = 5
+    ) -> int:
+        """Clean up old checkpoints, keeping only the most recent ones.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        keep_count : int
+            Number of recent checkpoints to keep
+        """
+        ...
+
+    async def clean_broken_symlinks(
+        self, session_name: str | None = None
+    ) -> int:
+        """Clean up broken symlinks.
+
+        Parameters
+        ----------
+        session_name : str | None
+            If provided, clean only in that session's directory.
+        """
+        ...
+
+    async def delete_checkpoints_batch(
+        self, checkpoints: Iterable[tuple[str, datetime]]
+    ) -> int:
+        """Delete multiple checkpoints.
+
+        Parameters
+        ----------
+        checkpoints : Iterable[tuple[str, datetime]]
+            List of (session_name, timestamp) tuples
+        """
+        ...
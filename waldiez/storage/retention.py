@@ -0,0 +1,285 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+"""Declarative retention of checkpoints."""
+
+import re
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from .protocol import Storage
+
+DURATION_UNITS = {
+    "s": 1,
+    "m": 60,
+    "h": 3600,
+    "d": 86400,
+    "w": 604800,
+}
+SIZE_UNITS = {
+    "": 1,
+    "b": 1,
+    "k": 1024,
+    "kb": 1024,
+    "m": 1024**2,
+    "mb": 1024**2,
+    "g": 1024**3,
+    "gb": 1024**3,
+    "t": 1024**4,
+    "tb": 1024**4,
+}
+
+_AMOUNT = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([a-z]*)\s*$")
+
+
+def _parse_amount(value: str, units: dict[str, int], default: str) -> float:
+    """Parse a number with an (optional) unit suffix."""
+    match = _AMOUNT.match(value.lower())
+    if not match or (match.group(2) or default) not in units:
+        raise ValueError(f"Invalid value: {value!r}")
+    return float(match.group(1)) * units[match.group(2) or default]
+
+
+def parse_duration(value: str | float | timedelta) -> timedelta:
+    """Parse a duration like ``"12h"`` or ``"7d"``.
+
+    Parameters
+    ----------
+    value : str | float | timedelta
+        The duration (plain numbers are seconds).
+
+    Returns
+    -------
+    timedelta
+        The parsed duration.
+
+    Raises
+    ------
+    ValueError
+        If the duration is invalid.
+    """
+    if isinstance(value, timedelta):
+        return value
+    if isinstance(value, (int, float)):
+        return timedelta(seconds=value)
+    return timedelta(seconds=_parse_amount(value, DURATION_UNITS, "s"))
+
+
+def parse_size(value: str | int) -> int:
+    """Parse a size like ``"500MB"`` or ``"2g"`` (in binary units).
+
+    Parameters
+    ----------
+    value : str | int
+        The size (plain numbers are bytes).
+
+    Returns
+    -------
+    int
+        The size in bytes.
+
+    Raises
+    ------
+    ValueError
+        If the size is invalid.
+    """
+    if isinstance(value, int):
+        return value
+    return int(_parse_amount(value, SIZE_UNITS, "b"))
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Which checkpoints to keep.
+
+    Attributes
+    ----------
+    max_checkpoints : int | None
+        The maximum number of checkpoints per session.
+    max_age : timedelta | None
+        The maximum age of a checkpoint.
+    max_total_bytes : int | None
+        The maximum size of all the checkpoints in the workspace
+        (the oldest ones are removed first).
+    keep_latest : bool
+        Never remove the latest checkpoint of a session.
+    """
+
+    max_checkpoints: int | None = None
+    max_age: timedelta | None = None
+    max_total_bytes: int | None = None
+    keep_latest: bool = True
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the policy has any limit."""
+        return (
+            self.max_checkpoints is not None
+            or self.max_age is not None
+            or self.max_total_bytes is not None
+        )
+
+
+@dataclass(frozen=True)
+class CheckpointUsage:
+    """A checkpoint and the space it takes."""
+
+    session_name: str
+    timestamp: datetime
+    size: int = 0
+
+
+@dataclass
+class RetentionReport:
+    """The outcome of enforcing a retention policy."""
+
+    expired: list[CheckpointUsage] = field(default_factory=list)
+    deleted: int = 0
+    dry_run: bool = False
+
+    @property
+    def freed_bytes(self) -> int:
+        """The (approximate) size of the expired checkpoints."""
+        return sum(item.size for item in self.expired)
+
+
+def _expired_in_session(
+    checkpoints: list[CheckpointUsage],
+    policy: RetentionPolicy,
+    cutoff: datetime | None,
+) -> tuple[list[CheckpointUsage], list[CheckpointUsage]]:
+    """Split a session's (newest first) checkpoints to expired and kept."""
+    expired: list[CheckpointUsage] = []
+    kept: list[CheckpointUsage] = []
+    for index, item in enumerate(checkpoints):
+        if index == 0 and policy.keep_latest:
+            continue
+        limit = policy.max_checkpoints
+        too_many = limit is not None and index >= max(limit, 0)
+        too_old = cutoff is not None and item.timestamp < cutoff
+        if too_many or too_old:
+            expired.append(item)
+        else:
+            kept.append(item)
+    return expired, kept
+
+
+def select_expired(
+    checkpoints: Iterable[CheckpointUsage],
+    policy: RetentionPolicy,
+    now: datetime | None = None,
+) -> list[CheckpointUsage]:
+    """Compute (in one pass) the checkpoints a policy removes.
+
+    The per session limits (count and age) are applied first.
+    If the rest still exceed the size limit, the oldest
+    checkpoints of the whole workspace are removed until they fit.
+
+    Parameters
+    ----------
+    checkpoints : Iterable[CheckpointUsage]
+        All the checkpoints of the workspace.
+    policy : RetentionPolicy
+        The policy to enforce.
+    now : datetime | None
+        The current time (for the age limit).
+
+    Returns
+    -------
+    list[CheckpointUsage]
+        The checkpoints to remove (oldest first).
+    """
+    if not policy.enabled:
+        return []
+    cutoff: datetime | None = None
+    if policy.max_age is not None:
+        cutoff = (now or datetime.now(timezone.utc)) - policy.max_age
+    sessions: dict[str, list[CheckpointUsage]] = defaultdict(list)
+    for item in checkpoints:
+        sessions[item.session_name].append(item)
+    expired: list[CheckpointUsage] = []
+    removable: list[CheckpointUsage] = []
+    total = 0
+    for items in sessions.values():
+        items.sort(key=lambda item: item.timestamp, reverse=True)
+        total += sum(item.size for item in items)
+        session_expired, session_kept = _expired_in_session(
+            items, policy, cutoff
+        )
+        expired.extend(session_expired)
+        removable.extend(session_kept)
+    total -= sum(item.size for item in expired)
+    if policy.max_total_bytes is not None:
+        removable.sort(key=lambda item: item.timestamp)
+        for item in removable:
+            if total <= policy.max_total_bytes:
+                break
+            expired.append(item)
+            total -= item.size
+    expired.sort(key=lambda item: item.timestamp)
+    return expired
+
+
+def checkpoint_usage(storage: Storage) -> list[CheckpointUsage]:
+    """Get the checkpoints of a storage and their sizes.
+
+    Parameters
+    ----------
+    storage : Storage
+        The storage to use.
+
+    Returns
+    -------
+    list[CheckpointUsage]
+        The checkpoints (with a zero size if the
+        storage cannot tell their sizes).
+    """
+    checkpoint_sizes: (
+        Callable[[], Iterable[tuple[str, datetime, int]]] | None
+    ) = getattr(storage, "checkpoint_sizes", None)
+    if checkpoint_sizes is not None:
+        return [
+            CheckpointUsage(session_name, timestamp, size)
+            for session_name, timestamp, size in checkpoint_sizes()
+        ]
+    return [
+        CheckpointUsage(info.session_name, info.timestamp)
+        for info in storage.list_checkpoints()
+    ]
+
+
+def apply_retention(
+    storage: Storage,
+    policy: RetentionPolicy,
+    now: datetime | None = None,
+    dry_run: bool = False,
+) -> RetentionReport:
+    """Remove the checkpoints a policy does not keep.
+
+    Parameters
+    ----------
+    storage : Storage
+        The storage to clean up.
+    policy : RetentionPolicy
+        The policy to enforce.
+    now : datetime | None
+        The current time (for the age limit).
+    dry_run : bool
+        Only report the checkpoints that would be removed.
+
+    Returns
+    -------
+    RetentionReport
+        The expired (and deleted) checkpoints.
+    """
+    if not policy.enabled:
+        return RetentionReport(dry_run=dry_run)
+    expired = select_expired(checkpoint_usage(storage), policy, now)
+    report = RetentionReport(expired=expired, dry_run=dry_run)
+    if expired and not dry_run:
+        report.deleted = storage.delete_checkpoints_batch(
+            [(item.session_name, item.timestamp) for item in expired]
+        )
+    return report
@@ -0,0 +1,399 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pyright: reportUnknownVariableType=false
+
+"""Write-ahead journal of the checkpoint saves.
+
+A checkpoint's files are written to temporary files, flushed to disk and
+renamed over the previous ones, so a reader sees either the old or the
+new contents, never a truncated file. Before that, the save is recorded
+in a (per process) journal and, once done, marked as committed. If the
+process is killed in between, the next storage that opens the workspace
+finds the save in the journal and completes it (if its temporary files
+were fully written) or rolls it back.
+
+Inside a :meth:`SaveJournal.group`, the files and directories are only
+flushed to disk (and the saves committed) when the group ends, so that
+many saves share the cost of the flushes.
+"""
+
+import json
+import os
+import threading
+import uuid
+from collections.abc import Callable, Generator, Iterable, Mapping
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+import psutil
+
+from .compression import dump_json, load_json
+
+SAVES_DIR = ".saves"
+
+
+def tmp_name(name: str) -> str:
+    """Get the name of a file's temporary copy.
+
+    Parameters
+    ----------
+    name : str
+        The file's name.
+
+    Returns
+    -------
+    str
+        The temporary file's name.
+    """
+    return f".{name}.tmp"
+
+
+def fsync_path(path: Path) -> None:
+    """Flush a file (or a directory entry) to disk.
+
+    Directories cannot be flushed on Windows (and some filesystems),
+    this is then a no-op.
+
+    Parameters
+    ----------
+    path : Path
+        The file or directory.
+    """
+    if path.is_dir():
+        if os.name == "nt":
+            return
+        with suppress(OSError):
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        return
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
+
+def _is_valid(path: Path) -> bool:
+    """Check that a file holds (complete) JSON."""
+    try:
+        load_json(path)
+    except (OSError, ValueError, EOFError):
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class PendingSave:
+    """A save that was not committed."""
+
+    id: str
+    directory: Path
+    names: tuple[str, ...]
+
+
+class SaveJournal:
+    """Atomic, journaled writes of the checkpoints' files."""
+
+    def __init__(self, root: Path) -> None:
+        """Initialize the journal.
+
+        Parameters
+        ----------
+        root : Path
+            The directory of the journals (one per storage instance).
+        """
+        self._root = root
+        self._pid = os.getpid()
+        self._path = self._new_path()
+        self._lock = threading.RLock()
+        self._open: set[str] = set()
+        self._group_depth = 0
+        self._unsynced: set[Path] = set()
+        self._uncommitted: list[str] = []
+
+    @property
+    def path(self) -> Path:
+        """The journal file of this instance."""
+        with self._lock:
+            if os.getpid() != self._pid:  # forked: do not share the file
+                self._pid = os.getpid()
+                self._path = self._new_path()
+                self._open.clear()
+            return self._path
+
+    @property
+    def grouped(self) -> bool:
+        """Whether the flushes are deferred to the end of a group."""
+        return self._group_depth > 0
+
+    def write(
+        self,
+        directory: Path,
+        files: Mapping[str, Any],
+        compression: str = "none",
+    ) -> str:
+        """Write (atomically) the JSON files of a directory.
+
+        Parameters
+        ----------
+        directory : Path
+            The directory (created if needed).
+        files : Mapping[str, Any]
+            The data to write, by file name.
+        compression : str
+            The compression of the files.
+
+        Returns
+        -------
+        str
+            The save's id, to :meth:`commit` when the save is complete.
+        """
+        created = self._make_dirs(directory)
+        save_id = self._begin(directory, list(files))
+        written: list[Path] = []
+        for name, data in files.items():
+            tmp = directory / tmp_name(name)
+            dump_json(tmp, data, compression)
+            if not self.grouped:
+                fsync_path(tmp)
+            os.replace(tmp, directory / name)
+            written.append(directory / name)
+        # the renames (and new directories) are durable
+        # once their parent directories are flushed
+        self._sync([*written, directory, *created])
+        return save_id
+
+    def commit(self, save_id: str) -> None:
+        """Mark a save as complete.
+
+        Parameters
+        ----------
+        save_id : str
+            The id returned by :meth:`write`.
+        """
+        with self._lock:
+            if self.grouped:
+                self._uncommitted.append(save_id)
+                return
+            self._commit([save_id], sync=False)
+
+    @contextmanager
+    def group(self) -> Generator[None, None, None]:
+        """Defer the flushes and commits of the saves to the group's end.
+
+        Yields
+        ------
+        None
+            Nothing, the saves of the block are grouped.
+        """
+        with self._lock:
+            self._group_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._group_depth -= 1
+                if self._group_depth == 0:
+                    self.flush()
+
+    def flush(self) -> None:
+        """Flush the deferred files and commit the grouped saves."""
+        with self._lock:
+            unsynced = sorted(self._unsynced)
+            uncommitted = self._uncommitted
+            self._unsynced = set()
+            self._uncommitted = []
+            for path in unsynced:
+                with suppress(OSError):  # e.g. removed since
+                    fsync_path(path)
+            if uncommitted:
+                self._commit(uncommitted, sync=True)
+
+    def recover(self, handler: Callable[[PendingSave], None]) -> int:
+        """Complete or roll back the saves of terminated processes.
+
+        The files of each save are restored (see :func:`restore`)
+        before passing it to the handler. The journals of this process
+        are skipped (other storages of the process may be using them).
+
+        Parameters
+        ----------
+        handler : Callable[[PendingSave], None]
+            Called for each interrupted save (e.g. to update an index).
+
+        Returns
+        -------
+        int
+            The number of interrupted saves.
+        """
+        recovered = 0
+        own = self.path
+        if not self._root.is_dir():
+            return 0
+        for journal in sorted(self._root.glob("*.jsonl")):
+            if journal == own or self._in_use(journal):
+                continue
+            for save in self.pending(journal):
+                restore(save)
+                handler(save)
+                recovered += 1
+            with suppress(OSError):
+                journal.unlink()
+        return recovered
+
+    @staticmethod
+    def pending(journal: Path) -> list[PendingSave]:
+        """Get the saves of a journal that were not committed.
+
+        Parameters
+        ----------
+        journal : Path
+            The journal file.
+
+        Returns
+        -------
+        list[PendingSave]
+            The pending saves, in the order they started.
+        """
+        saves: dict[str, PendingSave] = {}
+        try:
+            with open(journal, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:  # e.g. partially written
+                continue
+            if not isinstance(record, dict):
+                continue
+            record = cast(dict[str, Any], record)
+            save_id = str(record.get("id", ""))
+            if record.get("op") == "commit":
+                saves.pop(save_id, None)
+            elif record.get("op") == "begin" and record.get("path"):
+                stored = record.get("names")
+                names: list[Any] = stored if isinstance(stored, list) else []
+                saves[save_id] = PendingSave(
+                    id=save_id,
+                    directory=Path(str(record["path"])),
+                    names=tuple(str(name) for name in names if name),
+                )
+        return list(saves.values())
+
+    def _new_path(self) -> Path:
+        """Get a new journal file name for this process."""
+        return self._root / f"{self._pid}-{uuid.uuid4().hex[:12]}.jsonl"
+
+    def _begin(self, directory: Path, names: list[str]) -> str:
+        """Record (durably) that a save started."""
+        save_id = uuid.uuid4().hex
+        record = {
+            "op": "begin",
+            "id": save_id,
+            "path": str(directory),
+            "names": names,
+        }
+        with self._lock:
+            self._open.add(save_id)
+            self._append([record], sync=True)
+        return save_id
+
+    def _commit(self, save_ids: list[str], sync: bool) -> None:
+        """Record that saves are complete."""
+        self._open.difference_update(save_ids)
+        if not self._open:
+            # nothing to recover: start over
+            with suppress(OSError):
+                os.truncate(self.path, 0)
+            return
+        self._append(
+            [{"op": "commit", "id": save_id} for save_id in save_ids], sync
+        )
+
+    def _append(self, records: Iterable[dict[str, Any]], sync: bool) -> None:
+        """Append records to the journal file."""
+        path = self.path
+        created = not path.exists()
+        if created:
+            self._make_dirs(path.parent)
+        with open(path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+        if created and sync:
+            fsync_path(path.parent)
+
+    def _sync(self, paths: list[Path]) -> None:
+        """Flush the (renamed) files and directories of a save.
+
+        Outside of a group, the files were flushed before being renamed.
+        """
+        with self._lock:
+            if self.grouped:
+                self._unsynced.update(paths)
+                return
+        for path in paths:
+            if path.is_dir():
+                fsync_path(path)
+
+    @staticmethod
+    def _make_dirs(directory: Path) -> list[Path]:
+        """Create a directory, get the parents of the new directories."""
+        created: list[Path] = []
+        current = directory
+        while not current.exists():
+            created.append(current.parent)
+            current = current.parent
+        if created:
+            directory.mkdir(parents=True, exist_ok=True)
+        return created
+
+    def _in_use(self, journal: Path) -> bool:
+        """Check if a journal belongs to a running process."""
+        try:
+            pid = int(journal.name.split("-", 1)[0])
+        except ValueError:
+            return False
+        if pid == self._pid:
+            # another storage (or an earlier process with the same pid)
+            return True
+        return psutil.pid_exists(pid)
+
+
+def restore(save: PendingSave) -> bool:
+    """Complete (or roll back) the files of an interrupted save.
+
+    Fully written temporary files replace their targets,
+    partially written ones (and truncated targets) are removed.
+
+    Parameters
+    ----------
+    save : PendingSave
+        The interrupted save.
+
+    Returns
+    -------
+    bool
+        Whether all the save's files are now complete.
+    """
+    complete = True
+    for name in save.names:
+        target = save.directory / name
+        tmp = save.directory / tmp_name(name)
+        with suppress(OSError):
+            if tmp.is_file():
+                if _is_valid(tmp):
+                    os.replace(tmp, target)
+                else:
+                    tmp.unlink()
+            if target.is_file() and not _is_valid(target):
+                target.unlink()
+        complete = complete and target.is_file()
+    return complete
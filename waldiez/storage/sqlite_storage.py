@@ -0,0 +1,1037 @@
+# SPDX-License-Identifier: Apache-2.0.
+# Copyright (c) 2024 - 2025 Waldiez and contributors.
+
+# pylint: disable=broad-exception-caught,too-many-public-methods
+# pylint: disable=too-many-lines
+# pyright: reportUnknownVariableType=false,reportUnknownArgumentType=false
+
+"""SQLite implementation of the Storage protocol.
+
+All the checkpoints of a workspace are rows of a single (WAL mode)
+database file: a checkpoint's state, metadata and history are stored as
+(optionally compressed) JSON blobs keyed by their session and timestamp,
+so saving a checkpoint is a single transaction and listing them a single
+indexed query. The other artifacts of a run (results, logs, reports)
+are still files, under ``<workspace>/<session>/<timestamp>/``.
+"""
+
+import json
+import shutil
+import sqlite3
+from collections.abc import Generator, Iterable, Mapping
+from contextlib import AbstractContextManager, contextmanager, suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from typing_extensions import Self
+
+from ._sqlite import SqliteConnection
+from .checkpoint import (
+    HISTORY_FILE,
+    HISTORY_INDEX_FILE,
+    HISTORY_JOURNAL_FILE,
+    WaldiezCheckpoint,
+    WaldiezCheckpointInfo,
+)
+from .compression import compress, decompress, get_compression
+from .filesystem_storage import FilesystemStorage
+from .history_index import HistoryIndex
+from .utils import dir_size, session_dir_name, symlink
+
+SQLITE_FILE = "checkpoints.db"
+SCHEMA_VERSION = 1
+# the files of a checkpoint that are stored in (or replaced by) the database
+STORED_NAMES = (
+    "state.json",
+    "metadata.json",
+    HISTORY_FILE,
+    HISTORY_JOURNAL_FILE,
+    HISTORY_INDEX_FILE,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    session TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    state BLOB NOT NULL,
+    metadata BLOB,
+    history BLOB,
+    PRIMARY KEY (session, timestamp)
+);
+CREATE TABLE IF NOT EXISTS links (
+    session TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    link TEXT NOT NULL,
+    PRIMARY KEY (session, timestamp, link)
+);
+"""
+_SELECT_BLOB = {
+    "state": """
+        SELECT state FROM checkpoints WHERE session = ? AND timestamp = ?
+    """,
+    "metadata": """
+        SELECT metadata FROM checkpoints WHERE session = ? AND timestamp = ?
+    """,
+    "history": """
+        SELECT history FROM checkpoints WHERE session = ? AND timestamp = ?
+    """,
+}
+
+
+def _to_int(timestamp: datetime) -> int:
+    """Get the integer microseconds of a timestamp."""
+    return int(WaldiezCheckpoint.format_timestamp(timestamp))
+
+
+def _to_datetime(value: int) -> datetime:
+    """Get the timestamp of integer microseconds."""
+    timestamp = WaldiezCheckpoint.parse_timestamp(str(value))
+    if timestamp is None:  # pragma: no cover
+        timestamp = datetime.fromtimestamp(0, tz=timezone.utc)
+    return timestamp
+
+
+@dataclass
+class SqliteCheckpoint(WaldiezCheckpoint):
+    """A checkpoint whose state, metadata and history are database rows."""
+
+    storage: "SqliteStorage" = field(kw_only=True, repr=False, compare=False)
+
+    @property
+    def state(self) -> dict[str, Any]:
+        """Get the checkpoint's state."""
+        if self._state is None:
+            state = self.storage.read_blob(
+                self.session_name, self.timestamp, "state"
+            )
+            self._state = state if isinstance(state, dict) else {}
+        return self._state
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """Get the checkpoint's metadata."""
+        if self._metadata is None:
+            metadata = self.storage.read_blob(
+                self.session_name, self.timestamp, "metadata"
+            )
+            self._metadata = metadata if isinstance(metadata, dict) else {}
+        return self._metadata
+
+    @property
+    def exists(self) -> bool:
+        """Check if the checkpoint exists in the database."""
+        return self.storage.has_checkpoint(self.session_name, self.timestamp)
+
+    def history(self, decode: bool = True) -> list[dict[str, Any]]:
+        """Get the state history.
+
+        Parameters
+        ----------
+        decode : bool
+            Resolve the (delta) entries to full states. If False,
+            the entries are returned as stored.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The history entries
+        """
+        stored = self.storage.read_blob(
+            self.session_name, self.timestamp, "history"
+        )
+        entries = (
+            [entry for entry in stored if isinstance(entry, dict)]
+            if isinstance(stored, list)
+            else []
+        )
+        return self.decode_history(entries) if decode else entries
+
+    def _get_history_index(self) -> HistoryIndex | None:
+        """Get no index: the history is a single database blob."""
+        return None
+
+    def compact_history(self) -> int:
+        """Get the number of history entries (stored compacted).
+
+        Returns
+        -------
+        int
+            The number of entries in the history.
+        """
+        return len(self.history(decode=False))
+
+    def _store_state(self, state: dict[str, Any]) -> None:
+        """Replace the stored state."""
+        self.storage.save_checkpoint(
+            self.session_name, state, timestamp=self.timestamp
+        )
+
+
+# noinspection SqlNoDataSourceInspection,SqlResolve
+class SqliteStorage:
+    """SQLite-based storage implementation."""
+
+    def __init__(
+        self,
+        workspace_dir: Path | str = "workspace",
+        compression: str | None = None,
+        db_file: Path | str | None = None,
+    ) -> None:
+        """Initialize the SQLite storage.
+
+        Parameters
+        ----------
+        workspace_dir : str | Path
+            Base directory for all workspace data
+        compression : str | None
+            Compression of the stored JSON blobs ("none", "gzip" or
+            "zstd"). Defaults to the ``WALDIEZ_CHECKPOINT_COMPRESSION``
+            environment variable (or "none").
+        db_file : Path | str | None
+            The database file (defaults to ``checkpoints.db``
+            in the workspace directory).
+        """
+        self._compression = get_compression(compression)
+        self._workspace_dir = Path(workspace_dir).resolve()
+        self._workspace_dir.mkdir(parents=True, exist_ok=True)
+        self._path = (
+            Path(db_file).resolve()
+            if db_file
+            else self._workspace_dir / SQLITE_FILE
+        )
+        self._db = SqliteConnection(self._path, _SCHEMA, SCHEMA_VERSION)
+
+    @staticmethod
+    def load_dict(json_file: Path) -> dict[str, Any]:
+        """Load dict from json.
+
+        Parameters
+        ----------
+        json_file : Path
+            The path of the file to load data from.
+
+        Returns
+        -------
+        dict[str, Any]
+            The loaded dict.
+        """
+        return FilesystemStorage.load_dict(json_file)
+
+    @staticmethod
+    def load_list(
+        json_file: Path, fallback_dict_key: str
+    ) -> list[dict[str, Any]]:
+        """Load list from json.
+
+        Parameters
+        ----------
+        json_file : Path
+            The path of the file to load data from.
+        fallback_dict_key : str
+            The key to get the list from if the loaded data is dict.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The loaded list.
+        """
+        return FilesystemStorage.load_list(json_file, fallback_dict_key)
+
+    @property
+    def workspace_dir(self) -> Path:
+        """Base workspace directory."""
+        return self._workspace_dir
+
+    @property
+    def path(self) -> Path:
+        """The database file."""
+        return self._path
+
+    @property
+    def compression(self) -> str:
+        """The compression of the stored JSON blobs."""
+        return self._compression
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+    @contextmanager
+    def transaction(self) -> Generator[Self, None, None]:
+        """Batch multiple operations together (in a database transaction).
+
+        Only the database changes are rolled back if any operation fails,
+        already removed artifact directories or links are not restored.
+
+        Yields
+        ------
+        SqliteStorage
+            Self
+
+        Raises
+        ------
+        Exception
+            If any of the operations fails.
+
+        Example
+        -------
+        with storage.transaction():
+            storage.save_checkpoint("session1", state1)
+            storage.save_checkpoint("session2", state2)
+            storage.delete_checkpoint("session3", timestamp)
+        """
+        with self._cursor(write=True):
+            yield self
+
+    def save_checkpoint(
+        self,
+        session_name: str,
+        state: dict[str, Any],
+        metadata: dict[str, Any] | None = None,
+        timestamp: datetime | None = None,
+    ) -> Path:
+        """Save a checkpoint for a session.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        state : dict[str, Any]
+            State data to save
+        metadata : dict[str, Any]
+            Optional metadata to include
+        timestamp: datetime
+            Optional timestamp (defaults to now)
+
+        Returns
+        -------
+        Path
+            The directory for the checkpoint's other artifacts
+            (not created).
+        """
+        if timestamp is None:
+            timestamp = datetime.now(timezone.utc)
+        session = self._session(session_name)
+        with self._cursor(write=True) as cursor:
+            cursor.execute(
+                """
+                INSERT INTO checkpoints (session, timestamp, state, metadata)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (session, timestamp) DO UPDATE SET
+                    state = excluded.state,
+                    metadata = COALESCE(excluded.metadata, metadata)
+                """,
+                (
+                    session,
+                    _to_int(timestamp),
+                    self._encode(state),
+                    self._encode(metadata) if metadata else None,
+                ),
+            )
+        return self._checkpoint_path(session, timestamp)
+
+    def ingest_checkpoint(
+        self,
+        session_name: str,
+        timestamp: datetime,
+        source_dir: Path | None = None,
+    ) -> Path:
+        """Move a checkpoint's state, metadata and history files into the db.
+
+        Used after a run's results are copied into the checkpoint's
+        directory, or to import checkpoints of the filesystem layout.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        timestamp : datetime
+            The checkpoint's timestamp
+        source_dir : Path | None
+            A directory (left as is) to import the checkpoint from.
+            Its other files are copied into the checkpoint's directory.
+            If None, the files already in the checkpoint's directory
+            are imported (and removed).
+
+        Returns
+        -------
+        Path
+            The checkpoint's directory.
+        """
+        session = self._session(session_name)
+        checkpoint_path = self._checkpoint_path(session, timestamp)
+        files = WaldiezCheckpoint(
+            session_name=session,
+            timestamp=timestamp,
+            path=source_dir or checkpoint_path,
+        )
+        state = files.state if files.state_file.is_file() else None
+        metadata = files.metadata if files.metadata_file.is_file() else None
+        history = files.history(decode=False)
+        key = (session, _to_int(timestamp))
+        with self._cursor(write=True) as cursor:
+            row = cursor.execute(
+                """
+                SELECT state, metadata, history FROM checkpoints
+                WHERE session = ? AND timestamp = ?
+                """,
+                key,
+            ).fetchone()
+            stored = row or (None, None, None)
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO checkpoints
+                    (session, timestamp, state, metadata, history)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    *key,
+                    (
+                        self._encode(state)
+                        if state is not None
+                        else stored[0] or self._encode({})
+                    ),
+                    self._encode(metadata) if metadata else stored[1],
+                    self._encode(history) if history else stored[2],
+                ),
+            )
+        if source_dir is not None:
+            shutil.copytree(
+                source_dir,
+                checkpoint_path,
+                symlinks=True,
+                dirs_exist_ok=True,
+                ignore=shutil.ignore_patterns(*STORED_NAMES),
+            )
+        else:
+            for name in STORED_NAMES:
+                with suppress(OSError):
+                    (checkpoint_path / name).unlink(missing_ok=True)
+        return checkpoint_path
+
+    def migrate_from(self, source: FilesystemStorage | Path | str) -> int:
+        """Import the checkpoints of a filesystem storage.
+
+        If the source uses the same workspace directory, the checkpoints
+        are migrated in place (their JSON files are moved into the
+        database, their other files are kept where they are).
+        Checkpoints that are already migrated are skipped, so an
+        interrupted migration can be repeated.
+
+        Parameters
+        ----------
+        source : FilesystemStorage | Path | str
+            The filesystem storage (or its workspace directory).
+
+        Returns
+        -------
+        int
+            The number of imported checkpoints.
+        """
+        if not isinstance(source, FilesystemStorage):
+            source = FilesystemStorage(source)
+        in_place = source.workspace_dir == self._workspace_dir
+        count = 0
+        for info in source.list_checkpoints():
+            if not info.checkpoint.exists:
+                continue
+            self.ingest_checkpoint(
+                info.session_name,
+                info.timestamp,
+                source_dir=None if in_place else info.path,
+            )
+            count += 1
+        if in_place and count:
+            source.rebuild_catalog()
+        return count
+
+    def has_checkpoint(self, session_name: str, timestamp: datetime) -> bool:
+        """Check if a checkpoint exists.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        timestamp : datetime
+            The checkpoint's timestamp
+
+        Returns
+        -------
+        bool
+            True if the checkpoint exists.
+        """
+        with self._cursor() as cursor:
+            row = cursor.execute(
+                """
+                SELECT 1 FROM checkpoints WHERE session = ? AND timestamp = ?
+                """,
+                (self._session(session_name), _to_int(timestamp)),
+            ).fetchone()
+        return row is not None
+
+    def read_blob(
+        self, session_name: str, timestamp: datetime, name: str
+    ) -> Any:
+        """Read one of the stored JSON blobs of a checkpoint.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        timestamp : datetime
+            The checkpoint's timestamp
+        name : str
+            The blob to read: "state", "metadata" or "history".
+
+        Returns
+        -------
+        Any
+            The loaded data (None if not found).
+        """
+        with self._cursor() as cursor:
+            row = cursor.execute(
+                _SELECT_BLOB[name],
+                (self._session(session_name), _to_int(timestamp)),
+            ).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def get_checkpoint(
+        self, session_name: str, timestamp: datetime | None = None
+    ) -> WaldiezCheckpointInfo | None:
+        """Load a checkpoint for a session.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        timestamp: datetime
+            Optional timestamp (defaults to latest)
+
+        Returns
+        -------
+        WaldiezCheckpointInfo | None
+            The loaded checkpoint info.
+        """
+        timestamp = self._resolve(session_name, timestamp)
+        return WaldiezCheckpointInfo.from_checkpoint(
+            self._to_checkpoint(session_name, timestamp)
+        )
+
+    def load_checkpoint(
+        self, info: WaldiezCheckpointInfo, history_index: int | None
+    ) -> WaldiezCheckpoint:
+        """Load a checkpoint.
+
+        Parameters
+        ----------
+        info: WaldiezCheckpointInfo
+            The checkpoint's info.
+        history_index: int | None
+            Optional history index to use.
+
+        Returns
+        -------
+        WaldiezCheckpoint
+            The loaded checkpoint.
+        """
+        checkpoint = self._to_checkpoint(info.session_name, info.timestamp)
+        if history_index is not None:
+            checkpoint.load_state(history_index)
+        return checkpoint
+
+    def link_checkpoint(
+        self,
+        to: Path,
+        session_name: str,
+        timestamp: datetime | None = None,
+        overwrite: bool = False,
+    ) -> None:
+        """Create a symlink to a checkpoint's directory.
+
+        Parameters
+        ----------
+        to: Path
+            Where to create the symlink to.
+        session_name : str
+            The name of the session
+        timestamp : datetime | None
+            Optional specific timestamp
+        overwrite : bool
+            Overwrite existing link if needed.
+        """
+        timestamp = self._resolve(session_name, timestamp)
+        session = self._session(session_name)
+        checkpoint_path = self._checkpoint_path(session, timestamp)
+        checkpoint_path.mkdir(parents=True, exist_ok=True)
+        link_path = to / checkpoint_path.name
+        symlink(link_path, checkpoint_path, overwrite=overwrite)
+        if link_path.is_relative_to(self._workspace_dir):
+            return
+        with self._cursor(write=True) as cursor:
+            cursor.execute(
+                """
+                INSERT OR IGNORE INTO links (session, timestamp, link)
+                VALUES (?, ?, ?)
+                """,
+                (session, _to_int(timestamp), str(link_path)),
+            )
+
+    def list_checkpoints(
+        self, session_name: str | None = None
+    ) -> list[WaldiezCheckpointInfo]:
+        """List available checkpoints.
+
+        Parameters
+        ----------
+        session_name : str | None
+            Optional filter by session name
+
+        Returns
+        -------
+        list[WaldiezCheckpointInfo]
+            The checkpoints found (newest first per session).
+        """
+        with self._cursor() as cursor:
+            if session_name:
+                rows = cursor.execute(
+                    """
+                    SELECT session, timestamp FROM checkpoints
+                    WHERE session = ? ORDER BY timestamp DESC
+                    """,
+                    (self._session(session_name),),
+                ).fetchall()
+            else:
+                rows = cursor.execute(
+                    """
+                    SELECT session, timestamp FROM checkpoints
+                    ORDER BY session DESC, timestamp DESC
+                    """
+                ).fetchall()
+        return [
+            WaldiezCheckpointInfo.from_checkpoint(
+                self._to_checkpoint(
+                    session_name or row[0], _to_datetime(row[1])
+                )
+            )
+            for row in rows
+        ]
+
+    def list_sessions(self) -> list[str]:
+        """List available sessions.
+
+        Returns
+        -------
+        list[str]
+            The sessions, in reverse alphabetical order.
+        """
+        with self._cursor() as cursor:
+            rows = cursor.execute(
+                "SELECT DISTINCT session FROM checkpoints ORDER BY session DESC"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def delete_session(self, session_name: str) -> None:
+        """Delete a session and all its checkpoints.
+
+        Parameters
+        ----------
+        session_name : str
+            The session to delete.
+        """
+        session = self._session(session_name)
+        with self._cursor(write=True) as cursor:
+            links = cursor.execute(
+                "SELECT link FROM links WHERE session = ?", (session,)
+            ).fetchall()
+            cursor.execute("DELETE FROM links WHERE session = ?", (session,))
+            cursor.execute(
+                "DELETE FROM checkpoints WHERE session = ?", (session,)
+            )
+        self._remove_links(Path(row[0]) for row in links)
+        shutil.rmtree(self._workspace_dir / session, ignore_errors=True)
+
+    def delete_checkpoint(self, session_name: str, timestamp: datetime) -> None:
+        """Delete a specific checkpoint and its links.
+
+        Parameters
+        ----------
+        session_name : str
+            The name of the session
+        timestamp : datetime
+            Timestamp of the checkpoint to delete
+
+        Raises
+        ------
+        FileNotFoundError
+            If checkpoint not found
+        """
+        if not self.delete_checkpoints_batch([(session_name, timestamp)]):
+            msg = (
+                f"WaldiezCheckpoint not found for session '{session_name}' "
+                f"at {WaldiezCheckpoint.format_timestamp(timestamp)}"
+            )
+            raise FileNotFoundError(msg)
+
+    def delete_checkpoints_batch(
+        self, checkpoints: Iterable[tuple[str, datetime]]
+    ) -> int:
+        """Delete multiple checkpoints (in a single transaction).
+
+        Parameters
+        ----------
+        checkpoints : Iterable[tuple[str, datetime]]
+            List of (session_name, timestamp) tuples
+
+        Returns
+        -------
+        int
+            Number of checkpoints deleted
+        """
+        deleted: list[Path] = []
+        links: list[Path] = []
+        with self._cursor(write=True) as cursor:
+            for session_name, timestamp in checkpoints:
+                key = (self._session(session_name), _to_int(timestamp))
+                cursor.execute(
+                    """
+                    DELETE FROM checkpoints WHERE session = ? AND timestamp = ?
+                    """,
+                    key,
+                )
+                if not cursor.rowcount:
+                    continue
+                deleted.append(self._checkpoint_path(key[0], timestamp))
+                links.extend(
+                    Path(row[0])
+                    for row in cursor.execute(
+                        """
+                        SELECT link FROM links
+                        WHERE session = ? AND timestamp = ?
+                        """,
+                        key,
+                    ).fetchall()
+                )
+                cursor.execute(
+                    "DELETE FROM links WHERE session = ? AND timestamp = ?",
+                    key,
+                )
+        self._remove_links(links)
+        for checkpoint_path in deleted:
+            shutil.rmtree(checkpoint_path, ignore_errors=True)
+        return len(deleted)
+
+    def cleanup_old_checkpoints(
+        self, session_name: str, keep_count: int = 5
+    ) -> int:
+        """Clean up old checkpoints, keeping only the most recent ones.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        keep_count : int
+            Number of recent checkpoints to keep
+
+        Returns
+        -------
+        int
+            The number of deleted checkpoints.
+        """
+        with self._cursor() as cursor:
+            rows = cursor.execute(
+                """
+                SELECT timestamp FROM checkpoints WHERE session = ?
+                ORDER BY timestamp DESC LIMIT -1 OFFSET ?
+                """,
+                (self._session(session_name), max(keep_count, 0)),
+            ).fetchall()
+        return self.delete_checkpoints_batch(
+            (session_name, _to_datetime(row[0])) for row in rows
+        )
+
+    def checkpoint_sizes(
+        self, session_name: str | None = None
+    ) -> list[tuple[str, datetime, int]]:
+        """Get the sizes of the checkpoints.
+
+        A checkpoint's size is the size of its stored blobs
+        and of the run's files in its directory.
+
+        Parameters
+        ----------
+        session_name : str | None
+            Optional filter by session name
+
+        Returns
+        -------
+        list[tuple[str, datetime, int]]
+            The (session_name, timestamp, size in bytes)
+            of the checkpoints (newest first per session).
+        """
+        query = """
+            SELECT session, timestamp,
+                IFNULL(LENGTH(state), 0) + IFNULL(LENGTH(metadata), 0)
+                + IFNULL(LENGTH(history), 0)
+            FROM checkpoints WHERE ? IS NULL OR session = ?
+            ORDER BY session DESC, timestamp DESC
+            """
+        session = self._session(session_name) if session_name else None
+        with self._cursor() as cursor:
+            rows = cursor.execute(query, (session, session)).fetchall()
+        sizes: list[tuple[str, datetime, int]] = []
+        for row in rows:
+            timestamp = _to_datetime(row[1])
+            path = self._checkpoint_path(row[0], timestamp)
+            sizes.append((row[0], timestamp, row[2] + dir_size(path)))
+        return sizes
+
+    def clean_broken_symlinks(self, session_name: str | None = None) -> int:
+        """Clean up the broken (registered) links to checkpoints.
+
+        Parameters
+        ----------
+        session_name : str | None
+            If provided, clean only that session's links.
+
+        Returns
+        -------
+        int
+            The number of broken symlinks removed.
+        """
+        removed = 0
+        stale: list[tuple[str, int, str]] = []
+        for session, timestamp, link in self._links(session_name):
+            link_path = Path(link)
+            if link_path.is_symlink() and link_path.exists():
+                continue
+            if link_path.is_symlink():
+                with suppress(OSError):
+                    link_path.unlink(missing_ok=True)
+                    removed += 1
+            stale.append((session, timestamp, link))
+        self._forget_links(stale)
+        return removed
+
+    def compact_registry(self) -> int:
+        """Forget the registered links that no longer exist.
+
+        Returns
+        -------
+        int
+            Number of entries removed from registry
+        """
+        stale = [
+            entry
+            for entry in self._links(None)
+            if not Path(entry[2]).is_symlink()
+        ]
+        self._forget_links(stale)
+        return len(stale)
+
+    def verify_links(
+        self, session_name: str | None = None
+    ) -> Mapping[str, Iterable[str]]:
+        """Verify all links are valid and pointing to correct targets.
+
+        Parameters
+        ----------
+        session_name : str | None
+            If provided, verify only links for that session.
+
+        Returns
+        -------
+        Mapping[str, Iterable[str]]
+            Dictionary mapping checkpoint paths to list of issues found
+        """
+        issues: dict[str, list[str]] = {}
+        for session, timestamp, link in self._links(session_name):
+            checkpoint_path = self._checkpoint_path(
+                session, _to_datetime(timestamp)
+            )
+            link_path = Path(link)
+            issue: str | None = None
+            if not link_path.exists():
+                issue = f"Missing: {link}"
+            elif not link_path.is_symlink():
+                issue = f"Not a symlink: {link}"
+            elif link_path.resolve() != checkpoint_path:
+                issue = f"Wrong target: {link} -> {link_path.resolve()}"
+            if issue:
+                issues.setdefault(str(checkpoint_path), []).append(issue)
+        return issues
+
+    def compact(
+        self, session_name: str | None = None, compression: str | None = None
+    ) -> tuple[int, int]:
+        """Rewrite the stored blobs with a compression.
+
+        If all the sessions are compacted, the database file
+        is also vacuumed.
+
+        Parameters
+        ----------
+        session_name : str | None
+            Only compact this session's checkpoints.
+        compression : str | None
+            The compression to use (defaults to the storage's).
+
+        Returns
+        -------
+        tuple[int, int]
+            The size (in bytes) of the blobs before and after.
+        """
+        compression = (
+            self._compression
+            if compression is None
+            else get_compression(compression)
+        )
+        before = after = 0
+        with self._cursor(write=True) as cursor:
+            for info in self.list_checkpoints(session_name):
+                key = (
+                    self._session(info.session_name),
+                    _to_int(info.timestamp),
+                )
+                row = cursor.execute(
+                    """
+                    SELECT state, metadata, history FROM checkpoints
+                    WHERE session = ? AND timestamp = ?
+                    """,
+                    key,
+                ).fetchone()
+                blobs = [None if blob is None else bytes(blob) for blob in row]
+                recoded = [
+                    (
+                        None
+                        if blob is None
+                        else compress(decompress(blob), compression)
+                    )
+                    for blob in blobs
+                ]
+                before += sum(len(blob) for blob in blobs if blob)
+                after += sum(len(blob) for blob in recoded if blob)
+                cursor.execute(
+                    """
+                    UPDATE checkpoints SET state = ?, metadata = ?, history = ?
+                    WHERE session = ? AND timestamp = ?
+                    """,
+                    (*recoded, *key),
+                )
+        if session_name is None and not self._db.in_transaction:
+            with self._cursor() as cursor:
+                cursor.execute("VACUUM")
+        return before, after
+
+    def _cursor(
+        self, write: bool = False
+    ) -> AbstractContextManager[sqlite3.Cursor]:
+        """Get a cursor (in a transaction if writing).
+
+        Writes inside :meth:`transaction` join its transaction.
+        """
+        return self._db.cursor(write=write)
+
+    def _encode(self, data: Any) -> bytes:
+        """Serialize (and compress) data to store."""
+        dumped = json.dumps(data, default=str, separators=(",", ":"))
+        return compress(dumped.encode("utf-8"), self._compression)
+
+    @staticmethod
+    def _decode(blob: bytes | None) -> Any:
+        """Load stored data."""
+        if blob is None:
+            return None
+        try:
+            return json.loads(decompress(bytes(blob)))
+        except Exception:
+            return None
+
+    @staticmethod
+    def _session(session_name: str) -> str:
+        """Get the stored (and directory) name of a session."""
+        return session_dir_name(session_name)
+
+    def _checkpoint_path(self, session: str, timestamp: datetime) -> Path:
+        """Get the directory for a checkpoint's artifacts."""
+        return (
+            self._workspace_dir
+            / session
+            / WaldiezCheckpoint.format_timestamp(timestamp)
+        )
+
+    def _to_checkpoint(
+        self, session_name: str, timestamp: datetime
+    ) -> SqliteCheckpoint:
+        """Get a (lazily loaded) checkpoint."""
+        return SqliteCheckpoint(
+            session_name=session_name,
+            timestamp=timestamp,
+            path=self._checkpoint_path(self._session(session_name), timestamp),
+            storage=self,
+        )
+
+    def _resolve(
+        self, session_name: str, timestamp: datetime | None
+    ) -> datetime:
+        """Get the timestamp of an existing checkpoint (latest if None).
+
+        Raises
+        ------
+        FileNotFoundError
+            If no checkpoint is found.
+        """
+        if timestamp is not None:
+            if not self.has_checkpoint(session_name, timestamp):
+                msg = (
+                    f"WaldiezCheckpoint not found for session '{session_name}' "
+                    f"at {WaldiezCheckpoint.format_timestamp(timestamp)}"
+                )
+                raise FileNotFoundError(msg)
+            return timestamp
+        with self._cursor() as cursor:
+            row = cursor.execute(
+                "SELECT MAX(timestamp) FROM checkpoints WHERE session = ?",
+                (self._session(session_name),),
+            ).fetchone()
+        if row is None or row[0] is None:
+            raise FileNotFoundError(
+                f"No checkpoints found for session '{session_name}'"
+            )
+        return _to_datetime(row[0])
+
+    def _links(self, session_name: str | None) -> list[tuple[str, int, str]]:
+        """Get the registered (session, timestamp, link) entries."""
+        with self._cursor() as cursor:
+            if session_name:
+                rows = cursor.execute(
+                    """
+                    SELECT session, timestamp, link FROM links WHERE session = ?
+                    """,
+                    (self._session(session_name),),
+                ).fetchall()
+            else:
+                rows = cursor.execute(
+                    "SELECT session, timestamp, link FROM links"
+                ).fetchall()
+        return [(row[0], row[1], row[2]) for row in rows]
+
+    def _forget_links(self, entries: Iterable[tuple[str, int, str]]) -> None:
+        """Remove entries from the links registry."""
+        with self._cursor(write=True) as cursor:
+            cursor.executemany(
+                """
+                DELETE FROM links
+                WHERE session = ? AND timestamp = ? AND link = ?
+                """,
+                list(entries),
+            )
+
+    @staticmethod
+    def _remove_links(links: Iterable[Path]) -> None:
+        """Remove (external) links to deleted checkpoints."""
+        for link_path in links:
+            if link_path.is_symlink():
+                with suppress(OSError):
+                    link_path.unlink(missing_ok=True)
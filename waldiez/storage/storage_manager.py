@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: Apache-2.0.
 # Copyright (c) 2024 - 2025 Waldiez and contributors.
 
-# pylint: disable=too-many-public-methods
+# pylint: disable=too-many-public-methods,too-many-lines
 
 """High-level storage manager for workspace and checkpoint operations."""
 
@@ -10,19 +10,89 @@ from __future__ import annotations
 import os
 import shutil
 import sys
+import tempfile
+import time
 from collections.abc import Generator, Iterable
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from typing import Any
 
+import anyio
+import psutil
 from typing_extensions import Self
 
+from .async_storage import ThreadedAsyncStorage
 from .checkpoint import WaldiezCheckpoint, WaldiezCheckpointInfo
 from .filesystem_storage import FilesystemStorage
 from .protocol import Storage
+from .retention import RetentionPolicy, RetentionReport, apply_retention
+from .sqlite_storage import SqliteStorage
 from .utils import copy_results, get_root_dir, symlink
 
+STORAGE_BACKEND_ENV = "WALDIEZ_STORAGE_BACKEND"
+TMP_DIR = ".tmp"
+TMP_DIR_PREFIX = "wlz-"
+TMP_OWNER_FILE = ".owner"
+STALE_TMP_AGE = 86400.0
+DEFAULT_HISTORY_PAGE_SIZE = 20
+STORAGE_BACKENDS = ("filesystem", "sqlite")
+
+
+def get_backend(backend: str | None = None) -> str:
+    """Validate a storage backend (defaults to the environment's).
+
+    Parameters
+    ----------
+    backend : str | None
+        The backend to use, one of :data:`STORAGE_BACKENDS`.
+        If None, the ``WALDIEZ_STORAGE_BACKEND`` environment variable
+        is used (or "filesystem").
+
+    Returns
+    -------
+    str
+        The backend.
+
+    Raises
+    ------
+    ValueError
+        If the backend is unknown.
+    """
+    if backend is None:
+        backend = os.environ.get(STORAGE_BACKEND_ENV, "filesystem")
+    backend = backend.strip().lower() or "filesystem"
+    if backend not in STORAGE_BACKENDS:
+        msg = (
+            f"Unknown storage backend: {backend} "
+            f"(expected one of: {', '.join(STORAGE_BACKENDS)})"
+        )
+        raise ValueError(msg)
+    return backend
+
+
+def _tmp_dir_in_use(tmp_dir: Path) -> bool:
+    """Check if a run's temporary directory belongs to a running process."""
+    try:
+        pid = int((tmp_dir / TMP_OWNER_FILE).read_text().strip())
+    except (OSError, ValueError):
+        return False
+    return psutil.pid_exists(pid)
+
+
+def _newest_mtime(path: Path) -> float:
+    """Get the latest modification time of a directory or its contents."""
+    try:
+        newest = path.stat().st_mtime
+    except OSError:  # e.g. removed meanwhile
+        return time.time()
+    for root, dirs, files in os.walk(path):
+        for name in (*dirs, *files):
+            with suppress(OSError):
+                newest = max(newest, os.lstat(Path(root, name)).st_mtime)
+    return newest
+
 
 class StorageManager:
     """High-level storage manager to work with different storage backends."""
@@ -33,6 +103,8 @@ class StorageManager:
         self,
         storage: Storage | None = None,
         workspace_dir: Path | str | None = None,
+        compression: str | None = None,
+        backend: str | None = None,
     ) -> None:
         """
         Initialize the storage manager.
@@ -43,13 +115,31 @@ class StorageManager:
             The Storage backend to use (defaults to FilesystemStorage)
         workspace_dir : Path | str | None
             Workspace directory (only used if storage is None)
+        compression : str | None
+            Compression of the checkpoints' JSON files: "none", "gzip"
+            or "zstd" (only used if storage is None, defaults to the
+            ``WALDIEZ_CHECKPOINT_COMPRESSION`` environment variable).
+        backend : str | None
+            The storage backend to create: "filesystem" or "sqlite"
+            (only used if storage is None, defaults to the
+            ``WALDIEZ_STORAGE_BACKEND`` environment variable).
         """
+        # only a storage created here is closed by the manager
+        self._owns_storage = storage is None
         if storage is None:
             if workspace_dir is None:
                 workspace_dir = get_root_dir()
-            self._storage = FilesystemStorage(workspace_dir)
+            if get_backend(backend) == "sqlite":
+                self._storage = SqliteStorage(
+                    workspace_dir, compression=compression
+                )
+            else:
+                self._storage = FilesystemStorage(
+                    workspace_dir, compression=compression
+                )
         else:
             self._storage = storage
+        self._async_storage: ThreadedAsyncStorage | None = None
 
     @staticmethod
     def parse_checkpoint_arg(checkpoint_arg: str) -> tuple[str, int | None]:
@@ -127,12 +217,106 @@ class StorageManager:
         """Get the underlying storage backend."""
         return self._storage
 
+    def close(self) -> None:
+        """Close the storage backend's connections (if created here).
+
+        A storage that was passed to the manager is left open.
+        """
+        if not self._owns_storage:
+            return
+        close = getattr(self._storage, "close", None)
+        if callable(close):
+            close()
+
+    def __enter__(self) -> Self:
+        """Enter the context (closed on exit).
+
+        Returns
+        -------
+        Self
+            The manager.
+        """
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the storage backend on exit.
+
+        Parameters
+        ----------
+        *args : Any
+            The exception info (if any).
+        """
+        self.close()
+
     @property
     def workspace_dir(self) -> Path:
         """Get the workspace directory."""
         return self._storage.workspace_dir
 
-    # pylint: disable=too-many-locals,too-many-arguments
+    @property
+    def async_storage(self) -> ThreadedAsyncStorage:
+        """Get the non-blocking (async) view of the storage backend."""
+        if self._async_storage is None:
+            self._async_storage = ThreadedAsyncStorage(self._storage)
+        return self._async_storage
+
+    def make_tmp_dir(self, prefix: str = TMP_DIR_PREFIX) -> Path:
+        """Create a temporary directory for a run's artifacts.
+
+        It is created in the workspace (on the same filesystem as the
+        checkpoints), so finalizing the run renames its artifacts
+        instead of copying them. If that is not possible,
+        the system's temporary directory is used.
+
+        Parameters
+        ----------
+        prefix : str
+            The prefix of the directory's name.
+
+        Returns
+        -------
+        Path
+            The new directory (with only its owner's pid file).
+        """
+        tmp_root = self.workspace_dir / TMP_DIR
+        try:
+            tmp_root.mkdir(parents=True, exist_ok=True)
+            tmp_dir = Path(tempfile.mkdtemp(prefix=prefix, dir=tmp_root))
+        except OSError:
+            tmp_dir = Path(tempfile.mkdtemp(prefix=prefix))
+        with suppress(OSError):
+            (tmp_dir / TMP_OWNER_FILE).write_text(str(os.getpid()))
+        return tmp_dir
+
+    def clean_tmp_dirs(self, max_age: float = STALE_TMP_AGE) -> int:
+        """Remove the stale temporary directories of (interrupted) runs.
+
+        Parameters
+        ----------
+        max_age : float
+            The age (in seconds) after which a directory is stale,
+            if nothing in it changed since. The directories of runs
+            whose process is still alive are always kept.
+
+        Returns
+        -------
+        int
+            The number of removed directories.
+        """
+        tmp_root = self.workspace_dir / TMP_DIR
+        if not tmp_root.is_dir():
+            return 0
+        stale_before = time.time() - max_age
+        removed = 0
+        for path in tmp_root.glob(f"{TMP_DIR_PREFIX}*"):
+            if not path.is_dir() or _tmp_dir_in_use(path):
+                continue
+            if _newest_mtime(path) < stale_before:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        return removed
+
+    # pylint: disable=too-many-locals,too-many-arguments,too-complex
     def finalize(
         self,
         session_name: str,
@@ -151,7 +335,7 @@ class StorageManager:
         ),
         ignore_names: Iterable[str] = (".cache", ".env"),
     ) -> tuple[Path, Path]:
-        """Copy a run's temporary artifacts into a new checkpoint.
+        """Move (or copy) a run's temporary artifacts into a new checkpoint.
 
         Parameters
         ----------
@@ -172,7 +356,9 @@ class StorageManager:
             Whether to update a `latest` link under link_root/session_name.
             Defaults to True.
         keep_tmp : bool
-            If False, delete the tmp_dir after copying. Defaults to False.
+            If False, move the artifacts (a rename if tmp_dir is on the
+            workspace's filesystem) and delete the tmp_dir.
+            Defaults to False.
         copy_into_subdir : str | None
             If set, copy artifacts into
             checkpoint/<copy_into_subdir> instead of the root.
@@ -213,13 +399,22 @@ class StorageManager:
             else checkpoint_path
         )
         target_dir.mkdir(parents=True, exist_ok=True)
-        copy_results(
+        filesystem = (
+            self._storage
+            if isinstance(self._storage, FilesystemStorage)
+            else None
+        )
+        # identical files (across runs) are stored once and hard-linked
+        blobs = copy_results(
             temp_dir=tmp_dir,
             output_file=output_file,
             destination_dir=target_dir,
             promote_to_output=promote_to_output,
-            ignore_names=ignore_names,
+            ignore_names={*ignore_names, TMP_OWNER_FILE},
+            blob_store=filesystem.blob_store if filesystem else None,
+            move=not keep_tmp,
         )
+        self._store_results(session_name, timestamp, checkpoint_path, blobs)
         if link_root is None:
             link_root = Path.cwd() / "waldiez_out"
 
@@ -255,6 +450,57 @@ class StorageManager:
 
         return checkpoint_path, public_link_path
 
+    def _store_results(
+        self,
+        session_name: str,
+        timestamp: datetime,
+        checkpoint_path: Path,
+        blobs: list[tuple[str, int]],
+    ) -> None:
+        """Update the storage after copying a run's results into it."""
+        if isinstance(self._storage, FilesystemStorage):
+            # the copied results change the checkpoint's size (and metadata)
+            self._storage.compress_checkpoint(checkpoint_path)
+            self._storage.index_checkpoint(session_name, timestamp, blobs=blobs)
+        elif isinstance(self._storage, SqliteStorage):
+            # the run's state and history go into the database
+            self._storage.ingest_checkpoint(session_name, timestamp)
+
+    async def a_finalize(
+        self,
+        session_name: str,
+        output_file: Path,
+        tmp_dir: Path,
+        **kwargs: Any,
+    ) -> tuple[Path, Path]:
+        """Copy a run's artifacts into a new checkpoint without blocking.
+
+        Parameters
+        ----------
+        session_name : str
+            The session (flow) name.
+        output_file : Path
+            The run's output file.
+        tmp_dir : Path
+            The directory of the run's artifacts.
+        **kwargs : Any
+            The keyword arguments of :meth:`finalize`.
+
+        Returns
+        -------
+        tuple[Path, Path]
+            The checkpoint's path and its public link.
+        """
+        return await self.async_storage.run_sync(
+            partial(
+                self.finalize,
+                session_name,
+                output_file,
+                tmp_dir,
+                **kwargs,
+            )
+        )
+
     def save(
         self,
         session_name: str,
@@ -304,6 +550,29 @@ class StorageManager:
             session_name=session_name, timestamp=timestamp
         )
 
+    async def a_get(
+        self, session_name: str, timestamp: datetime | None = None
+    ) -> WaldiezCheckpointInfo | None:
+        """Get a checkpoint (latest by default) without blocking.
+
+        The checkpoint's state and metadata are loaded too.
+
+        Parameters
+        ----------
+        session_name : str
+            The name of the session
+        timestamp : datetime | None
+            Optional specific timestamp
+
+        Returns
+        -------
+        WaldiezCheckpointInfo | None
+            The checkpoint's info if found.
+        """
+        return await self.async_storage.get_checkpoint(
+            session_name=session_name, timestamp=timestamp
+        )
+
     def update(
         self,
         session_name: str,
@@ -324,14 +593,9 @@ class StorageManager:
         metadata : dict[str, Any]
             Optional new metadata to set.
         """
-        if isinstance(checkpoint, str):
-            # maybe a full
-            dir_name = Path(checkpoint).name
-            checkpoint_dt = WaldiezCheckpoint.parse_timestamp(dir_name)
-            if not checkpoint_dt:
-                return
-        else:
-            checkpoint_dt = checkpoint
+        checkpoint_dt = self._checkpoint_timestamp(checkpoint)
+        if not checkpoint_dt:
+            return
         self._storage.save_checkpoint(
             session_name=session_name,
             state=state,
@@ -339,6 +603,44 @@ class StorageManager:
             timestamp=checkpoint_dt,
         )
 
+    async def a_update(
+        self,
+        session_name: str,
+        checkpoint: str | datetime,
+        state: dict[str, Any],
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Update a checkpoint without blocking the event loop.
+
+        Parameters
+        ----------
+        session_name : str
+            The name of the session
+        checkpoint : str | datetime
+            Specific timestamp for checkpoint.
+        state : dict[str, Any]
+            The new state to set.
+        metadata : dict[str, Any]
+            Optional new metadata to set.
+        """
+        checkpoint_dt = self._checkpoint_timestamp(checkpoint)
+        if not checkpoint_dt:
+            return
+        await self.async_storage.save_checkpoint(
+            session_name=session_name,
+            state=state,
+            metadata=metadata,
+            timestamp=checkpoint_dt,
+        )
+
+    @staticmethod
+    def _checkpoint_timestamp(checkpoint: str | datetime) -> datetime | None:
+        if isinstance(checkpoint, str):
+            # maybe a full path
+            dir_name = Path(checkpoint).name
+            return WaldiezCheckpoint.parse_timestamp(dir_name)
+        return checkpoint
+
     def load(
         self,
         info: WaldiezCheckpointInfo,
@@ -440,6 +742,157 @@ class StorageManager:
                 ] = checkpoint_history
         return entries
 
+    async def a_history(
+        self, session_name: str, checkpoint_name: str | None = None
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Get a session's checkpoints' history without blocking.
+
+        The checkpoints' histories are loaded concurrently
+        (bounded by the async storage's threads).
+
+        Parameters
+        ----------
+        session_name : str
+            The session to use.
+        checkpoint_name : str | None
+            Optional checkpoint/folder name to use
+
+        Returns
+        -------
+        dict[str, list[dict[str, Any]]]
+            Each checkpoint's history.
+        """
+        storage = self.async_storage
+        if checkpoint_name:
+            checkpoint_dt = WaldiezCheckpoint.parse_timestamp(checkpoint_name)
+            checkpoint_info = await storage.get_checkpoint(
+                session_name=session_name, timestamp=checkpoint_dt
+            )
+            if not checkpoint_info:
+                return {"history": []}
+            return {"history": await storage.load_history(checkpoint_info)}
+        infos = await storage.list_checkpoints(session_name=session_name)
+        histories: list[list[dict[str, Any]]] = [[] for _ in infos]
+
+        async def _load(index: int) -> None:
+            histories[index] = await storage.load_history(infos[index])
+
+        async with anyio.create_task_group() as task_group:
+            for index in range(len(infos)):
+                task_group.start_soon(_load, index)
+        return {
+            WaldiezCheckpoint.format_timestamp(info.timestamp): history
+            for info, history in zip(infos, histories, strict=True)
+            if history
+        }
+
+    def history_page(
+        self,
+        session_name: str,
+        checkpoint_name: str | None = None,
+        offset: int = 0,
+        limit: int | None = DEFAULT_HISTORY_PAGE_SIZE,
+    ) -> dict[str, dict[str, Any]]:
+        """Get a page of a session's checkpoints' history.
+
+        Only the requested entries are decoded. The number of entries
+        and their timestamps come from the history's offset index.
+
+        Parameters
+        ----------
+        session_name : str
+            The session to use.
+        checkpoint_name : str | None
+            Optional checkpoint/folder name to use
+        offset : int
+            The index of the first entry (of each checkpoint).
+        limit : int | None
+            The maximum number of entries (of each checkpoint),
+            0 for only the number of entries and their timestamps.
+
+        Returns
+        -------
+        dict[str, dict[str, Any]]
+            Each checkpoint's page: its ``total`` number of entries,
+            their ``timestamps``, the ``offset`` and the ``history``.
+        """
+        if checkpoint_name:
+            checkpoint_dt = WaldiezCheckpoint.parse_timestamp(checkpoint_name)
+            infos = [
+                self._storage.get_checkpoint(
+                    session_name=session_name, timestamp=checkpoint_dt
+                )
+            ]
+        else:
+            infos = list(self._storage.list_checkpoints(session_name))
+        return {
+            info.id: self._history_page(info.checkpoint, offset, limit)
+            for info in infos
+            if info is not None
+        }
+
+    async def a_history_page(
+        self,
+        session_name: str,
+        checkpoint_name: str | None = None,
+        offset: int = 0,
+        limit: int | None = DEFAULT_HISTORY_PAGE_SIZE,
+    ) -> dict[str, dict[str, Any]]:
+        """Get a page of a session's checkpoints' history without blocking.
+
+        Parameters
+        ----------
+        session_name : str
+            The session to use.
+        checkpoint_name : str | None
+            Optional checkpoint/folder name to use
+        offset : int
+            The index of the first entry (of each checkpoint).
+        limit : int | None
+            The maximum number of entries (of each checkpoint),
+            0 for only the number of entries and their timestamps.
+
+        Returns
+        -------
+        dict[str, dict[str, Any]]
+            Each checkpoint's page.
+        """
+        storage = self.async_storage
+        if checkpoint_name:
+            checkpoint_dt = WaldiezCheckpoint.parse_timestamp(checkpoint_name)
+            info = await storage.get_checkpoint(
+                session_name=session_name, timestamp=checkpoint_dt
+            )
+            infos = [info] if info is not None else []
+        else:
+            infos = await storage.list_checkpoints(session_name=session_name)
+        pages: list[dict[str, Any]] = [{} for _ in infos]
+
+        async def _load(index: int) -> None:
+            pages[index] = await storage.run_sync(
+                self._history_page, infos[index].checkpoint, offset, limit
+            )
+
+        async with anyio.create_task_group() as task_group:
+            for index in range(len(infos)):
+                task_group.start_soon(_load, index)
+        return {info.id: page for info, page in zip(infos, pages, strict=True)}
+
+    @staticmethod
+    def _history_page(
+        checkpoint: WaldiezCheckpoint, offset: int, limit: int | None
+    ) -> dict[str, Any]:
+        """Get a page of a checkpoint's history."""
+        timestamps = checkpoint.history_timestamps()
+        return {
+            "total": len(timestamps),
+            "offset": offset,
+            "timestamps": timestamps,
+            "history": (
+                checkpoint.history_page(offset, limit) if limit != 0 else []
+            ),
+        }
+
     def sessions(self) -> list[str]:
         """List available sessions.
 
@@ -472,6 +925,20 @@ class StorageManager:
             session_name=session_name, timestamp=timestamp
         )
 
+    async def a_delete(self, session_name: str, timestamp: datetime) -> None:
+        """Delete a specific checkpoint without blocking the event loop.
+
+        Parameters
+        ----------
+        session_name : str
+            Name of the session
+        timestamp : datetime
+            Timestamp of the checkpoint
+        """
+        await self.async_storage.delete_checkpoint(
+            session_name=session_name, timestamp=timestamp
+        )
+
     def cleanup(self, session_name: str, keep_count: int = 5) -> int:
         """
         Clean up old checkpoints.
@@ -492,6 +959,59 @@ class StorageManager:
             session_name=session_name, keep_count=keep_count
         )
 
+    def apply_retention(
+        self, policy: RetentionPolicy, dry_run: bool = False
+    ) -> RetentionReport:
+        """
+        Remove the checkpoints a retention policy does not keep.
+
+        The checkpoints to remove (of all the sessions) are
+        computed at once and deleted in a single batch.
+        Unless it is a dry run, the stale temporary directories
+        of interrupted runs are also removed.
+
+        Parameters
+        ----------
+        policy : RetentionPolicy
+            The policy to enforce.
+        dry_run : bool
+            Only report the checkpoints that would be removed.
+
+        Returns
+        -------
+        RetentionReport
+            The expired (and deleted) checkpoints.
+        """
+        report = apply_retention(self._storage, policy, dry_run=dry_run)
+        if not dry_run:
+            self.clean_tmp_dirs()
+        return report
+
+    async def a_apply_retention(
+        self, policy: RetentionPolicy, dry_run: bool = False
+    ) -> RetentionReport:
+        """
+        Enforce a retention policy without blocking the event loop.
+
+        Parameters
+        ----------
+        policy : RetentionPolicy
+            The policy to enforce.
+        dry_run : bool
+            Only report the checkpoints that would be removed.
+
+        Returns
+        -------
+        RetentionReport
+            The expired (and deleted) checkpoints.
+        """
+        report = await self.async_storage.run_sync(
+            partial(apply_retention, self._storage, policy, dry_run=dry_run)
+        )
+        if not dry_run:
+            await self.async_storage.run_sync(self.clean_tmp_dirs)
+        return report
+
     def clean_broken_symlinks(self, session_name: str | None = None) -> int:
         """
         Clean up broken symlinks.
@@ -512,6 +1032,62 @@ class StorageManager:
             return self._storage.clean_broken_symlinks(session_name)
         return 0
 
+    def rebuild_catalog(self) -> int:
+        """
+        Rebuild the checkpoints catalog from the workspace's directories.
+
+        Returns
+        -------
+        int
+            Number of checkpoints found.
+        """
+        # Only FilesystemStorage has a catalog currently
+        if isinstance(self._storage, FilesystemStorage):
+            return self._storage.rebuild_catalog()
+        return 0
+
+    def compact(
+        self, session_name: str | None = None, compression: str | None = None
+    ) -> tuple[int, int]:
+        """
+        Compress the checkpoints' files and compact their history.
+
+        Parameters
+        ----------
+        session_name : str | None
+            Only compact this session's checkpoints.
+        compression : str | None
+            The compression to use (defaults to the storage's).
+
+        Returns
+        -------
+        tuple[int, int]
+            The size (in bytes) of the checkpoints' files before and after.
+        """
+        if isinstance(self._storage, (FilesystemStorage, SqliteStorage)):
+            return self._storage.compact(session_name, compression=compression)
+        return 0, 0
+
+    def migrate(self, source_dir: Path | str | None = None) -> int:
+        """
+        Import the checkpoints of a filesystem workspace into SQLite storage.
+
+        Parameters
+        ----------
+        source_dir : Path | str | None
+            The filesystem workspace (defaults to this workspace,
+            migrating its checkpoints in place).
+
+        Returns
+        -------
+        int
+            The number of imported checkpoints
+            (0 if the storage is not SQLite storage).
+        """
+        if not isinstance(self._storage, SqliteStorage):
+            return 0
+        return self._storage.migrate_from(source_dir or self.workspace_dir)
+
     @contextmanager
     def transaction(self) -> Generator[Self, None, None]:
         """
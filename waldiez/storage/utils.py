@@ -4,6 +4,7 @@
 """Utility functions for storage operations."""
 
 import builtins
+import errno
 import getpass
 import os
 import platform
@@ -13,8 +14,16 @@ import stat
 import subprocess
 import sys
 from collections.abc import Iterable
+from contextlib import suppress
 from functools import lru_cache
 from pathlib import Path
+from typing import Any
+
+from .blobs import BlobStore
+
+_SAFE_SESSION = re.compile(
+    r"^(?!.*\.\.)(?!\.)(?!.*\.$)[\w\-.]{1,128}$", re.UNICODE
+)
 
 
 def symlink(
@@ -230,6 +239,56 @@ def safe_name(
     return safe or fallback
 
 
+def session_dir_name(session_name: str) -> str:
+    """Get the (directory) name that a session is stored as.
+
+    Every storage backend uses it, so a session has the same name
+    (and artifacts directory) whatever the backend.
+
+    Parameters
+    ----------
+    session_name : str
+        The session's name.
+
+    Returns
+    -------
+    str
+        The session's safe name.
+
+    Raises
+    ------
+    ValueError
+        If the name is not valid (e.g. too long).
+    """
+    name = safe_name(session_name)
+    if not _SAFE_SESSION.match(name):
+        raise ValueError("Invalid session_name")
+    return name
+
+
+def dir_size(path: Path) -> int:
+    """Get the total size of the files in a directory.
+
+    Symlinks are not followed (their own size is counted).
+
+    Parameters
+    ----------
+    path : Path
+        The directory.
+
+    Returns
+    -------
+    int
+        The size in bytes (0 if the directory does not exist).
+    """
+    size = 0
+    for root, _, files in os.walk(path):
+        for file in files:
+            with suppress(OSError):
+                size += os.lstat(os.path.join(root, file)).st_size
+    return size
+
+
 def _is_windows_junction(p: Path) -> bool:
     """Heuristically detect a Windows directory junction."""
     if platform.system() != "Windows":
@@ -298,9 +357,35 @@ def _pre_link(
     return True
 
 
+def move_path(source: Path, destination: Path) -> None:
+    """Move a file or a directory, renaming it if possible.
+
+    Across devices, the source is copied and then removed.
+
+    Parameters
+    ----------
+    source : Path
+        The file or directory to move.
+    destination : Path
+        The new path (an existing file is replaced,
+        an existing directory must be empty).
+
+    Raises
+    ------
+    OSError
+        If the source cannot be moved.
+    """
+    try:
+        os.replace(source, destination)
+    except OSError as error:
+        if error.errno != errno.EXDEV:
+            raise
+        shutil.move(str(source), str(destination))
+
+
 # pylint: disable=too-complex
 # noinspection TryExceptPass,PyBroadException
-def copy_results(
+def copy_results(  # noqa: C901
     temp_dir: Path,
     output_file: Path,
     destination_dir: Path,
@@ -310,9 +395,14 @@ def copy_results(
         "reasoning_tree.json",
     ),
     ignore_names: Iterable[str] = (".cache", ".env"),
-) -> None:
+    blob_store: BlobStore | None = None,
+    move: bool = False,
+) -> list[tuple[str, int]]:
     """Copy the results to the output directory, merge-safe.
 
+    With a blob store, the (shareable) files are stored once and linked
+    into the destination instead of being copied.
+
     Parameters
     ----------
     temp_dir : Path
@@ -326,18 +416,51 @@ def copy_results(
         File names (exact matches) to also copy into output_dir.
     ignore_names : Iterable[str]
         Directory/file names to skip entirely.
+    blob_store : BlobStore | None
+        Optional store to share identical files between destinations.
+    move : bool
+        Move the files (into the blob store, if any) instead of copying
+        them, renaming whole directories when possible
+        (temp_dir is not needed afterwards).
+
+    Returns
+    -------
+    list[tuple[str, int]]
+        The (digest, size) of each file that is linked to a blob.
     """
     # pylint: disable=broad-exception-caught
     temp_dir.mkdir(parents=True, exist_ok=True)
     destination_dir.mkdir(parents=True, exist_ok=True)
+    blobs: list[tuple[str, int]] = []
+
+    def _copy(src: Any, dst: Any) -> Any:
+        """Copy a file (through the blob store, if any)."""
+        if blob_store is None:
+            if move:
+                move_path(Path(src), Path(dst))
+                return dst
+            return shutil.copy2(src, dst)
+        size = os.path.getsize(src)
+        digest = blob_store.store(Path(src), Path(dst), move=move)
+        if digest is not None:
+            blobs.append((digest, size))
+        return dst
 
     output_dir = output_file.parent
+    # the generated source goes next to the output (not in the destination)
+    output_source = _copy_output_file(
+        src_root=temp_dir,
+        output_file_path=output_file,
+        destination_dir=destination_dir,
+        output_dir=output_dir,
+    )
     for item in temp_dir.iterdir():
         # skip cache files / dirs
         if (
             item.name == "__pycache__"
             or item.suffix in (".pyc", ".pyo", ".pyd")
             or item.name in ignore_names
+            or item.name == output_source
         ):
             continue
 
@@ -348,22 +471,30 @@ def copy_results(
                 except Exception:
                     pass
             try:
-                shutil.copy2(item, destination_dir / item.name)
+                _copy(item, destination_dir / item.name)
+            except Exception:
+                pass
+        elif (
+            move
+            and blob_store is None
+            and not (destination_dir / item.name).exists()
+        ):
+            try:
+                # a single rename instead of copying the whole tree
+                move_path(item, destination_dir / item.name)
             except Exception:
                 pass
         else:
             try:
                 shutil.copytree(
-                    item, destination_dir / item.name, dirs_exist_ok=True
+                    item,
+                    destination_dir / item.name,
+                    dirs_exist_ok=True,
+                    copy_function=_copy,
                 )
             except Exception:
                 pass
-    _copy_output_file(
-        src_root=temp_dir,
-        output_file_path=output_file,
-        destination_dir=destination_dir,
-        output_dir=output_dir,
-    )
+    return blobs
 
 
 def _copy_output_file(
@@ -372,8 +503,11 @@ def _copy_output_file(
     output_file_path: Path,
     destination_dir: Path,
     output_dir: Path,
-) -> None:
-    """Place the generated source (.py) next to outputs (and avoid dupes)."""
+) -> str | None:
+    """Place the generated source (.py) next to outputs (and avoid dupes).
+
+    Returns the name of the placed file (if any).
+    """
     if output_file_path.is_file():
         out_path = (
             output_file_path.with_suffix(".py")
@@ -390,3 +524,5 @@ def _copy_output_file(
                 shutil.copyfile(src, output_dir / out_path.name)
             except BaseException:  # pylint: disable=broad-exception-caught
                 pass
+            return out_path.name
+    return None
@@ -9,13 +9,12 @@
 import json
 from typing import Any, Callable
 
-import anyio.to_thread
-
 from waldiez.storage import (
     StorageManager,
     WaldiezCheckpoint,
     WaldiezCheckpointInfo,
 )
+from waldiez.storage.storage_manager import DEFAULT_HISTORY_PAGE_SIZE
 
 from .models import (
     DeleteCheckpointRequest,
@@ -57,48 +56,11 @@ class CheckpointsHandler:
         Returns
         -------
         dict[str, Any]
-            The flow's checkpoints.
-        """
-        return await anyio.to_thread.run_sync(self._handle_get_checkpoints, msg)
-
-    async def handle_save_checkpoint(
-        self, msg: SetCheckpointRequest
-    ) -> dict[str, Any]:
-        """Handle saving a checkpoint.
-
-        Parameters
-        ----------
-        msg : SetCheckpointRequest
-            The save request.
-
-        Returns
-        -------
-        dict[str, Any]
-            The updated checkpoint.
-        """
-        return await anyio.to_thread.run_sync(self._handle_save_checkpoint, msg)
-
-    async def handle_delete_checkpoint(
-        self, msg: DeleteCheckpointRequest
-    ) -> dict[str, Any]:
-        """Handle deleting a checkpoint.
-
-        Parameters
-        ----------
-        msg : DeleteCheckpointRequest
-
-        Returns
-        -------
-        dict[str, Any]
-            The result of the action.
+            The flow's checkpoints. If the payload has an ``offset``
+            or a ``limit`` (and optionally a ``checkpoint``), a page of
+            each checkpoint's history with its total number of entries
+            and their timestamps.
         """
-        return await anyio.to_thread.run_sync(
-            self._handle_delete_checkpoint, msg
-        )
-
-    def _handle_get_checkpoints(
-        self, msg: GetCheckpointsRequest
-    ) -> dict[str, Any]:
         flow_name = ""
         if isinstance(msg.payload, str):
             flow_name = msg.payload
@@ -111,23 +73,47 @@ class CheckpointsHandler:
                 ValueError("Invalid flow name"),
                 msg.request_id,
             )
-        checkpoints = self.storage_manager.history(flow_name)
+        page = _get_page(msg.payload)
+        if page is not None:
+            # paginated: only the requested entries are decoded
+            checkpoints: dict[str, Any] = (
+                await self.storage_manager.a_history_page(
+                    flow_name,
+                    checkpoint_name=page[0],
+                    offset=page[1],
+                    limit=page[2],
+                )
+            )
+        else:
+            checkpoints = await self.storage_manager.a_history(flow_name)
         response = GetCheckpointsResponse(
             checkpoints=checkpoints, request_id=msg.request_id
         ).model_dump(mode="json")
         response["payload"] = response["checkpoints"]
         return response
 
-    def _handle_save_checkpoint(
+    async def handle_save_checkpoint(
         self, msg: SetCheckpointRequest
     ) -> dict[str, Any]:
+        """Handle saving a checkpoint.
+
+        Parameters
+        ----------
+        msg : SetCheckpointRequest
+            The save request.
+
+        Returns
+        -------
+        dict[str, Any]
+            The updated checkpoint.
+        """
         payload_dict = _get_payload_dict(msg.payload)
         if not payload_dict:
             return self._error_to_response(
                 ValueError("Invalid request"),
                 msg.request_id,
             )
-        checkpoint_info = _get_checkpoint_info(
+        checkpoint_info = await _get_checkpoint_info(
             payload_dict, self.storage_manager
         )
         if not checkpoint_info:
@@ -143,10 +129,10 @@ class CheckpointsHandler:
                 ValueError("Invalid request"),
                 msg.request_id,
             )
-        self.storage_manager.update(
+        await self.storage_manager.a_update(
             checkpoint_info.session_name, checkpoint_info.timestamp, new_state
         )
-        updated_cp = self.storage_manager.get(
+        updated_cp = await self.storage_manager.a_get(
             checkpoint_info.session_name, checkpoint_info.timestamp
         )
         if not updated_cp:  # pragma: no cover
@@ -160,16 +146,27 @@ class CheckpointsHandler:
         response["payload"] = response["checkpoint"]
         return response
 
-    def _handle_delete_checkpoint(
+    async def handle_delete_checkpoint(
         self, msg: DeleteCheckpointRequest
     ) -> dict[str, Any]:
+        """Handle deleting a checkpoint.
+
+        Parameters
+        ----------
+        msg : DeleteCheckpointRequest
+
+        Returns
+        -------
+        dict[str, Any]
+            The result of the action.
+        """
         payload_dict = _get_payload_dict(msg.payload)
         if not payload_dict:
             return self._error_to_response(
                 ValueError("Invalid request"),
                 msg.request_id,
             )
-        checkpoint_info = _get_checkpoint_info(
+        checkpoint_info = await _get_checkpoint_info(
             payload_dict, self.storage_manager
         )
         if not checkpoint_info:
@@ -177,7 +174,7 @@ class CheckpointsHandler:
                 ValueError("Invalid request"),
                 msg.request_id,
             )
-        self.storage_manager.delete(
+        await self.storage_manager.a_delete(
             session_name=checkpoint_info.session_name,
             timestamp=checkpoint_info.timestamp,
         )
@@ -204,8 +201,26 @@ def _get_payload_dict(payload: Any) -> dict[str, Any]:
     return payload_dict
 
 
+def _get_page(payload: Any) -> tuple[str | None, int, int] | None:
+    """Get the (checkpoint, offset, limit) of a paginated request."""
+    if not isinstance(payload, dict):
+        return None
+    if "offset" not in payload and "limit" not in payload:
+        return None
+    try:
+        offset = max(int(payload.get("offset", 0)), 0)
+        limit = max(int(payload.get("limit", DEFAULT_HISTORY_PAGE_SIZE)), 0)
+    except (TypeError, ValueError):
+        offset, limit = 0, DEFAULT_HISTORY_PAGE_SIZE
+    checkpoint = payload.get("checkpoint")
+    if not isinstance(checkpoint, str) or not checkpoint:
+        # all the checkpoints ("latest" is resolved by the storage)
+        checkpoint = None
+    return checkpoint, offset, limit
+
+
 # noinspection PyBroadException,PyUnusedLocal
-def _get_checkpoint_info(
+async def _get_checkpoint_info(
     payload_dict: dict[str, Any],
     storage_manager: StorageManager,
 ) -> WaldiezCheckpointInfo | None:
@@ -225,12 +240,13 @@ def _get_checkpoint_info(
     else:
         cp_ts_str = checkpoint
     if cp_ts_str == "latest":
-        cp_info = storage_manager.get_latest_checkpoint(flow_name)
+        # no timestamp: the latest one
+        cp_info = await storage_manager.a_get(flow_name)
     else:
         cp_ts = WaldiezCheckpoint.parse_timestamp(cp_ts_str)
         if not cp_ts:
             return None
-        cp_info = storage_manager.get(flow_name, cp_ts)
+        cp_info = await storage_manager.a_get(flow_name, cp_ts)
     if not cp_info:
         return None
     return cp_info
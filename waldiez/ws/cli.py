@@ -2,6 +2,7 @@
 # Copyright (c) 2024 - 2025 Waldiez and contributors.
 
 # pylint: disable=too-many-locals,unused-import,invalid-name
+# pylint: disable=too-many-arguments,too-many-positional-arguments
 # pylint: disable=missing-function-docstring, missing-param-doc
 # pyright: reportUnusedImport=false,reportConstantRedefinition=false
 # pyright: reportUnusedParameter=false, reportCallInDefaultInitializer=false
@@ -19,6 +20,12 @@ from typing import Annotated, Any
 
 import typer
 
+from waldiez.storage.retention import (
+    RetentionPolicy,
+    parse_duration,
+    parse_size,
+)
+
 HAS_WATCHDOG = False
 try:
     from .reloader import FileWatcher  # noqa: F401
@@ -96,6 +103,30 @@ def _get_ws_port() -> int:
         return DEFAULT_WS_PORT
 
 
+def _retention_policy(
+    keep_checkpoints: int | None,
+    max_checkpoint_age: str | None,
+    max_checkpoints_size: str | None,
+) -> RetentionPolicy:
+    try:
+        return RetentionPolicy(
+            max_checkpoints=keep_checkpoints,
+            max_age=(
+                parse_duration(max_checkpoint_age)
+                if max_checkpoint_age
+                else None
+            ),
+            max_total_bytes=(
+                parse_size(max_checkpoints_size)
+                if max_checkpoints_size
+                else None
+            ),
+        )
+    except ValueError as e:
+        typer.echo(f"Invalid checkpoint retention: {e}")
+        sys.exit(1)
+
+
 # noinspection PyBroadException
 @app.command()
 def serve(
@@ -165,6 +196,47 @@ def serve(
     max_size: Annotated[
         int, typer.Option("--max-size", help="Maximum message size in bytes")
     ] = 8388608,
+    workers: Annotated[
+        int,
+        typer.Option(
+            "--workers",
+            help=(
+                "Number of warm worker processes to run the flows in "
+                "(0 to start a new process for each run)"
+            ),
+        ),
+    ] = 0,
+    keep_checkpoints: Annotated[
+        int | None,
+        typer.Option(
+            "--keep-checkpoints",
+            help="Keep at most this many checkpoints per session",
+        ),
+    ] = None,
+    max_checkpoint_age: Annotated[
+        str | None,
+        typer.Option(
+            "--max-checkpoint-age",
+            help="Remove checkpoints older than this (e.g. '12h', '7d')",
+        ),
+    ] = None,
+    max_checkpoints_size: Annotated[
+        str | None,
+        typer.Option(
+            "--max-checkpoints-size",
+            help=(
+                "Remove the oldest checkpoints when all of them "
+                "exceed this size (e.g. '500MB', '2GB')"
+            ),
+        ),
+    ] = None,
+    gc_interval: Annotated[
+        float,
+        typer.Option(
+            "--gc-interval",
+            help="Interval in seconds between checkpoint garbage collections",
+        ),
+    ] = 3600.0,
     verbose: Annotated[
         bool, typer.Option("--verbose", "-v", help="Enable verbose logging")
     ] = False,
@@ -189,6 +261,10 @@ def serve(
             typer.echo(f"Invalid regex pattern in allowed origins: {e}")
             sys.exit(1)
 
+    retention_policy = _retention_policy(
+        keep_checkpoints, max_checkpoint_age, max_checkpoints_size
+    )
+
     # Server configuration
     server_config: dict[str, Any] = {
         "max_clients": max_clients,
@@ -196,6 +272,9 @@ def serve(
         "ping_interval": ping_interval,
         "ping_timeout": ping_timeout,
         "max_size": max_size,
+        "worker_pool_size": workers,
+        "retention_policy": retention_policy,
+        "gc_interval": gc_interval,
     }
     if not HAS_WATCHDOG and auto_reload:
         msg = (
@@ -212,6 +291,8 @@ def serve(
     logger.info("  Allowed origins: %s", allowed_origins or ["*"])
     logger.info("  Auto-reload: %s", auto_reload)
     logger.info("  Workspace directory: %s", workspace_dir)
+    logger.info("  Warm workers: %d", workers)
+    logger.info("  Checkpoint retention: %s", retention_policy)
 
     if watch_dirs:
         logger.info("  Watch directories: %s", watch_dirs)
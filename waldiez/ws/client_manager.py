@@ -17,7 +17,7 @@ import json
 import logging
 import time
 from pathlib import Path
-from typing import Any, Callable, Literal
+from typing import TYPE_CHECKING, Any, Callable, Literal
 
 try:
     import websockets  # type: ignore[unused-ignore, unused-import, import-not-found, import-untyped] # noqa
@@ -27,6 +27,7 @@ except ImportError:  # pragma: no cover
 
 from waldiez.models import Waldiez
 from waldiez.running.subprocess_runner.runner import WaldiezSubprocessRunner
+from waldiez.running.subprocess_runner.worker_pool import WorkerPool
 from waldiez.storage import StorageManager
 
 from ._file_handler import FileRequestHandler
@@ -67,10 +68,14 @@ from .models import (
     WorkflowStatus,
     WorkflowStatusNotification,
     create_error_response,
+    load_message,
     parse_client_message,
 )
 from .session_manager import SessionManager
 
+if TYPE_CHECKING:
+    from waldiez.io.codec import PayloadCodec
+
 CWD = Path.cwd()
 
 
@@ -85,16 +90,20 @@ class ClientManager:
         session_manager: SessionManager,
         workspace_dir: Path = CWD,
         error_handler: ErrorHandler | None = None,
+        worker_pool: WorkerPool | None = None,
     ) -> None:
         self.websocket = websocket
         self.client_id = client_id
         self.session_manager = session_manager
         self.workspace_dir = workspace_dir
+        self.worker_pool = worker_pool
         self.storage_manager = StorageManager()
         self.checkpoints_handler = CheckpointsHandler(
             self.storage_manager, self._error_to_response
         )
         self.is_active = True
+        # plain JSON, until the client sends a message with another codec
+        self.codec: "PayloadCodec | None" = None
 
         # Active runners per session
         self._runners: dict[str, WaldiezSubprocessRunner] = {}
@@ -156,7 +165,9 @@ class ClientManager:
                 data = payload
             else:
                 data = json.loads(json.dumps(payload, default=str))
-            await self.websocket.send(json.dumps(data))
+            await self.websocket.send(
+                self.codec.dumps(data) if self.codec else json.dumps(data)
+            )
             return True
         except (
             websockets.ConnectionClosed,
@@ -191,6 +202,7 @@ class ClientManager:
         self._runners.clear()
         self._pending_input.clear()
         self._last_prompt.clear()
+        self.storage_manager.close()
         self.close_connection()
 
     # ---------------------------------------------------------------------
@@ -261,6 +273,29 @@ class ClientManager:
     # ---------------------------------------------------------------------
 
     # pylint: disable=too-many-branches
+    def _negotiate_codec(self, raw_message: str) -> None:
+        """Reply with the codec of the client's (enveloped) messages.
+
+        Parameters
+        ----------
+        raw_message : str
+            The raw message received from the client.
+        """
+        if not raw_message.lstrip().startswith('{"codec"'):
+            return
+        # pylint: disable=import-outside-toplevel
+        from waldiez.io.codec import envelope_codec, get_codec
+
+        name = envelope_codec(raw_message)
+        if name is None:
+            return
+        try:
+            self.codec = get_codec(name)
+        except ValueError as e:
+            self.logger.warning(
+                "Client %s codec %s not supported: %s", self.client_id, name, e
+            )
+
     async def handle_message(self, raw_message: str) -> dict[str, Any] | None:
         """Parse & dispatch an inbound client message.
 
@@ -277,6 +312,7 @@ class ClientManager:
         dict[str, Any] | None
             The parsed message or None if it couldn't be parsed.
         """
+        self._negotiate_codec(raw_message)
         try:
             msg = parse_client_message(raw_message)
         except ValueError as e:
@@ -359,7 +395,7 @@ class ClientManager:
 
     async def _handle_run(self, msg: RunWorkflowRequest) -> dict[str, Any]:
         try:
-            data_dict = json.loads(msg.data)
+            data_dict = load_message(msg.data)
             waldiez = Waldiez.from_dict(data_dict)
         except Exception as e:
             return RunWorkflowResponse.fail(
@@ -373,6 +409,7 @@ class ClientManager:
             on_output=self._mk_on_output(session_id),
             on_input_request=self._mk_on_input_request(session_id),
             mode="run",
+            worker_pool=self.worker_pool,
         )
 
         await self._create_session_for_runner(
@@ -389,7 +426,7 @@ class ClientManager:
         self, msg: StepRunWorkflowRequest
     ) -> dict[str, Any]:
         try:
-            data_dict = json.loads(msg.data)
+            data_dict = load_message(msg.data)
             waldiez = Waldiez.from_dict(data_dict)
         except Exception as e:
             return StepRunWorkflowResponse.fail(
@@ -406,6 +443,7 @@ class ClientManager:
             mode="debug",  # step-by-step via CLI
             breakpoints=msg.breakpoints,
             checkpoint=msg.checkpoint,
+            worker_pool=self.worker_pool,
         )
 
         await self._create_session_for_runner(
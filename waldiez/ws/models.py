@@ -670,6 +670,38 @@ WaldiezWsMessage = Annotated[
 # ========================================
 
 
+def load_message(data: str | dict[str, Any]) -> Any:
+    """Load a (JSON) message, decoding it if enveloped by a codec.
+
+    Parameters
+    ----------
+    data : str | dict[str, Any]
+        Message data
+
+    Returns
+    -------
+    Any
+        The loaded message
+
+    Raises
+    ------
+    ValueError
+        If the message cannot be loaded
+    """
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid message format: {e}") from e
+    if isinstance(data, dict) and "codec" in data and "payload" in data:
+        # only imported (with the I/O streams) if needed
+        # pylint: disable=import-outside-toplevel
+        from waldiez.io.codec import decode_payload
+
+        return decode_payload(data)
+    return data
+
+
 # noinspection PyTypeHints,DuplicatedCode
 def parse_client_message(data: str | dict[str, Any]) -> ClientMessage:
     """Parse client message from JSON string or dict.
@@ -689,11 +721,7 @@ def parse_client_message(data: str | dict[str, Any]) -> ClientMessage:
     ValueError
         If message cannot be parsed
     """
-    if isinstance(data, str):
-        try:
-            data = json.loads(data)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid message format: {e}") from e
+    data = load_message(data)
     try:
         return _ClientMessageWrapper.model_validate({"message": data}).message
     except ValidationError as e:
@@ -719,11 +747,7 @@ def parse_server_message(data: str | dict[str, Any]) -> ServerMessage:
     ValueError
         If message cannot be parsed
     """
-    if isinstance(data, str):
-        try:
-            data = json.loads(data)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid message format: {e}") from e
+    data = load_message(data)
     try:
         return _ServerMessageWrapper.model_validate({"message": data}).message
     except ValidationError as e:
@@ -22,6 +22,10 @@ from collections.abc import Sequence
 from pathlib import Path
 from typing import Any, final
 
+from waldiez.running.subprocess_runner.worker_pool import WorkerPool
+from waldiez.storage import StorageManager
+from waldiez.storage.retention import RetentionPolicy
+
 from .client_manager import ClientManager
 from .errors import ErrorHandler, MessageParsingError, ServerOverloadError
 from .models import ConnectionNotification
@@ -116,6 +120,15 @@ class WaldiezWsServer:
             Maximum queue size
         write_limit : int
             Write buffer limit
+        worker_pool_size : int
+            Number of warm worker processes to run the flows in
+            (default: 0, spawn a new process for each run)
+        retention_policy : RetentionPolicy | None
+            Checkpoint retention to enforce in the background
+            (default: None, keep all checkpoints)
+        gc_interval : float
+            Interval in seconds between checkpoint garbage collections
+            (default: 3600)
         """
         self.host = host
         self.port = port
@@ -131,6 +144,19 @@ class WaldiezWsServer:
         self.max_size = kwargs.get("max_size", 2**23)  # 8MB
         self.max_queue = kwargs.get("max_queue", 32)
         self.write_limit = kwargs.get("write_limit", 2**16)  # 64KB
+        worker_pool_size = int(kwargs.get("worker_pool_size", 0) or 0)
+        self.worker_pool: WorkerPool | None = (
+            WorkerPool(size=worker_pool_size, logger=logger)
+            if worker_pool_size > 0 and WorkerPool.is_supported()
+            else None
+        )
+
+        # Checkpoint garbage collection
+        self.retention_policy: RetentionPolicy | None = kwargs.get(
+            "retention_policy"
+        )
+        self.gc_interval = float(kwargs.get("gc_interval", 3600.0))
+        self._gc_task: asyncio.Task[None] | None = None
 
         # Server state
         self.server: websockets.Server | None = None
@@ -184,6 +210,7 @@ class WaldiezWsServer:
             self.session_manager,
             workspace_dir=self.workspace_dir,
             error_handler=self.error_handler,
+            worker_pool=self.worker_pool,
         )
         self.clients[client_id] = client_manager
         self.stats["connections_total"] += 1
@@ -283,6 +310,10 @@ class WaldiezWsServer:
             return
 
         await self.session_manager.start()
+        self._start_gc()
+        if self.worker_pool is not None:
+            logger.info("Starting %d warm workers", self.worker_pool.size)
+            await asyncio.to_thread(self.worker_pool.start)
         # Check port availability
         if not self.auto_reload and not is_port_available(self.port):
             logger.warning("Port %d is not available", self.port)
@@ -335,6 +366,9 @@ class WaldiezWsServer:
     async def stop(self) -> None:
         """Stop the WebSocket server."""
         await self.session_manager.stop()
+        await self._stop_gc()
+        if self.worker_pool is not None:
+            await asyncio.to_thread(self.worker_pool.close)
         if not self.is_running:
             logger.warning("Server is not running")
             return
@@ -366,6 +400,48 @@ class WaldiezWsServer:
         uptime = time.time() - self.start_time
         logger.info("WebSocket server stopped (uptime: %.1f seconds)", uptime)
 
+    def _start_gc(self) -> None:
+        """Start the checkpoint garbage collection (if configured)."""
+        if self._gc_task is not None:
+            return
+        if self.retention_policy is None or not self.retention_policy.enabled:
+            return
+        self._gc_task = asyncio.create_task(
+            self._gc_loop(StorageManager(), self.retention_policy)
+        )
+
+    async def _stop_gc(self) -> None:
+        """Stop the checkpoint garbage collection."""
+        if self._gc_task is None:
+            return
+        self._gc_task.cancel()
+        try:
+            await self._gc_task
+        except asyncio.CancelledError:
+            pass
+        self._gc_task = None
+
+    async def _gc_loop(
+        self, storage_manager: StorageManager, policy: RetentionPolicy
+    ) -> None:
+        """Periodically remove the checkpoints the policy does not keep."""
+        while True:
+            try:
+                await asyncio.sleep(self.gc_interval)
+                report = await storage_manager.a_apply_retention(policy)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Checkpoint garbage collection failed: %s", e)
+                continue
+            if report.deleted:
+                logger.info(
+                    "Removed %d expired checkpoint(s) (~%d bytes)",
+                    report.deleted,
+                    report.freed_bytes,
+                )
+        storage_manager.close()
+
     def shutdown(self) -> None:
         """Trigger server shutdown."""
         self.shutdown_event.set()